@@ -0,0 +1,101 @@
+"""
+Benchmark Analyzer.merge_thin_units against the previous row-by-row implementation.
+
+Builds synthetic holes of 1k to 100k units with many thin, repeated
+lithologies, checks that both implementations produce the same units and
+prints their run times.
+
+Usage:
+    python -m benchmarks.bench_merge_thin_units [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.core.analyzer import Analyzer
+from src.core.config import (
+    COALLOG_V31_COLUMNS, DEFAULT_LITHOLOGY_RULES, DEFAULT_MERGE_THRESHOLD,
+    LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN
+)
+
+
+def legacy_merge_thin_units(analyzer, units_df, threshold=DEFAULT_MERGE_THRESHOLD):
+    """The iloc/Series based merge that merge_thin_units replaced."""
+    if units_df.empty or len(units_df) <= 1:
+        return units_df
+
+    merged_units = units_df.sort_values('from_depth').reset_index(drop=True)
+    final_units = []
+    i = 0
+
+    while i < len(merged_units):
+        current_unit = merged_units.iloc[i].copy()
+        while (current_unit.get(RECOVERED_THICKNESS_COLUMN, 0) < threshold and
+               i + 1 < len(merged_units)):
+            next_unit = merged_units.iloc[i + 1]
+            same_lithology = (current_unit.get(LITHOLOGY_COLUMN, '') == next_unit.get(LITHOLOGY_COLUMN, '') and
+                              current_unit.get('lithology_qualifier', '') == next_unit.get('lithology_qualifier', ''))
+            if same_lithology:
+                current_unit['to_depth'] = next_unit['to_depth']
+                current_unit[RECOVERED_THICKNESS_COLUMN] = current_unit['to_depth'] - current_unit['from_depth']
+                i += 1
+            else:
+                break
+        final_units.append(current_unit)
+        i += 1
+
+    result_df = pd.DataFrame(final_units)
+    if not result_df.empty:
+        result_df = analyzer._ensure_all_columns(result_df)
+        result_df = result_df[COALLOG_V31_COLUMNS + ["background_color", "svg_path"]]
+    return result_df
+
+
+def synthetic_units(analyzer, num_units, seed=0):
+    """Group a synthetic classified hole that yields roughly ``num_units`` units."""
+    rng = np.random.default_rng(seed)
+    codes = rng.choice(['CO', 'SS', 'SH'], size=num_units, p=[0.2, 0.4, 0.4])
+    run_lengths = rng.choice([1, 2, 3, 10], size=num_units, p=[0.4, 0.3, 0.2, 0.1])
+    samples = pd.DataFrame({
+        'DEPT': np.arange(run_lengths.sum()) * 0.01,
+        LITHOLOGY_COLUMN: np.repeat(codes, run_lengths),
+    })
+    # Merging adjacent equal codes of the raw runs is what group_into_units does;
+    # rebuild the units directly so that thin units of the same code are adjacent
+    units = analyzer._group_standard_units(samples, {rule['code']: rule for rule in DEFAULT_LITHOLOGY_RULES})
+    split = units.loc[units.index.repeat(2)].reset_index(drop=True)
+    midpoints = (split['from_depth'] + split['to_depth']) / 2
+    split.loc[0::2, 'to_depth'] = midpoints[0::2]
+    split.loc[1::2, 'from_depth'] = midpoints[1::2]
+    split[RECOVERED_THICKNESS_COLUMN] = split['to_depth'] - split['from_depth']
+    return split.head(num_units)
+
+
+def run(sizes, threshold):
+    analyzer = Analyzer()
+    print(f"{'units':>8} {'legacy (s)':>12} {'array (s)':>12} {'speedup':>9} {'merged':>8}")
+    for size in sizes:
+        units = synthetic_units(analyzer, size)
+
+        start = time.perf_counter()
+        expected = legacy_merge_thin_units(analyzer, units, threshold)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = analyzer.merge_thin_units(units, threshold)
+        array_time = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        print(f"{size:>8} {legacy_time:>12.4f} {array_time:>12.4f} "
+              f"{legacy_time / max(array_time, 1e-9):>8.1f}x {len(result):>8}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--threshold', type=float, default=DEFAULT_MERGE_THRESHOLD)
+    args = parser.parse_args()
+    run(args.sizes, args.threshold)
@@ -0,0 +1,126 @@
+"""
+Earthworm Borehole Logger - command-line interface
+
+Classifies LAS files and writes the lithology template without starting the
+GUI:
+
+    python -m src.cli classify hole.las --settings settings.json --output hole.xlsx
+    python -m src.cli classify campaign/ --settings settings.json --output results/ --workers 8
+
+Only ``src/core`` is used. Heavy modules (pandas, lasio, openpyxl) are
+imported when a command runs, so ``--help`` and argument errors return
+immediately; Qt and pyqtgraph are never imported.
+"""
+
+import argparse
+import os
+import sys
+
+# Default curve selections, matching the analysis tab's defaults
+DEFAULT_GAMMA_MNEMONIC = 'GR'
+DEFAULT_DENSITY_MNEMONIC = 'RHOB'
+
+
+def find_las_files(path):
+    """Return the LAS file at ``path``, or every LAS file in it if it's a directory."""
+    if os.path.isdir(path):
+        return sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith('.las') and os.path.isfile(os.path.join(path, name))
+        )
+    return [path]
+
+
+def build_mnemonic_map(args, settings):
+    """Curve mapping from the settings file, overridden by command-line options."""
+    mnemonic_map = {'gamma': DEFAULT_GAMMA_MNEMONIC, 'density': DEFAULT_DENSITY_MNEMONIC}
+    mnemonic_map.update(settings.get('mnemonic_map') or {})
+    for standard_name in ('gamma', 'density', 'short_space_density', 'long_space_density', 'caliper', 'resistivity'):
+        value = getattr(args, standard_name)
+        if value:
+            mnemonic_map[standard_name] = value
+    return mnemonic_map
+
+
+def classify_command(args):
+    """Run the classification pipeline over the given LAS file(s)."""
+    from .core.settings_manager import load_settings
+    from .core.batch_pipeline import (
+        AnalysisSettings, BatchAnalysisPipeline, BatchReport, DEFAULT_TEMPLATE_PATH, run_hole
+    )
+
+    if args.settings and not os.path.exists(args.settings):
+        print(f"Error: settings file not found: {args.settings}", file=sys.stderr)
+        return 2
+
+    file_paths = find_las_files(args.input)
+    if not file_paths:
+        print(f"Error: no LAS files found in {args.input}", file=sys.stderr)
+        return 2
+
+    settings = load_settings(args.settings)
+
+    # A single file may be written to an explicit .xlsx path; otherwise the
+    # output is a directory holding <hole>_lithology.xlsx per file
+    single_output = (len(file_paths) == 1 and args.output and args.output.lower().endswith('.xlsx'))
+    output_dir = os.path.dirname(os.path.abspath(args.output)) if single_output else args.output
+
+    analysis_settings = AnalysisSettings.from_settings(
+        settings, build_mnemonic_map(args, settings),
+        template_path=None if args.no_template else (args.template or DEFAULT_TEMPLATE_PATH),
+        output_dir=output_dir,
+    )
+
+    def report_progress(completed, total, result):
+        status = 'OK' if result.success else 'FAILED'
+        print(f"[{completed}/{total}] {status} {result.file_path} "
+              f"({result.num_units} units, {result.elapsed_seconds:.1f} s)")
+
+    if single_output:
+        result = run_hole(file_paths[0], analysis_settings, output_path=os.path.abspath(args.output))
+        report_progress(1, 1, result)
+        report = BatchReport([result], result.elapsed_seconds)
+    else:
+        pipeline = BatchAnalysisPipeline(analysis_settings, max_workers=args.workers)
+        report = pipeline.run(file_paths, progress_callback=report_progress)
+
+    print(report.summary())
+    if args.report:
+        report.save(args.report)
+        print(f"Report written to {args.report}")
+    return 0 if not report.failed else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m src.cli', description='Earthworm Borehole Logger (headless)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    classify = subparsers.add_parser('classify', help='Classify LAS files and export the lithology template')
+    classify.add_argument('input', help='LAS file, or directory of LAS files')
+    classify.add_argument('--settings', help='Settings JSON (as saved by the application); defaults to the saved application settings')
+    classify.add_argument('--output', '-o',
+                          help='Output .xlsx for a single file, or output directory (default: next to each LAS file)')
+    classify.add_argument('--template', help='Excel template to fill (default: the bundled TEMPLATE.xlsx)')
+    classify.add_argument('--no-template', action='store_true', help='Classify only; skip the Excel export')
+    classify.add_argument('--workers', '-j', type=int, default=None,
+                          help='Worker processes for directories (default: CPU count)')
+    classify.add_argument('--report', help='Write a per-hole CSV report to this path')
+
+    curves = classify.add_argument_group('curve mnemonics')
+    curves.add_argument('--gamma', help=f'Gamma ray mnemonic (default: {DEFAULT_GAMMA_MNEMONIC})')
+    curves.add_argument('--density', help=f'Density mnemonic (default: {DEFAULT_DENSITY_MNEMONIC})')
+    curves.add_argument('--short-space-density', dest='short_space_density', help='Short space density mnemonic')
+    curves.add_argument('--long-space-density', dest='long_space_density', help='Long space density mnemonic')
+    curves.add_argument('--caliper', help='Caliper mnemonic')
+    curves.add_argument('--resistivity', help='Resistivity mnemonic')
+    classify.set_defaults(func=classify_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
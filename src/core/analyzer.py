@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import openpyxl
 import os
 import shutil
 import logging
@@ -12,6 +11,7 @@ from .config import (
     RECORD_SEQUENCE_FLAG_COLUMN, INTERRELATIONSHIP_COLUMN, LITHOLOGY_PERCENT_COLUMN,
     DEFAULT_LITHOLOGY_RULES
 )
+from .classification_engine import CompiledLithologyRules, nearest_lithology_codes, extreme_value_codes
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -38,9 +38,10 @@ class Analyzer:
             pandas.DataFrame: The DataFrame with lithology classification columns.
         """
         logger.info(f"classify_rows called with use_researched_defaults={use_researched_defaults}")
-        classified_df = dataframe.copy()
-        classified_df[LITHOLOGY_COLUMN] = 'NL'  # Old column for backward compatibility
-        classified_df[LITHOLOGY_COLUMN] = 'NL'  # New column for 37-column schema
+        # Shallow copy: the new lithology column must not leak into the caller's frame,
+        # but there is no need to duplicate the curve data
+        classified_df = dataframe.copy(deep=False)
+        classified_df[LITHOLOGY_COLUMN] = 'NL'
 
         # Apply casing depth masking if enabled
         if casing_depth_enabled and casing_depth_m > 0:
@@ -49,7 +50,6 @@ class Analyzer:
                 # Force rows with depth <= casing_depth_m to 'NL'
                 mask = classified_df[DEPTH_COLUMN] <= casing_depth_m
                 classified_df.loc[mask, LITHOLOGY_COLUMN] = 'NL'
-                classified_df.loc[mask, LITHOLOGY_COLUMN] = 'NL'
                 logger.debug(f"Applied casing depth masking: {mask.sum()} rows with depth <= {casing_depth_m}m forced to 'NL'")
             else:
                 logger.warning(f"Depth column '{DEPTH_COLUMN}' not found. Cannot apply casing depth masking.")
@@ -74,64 +74,15 @@ class Analyzer:
             logger.warning("No suitable density column found in DataFrame for classification. Classification may be inaccurate.")
             return classified_df # Cannot classify without density
 
-        for rule in lithology_rules:
-            name = rule.get('name')
-            code = rule.get('code')
-            
-            # Get current rule values
-            gamma_min = rule.get('gamma_min')
-            gamma_max = rule.get('gamma_max')
-            density_min = rule.get('density_min')
-            density_max = rule.get('density_max')
-
-            # Skip rule if it's for 'Not Logged' as it's a default classification
-            if code == 'NL':
-                continue
+        # Compile the rules into bound arrays and match every row in one pass (first match wins)
+        rule_set = CompiledLithologyRules(lithology_rules, use_researched_defaults)
+        code_indices = rule_set.classify(
+            classified_df[gamma_col_name].to_numpy(dtype=np.float64, na_value=np.nan),
+            classified_df[density_col_name].to_numpy(dtype=np.float64, na_value=np.nan)
+        )
 
-            # Determine if parameters are marked as "don't care" (both min and max are INVALID_DATA_VALUE)
-            gamma_ignore = (gamma_min == INVALID_DATA_VALUE and gamma_max == INVALID_DATA_VALUE)
-            density_ignore = (density_min == INVALID_DATA_VALUE and density_max == INVALID_DATA_VALUE)
-
-            # Handle gamma and density ranges based on user preference for researched defaults
-            if code in RESEARCHED_LITHOLOGY_DEFAULTS:
-                researched_defaults = RESEARCHED_LITHOLOGY_DEFAULTS[code]
-
-                if use_researched_defaults:
-                    # Apply gamma defaults if current rule's gamma range is don't care OR zero
-                    gamma_missing = gamma_ignore or (gamma_min == 0.0 and gamma_max == 0.0)
-                    if gamma_missing and 'gamma_min' in researched_defaults and 'gamma_max' in researched_defaults:
-                        gamma_min = researched_defaults['gamma_min']
-                        gamma_max = researched_defaults['gamma_max']
-                        gamma_ignore = False  # No longer ignore this parameter
-                        logger.info(f"Applying researched gamma defaults for {code}: {gamma_min}-{gamma_max} (use_researched_defaults={use_researched_defaults})")
-                    elif gamma_missing:
-                        logger.debug(f"Gamma missing for {code} but no researched defaults available")
-
-                    # Apply density defaults if current rule's density range is don't care OR zero
-                    density_missing = density_ignore or (density_min == 0.0 and density_max == 0.0)
-                    if density_missing and 'density_min' in researched_defaults and 'density_max' in researched_defaults:
-                        density_min = researched_defaults['density_min']
-                        density_max = researched_defaults['density_max']
-                        density_ignore = False  # No longer ignore this parameter
-                        logger.info(f"Applying researched density defaults for {code}: {density_min}-{density_max} (use_researched_defaults={use_researched_defaults})")
-                    elif density_missing:
-                        logger.debug(f"Density missing for {code} but no researched defaults available")
-                else:
-                    logger.debug(f"use_researched_defaults is False, skipping researched defaults for {code}")
-
-            # Create a boolean mask for rows that are not yet classified
-            unclassified_mask = (classified_df[LITHOLOGY_COLUMN] == 'NL')
-
-            # Create conditions for gamma and density, handling "don't care" markers
-            gamma_condition = ((classified_df[gamma_col_name] >= gamma_min) & (classified_df[gamma_col_name] <= gamma_max)) if not gamma_ignore else True
-            density_condition = ((classified_df[density_col_name] >= density_min) & (classified_df[density_col_name] <= density_max)) if not density_ignore else True
-
-            # Create a boolean mask for the current rule
-            rule_mask = gamma_condition & density_condition
-
-            # Apply the rule only to unclassified rows that match the rule criteria
-            classified_df.loc[unclassified_mask & rule_mask, LITHOLOGY_COLUMN] = code
-            classified_df.loc[unclassified_mask & rule_mask, LITHOLOGY_COLUMN] = code
+        # Every row is still 'NL' at this point, so the rule codes apply to all of them
+        classified_df[LITHOLOGY_COLUMN] = rule_set.labels(code_indices)
 
         # Apply fallback classification for remaining 'NL' rows if enabled
         if use_fallback_classification:
@@ -163,21 +114,19 @@ class Analyzer:
 
         logger.debug(f"Found {nl_count} 'NL' rows for fallback classification")
 
-        # Apply fallback using researched defaults
-        fallback_classified_df = dataframe.copy()
-
-        for idx in dataframe[nl_mask].index:
-            row = dataframe.loc[idx]
-            gamma_val = row[gamma_col_name]
-            density_val = row[density_col_name]
+        # Apply fallback using researched defaults to all 'NL' rows at once
+        fallback_classified_df = dataframe.copy(deep=False)
+        lithology = fallback_classified_df[LITHOLOGY_COLUMN].to_numpy(dtype=object, copy=True)
+        nl_rows = np.flatnonzero(nl_mask.to_numpy())
 
-            # Find best matching lithology from researched defaults
-            best_match = self._get_nearest_lithology(gamma_val, density_val)
+        gamma_values = fallback_classified_df[gamma_col_name].to_numpy(dtype=np.float64, na_value=np.nan)[nl_rows]
+        density_values = fallback_classified_df[density_col_name].to_numpy(dtype=np.float64, na_value=np.nan)[nl_rows]
+        best_matches = nearest_lithology_codes(gamma_values, density_values)
 
-            if best_match:
-                fallback_classified_df.loc[idx, LITHOLOGY_COLUMN] = best_match
-                fallback_classified_df.loc[idx, LITHOLOGY_COLUMN] = best_match
-                logger.debug(f"Fallback classified row {idx}: gamma={gamma_val:.1f}, density={density_val:.3f} -> {best_match}")
+        matched = pd.notna(best_matches)
+        lithology[nl_rows[matched]] = best_matches[matched]
+        fallback_classified_df[LITHOLOGY_COLUMN] = lithology
+        logger.debug(f"Fallback classified {int(matched.sum())} rows by nearest researched lithology")
 
         # Apply extreme value rules for any remaining 'NL' rows
         remaining_nl_mask = (fallback_classified_df[LITHOLOGY_COLUMN] == 'NL')
@@ -200,32 +149,7 @@ class Analyzer:
         Returns:
             str: Best matching lithology code, or None if no match found
         """
-        best_match = None
-        min_distance = float('inf')
-
-        for code, defaults in RESEARCHED_LITHOLOGY_DEFAULTS.items():
-            # Calculate distance in parameter space
-            gamma_center = (defaults['gamma_min'] + defaults['gamma_max']) / 2
-            density_center = (defaults['density_min'] + defaults['density_max']) / 2
-
-            # Euclidean distance in normalized space
-            gamma_range = defaults['gamma_max'] - defaults['gamma_min']
-            density_range = defaults['density_max'] - defaults['density_min']
-
-            if gamma_range > 0 and density_range > 0:
-                gamma_distance = abs(gamma_val - gamma_center) / gamma_range
-                density_distance = abs(density_val - density_center) / density_range
-                distance = (gamma_distance ** 2 + density_distance ** 2) ** 0.5
-
-                if distance < min_distance:
-                    min_distance = distance
-                    best_match = code
-
-        # Only return match if it's reasonably close (within 2 standard deviations)
-        if min_distance <= 2.0:
-            return best_match
-
-        return None
+        return nearest_lithology_codes(np.array([gamma_val]), np.array([density_val]))[0]
 
     def _apply_extreme_value_rules(self, dataframe, gamma_col_name, density_col_name, nl_mask):
         """
@@ -240,40 +164,18 @@ class Analyzer:
         Returns:
             pandas.DataFrame: DataFrame with extreme value classifications
         """
-        classified_df = dataframe.copy()
+        classified_df = dataframe.copy(deep=False)
+        lithology = classified_df[LITHOLOGY_COLUMN].to_numpy(dtype=object, copy=True)
+        nl_rows = np.flatnonzero(np.asarray(nl_mask))
 
-        for idx in dataframe[nl_mask].index:
-            gamma_val = dataframe.loc[idx, gamma_col_name]
-            density_val = dataframe.loc[idx, density_col_name]
-
-            # Extreme low density (gas, organic-rich)
-            if density_val < 1.0:
-                classified_df.loc[idx, LITHOLOGY_COLUMN] = 'CO'  # Coal
-                classified_df.loc[idx, LITHOLOGY_COLUMN] = 'CO'  # Coal
-                logger.debug(f"Extreme low density fallback: row {idx}, density={density_val:.3f} -> CO")
-
-            # Extreme high density (metamorphic, dense igneous)
-            elif density_val > 3.5:
-                classified_df.loc[idx, LITHOLOGY_COLUMN] = 'IG'  # Igneous (would need to add this rule)
-                classified_df.loc[idx, LITHOLOGY_COLUMN] = 'IG'  # Igneous (would need to add this rule)
-                logger.debug(f"Extreme high density fallback: row {idx}, density={density_val:.3f} -> IG")
-
-            # Extreme high gamma (very shaly, radioactive)
-            elif gamma_val > 200:
-                classified_df.loc[idx, LITHOLOGY_COLUMN] = 'SH'  # Shale
-                classified_df.loc[idx, LITHOLOGY_COLUMN] = 'SH'  # Shale
-                logger.debug(f"Extreme high gamma fallback: row {idx}, gamma={gamma_val:.1f} -> SH")
-
-            # Very low gamma, moderate density (clean sandstones or carbonates)
-            elif gamma_val < 10 and 2.0 <= density_val <= 3.0:
-                if density_val < 2.7:
-                    classified_df.loc[idx, LITHOLOGY_COLUMN] = 'SS'  # Sandstone
-                    classified_df.loc[idx, LITHOLOGY_COLUMN] = 'SS'  # Sandstone
-                    logger.debug(f"Clean sandstone fallback: row {idx}, gamma={gamma_val:.1f}, density={density_val:.3f} -> SS")
-                else:
-                    classified_df.loc[idx, LITHOLOGY_COLUMN] = 'LS'  # Limestone (would need to add this rule)
-                    classified_df.loc[idx, LITHOLOGY_COLUMN] = 'LS'  # Limestone (would need to add this rule)
-                    logger.debug(f"Carbonate fallback: row {idx}, gamma={gamma_val:.1f}, density={density_val:.3f} -> LS")
+        gamma_values = classified_df[gamma_col_name].to_numpy(dtype=np.float64, na_value=np.nan)[nl_rows]
+        density_values = classified_df[density_col_name].to_numpy(dtype=np.float64, na_value=np.nan)[nl_rows]
+        extreme_codes = extreme_value_codes(gamma_values, density_values)
+
+        matched = pd.notna(extreme_codes)
+        lithology[nl_rows[matched]] = extreme_codes[matched]
+        classified_df[LITHOLOGY_COLUMN] = lithology
+        logger.debug(f"Extreme value fallback classified {int(matched.sum())} rows")
 
         return classified_df
 
@@ -414,17 +316,17 @@ class Analyzer:
                     rule['svg_path'] = ''
             processed_rules.append(rule)
         
-        # Ensure the DataFrame is sorted by depth for correct grouping
-        sorted_df = dataframe.sort_values(by=DEPTH_COLUMN).reset_index(drop=True)
+        # Ensure the DataFrame is sorted by depth for correct grouping (LAS data usually already is)
+        if dataframe[DEPTH_COLUMN].is_monotonic_increasing:
+            sorted_df = dataframe.reset_index(drop=True)
+        else:
+            sorted_df = dataframe.sort_values(by=DEPTH_COLUMN).reset_index(drop=True)
         
         # Create a mapping from lithology code to rule details
         rules_map = {rule['code']: rule for rule in processed_rules}
         
-        # Debug: print rules_map entries
-        print(f"DEBUG (group_into_units): rules_map contains {len(rules_map)} entries")
-        for code, rule in rules_map.items():
-            print(f"  {code}: background_color={rule.get('background_color', 'MISSING')}, svg_path={rule.get('svg_path', 'MISSING')}")
-        
+        logger.debug(f"group_into_units: rules_map contains {len(rules_map)} entries")
+
         # Add missing lithology codes from data (should only be NL if missing)
         unique_codes = sorted_df[LITHOLOGY_COLUMN].unique()
         for code in unique_codes:
@@ -436,12 +338,7 @@ class Analyzer:
                     'svg_path': ''
                 }
                 rules_map[code] = default_rule
-                print(f"DEBUG (group_into_units): Added missing rule for code '{code}' with color {default_rule['background_color']}")
-        
-        # Debug: print final rules_map
-        print(f"DEBUG (group_into_units): Final rules_map entries:")
-        for code, rule in rules_map.items():
-            print(f"  {code}: background_color={rule.get('background_color', 'MISSING')}, svg_path={rule.get('svg_path', 'MISSING')}")
+                logger.debug(f"group_into_units: Added missing rule for code '{code}' with color {default_rule['background_color']}")
 
         # Always use standard grouping - smart interbedding now runs as post-processing
         return self._group_standard_units(sorted_df, rules_map)
@@ -451,6 +348,10 @@ class Analyzer:
         Scan units dataframe for potential interbedding candidates.
         This runs as post-processing after analysis is complete.
 
+        The whole hole is scanned in one forward pass: the alternating sequence
+        from every start index is found at once (see _alternating_sequence_lengths),
+        so unit dictionaries are only built for the sequences that are checked.
+
         Args:
             units_df (pandas.DataFrame): DataFrame of lithological units
             max_sequence_length (int): Maximum number of alternating units to consider
@@ -459,80 +360,123 @@ class Analyzer:
         Returns:
             list: List of interbedding candidate dictionaries
         """
-        print(f"DEBUG: find_interbedding_candidates called with max_sequence_length={max_sequence_length}, thick_unit_threshold={thick_unit_threshold}")
-        print(f"DEBUG: units_df shape: {units_df.shape if hasattr(units_df, 'shape') else 'No shape'}")
-        print(f"DEBUG: units_df columns: {list(units_df.columns) if hasattr(units_df, 'columns') else 'No columns'}")
-
         if units_df.empty or len(units_df) <= 1:
-            print("DEBUG: units_df is empty or has <= 1 rows, returning empty candidates")
             return []
 
+        # Length of the alternating sequence found from every start index (0: none)
+        sequence_lengths = self._alternating_sequence_lengths(units_df, max_sequence_length, thick_unit_threshold)
+        sequence_starts = np.flatnonzero(sequence_lengths)
+        # Object arrays hold Python scalars, as in the unit dictionaries from Series.to_dict
+        column_names = list(units_df.columns)
+        column_values = [units_df[column].to_numpy(dtype=object) for column in column_names]
+
         candidates = []
         i = 0
-        total_iterations = 0
+        while True:
+            # Jump to the next start index with an alternating sequence
+            next_start = int(np.searchsorted(sequence_starts, i))
+            if next_start == len(sequence_starts):
+                break
+            i = int(sequence_starts[next_start])
+            length = int(sequence_lengths[i])
 
-        print(f"DEBUG: Starting scan through {len(units_df)} units")
-        while i < len(units_df) and total_iterations < 1000:  # Safety limit
-            print(f"DEBUG: Iteration {total_iterations}, checking from index {i}")
-            # Look for alternating pattern starting from current position
-            candidate = self._find_interbedding_candidate(units_df, i, max_sequence_length, thick_unit_threshold)
+            rows = zip(*(values[i:i + length] for values in column_values))
+            sequence = [dict(zip(column_names, row)) for row in rows]
+            candidate = self._build_interbedding_candidate(sequence)
 
             if candidate:
-                print(f"DEBUG: Found candidate at index {i}: {candidate.get('from_depth')} - {candidate.get('to_depth')}, {len(candidate.get('lithologies', []))} lithologies")
                 candidates.append(candidate)
                 # Skip the units that were included in this candidate
-                units_skipped = len(candidate['original_sequence'])
-                print(f"DEBUG: Skipping {units_skipped} units after finding candidate")
-                i += units_skipped
+                i += length
             else:
-                print(f"DEBUG: No candidate found at index {i}, moving to next unit")
                 i += 1
 
-            total_iterations += 1
-
-        print(f"DEBUG: Scan complete. Found {len(candidates)} interbedding candidates")
-        for idx, cand in enumerate(candidates):
-            print(f"DEBUG: Candidate {idx}: from_depth={cand.get('from_depth')}, to_depth={cand.get('to_depth')}, lithologies={[l.get('code') for l in cand.get('lithologies', [])]}")
-
-        logger.debug(f"Found {len(candidates)} interbedding candidates")
+        logger.debug(f"Found {len(candidates)} interbedding candidates in {len(units_df)} units")
         return candidates
 
-    def _find_interbedding_candidate(self, units_df, start_idx, max_sequence_length=10, thick_unit_threshold=0.5):
+    def _alternating_sequence_lengths(self, units_df, max_sequence_length=10, thick_unit_threshold=0.5):
         """
-        Find a single interbedding candidate starting from the given index.
+        Length of the alternating sequence accepted from every start index.
+
+        A sequence runs over consecutive units that are not NL, thinner than
+        0.2 m and than thick_unit_threshold, each with a lithology different
+        from the previous unit, for at most max_sequence_length units. It is
+        accepted when it strictly repeats a pattern of 2 lithologies (at least
+        4 units) or 3 lithologies (at least 6 units). All start indices are
+        handled at once from the lithology and thickness arrays.
 
         Args:
             units_df (pandas.DataFrame): DataFrame of lithological units
-            start_idx (int): Starting index in the units dataframe
             max_sequence_length (int): Maximum number of alternating units to consider
             thick_unit_threshold (float): Skip interbedding detection for units thicker than this
 
         Returns:
-            dict: Interbedding candidate dictionary or None if no candidate found
+            numpy.ndarray: Sequence length per start index, 0 where no sequence is accepted
         """
-        print(f"DEBUG: _find_interbedding_candidate called with start_idx={start_idx}, max_sequence_length={max_sequence_length}, thick_unit_threshold={thick_unit_threshold}")
-
-        if start_idx >= len(units_df):
-            print("DEBUG: start_idx >= len(units_df), returning None")
-            return None
+        count = len(units_df)
+        lithology = units_df[LITHOLOGY_COLUMN].to_numpy()
+        codes, _ = pd.factorize(lithology)
+        if RECOVERED_THICKNESS_COLUMN in units_df.columns:
+            thickness = pd.to_numeric(units_df[RECOVERED_THICKNESS_COLUMN], errors='coerce').to_numpy(dtype=float)
+        elif 'thickness' in units_df.columns:
+            thickness = pd.to_numeric(units_df['thickness'], errors='coerce').to_numpy(dtype=float)
+        else:
+            thickness = np.zeros(count)
+
+        # Units a sequence may contain (NaN thicknesses pass, as in the unit-by-unit checks)
+        eligible = (lithology != 'NL') & ~(thickness >= 0.2) & ~(thickness > thick_unit_threshold)
+
+        positions = np.arange(count + 1)
+        starts = positions[:count]
+
+        def first_false(flags, indices):
+            """Index of the first False in flags at or after each index (flags[count] is always False)."""
+            first_false_from = np.minimum.accumulate(np.where(flags, count, positions)[::-1])[::-1]
+            return first_false_from[np.minimum(indices, count)]
+
+        # links[k]: unit k extends a sequence that reaches unit k - 1
+        links = np.zeros(count + 1, dtype=bool)
+        links[1:count] = eligible[1:] & eligible[:-1] & (codes[1:] != codes[:-1])
+        lengths = np.where(eligible, np.minimum(first_false(links, starts + 1) - starts, max_sequence_length), 0)
+        ends = starts + lengths
+
+        # A pattern of `period` lithologies repeats when every unit from start + period
+        # up to the end of the sequence has the lithology of the unit `period` before it
+        accepted = np.zeros(count, dtype=bool)
+        for period, min_length in ((2, 4), (3, 6)):
+            repeats = np.zeros(count + 1, dtype=bool)
+            repeats[period:count] = codes[period:] == codes[:-period]
+            periodic = (lengths >= min_length) & (first_false(repeats, starts + period) >= ends)
+            if period == 3:
+                # The first three lithologies must all differ (neighbours already do)
+                distinct = np.zeros(count, dtype=bool)
+                distinct[:count - 2] = codes[:-2] != codes[2:]
+                periodic &= distinct
+            accepted |= periodic
+
+        return np.where(accepted, lengths, 0)
+
+    def _build_interbedding_candidate(self, sequence):
+        """
+        Build an interbedding candidate from an alternating sequence of units.
 
-        # Get sequence of alternating units
-        print(f"DEBUG: Calling _extract_alternating_sequence from index {start_idx}")
-        sequence = self._extract_alternating_sequence(units_df, start_idx, max_sequence_length, thick_unit_threshold)
-        print(f"DEBUG: _extract_alternating_sequence returned {len(sequence) if sequence else 0} units")
+        Args:
+            sequence (list): Unit dictionaries of an accepted alternating sequence
 
+        Returns:
+            dict: Interbedding candidate dictionary or None if the sequence does not qualify
+        """
         if not sequence or len(sequence) < 3:  # Need at least 3 units for meaningful interbedding
-            print(f"DEBUG: Sequence too short (length={len(sequence) if sequence else 0}), need at least 3 units. Returning None")
             return None
 
         # Calculate metrics for the sequence
         total_thickness = sum(unit.get(RECOVERED_THICKNESS_COLUMN, unit.get('thickness', 0)) for unit in sequence)
-        print(f"DEBUG: Total thickness of sequence: {total_thickness}")
+        if total_thickness == 0:  # No thicknesses to work out lithology percentages from
+            return None
 
         # Calculate average layer thickness (total thickness ÷ number of layers)
         # This matches the user's specification: "the layer thickness calculation should be a sum of all grouped lithology units that are creating the interbedded section"
         avg_layer_thickness = total_thickness / len(sequence)
-        print(f"DEBUG: Average layer thickness: {avg_layer_thickness}")
 
         # Determine interrelationship code based on average layer thickness
         if avg_layer_thickness < 0.02:
@@ -544,8 +488,6 @@ class Analyzer:
         else:
             inter_code = 'CB'  # Coarsely Interbedded (> 200mm)
 
-        print(f"DEBUG: Determined interrelationship code: {inter_code}")
-
         # Calculate lithology percentages and dominance
         lithology_thicknesses = {}
         for unit in sequence:
@@ -556,20 +498,15 @@ class Analyzer:
             thickness = unit.get(RECOVERED_THICKNESS_COLUMN, unit.get('thickness', 0))
             lithology_thicknesses[code] = lithology_thicknesses.get(code, 0) + thickness
 
-        print(f"DEBUG: Lithology thicknesses (NL excluded): {lithology_thicknesses}")
-
         # If we have no lithologies after excluding NL, return None
         if not lithology_thicknesses:
-            print(f"DEBUG: No lithologies after excluding NL, returning None")
             return None
 
         # Sort by thickness (dominance) - user specified "by total thickness"
         sorted_lithologies = sorted(lithology_thicknesses.items(), key=lambda x: x[1], reverse=True)
-        print(f"DEBUG: Sorted lithologies by thickness: {sorted_lithologies}")
 
         # Apply simplification for 3+ lithologies
         if len(sorted_lithologies) > 2:
-            print(f"DEBUG: Found {len(sorted_lithologies)} lithologies, applying simplification rules")
             
             # Get the two most dominant lithologies
             dominant1_code, dominant1_thickness = sorted_lithologies[0]
@@ -586,12 +523,10 @@ class Analyzer:
                 
                 # If third lithology exceeds 10%, keep it as separate
                 if percentage > 10:
-                    print(f"DEBUG: Third lithology {code} exceeds 10% ({percentage:.2f}%), keeping as separate")
                     remaining_lithologies.append((code, thickness))
                 else:
                     # Group into most similar major lithology
                     # For now, we'll group into dominant1 (could be enhanced with similarity logic)
-                    print(f"DEBUG: Third lithology {code} is {percentage:.2f}%, grouping into {dominant1_code}")
                     dominant1_thickness += thickness
             
             # Rebuild sorted lithologies list
@@ -600,17 +535,14 @@ class Analyzer:
                 (dominant2_code, dominant2_thickness)
             ] + remaining_lithologies
             
-            print(f"DEBUG: Simplified lithologies: {sorted_lithologies}")
 
         # Create lithology components with percentages and sequence numbers
         lithologies = []
         for seq_num, (code, thickness) in enumerate(sorted_lithologies, 1):
             percentage = (thickness / total_thickness) * 100
-            print(f"DEBUG: Lithology {code}: thickness={thickness}, percentage={percentage}")
 
             # Apply ≥5% rule for non-dominant lithologies (dominant always included)
             if seq_num > 1 and percentage < 5:
-                print(f"DEBUG: Skipping lithology {code} (percentage {percentage} < 5% and not dominant)")
                 continue
 
             lithologies.append({
@@ -620,11 +552,8 @@ class Analyzer:
                 'sequence': seq_num
             })
 
-        print(f"DEBUG: Final lithologies list: {[l['code'] for l in lithologies]}")
-
         # Only proceed if we have at least 2 lithologies after filtering
         if len(lithologies) < 2:
-            print(f"DEBUG: Only {len(lithologies)} lithologies after filtering, need at least 2. Returning None")
             return None
 
         # Create candidate dictionary
@@ -638,147 +567,8 @@ class Analyzer:
             'total_thickness': total_thickness
         }
 
-        print(f"DEBUG: Created candidate: from_depth={candidate['from_depth']}, to_depth={candidate['to_depth']}")
         return candidate
 
-    def _extract_alternating_sequence(self, units_df, start_idx, max_sequence_length=10, thick_unit_threshold=0.5):
-        """
-        Extract a sequence of alternating lithology units according to Luke's specifications:
-        - Individual layer thicknesses must be <200mm
-        - At least two full cycles of alternation (minimum 4 units for 2 lithologies)
-        - Stop if single lithology persists for >500mm
-        - Stop if clean (non-alternating) unit detected
-        - NL units are excluded from sequence
-
-        Args:
-            units_df (pandas.DataFrame): DataFrame of lithological units
-            start_idx (int): Starting index
-            max_sequence_length (int): Maximum sequence length
-            thick_unit_threshold (float): Stop if unit exceeds this thickness
-
-        Returns:
-            list: List of unit dictionaries in the alternating sequence
-        """
-        print(f"DEBUG: _extract_alternating_sequence called with start_idx={start_idx}, max_sequence_length={max_sequence_length}, thick_unit_threshold={thick_unit_threshold}")
-
-        if start_idx >= len(units_df):
-            print("DEBUG: start_idx >= len(units_df), returning empty sequence")
-            return []
-
-        sequence = []
-        current_code = None
-        units_added = 0
-        same_lithology_run_length = 0
-        same_lithology_run_thickness = 0.0
-
-        print(f"DEBUG: Scanning from index {start_idx} to {min(start_idx + max_sequence_length, len(units_df))}")
-
-        for i in range(start_idx, min(start_idx + max_sequence_length, len(units_df))):
-            unit = units_df.iloc[i]
-            unit_code = unit[LITHOLOGY_COLUMN]
-            unit_thickness = unit.get(RECOVERED_THICKNESS_COLUMN, unit.get('thickness', 0))
-
-            print(f"DEBUG: Checking unit at index {i}: code={unit_code}, thickness={unit_thickness}")
-
-            # Skip NL units - they should not be included in interbedding sequences
-            if unit_code == 'NL':
-                print(f"DEBUG: Unit is NL (Not Logged), breaking sequence")
-                break
-
-            # Check individual layer thickness <200mm (0.2m)
-            if unit_thickness >= 0.2:
-                print(f"DEBUG: Unit thickness {unit_thickness} >= 0.2m, individual layers must be <200mm, stopping sequence")
-                break
-
-            # Skip units that are too thick (user's thick unit threshold - 500mm)
-            if unit_thickness > thick_unit_threshold:
-                print(f"DEBUG: Unit thickness {unit_thickness} > thick_unit_threshold {thick_unit_threshold}, stopping sequence extraction")
-                break
-
-            # Forward-looking: check if next unit would break the sequence
-            if i + 1 < len(units_df):
-                next_unit = units_df.iloc[i + 1]
-                next_unit_thickness = next_unit.get(RECOVERED_THICKNESS_COLUMN, next_unit.get('thickness', 0))
-                next_unit_code = next_unit[LITHOLOGY_COLUMN]
-                
-                # Stop if next unit is too thick (>500mm)
-                if next_unit_thickness > 0.5:
-                    print(f"DEBUG: Next unit thickness {next_unit_thickness} > 500mm, stopping proactively")
-                    # Still add current unit if it fits the pattern
-                    pass
-                # Stop if next unit is NL
-                elif next_unit_code == 'NL':
-                    print(f"DEBUG: Next unit is NL (Not Logged), stopping proactively")
-                    # Still add current unit if it fits the pattern
-                    pass
-
-            # Check if this is the same lithology as previous
-            if unit_code == current_code:
-                same_lithology_run_length += 1
-                same_lithology_run_thickness += unit_thickness
-                print(f"DEBUG: Same lithology {unit_code} as previous, run length={same_lithology_run_length}, run thickness={same_lithology_run_thickness}")
-                
-                # Stop if single lithology persists for >500mm
-                if same_lithology_run_thickness > 0.5:
-                    print(f"DEBUG: Single lithology {unit_code} persists for {same_lithology_run_thickness}m > 500mm, stopping sequence")
-                    break
-                    
-                # Same lithology - this breaks the alternating pattern
-                print(f"DEBUG: Same lithology {unit_code} as previous, breaking alternating pattern")
-                break
-            else:
-                # Different lithology - reset same lithology tracking
-                same_lithology_run_length = 1
-                same_lithology_run_thickness = unit_thickness
-                current_code = unit_code
-                
-                print(f"DEBUG: Adding unit with code {unit_code} (different from previous)")
-                sequence.append(unit.to_dict())
-                units_added += 1
-
-                # Stop if we've added too many units
-                if units_added >= max_sequence_length:
-                    print(f"DEBUG: Reached max_sequence_length {max_sequence_length}, stopping")
-                    break
-
-        # Validate that we have at least two full cycles of alternation
-        if len(sequence) >= 4:  # Need at least 4 units for two full cycles (A-B-A-B)
-            codes = [u[LITHOLOGY_COLUMN] for u in sequence]
-            unique_codes = list(set(codes))
-
-            # For interbedding, we require STRICT alternation between 2 or 3 lithologies
-            if len(unique_codes) < 2 or len(unique_codes) > 3:
-                print(f"DEBUG: Sequence has {len(unique_codes)} unique lithologies (need 2 or 3), returning empty sequence")
-                return []
-
-            # Check if the sequence follows a repeating pattern of the unique codes in order of first appearance
-            # Determine pattern order by first appearance
-            pattern = []
-            for code in codes:
-                if code not in pattern:
-                    pattern.append(code)
-            # Now pattern length equals len(unique_codes)
-            # Verify that the entire sequence matches pattern repeated
-            for i, code in enumerate(codes):
-                expected = pattern[i % len(pattern)]
-                if code != expected:
-                    print(f"DEBUG: Sequence does not follow repeating pattern {pattern}, returning empty sequence")
-                    return []
-                    
-            # Check that we have at least two full cycles
-            # For 2 lithologies: need at least pattern repeated twice (4 units)
-            # For 3 lithologies: need at least pattern repeated twice (6 units)
-            min_units_needed = len(pattern) * 2
-            if len(sequence) < min_units_needed:
-                print(f"DEBUG: Sequence has {len(sequence)} units but need at least {min_units_needed} for two full cycles, returning empty sequence")
-                return []
-        else:
-            print(f"DEBUG: Sequence too short (length={len(sequence)}), need at least 4 units for two full cycles. Returning empty sequence")
-            return []
-
-        print(f"DEBUG: Extracted sequence with {len(sequence)} units: {[u[LITHOLOGY_COLUMN] for u in sequence]}")
-        return sequence
-
     def apply_interbedding_candidates(self, units_df, candidates, selected_indices, lithology_rules):
         """
         Apply selected interbedding candidates to create interbedded units.
@@ -1081,62 +871,42 @@ class Analyzer:
         return merged_units
 
     def _group_standard_units(self, sorted_df, rules_map):
-        """Standard unit grouping without interbedding detection using 37-column schema."""
-        print(f"DEBUG (group_standard_units): rules_map keys = {list(rules_map.keys())}")
-        for code, rule in rules_map.items():
-            print(f"  {code}: background_color={rule.get('background_color', 'MISSING')}, svg_path={rule.get('svg_path', 'MISSING')}")
-        units = []
-        current_unit = None
-
-        for i, row in sorted_df.iterrows():
-            lithology_code = row[LITHOLOGY_COLUMN]
-            current_depth = row[DEPTH_COLUMN]
-            rule = rules_map.get(lithology_code, {})
-            # DEBUG: Print rule info for problematic colors
-            if lithology_code in ['NL', 'XM', 'CO', 'SS', 'SH']:
-                print(f"DEBUG (group_standard_units): lithology_code={lithology_code}, rule keys={list(rule.keys())}, background_color={rule.get('background_color', 'MISSING')}, svg_path={rule.get('svg_path', 'MISSING')}")
-
-            if current_unit is None:
-                # Start a new unit with all 37 columns
-                current_unit = self._create_unit_template(current_depth, lithology_code, rule)
-            elif lithology_code == current_unit[LITHOLOGY_COLUMN]:
-                # Continue the current unit
-                current_unit['to_depth'] = current_depth
-            else:
-                # End the previous unit and start a new one
-                current_unit['to_depth'] = current_depth
-                units.append(current_unit)
-
-                # Start a new unit
-                current_unit = self._create_unit_template(current_depth, lithology_code, rule)
-
-        # Add the last unit
-        if current_unit is not None:
-            current_unit['to_depth'] = sorted_df.iloc[-1][DEPTH_COLUMN]
-            units.append(current_unit)
-
-        # Convert to DataFrame
-        units_df = pd.DataFrame(units)
+        """
+        Standard unit grouping without interbedding detection using 37-column schema.
 
-        # Calculate recovered thickness and ensure all columns are present
-        if not units_df.empty:
-            units_df.loc[:, RECOVERED_THICKNESS_COLUMN] = units_df['to_depth'] - units_df['from_depth']
-            
-            # Ensure all 37 columns are present (add missing ones with defaults)
-            units_df = self._ensure_all_columns(units_df)
-            
-            # Reorder columns to match CoalLog v3.1 schema order
-            units_df = units_df[COALLOG_V31_COLUMNS + ["background_color", "svg_path"]]
-        else:
+        Unit boundaries come from run-length encoding the lithology code array:
+        a unit starts wherever the code differs from the previous row. The units
+        DataFrame is then built column-wise by taking one template row per code.
+        """
+        if sorted_df.empty:
             # Create empty DataFrame with all 37 columns
-            units_df = pd.DataFrame(columns=COALLOG_V31_COLUMNS + ["background_color", "svg_path"])
-
-        return units_df
+            return pd.DataFrame(columns=COALLOG_V31_COLUMNS + ["background_color", "svg_path"])
+
+        code_ids, unique_codes = pd.factorize(sorted_df[LITHOLOGY_COLUMN], use_na_sentinel=False)
+        depths = sorted_df[DEPTH_COLUMN].to_numpy()
+
+        # Change points of the code array give the first row of every unit
+        starts = np.flatnonzero(np.concatenate(([True], code_ids[1:] != code_ids[:-1])))
+        from_depths = depths[starts]
+        # Each unit ends where the next one starts; the last ends at the final sample
+        to_depths = np.append(depths[starts[1:]], depths[-1])
+
+        templates = pd.DataFrame([
+            self._create_unit_template(0.0, code, rules_map.get(code, {})) for code in unique_codes
+        ])
+        units_df = templates.take(code_ids[starts]).reset_index(drop=True)
+        units_df['from_depth'] = from_depths
+        units_df['to_depth'] = to_depths
+        units_df[RECOVERED_THICKNESS_COLUMN] = to_depths - from_depths
+
+        # Ensure all 37 columns are present (add missing ones with defaults)
+        units_df = self._ensure_all_columns(units_df)
+
+        # Reorder columns to match CoalLog v3.1 schema order
+        return units_df[COALLOG_V31_COLUMNS + ["background_color", "svg_path"]]
     
     def _create_unit_template(self, depth, lithology_code, rule):
         """Create a unit dictionary with all 37 columns initialized."""
-        # Debug: print rule info
-        print(f"DEBUG (_create_unit_template): lithology_code={lithology_code}, rule keys={list(rule.keys())}, background_color={rule.get('background_color', 'MISSING')}, svg_path={rule.get('svg_path', 'MISSING')}")
         # Start with default values for all columns
         unit = {col: DEFAULT_COLUMN_VALUES.get(col, '') for col in COALLOG_V31_COLUMNS}
         
@@ -1167,7 +937,6 @@ class Analyzer:
         unit[INTERRELATIONSHIP_COLUMN] = ''
         unit[LITHOLOGY_PERCENT_COLUMN] = 0.0
         
-        print(f"DEBUG (_create_unit_template): unit background_color={unit['background_color']}, svg_path={unit['svg_path']}")
         return unit
     
     def _ensure_all_columns(self, dataframe):
@@ -1424,40 +1193,47 @@ class Analyzer:
         # Ensure units are sorted by depth
         merged_units = units_df.sort_values('from_depth').reset_index(drop=True)
 
-        # List to hold final merged units
-        final_units = []
-        i = 0
-
-        while i < len(merged_units):
-            current_unit = merged_units.iloc[i].copy()
-
-            # Check if this unit is thin and if there are more units to potentially merge
-            # Use recovered_thickness instead of thickness
-            while (current_unit.get(RECOVERED_THICKNESS_COLUMN, 0) < threshold and
-                   i + 1 < len(merged_units)):
-
-                next_unit = merged_units.iloc[i + 1]
+        from_depths = merged_units['from_depth'].tolist()
+        to_depths = merged_units['to_depth'].tolist()
+        if RECOVERED_THICKNESS_COLUMN in merged_units.columns:
+            thicknesses = merged_units[RECOVERED_THICKNESS_COLUMN].tolist()
+        else:
+            thicknesses = [0] * len(merged_units)
 
-                # Check if next unit has same lithology (code and qualifier)
-                # Use new lithology column name
-                same_lithology = (current_unit.get(LITHOLOGY_COLUMN, '') == next_unit.get(LITHOLOGY_COLUMN, '') and
-                                current_unit.get('lithology_qualifier', '') == next_unit.get('lithology_qualifier', ''))
+        # Lithology identity is the (code, qualifier) pair
+        codes = merged_units[LITHOLOGY_COLUMN].tolist() if LITHOLOGY_COLUMN in merged_units.columns else [''] * len(merged_units)
+        qualifiers = merged_units['lithology_qualifier'].tolist() if 'lithology_qualifier' in merged_units.columns else [''] * len(merged_units)
 
-                if same_lithology:
-                    # Merge: extend current unit to include next unit
-                    current_unit['to_depth'] = next_unit['to_depth']
-                    current_unit[RECOVERED_THICKNESS_COLUMN] = current_unit['to_depth'] - current_unit['from_depth']
-                    i += 1  # Skip the merged unit
+        # Single forward pass: a thin unit absorbs following units of the same
+        # lithology until it is no longer thin
+        group_starts = []
+        group_ends = []
+        i = 0
+        n = len(merged_units)
+        while i < n:
+            start = i
+            thickness = thicknesses[i]
+            while thickness < threshold and i + 1 < n:
+                if codes[i + 1] == codes[start] and qualifiers[i + 1] == qualifiers[start]:
+                    i += 1
+                    thickness = to_depths[i] - from_depths[start]
                 else:
-                    # Cannot merge, break the inner loop
                     break
-
-            # Add the (potentially merged) unit to final list
-            final_units.append(current_unit)
+            group_starts.append(start)
+            group_ends.append(i)
             i += 1
 
-        # Convert back to DataFrame
-        result_df = pd.DataFrame(final_units)
+        group_starts = np.array(group_starts, dtype=np.intp)
+        group_ends = np.array(group_ends, dtype=np.intp)
+        merged = group_ends > group_starts
+
+        # Build the result column-wise from the first unit of every group
+        result_df = merged_units.iloc[group_starts].copy()
+        if merged.any():
+            merged_labels = result_df.index[merged]
+            new_to = merged_units['to_depth'].to_numpy()[group_ends[merged]]
+            result_df.loc[merged_labels, 'to_depth'] = new_to
+            result_df.loc[merged_labels, RECOVERED_THICKNESS_COLUMN] = new_to - merged_units['from_depth'].to_numpy()[group_starts[merged]]
 
         # Ensure all 37 columns are present
         if not result_df.empty:
@@ -1473,7 +1249,25 @@ class Analyzer:
 
         return result_df
 
-    def save_to_template(self, classified_data, template_path, output_path, callback=None, units=None):
+    # Template columns written for each unit. Columns flagged as optional are
+    # only written when the unit has a value for them.
+    TEMPLATE_UNIT_COLUMNS = [
+        ('from_depth', 'A', False),
+        ('to_depth', 'B', False),
+        ('recovered_thickness', 'D', False),
+        ('lithology', 'L', False),
+        ('lithology_qualifier', 'M', True),
+        ('shade', 'N', True),
+        ('hue', 'O', True),
+        ('colour', 'P', True),
+        ('weathering', 'Q', True),
+        ('estimated_strength', 'R', True),
+        ('record_sequence_flag', 'S', True),
+        ('interrelationship', 'T', True),
+        ('lithology_percent', 'U', True),
+    ]
+
+    def save_to_template(self, classified_data, template_path, output_path, callback=None, units=None, streaming=False):
         """
         Save classified lithology data to the 'Lithology' sheet in the TEMPLATE.xlsx file.
         
@@ -1483,10 +1277,16 @@ class Analyzer:
             output_path (str): Path where the output file should be saved
             callback (function, optional): Callback function for progress updates
             units (pd.DataFrame, optional): Lithology units with from/to depths and properties
+            streaming (bool): Write the output with openpyxl's write-only mode when the
+                template is a plain single-sheet workbook that can be rebuilt without loss
             
         Returns:
             bool: True if successful, False otherwise
         """
+        # openpyxl is only needed for export, so it isn't imported with the module
+        import openpyxl
+        from openpyxl.utils import get_column_letter
+
         try:
             # Update progress
             if callback:
@@ -1537,124 +1337,44 @@ class Analyzer:
             
             # Define starting row for data insertion (row 5 as specified)
             start_row = 5
-            
-            # Column mapping as specified - updated for 37-column schema
-            # Note: This maps to the TEMPLATE.xlsx columns which may not have all 37 columns
-            # We'll write the core columns that exist in the template
-            column_mapping = {
-                'from_depth': 'A',
-                'to_depth': 'B',
-                'recovered_thickness': 'D',  # Updated column name
-                'lithology': 'L',  # Updated column name (was LITHOLOGY_COLUMN)
-                'lithology_qualifier': 'M',
-                'shade': 'N',
-                'hue': 'O',
-                'colour': 'P',
-                'weathering': 'Q',
-                'estimated_strength': 'R',
-                'record_sequence_flag': 'S',  # Updated column name
-                'interrelationship': 'T',  # Updated column name
-                'lithology_percent': 'U'  # Updated column name
-            }
-            
-            # Function to safely write to a cell, handling merged cells
-            def safe_write_cell(sheet, cell_coord, value):
-                # Check if the cell coordinate is valid
-                try:
-                    cell = sheet[cell_coord]
-                    
-                    # Check if it's a merged cell
-                    for merged_range in sheet.merged_cells.ranges:
-                        if cell.coordinate in merged_range:
-                            # Skip this cell - don't try to write to merged cells
-                            return False
-                    
-                    # If not a merged cell, write the value
-                    cell.value = value
-                    return True
-                except Exception as e:
-                    logger.warning(f"Couldn't write to cell {cell_coord}: {str(e)}")
-                    return False
-            
-            # If we have units data, use it for the template
-            if units is not None and not units.empty:
+
+            has_units = units is not None and not units.empty
+            unit_rows = self._template_unit_rows(units, start_row) if has_units else []
+
+            if streaming and self._template_supports_streaming(workbook, sheet, start_row, unit_rows):
                 if callback:
-                    callback(f"Writing {len(units)} lithology units to Lithology sheet starting at row {start_row}...")
-
-                # Debug: Log first 5 units being written
-                if callback and len(units) > 0:
-                     callback("DEBUG (save_to_template): First 5 units to be written:")
-                     for idx, unit_debug in units.head(5).iterrows():
-                         callback(f"  Index {idx}: {unit_debug.to_dict()}")
-
-                # Write units to the template
-                for i, unit in units.iterrows():
-                    row_num = start_row + i
-
-                    # Write from depth in column A
-                    safe_write_cell(sheet, f'{column_mapping["from_depth"]}{row_num}', unit.get('from_depth', ''))
-                    
-                    # Write to depth in column B
-                    safe_write_cell(sheet, f'{column_mapping["to_depth"]}{row_num}', unit.get('to_depth', ''))
-                    
-                    # Write recovered thickness in column D
-                    safe_write_cell(sheet, f'{column_mapping["recovered_thickness"]}{row_num}', unit.get('recovered_thickness', ''))
-                    
-                    # Write lithology code in column L (using new column name)
-                    safe_write_cell(sheet, f'{column_mapping["lithology"]}{row_num}', unit.get('lithology', unit.get(LITHOLOGY_COLUMN, '')))
-                    
-                    # Write lithology qualifier in column M if available
-                    if 'lithology_qualifier' in unit and unit['lithology_qualifier']:
-                        safe_write_cell(sheet, f'{column_mapping["lithology_qualifier"]}{row_num}', unit['lithology_qualifier'])
-
-                    # Write shade in column N if available in the units dataframe
-                    if 'shade' in unit and unit['shade']:
-                        safe_write_cell(sheet, f'{column_mapping["shade"]}{row_num}', unit['shade'])
-                    
-                    # Write hue in column O if available
-                    if 'hue' in unit and unit['hue']:
-                        safe_write_cell(sheet, f'{column_mapping["hue"]}{row_num}', unit['hue'])
-                    
-                    # Write colour in column P if available
-                    if 'colour' in unit and unit['colour']:
-                        safe_write_cell(sheet, f'{column_mapping["colour"]}{row_num}', unit['colour'])
-
-                    # Write weathering in column Q if available
-                    if 'weathering' in unit and unit['weathering']:
-                        safe_write_cell(sheet, f'{column_mapping["weathering"]}{row_num}', unit['weathering'])
-
-                    # Write estimated strength in column R if available
-                    if 'estimated_strength' in unit and unit['estimated_strength']:
-                        safe_write_cell(sheet, f'{column_mapping["estimated_strength"]}{row_num}', unit['estimated_strength'])
-
-                    # Write record sequence flag in column S if available
-                    if 'record_sequence_flag' in unit and unit['record_sequence_flag']:
-                        safe_write_cell(sheet, f'{column_mapping["record_sequence_flag"]}{row_num}', unit['record_sequence_flag'])
-
-                    # Write interrelationship in column T if available
-                    if 'interrelationship' in unit and unit['interrelationship']:
-                        safe_write_cell(sheet, f'{column_mapping["interrelationship"]}{row_num}', unit['interrelationship'])
-
-                    # Write lithology percent in column U if available
-                    if 'lithology_percent' in unit and unit['lithology_percent'] > 0:
-                        safe_write_cell(sheet, f'{column_mapping["lithology_percent"]}{row_num}', unit['lithology_percent'])
-
-                    # Update progress every 100 units
-                    if i % 100 == 0 and callback and i > 0:
-                        callback(f"Writing unit {i+1} of {len(units)}...")
-
-                # Debug: Log last 5 units being written
-                if callback and len(units) > 5:
-                     callback("DEBUG (save_to_template): Last 5 units to be written:")
-                     for idx, unit_debug in units.tail(5).iterrows():
-                         callback(f"  Index {idx}: {unit_debug.to_dict()}")
+                    callback(f"Streaming {len(unit_rows)} lithology units to: {output_path}")
+                self._stream_template(sheet, start_row, unit_rows, output_path)
+            else:
+                if unit_rows:
+                    if callback:
+                        callback(f"Writing {len(unit_rows)} lithology units to Lithology sheet starting at row {start_row}...")
+
+                    # Merged cells can't be written to; find the ones covering
+                    # the target area once instead of checking every range per cell
+                    row_numbers = [row_num for row_num, _ in unit_rows]
+                    columns = {column for _, cells in unit_rows for column, _ in cells}
+                    merged = self._merged_cell_coordinates(sheet, min(row_numbers), max(row_numbers), columns)
+
+                    for count, (row_num, cells) in enumerate(unit_rows):
+                        for column, value in cells:
+                            if (row_num, column) in merged:
+                                continue
+                            try:
+                                sheet.cell(row=row_num, column=column).value = value
+                            except Exception as e:
+                                logger.warning(f"Couldn't write to cell {get_column_letter(column)}{row_num}: {str(e)}")
+
+                        # Update progress every 1000 units
+                        if count % 1000 == 0 and callback and count > 0:
+                            callback(f"Writing unit {count+1} of {len(unit_rows)}...")
+
+                # Update progress
+                if callback:
+                    callback(f"Saving results to: {output_path}")
 
-            # Update progress
-            if callback:
-                callback(f"Saving results to: {output_path}")
-                
-            # Save the workbook to the output path
-            workbook.save(output_path)
+                # Save the workbook to the output path
+                workbook.save(output_path)
             
             # Log success
             logger.info(f"Successfully saved results to {output_path} (Lithology sheet)")
@@ -1679,3 +1399,101 @@ class Analyzer:
                 callback(error_msg)
             return False
             # Save the workbook to the output path
+
+    def _template_unit_rows(self, units, start_row):
+        """
+        Collect the template cells to write for every unit.
+
+        Returns:
+            list: ``(row_number, [(column_index, value), ...])`` per unit, where the
+                row number is ``start_row`` plus the unit's index label
+        """
+        from openpyxl.utils import column_index_from_string
+
+        columns = []
+        for name, letter, optional in self.TEMPLATE_UNIT_COLUMNS:
+            column_index = column_index_from_string(letter)
+            if name in units.columns:
+                values = units[name].tolist()
+                if name == 'lithology_percent':
+                    write = [value > 0 for value in values]
+                elif optional:
+                    write = [bool(value) for value in values]
+                else:
+                    write = None
+            elif optional:
+                continue
+            else:
+                values = [''] * len(units)
+                write = None
+            columns.append((column_index, values, write))
+
+        unit_rows = []
+        for position, label in enumerate(units.index.tolist()):
+            cells = [(column_index, values[position]) for column_index, values, write in columns
+                     if write is None or write[position]]
+            unit_rows.append((start_row + label, cells))
+        return unit_rows
+
+    @staticmethod
+    def _merged_cell_coordinates(sheet, min_row, max_row, columns):
+        """Return the (row, column) pairs inside merged ranges that overlap the given rows and columns."""
+        merged = set()
+        for merged_range in sheet.merged_cells.ranges:
+            first_row = max(merged_range.min_row, min_row)
+            last_row = min(merged_range.max_row, max_row)
+            if first_row > last_row:
+                continue
+            for column in columns:
+                if merged_range.min_col <= column <= merged_range.max_col:
+                    merged.update((row, column) for row in range(first_row, last_row + 1))
+        return merged
+
+    @staticmethod
+    def _template_supports_streaming(workbook, sheet, start_row, unit_rows):
+        """
+        Check whether the output can be rebuilt in write-only mode without losing anything.
+
+        Write-only workbooks can't carry over the template's formatting, so this is
+        only allowed for a single, unstyled 'Lithology' sheet with nothing below the
+        header rows, and units whose rows can be appended in order.
+        """
+        if workbook.sheetnames != [sheet.title] or sheet.merged_cells.ranges:
+            return False
+        if sheet._images or sheet._charts or sheet.data_validations.dataValidation or sheet.conditional_formatting:
+            return False
+        if sheet.max_row >= start_row and any(cell.value is not None for row in sheet.iter_rows(min_row=start_row) for cell in row):
+            return False
+        if any(cell.has_style for row in sheet.iter_rows(max_row=start_row - 1) for cell in row):
+            return False
+        row_numbers = [row_num for row_num, _ in unit_rows]
+        return all(row_numbers[i] < row_numbers[i + 1] for i in range(len(row_numbers) - 1)) and \
+            (not row_numbers or row_numbers[0] >= start_row)
+
+    @staticmethod
+    def _stream_template(sheet, start_row, unit_rows, output_path):
+        """Write the template header rows and the unit rows with a write-only workbook."""
+        import openpyxl
+
+        header_rows = [[cell.value for cell in row] for row in sheet.iter_rows(max_row=start_row - 1)]
+        width = max([len(row) for row in header_rows] +
+                    [column for _, cells in unit_rows for column, _ in cells[-1:]] + [0])
+
+        stream_workbook = openpyxl.Workbook(write_only=True)
+        stream_sheet = stream_workbook.create_sheet(sheet.title)
+        for row in header_rows:
+            stream_sheet.append(row)
+        for _ in range(len(header_rows), start_row - 1):
+            stream_sheet.append([])
+
+        next_row = start_row
+        for row_num, cells in unit_rows:
+            for _ in range(next_row, row_num):
+                stream_sheet.append([])
+            values = [None] * width
+            for column, value in cells:
+                values[column - 1] = value
+            stream_sheet.append(values)
+            next_row = row_num + 1
+
+        stream_workbook.save(output_path)
@@ -0,0 +1,338 @@
+"""
+Headless batch analysis of many holes.
+
+Runs the same chain as the interactive analysis ``Worker`` (both call
+``analyze_hole``) - load, preprocess, classify, group into units, optionally
+merge thin units and write the Excel template - for every LAS file of a
+campaign, spread over a process pool. Each hole runs in isolation: a failing
+file is recorded in the report and the remaining holes carry on, even when a
+worker process dies. Nothing in here imports Qt, so batches can run on a
+server.
+"""
+
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .analyzer import Analyzer
+from .config import (
+    DEFAULT_MERGE_THRESHOLD, DEFAULT_SMART_INTERBEDDING_MAX_SEQUENCE_LENGTH,
+    DEFAULT_SMART_INTERBEDDING_THICK_UNIT_THRESHOLD, LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN
+)
+from .data_processor import DataProcessor
+
+DEFAULT_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "src", "assets", "TEMPLATE.xlsx"
+)
+
+
+@dataclass
+class AnalysisSettings:
+    """Settings for analysing a hole, mirroring the options of the analysis Worker."""
+    mnemonic_map: Dict[str, str]
+    lithology_rules: List[Dict]
+    use_researched_defaults: bool = True
+    merge_thin_units: bool = False
+    merge_threshold: float = DEFAULT_MERGE_THRESHOLD
+    smart_interbedding: bool = False
+    smart_interbedding_max_sequence_length: int = DEFAULT_SMART_INTERBEDDING_MAX_SEQUENCE_LENGTH
+    smart_interbedding_thick_unit_threshold: float = DEFAULT_SMART_INTERBEDDING_THICK_UNIT_THRESHOLD
+    use_fallback_classification: bool = False
+    analysis_method: str = "standard"
+    casing_depth_enabled: bool = False
+    casing_depth_m: float = 0.0
+    template_path: Optional[str] = DEFAULT_TEMPLATE_PATH  # None skips the Excel export
+    output_dir: Optional[str] = None  # Defaults to each LAS file's own directory
+
+    @classmethod
+    def from_settings(cls, settings: Dict, mnemonic_map: Dict[str, str], **overrides) -> 'AnalysisSettings':
+        """
+        Build analysis settings from an application settings dictionary.
+
+        Args:
+            settings: Dictionary as returned by ``settings_manager.load_settings``
+            mnemonic_map: Mapping of standard curve names to LAS mnemonics
+            **overrides: Field values that take precedence over ``settings``
+        """
+        values = {
+            'mnemonic_map': mnemonic_map,
+            'lithology_rules': settings['lithology_rules'],
+            'use_researched_defaults': settings.get('use_researched_defaults', True),
+            'merge_thin_units': settings.get('merge_thin_units', False),
+            'merge_threshold': settings.get('merge_threshold', DEFAULT_MERGE_THRESHOLD),
+            'smart_interbedding': settings.get('smart_interbedding', False),
+            'smart_interbedding_max_sequence_length': settings.get(
+                'smart_interbedding_max_sequence_length', DEFAULT_SMART_INTERBEDDING_MAX_SEQUENCE_LENGTH),
+            'smart_interbedding_thick_unit_threshold': settings.get(
+                'smart_interbedding_thick_unit_threshold', DEFAULT_SMART_INTERBEDDING_THICK_UNIT_THRESHOLD),
+            'use_fallback_classification': settings.get('fallback_classification', False),
+            'analysis_method': settings.get('analysis_method', 'standard'),
+            'casing_depth_enabled': settings.get('casing_depth_enabled', False),
+            'casing_depth_m': settings.get('casing_depth_m', 0.0),
+        }
+        values.update(overrides)
+        return cls(**values)
+
+
+@dataclass
+class HoleResult:
+    """Outcome of analysing a single hole."""
+    file_path: str
+    success: bool
+    output_path: Optional[str] = None
+    num_samples: int = 0
+    num_units: int = 0
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+    lithology_thickness: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for serialization."""
+        return asdict(self)
+
+
+class BatchReport:
+    """Summary of a batch run."""
+
+    def __init__(self, results: List[HoleResult], elapsed_seconds: float):
+        self.results = results
+        self.elapsed_seconds = elapsed_seconds
+
+    @property
+    def succeeded(self) -> List[HoleResult]:
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> List[HoleResult]:
+        return [result for result in self.results if not result.success]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """One row per hole, without the per-lithology breakdown."""
+        rows = []
+        for result in self.results:
+            row = result.to_dict()
+            row.pop('lithology_thickness')
+            rows.append(row)
+        return pd.DataFrame(rows, columns=[name for name in HoleResult.__dataclass_fields__
+                                           if name != 'lithology_thickness'])
+
+    def lithology_totals(self) -> pd.Series:
+        """Total classified thickness per lithology code across all successful holes."""
+        totals: Dict[str, float] = {}
+        for result in self.succeeded:
+            for code, thickness in result.lithology_thickness.items():
+                totals[code] = totals.get(code, 0.0) + thickness
+        return pd.Series(totals, dtype=float).sort_values(ascending=False)
+
+    def summary(self) -> str:
+        """Human-readable summary of the run."""
+        lines = [
+            f"Analysed {len(self.results)} holes in {self.elapsed_seconds:.1f} s: "
+            f"{len(self.succeeded)} succeeded, {len(self.failed)} failed",
+        ]
+        if self.succeeded:
+            lines.append(f"Total units: {sum(result.num_units for result in self.succeeded)}")
+        for result in self.failed:
+            first_line = (result.error or '').strip().splitlines()[:1]
+            lines.append(f"  FAILED {result.file_path}: {first_line[0] if first_line else 'unknown error'}")
+        return "\n".join(lines)
+
+    def save(self, path: str):
+        """Write the per-hole report as CSV."""
+        self.to_dataframe().to_csv(path, index=False)
+
+
+def analyze_hole(file_path: str, settings: AnalysisSettings) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Run the analysis chain for one LAS file.
+
+    Shared by the batch pipeline and the interactive analysis ``Worker``.
+
+    Returns:
+        tuple: (units DataFrame, classified DataFrame)
+    """
+    data_processor = DataProcessor()
+    analyzer = Analyzer()
+    dataframe, _, units = data_processor.load_las_file(file_path)
+
+    # Ensure all required curve mnemonics are in the map for preprocessing
+    full_mnemonic_map = dict(settings.mnemonic_map)
+    full_mnemonic_map.setdefault('short_space_density', 'DENS')
+    full_mnemonic_map.setdefault('long_space_density', 'LSD')
+
+    processed_dataframe = data_processor.preprocess_data(dataframe, full_mnemonic_map, units)
+    if settings.analysis_method == "simple":
+        classified_dataframe = analyzer.classify_rows_simple(
+            processed_dataframe, settings.lithology_rules, full_mnemonic_map,
+            settings.casing_depth_enabled, settings.casing_depth_m)
+    else:
+        classified_dataframe = analyzer.classify_rows(
+            processed_dataframe, settings.lithology_rules, full_mnemonic_map,
+            settings.use_researched_defaults, settings.use_fallback_classification,
+            settings.casing_depth_enabled, settings.casing_depth_m)
+
+    units_dataframe = analyzer.group_into_units(
+        classified_dataframe, settings.lithology_rules, settings.smart_interbedding,
+        settings.smart_interbedding_max_sequence_length, settings.smart_interbedding_thick_unit_threshold)
+    if settings.merge_thin_units:
+        units_dataframe = analyzer.merge_thin_units(units_dataframe, settings.merge_threshold)
+    return units_dataframe, classified_dataframe
+
+
+def output_path_for(file_path: str, settings: AnalysisSettings) -> str:
+    """Excel output path for a hole; named after the LAS file so holes sharing a directory don't clash."""
+    output_dir = settings.output_dir or os.path.dirname(os.path.abspath(file_path))
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(output_dir, f"{stem}_lithology.xlsx")
+
+
+def run_hole(file_path: str, settings: AnalysisSettings, output_path: Optional[str] = None) -> HoleResult:
+    """
+    Analyse one hole, capturing any failure in the result instead of raising.
+
+    Args:
+        file_path: LAS file to analyse
+        settings: Analysis settings
+        output_path: Excel output path; defaults to ``output_path_for(file_path, settings)``
+    """
+    start = time.perf_counter()
+    try:
+        units_dataframe, classified_dataframe = analyze_hole(file_path, settings)
+
+        if settings.template_path:
+            output_path = output_path or output_path_for(file_path, settings)
+            if not Analyzer().save_to_template(classified_dataframe, settings.template_path, output_path,
+                                               units=units_dataframe):
+                raise RuntimeError(f"Failed to save results to Excel template: {output_path}")
+
+        lithology_thickness = {}
+        if not units_dataframe.empty:
+            lithology_thickness = units_dataframe.groupby(LITHOLOGY_COLUMN)[RECOVERED_THICKNESS_COLUMN].sum().to_dict()
+
+        return HoleResult(
+            file_path=file_path,
+            success=True,
+            output_path=output_path if settings.template_path else None,
+            num_samples=len(classified_dataframe),
+            num_units=len(units_dataframe),
+            elapsed_seconds=time.perf_counter() - start,
+            lithology_thickness={str(code): float(value) for code, value in lithology_thickness.items()},
+        )
+    except Exception as e:
+        return HoleResult(
+            file_path=file_path,
+            success=False,
+            elapsed_seconds=time.perf_counter() - start,
+            error=f"{str(e)}\n{traceback.format_exc()}",
+        )
+
+
+class BatchAnalysisPipeline:
+    """
+    Analyse many holes in parallel worker processes.
+
+    Each hole is an independent task, so throughput scales with the number of
+    processes until disk I/O becomes the limit.
+    """
+
+    def __init__(self, settings: AnalysisSettings, max_workers: Optional[int] = None):
+        """
+        Args:
+            settings: Analysis settings applied to every hole
+            max_workers: Number of worker processes; defaults to the CPU count.
+                1 runs every hole in the calling process.
+        """
+        self.settings = settings
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self, file_paths: List[str],
+            progress_callback: Optional[Callable[[int, int, HoleResult], None]] = None) -> BatchReport:
+        """
+        Analyse all holes.
+
+        Args:
+            file_paths: LAS files to analyse
+            progress_callback: Called as ``(completed, total, result)`` after each hole
+
+        Returns:
+            BatchReport with one result per file, in input order
+        """
+        start = time.perf_counter()
+        total = len(file_paths)
+        results: List[Optional[HoleResult]] = [None] * total
+        completed = 0
+
+        def record(position, result):
+            nonlocal completed
+            results[position] = result
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, total, result)
+
+        if self.max_workers == 1 or total <= 1:
+            for position, file_path in enumerate(file_paths):
+                record(position, run_hole(file_path, self.settings))
+        else:
+            pending = list(range(total))
+            while pending:
+                unfinished = self._run_pool(file_paths, pending, record)
+                # A worker process died and took the pool down with it. Holes are handed to the
+                # workers in submission order, so the hole that killed it is one of the first
+                # unfinished ones: run those one per process, and the rest in a fresh pool.
+                suspects = unfinished[:2 * self.max_workers]
+                pending = unfinished[2 * self.max_workers:]
+                self._run_isolated(file_paths, suspects, record)
+
+        return BatchReport(results, time.perf_counter() - start)
+
+    def _run_pool(self, file_paths: List[str], positions: List[int], record) -> List[int]:
+        """
+        Analyse holes in one process pool.
+
+        Returns:
+            Positions left without a result because the pool broke, in submission order
+        """
+        unfinished = []
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(positions))) as executor:
+            futures = {executor.submit(run_hole, file_paths[position], self.settings): position
+                       for position in positions}
+            for future in as_completed(futures):
+                position = futures[future]
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    unfinished.append(position)
+                    continue
+                except Exception as e:
+                    result = HoleResult(file_path=file_paths[position], success=False,
+                                        error=f"Worker process failed: {str(e)}")
+                record(position, result)
+        return sorted(unfinished)
+
+    def _run_isolated(self, file_paths: List[str], positions: List[int], record):
+        """Analyse holes each in its own worker process, so a dying process only fails its own hole."""
+        queue = list(positions)
+        running = {}
+        while queue or running:
+            while queue and len(running) < self.max_workers:
+                position = queue.pop(0)
+                executor = ProcessPoolExecutor(max_workers=1)
+                running[executor.submit(run_hole, file_paths[position], self.settings)] = (position, executor)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                position, executor = running.pop(future)
+                executor.shutdown()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. out of memory or a crash in native code)
+                    result = HoleResult(file_path=file_paths[position], success=False,
+                                        error=f"Worker process failed: {type(e).__name__}: {str(e)}")
+                record(position, result)
@@ -0,0 +1,294 @@
+"""
+Vectorised lithology classification engine.
+
+Lithology rules are compiled once into NumPy bound arrays. Because every rule
+is a rectangle in gamma/density space, the sorted rule bounds split each axis
+into a small number of cells within which every rule's outcome is constant.
+Compilation resolves the winning rule for each (gamma cell, density cell) pair
+into a lookup table, so classifying samples is two ``searchsorted`` calls and
+a table gather. The first matching rule wins, which reproduces the ordering
+semantics of applying the rules one after another to the still-unclassified
+rows.
+"""
+
+import logging
+from typing import Dict, List
+
+import numpy as np
+
+from .config import INVALID_DATA_VALUE, RESEARCHED_LITHOLOGY_DEFAULTS
+
+logger = logging.getLogger(__name__)
+
+# Code assigned to samples that no rule matches
+UNCLASSIFIED_CODE = 'NL'
+
+
+class CompiledLithologyRules:
+    """
+    Lithology rules compiled into NumPy arrays for vectorised classification.
+
+    Attributes:
+        codes (list): Lithology codes; index 0 is always 'NL'. The integer
+            arrays returned by ``classify`` index into this list.
+        gamma_min, gamma_max, density_min, density_max (np.ndarray): Effective
+            bounds per rule after researched defaults have been substituted.
+        gamma_ignore, density_ignore (np.ndarray): Whether a rule treats the
+            parameter as "don't care".
+        rule_codes (np.ndarray): Index into ``codes`` for each rule.
+        lookup (np.ndarray): Winning code index per (gamma cell, density cell).
+    """
+
+    def __init__(self, lithology_rules: List[Dict], use_researched_defaults: bool = True):
+        """
+        Compile lithology rules.
+
+        Args:
+            lithology_rules: List of rule dictionaries as stored in settings
+            use_researched_defaults: Whether to substitute researched defaults
+                for missing (don't care or zero) ranges
+        """
+        self.codes = [UNCLASSIFIED_CODE]
+        code_lookup = {UNCLASSIFIED_CODE: 0}
+
+        bounds = []
+        ignores = []
+        rule_codes = []
+
+        for rule in lithology_rules:
+            code = rule.get('code')
+
+            # Skip rule if it's for 'Not Logged' as it's a default classification
+            if code == UNCLASSIFIED_CODE:
+                continue
+
+            gamma_min, gamma_max, gamma_ignore, density_min, density_max, density_ignore = \
+                self._effective_bounds(rule, use_researched_defaults)
+
+            if code not in code_lookup:
+                code_lookup[code] = len(self.codes)
+                self.codes.append(code)
+
+            bounds.append((gamma_min, gamma_max, density_min, density_max))
+            ignores.append((gamma_ignore, density_ignore))
+            rule_codes.append(code_lookup[code])
+
+        bounds = np.array(bounds, dtype=np.float64).reshape(-1, 4)
+        ignores = np.array(ignores, dtype=bool).reshape(-1, 2)
+
+        self.gamma_min = bounds[:, 0]
+        self.gamma_max = bounds[:, 1]
+        self.density_min = bounds[:, 2]
+        self.density_max = bounds[:, 3]
+        self.gamma_ignore = ignores[:, 0]
+        self.density_ignore = ignores[:, 1]
+
+        self.code_dtype = np.int8 if len(self.codes) <= np.iinfo(np.int8).max else np.int16
+        self.rule_codes = np.array(rule_codes, dtype=self.code_dtype)
+
+        self.gamma_edges = self._axis_edges(self.gamma_min, self.gamma_max, self.gamma_ignore)
+        self.density_edges = self._axis_edges(self.density_min, self.density_max, self.density_ignore)
+        self.lookup = self._build_lookup()
+
+    @staticmethod
+    def _effective_bounds(rule: Dict, use_researched_defaults: bool):
+        """Resolve a rule's bounds, applying researched defaults where configured."""
+        code = rule.get('code')
+        gamma_min = rule.get('gamma_min')
+        gamma_max = rule.get('gamma_max')
+        density_min = rule.get('density_min')
+        density_max = rule.get('density_max')
+
+        # Both min and max set to INVALID_DATA_VALUE marks the parameter as "don't care"
+        gamma_ignore = (gamma_min == INVALID_DATA_VALUE and gamma_max == INVALID_DATA_VALUE)
+        density_ignore = (density_min == INVALID_DATA_VALUE and density_max == INVALID_DATA_VALUE)
+
+        if code in RESEARCHED_LITHOLOGY_DEFAULTS:
+            researched_defaults = RESEARCHED_LITHOLOGY_DEFAULTS[code]
+
+            if use_researched_defaults:
+                gamma_missing = gamma_ignore or (gamma_min == 0.0 and gamma_max == 0.0)
+                if gamma_missing and 'gamma_min' in researched_defaults and 'gamma_max' in researched_defaults:
+                    gamma_min = researched_defaults['gamma_min']
+                    gamma_max = researched_defaults['gamma_max']
+                    gamma_ignore = False
+                    logger.info(f"Applying researched gamma defaults for {code}: {gamma_min}-{gamma_max} (use_researched_defaults={use_researched_defaults})")
+                elif gamma_missing:
+                    logger.debug(f"Gamma missing for {code} but no researched defaults available")
+
+                density_missing = density_ignore or (density_min == 0.0 and density_max == 0.0)
+                if density_missing and 'density_min' in researched_defaults and 'density_max' in researched_defaults:
+                    density_min = researched_defaults['density_min']
+                    density_max = researched_defaults['density_max']
+                    density_ignore = False
+                    logger.info(f"Applying researched density defaults for {code}: {density_min}-{density_max} (use_researched_defaults={use_researched_defaults})")
+                elif density_missing:
+                    logger.debug(f"Density missing for {code} but no researched defaults available")
+            else:
+                logger.debug(f"use_researched_defaults is False, skipping researched defaults for {code}")
+
+        # Missing bounds can never be satisfied
+        gamma_min, gamma_max, density_min, density_max = (
+            np.nan if value is None else value
+            for value in (gamma_min, gamma_max, density_min, density_max)
+        )
+        return gamma_min, gamma_max, gamma_ignore, density_min, density_max, density_ignore
+
+    @staticmethod
+    def _axis_edges(lower: np.ndarray, upper: np.ndarray, ignore: np.ndarray) -> np.ndarray:
+        """Sorted unique finite-or-infinite bounds used by the rules on one axis."""
+        edges = np.concatenate((lower[~ignore], upper[~ignore]))
+        return np.unique(edges[~np.isnan(edges)])
+
+    @staticmethod
+    def _cell_representatives(edges: np.ndarray) -> np.ndarray:
+        """
+        One sample value per cell of an axis.
+
+        Cells alternate between the open interval before each edge and the edge
+        itself: cell 2p is (edges[p-1], edges[p]), cell 2p+1 is edges[p], cell
+        2m is everything above the last edge, and the final cell holds NaN.
+        """
+        if len(edges) == 0:
+            return np.array([0.0, np.nan])
+
+        with np.errstate(invalid='ignore'):
+            gaps = (edges[:-1] + edges[1:]) / 2.0
+        below = edges[0] - 1.0
+        above = edges[-1] + 1.0
+
+        reps = np.empty(2 * len(edges) + 2, dtype=np.float64)
+        reps[0:-2:2] = np.concatenate(([below], gaps))
+        reps[1:-2:2] = edges
+        reps[-2] = above
+        reps[-1] = np.nan
+        return reps
+
+    @staticmethod
+    def _cells(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        """Map values to the cells described in ``_cell_representatives``."""
+        positions = np.searchsorted(edges, values, side='left')
+        if len(edges) == 0:
+            return positions + np.isnan(values)
+        # NaN sorts past the last edge, so it lands in cell 2m + 1 like an exact edge hit
+        on_edge = edges[np.minimum(positions, len(edges) - 1)] == values
+        return 2 * positions + (on_edge | np.isnan(values))
+
+    def _build_lookup(self) -> np.ndarray:
+        """Resolve the first matching rule for every (gamma cell, density cell) pair."""
+        g = self._cell_representatives(self.gamma_edges)[:, np.newaxis, np.newaxis]
+        d = self._cell_representatives(self.density_edges)[np.newaxis, :, np.newaxis]
+
+        if len(self.rule_codes) == 0:
+            return np.zeros((g.shape[0], d.shape[1]), dtype=self.code_dtype)
+
+        matches = ((self.gamma_ignore | ((g >= self.gamma_min) & (g <= self.gamma_max))) &
+                   (self.density_ignore | ((d >= self.density_min) & (d <= self.density_max))))
+
+        first_match = matches.argmax(axis=2)
+        matched = np.take_along_axis(matches, first_match[..., np.newaxis], axis=2)[..., 0]
+        return np.where(matched, self.rule_codes[first_match], 0).astype(self.code_dtype)
+
+    def classify(self, gamma: np.ndarray, density: np.ndarray) -> np.ndarray:
+        """
+        Assign a rule to every sample; the first matching rule wins.
+
+        Args:
+            gamma: Gamma values (NaN never matches a bounded range)
+            density: Density values, same length as ``gamma``
+
+        Returns:
+            Integer array indexing into ``codes``; 0 ('NL') where no rule matches
+        """
+        gamma = np.asarray(gamma, dtype=np.float64)
+        density = np.asarray(density, dtype=np.float64)
+        return self.lookup[self._cells(gamma, self.gamma_edges), self._cells(density, self.density_edges)]
+
+    def labels(self, code_indices: np.ndarray) -> np.ndarray:
+        """Convert integer code indices back to an object array of lithology codes."""
+        return np.asarray(self.codes, dtype=object)[code_indices]
+
+
+# Samples further than this (in normalised range units) from every researched
+# lithology centre are left unclassified by the nearest-lithology fallback
+FALLBACK_MAX_DISTANCE = 2.0
+
+
+def nearest_lithology_codes(gamma: np.ndarray, density: np.ndarray,
+                            lithology_defaults: Dict = RESEARCHED_LITHOLOGY_DEFAULTS) -> np.ndarray:
+    """
+    Find the nearest researched lithology for every sample.
+
+    Distances are Euclidean in a space where each axis is scaled by the
+    lithology's own range, measured from the centre of its range. Ties go to
+    the lithology listed first.
+
+    Args:
+        gamma: Gamma values
+        density: Density values, same length as ``gamma``
+        lithology_defaults: Mapping of code to gamma/density min/max ranges
+
+    Returns:
+        Object array of lithology codes, None where the nearest centre is
+        further than ``FALLBACK_MAX_DISTANCE`` or a value is NaN
+    """
+    gamma = np.asarray(gamma, dtype=np.float64)
+    density = np.asarray(density, dtype=np.float64)
+    result = np.full(len(gamma), None, dtype=object)
+
+    codes = []
+    centres = []
+    ranges = []
+    for code, defaults in lithology_defaults.items():
+        gamma_range = defaults['gamma_max'] - defaults['gamma_min']
+        density_range = defaults['density_max'] - defaults['density_min']
+        if gamma_range > 0 and density_range > 0:
+            codes.append(code)
+            centres.append(((defaults['gamma_min'] + defaults['gamma_max']) / 2,
+                            (defaults['density_min'] + defaults['density_max']) / 2))
+            ranges.append((gamma_range, density_range))
+
+    if not codes or len(gamma) == 0:
+        return result
+
+    centres = np.array(centres, dtype=np.float64)
+    ranges = np.array(ranges, dtype=np.float64)
+
+    # (samples x lithologies) normalised distance matrix
+    gamma_distance = (gamma[:, np.newaxis] - centres[:, 0]) / ranges[:, 0]
+    density_distance = (density[:, np.newaxis] - centres[:, 1]) / ranges[:, 1]
+    distances = np.sqrt(gamma_distance ** 2 + density_distance ** 2)
+
+    valid = ~(np.isnan(gamma) | np.isnan(density))
+    nearest = np.argmin(np.where(valid[:, np.newaxis], distances, np.inf), axis=1)
+    min_distance = distances[np.arange(len(gamma)), nearest]
+
+    matched = valid & (min_distance <= FALLBACK_MAX_DISTANCE)
+    result[matched] = np.asarray(codes, dtype=object)[nearest[matched]]
+    return result
+
+
+def extreme_value_codes(gamma: np.ndarray, density: np.ndarray) -> np.ndarray:
+    """
+    Classify samples whose values lie outside every standard lithology.
+
+    Rules are checked in order and the first that applies wins: very low
+    density is coal, very high density is igneous, very high gamma is shale,
+    and very low gamma at moderate density is sandstone or limestone.
+
+    Returns:
+        Object array of lithology codes, None where no rule applies
+    """
+    gamma = np.asarray(gamma, dtype=np.float64)
+    density = np.asarray(density, dtype=np.float64)
+
+    with np.errstate(invalid='ignore'):
+        clean = (gamma < 10) & (density >= 2.0) & (density <= 3.0)
+        conditions = [
+            density < 1.0,              # Extreme low density (gas, organic-rich)
+            density > 3.5,              # Extreme high density (metamorphic, dense igneous)
+            gamma > 200,                # Extreme high gamma (very shaly, radioactive)
+            clean & (density < 2.7),    # Clean sandstone
+            clean,                      # Carbonate
+        ]
+    return np.select(conditions, ['CO', 'IG', 'SH', 'SS', 'LS'], default=None).astype(object)
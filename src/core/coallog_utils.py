@@ -1,5 +1,17 @@
 import pandas as pd
 import os
+import hashlib
+import pickle
+import tempfile
+
+# Parsed dictionaries are pickled here, keyed by workbook path, size and mtime
+DEFAULT_DICTIONARY_CACHE_DIR = os.environ.get(
+    'EARTHWORM_DICTIONARY_CACHE_DIR',
+    os.path.join(os.path.expanduser("~"), ".earthworm_cache", "dictionaries")
+)
+
+# Bump when load_coallog_dictionaries changes what it returns; older pickles are then ignored
+DICTIONARY_CACHE_VERSION = 1
 
 def load_coallog_dictionaries(file_path):
     """
@@ -111,3 +123,42 @@ def load_coallog_dictionaries(file_path):
     }
     
     return dictionaries
+
+
+def load_coallog_dictionaries_cached(file_path, cache_dir=None):
+    """
+    Loads dictionaries from the CoalLog Excel file, reusing a pickled copy of
+    the last parse while the workbook is unchanged.
+
+    Args:
+        file_path (str): The path to the CoalLog Excel file.
+        cache_dir (str): Directory for the pickled parse (default: DEFAULT_DICTIONARY_CACHE_DIR).
+
+    Returns:
+        dict: Same as load_coallog_dictionaries.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"CoalLog dictionaries file not found: {file_path}")
+
+    cache_dir = cache_dir or DEFAULT_DICTIONARY_CACHE_DIR
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    key = f"{DICTIONARY_CACHE_VERSION}|{path}|{stat.st_size}|{stat.st_mtime_ns}"
+    cache_path = os.path.join(cache_dir, hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest() + '.pkl')
+
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    dictionaries = load_coallog_dictionaries(file_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.pkl.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(dictionaries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not cache CoalLog dictionaries: {e}")
+    return dictionaries
@@ -0,0 +1,377 @@
+"""
+Header-only collar coordinate extraction for hole files.
+
+Loading a project into the map only needs each hole's collar (easting,
+northing, elevation, hole id), which lives in the file header. The readers
+here stop at the start of the data: LAS files are read up to the ``~A``
+section, CSV/text files up to ``HEADER_SCAN_LINES`` lines, and Excel files
+only as far as the first data row.
+
+``CollarIndex`` scans many files on a thread pool and remembers the result
+for every file in a per-project JSON index keyed by path, size and mtime,
+so re-opening the map only rescans files that changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import lasio
+
+from .las_cache import get_default_cache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the extracted fields change; older indexes are then ignored
+COLLAR_INDEX_VERSION = 1
+
+DEFAULT_COLLAR_INDEX_DIR = os.environ.get(
+    'EARTHWORM_COLLAR_INDEX_DIR',
+    os.path.join(os.path.expanduser("~"), ".earthworm_cache", "collars")
+)
+
+# Lines of a CSV/text file searched for header comments
+HEADER_SCAN_LINES = 200
+
+LAS_EASTING_MNEMONICS = ('X', 'EAST', 'EASTING')
+LAS_NORTHING_MNEMONICS = ('Y', 'NORTH', 'NORTHING')
+LAS_ELEVATION_MNEMONICS = ('ELEV', 'ELEVATION', 'KB', 'GL')
+LAS_HOLE_ID_MNEMONICS = ('WELL', 'UWI')
+
+# Header comment patterns for CSV/text files, tried in order per field
+TEXT_FIELD_PATTERNS = {
+    'easting': [re.compile(pattern) for pattern in (
+        r'[Ee]asting\s*[:=]\s*([\d\.\-]+)',  # Easting: 500000
+        r'[Xx]\s*[:=]\s*([\d\.\-]+)',        # X: 500000
+        r'[Ee]asting\s+([\d\.\-]+)',         # Easting 500000
+        r'[Xx]\s+([\d\.\-]+)',               # X 500000
+        r'EAST\s*[:=]\s*([\d\.\-]+)',        # EAST: 500000
+    )],
+    'northing': [re.compile(pattern) for pattern in (
+        r'[Nn]orthing\s*[:=]\s*([\d\.\-]+)',  # Northing: 7000000
+        r'[Yy]\s*[:=]\s*([\d\.\-]+)',         # Y: 7000000
+        r'[Nn]orthing\s+([\d\.\-]+)',         # Northing 7000000
+        r'[Yy]\s+([\d\.\-]+)',                # Y 7000000
+        r'NORTH\s*[:=]\s*([\d\.\-]+)',        # NORTH: 7000000
+    )],
+    'total_depth': [re.compile(pattern) for pattern in (
+        r'[Tt]otal\s*[Dd]epth\s*[:=]\s*([\d\.\-]+)',
+        r'[Tt][Dd]\s*[:=]\s*([\d\.\-]+)',
+        r'[Ff]inal\s*[Dd]epth\s*[:=]\s*([\d\.\-]+)',
+        r'[Ee]nd\s*[Dd]epth\s*[:=]\s*([\d\.\-]+)',
+    )],
+    'elevation': [re.compile(pattern) for pattern in (
+        r'[Ee]levation\s*[:=]\s*([\d\.\-]+)',
+        r'[Ee]lev\s*[:=]\s*([\d\.\-]+)',
+        r'[Cc]ollar\s*[Ee]levation\s*[:=]\s*([\d\.\-]+)',
+        r'[Kk][Bb]\s*[:=]\s*([\d\.\-]+)',  # Kelly Bushing
+        r'[Gg][Ll]\s*[:=]\s*([\d\.\-]+)',  # Ground Level
+    )],
+}
+HOLE_ID_PATTERNS = [re.compile(pattern) for pattern in (
+    r'[Hh]ole\s*[:=]\s*([\w\d\-_\.]+)',
+    r'[Ww]ell\s*[:=]\s*([\w\d\-_\.]+)',
+    r'[Bb]orehole\s*[:=]\s*([\w\d\-_\.]+)',
+    r'[Dd]rillhole\s*[:=]\s*([\w\d\-_\.]+)',
+    r'[Ii][Dd]\s*[:=]\s*([\w\d\-_\.]+)',
+)]
+
+
+def extract_collar(file_path: str) -> Optional[Dict]:
+    """
+    Extract collar coordinates from a hole file's header.
+
+    Args:
+        file_path: Path to a .las, .csv, .xlsx or text hole file
+
+    Returns:
+        Dict with easting, northing, hole_id, and other metadata,
+        or None if coordinates not found.
+    """
+    try:
+        hole_info = {
+            'file_path': file_path,
+            'hole_id': os.path.basename(file_path).replace('.csv', '').replace('.xlsx', '').replace('.las', ''),
+            'easting': None,
+            'northing': None,
+            'total_depth': None,
+            'elevation': None,
+            'collar_elevation': None
+        }
+
+        # Handle different file types
+        lower_path = file_path.lower()
+        if lower_path.endswith('.las'):
+            hole_info = _extract_from_las(file_path, hole_info)
+        elif lower_path.endswith('.xlsx'):
+            hole_info = _extract_from_excel(file_path, hole_info)
+        else:
+            # CSV and generic text files carry the collar in header comments
+            hole_info = _extract_from_text_lines(_read_head_lines(file_path), hole_info)
+
+        if hole_info['easting'] is not None and hole_info['northing'] is not None:
+            return hole_info
+        return None
+
+    except Exception as e:
+        print(f"Error extracting coordinates from {file_path}: {e}")
+        return None
+
+
+def _read_head_lines(file_path: str, max_lines: int = HEADER_SCAN_LINES) -> List[str]:
+    lines = []
+    with open(file_path, 'r', errors='replace') as f:
+        for line in f:
+            lines.append(line)
+            if len(lines) >= max_lines:
+                break
+    return lines
+
+
+def _read_las_header_text(file_path: str) -> str:
+    """LAS text up to (not including) the ~A data section."""
+    lines = []
+    with open(file_path, 'r', errors='replace') as f:
+        for line in f:
+            if line.lstrip().upper().startswith('~A'):
+                break
+            lines.append(line)
+    return ''.join(lines)
+
+
+def _extract_from_las(file_path: str, hole_info: Dict) -> Dict:
+    """Extract coordinates from the LAS ~Well section."""
+    header_text = None
+    try:
+        # Served from the LAS parse cache when the file has been loaded before
+        las = get_default_cache().cached_header(file_path)
+        if las is None:
+            header_text = _read_las_header_text(file_path)
+            las = lasio.read(header_text, ignore_data=True)
+    except Exception:
+        if header_text is None:
+            header_text = _read_las_header_text(file_path)
+        return _extract_from_las_text(header_text, hole_info)
+
+    for item in las.well:
+        _apply_las_well_item(item.mnemonic, item.value, hole_info)
+    return hole_info
+
+
+def _apply_las_well_item(mnemonic: str, value, hole_info: Dict):
+    mnemonic = mnemonic.upper()
+    if mnemonic in LAS_EASTING_MNEMONICS:
+        field = 'easting'
+    elif mnemonic in LAS_NORTHING_MNEMONICS:
+        field = 'northing'
+    elif mnemonic in LAS_ELEVATION_MNEMONICS:
+        field = 'elevation'
+    elif mnemonic in LAS_HOLE_ID_MNEMONICS:
+        hole_info['hole_id'] = str(value)
+        return
+    else:
+        return
+    try:
+        hole_info[field] = float(value)
+    except (ValueError, TypeError):
+        pass
+
+
+def _extract_from_las_text(header_text: str, hole_info: Dict) -> Dict:
+    """Extract coordinates by scanning LAS header text (for headers lasio can't parse)."""
+    in_well_section = False
+    for line in header_text.splitlines():
+        line = line.strip()
+
+        # Check for well section
+        if line.startswith('~W'):
+            in_well_section = True
+            continue
+        elif line.startswith('~'):
+            in_well_section = False
+            continue
+
+        if in_well_section and line:
+            # Parse LAS well information: MNEM.UNIT VALUE : DESCRIPTION
+            parts = line.split('.')
+            if len(parts) >= 2:
+                mnemonic = parts[0].strip()
+                value = '.'.join(parts[1:]).strip().split(':')[0].strip()
+                _apply_las_well_item(mnemonic, value, hole_info)
+    return hole_info
+
+
+def _extract_from_excel(file_path: str, hole_info: Dict) -> Dict:
+    """Extract coordinates from the header row and first data row of the first sheet."""
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(min_row=1, max_row=2, values_only=True)
+            header = next(rows, ())
+            first_row = next(rows, ())
+        finally:
+            workbook.close()
+    except Exception as e:
+        print(f"Error reading Excel {file_path}: {e}")
+        return hole_info
+
+    for position, column in enumerate(header):
+        column_lower = str(column).lower()
+        value = first_row[position] if position < len(first_row) else None
+        if value is None:
+            continue
+        if 'easting' in column_lower or 'x' == column_lower:
+            field = 'easting'
+        elif 'northing' in column_lower or 'y' == column_lower:
+            field = 'northing'
+        else:
+            continue
+        try:
+            hole_info[field] = float(value)
+        except (ValueError, TypeError):
+            pass
+    return hole_info
+
+
+def _extract_from_text_lines(lines: List[str], hole_info: Dict) -> Dict:
+    """Extract coordinates from header comment lines."""
+    for line in lines:
+        line = line.strip()
+
+        # Skip empty lines and data rows (starting with numbers or dashes)
+        if not line or line[0].isdigit() or line[0] == '-':
+            continue
+
+        for field, patterns in TEXT_FIELD_PATTERNS.items():
+            for pattern in patterns:
+                match = pattern.search(line)
+                if match:
+                    try:
+                        hole_info[field] = float(match.group(1))
+                        break
+                    except ValueError:
+                        pass
+
+        for pattern in HOLE_ID_PATTERNS:
+            match = pattern.search(line)
+            if match:
+                hole_info['hole_id'] = match.group(1)
+                break
+
+    return hole_info
+
+
+class CollarIndex:
+    """
+    Per-project cache of extracted collars.
+
+    Entries are keyed by absolute path and remember the file's size and
+    mtime; files without coordinates are remembered too, so they aren't
+    rescanned either. Entries for files that no longer exist are dropped on
+    the next scan.
+    """
+
+    def __init__(self, project_root: str, index_dir: Optional[str] = None):
+        self.project_root = os.path.abspath(project_root)
+        project_key = hashlib.blake2b(self.project_root.encode('utf-8'), digest_size=8).hexdigest()
+        self.index_dir = index_dir or DEFAULT_COLLAR_INDEX_DIR
+        self.index_path = os.path.join(self.index_dir, f"{project_key}.json")
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, List]:
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            if index.get('version') == COLLAR_INDEX_VERSION:
+                return index.get('entries', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def save(self):
+        """Write the index atomically."""
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix='.json.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': COLLAR_INDEX_VERSION, 'project_root': self.project_root,
+                           'entries': self._entries}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not save collar index: {e}")
+
+    def _lookup(self, path: str):
+        """(hit, hole_info) for a path whose file is unchanged since it was indexed."""
+        entry = self._entries.get(path)
+        if entry is None:
+            return False, None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False, None
+        if entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return True, entry[2]
+        return False, None
+
+    def _scan_one(self, path: str):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns, extract_collar(path)]
+
+    def scan(self, file_paths: List[str], max_workers: Optional[int] = None,
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Dict]:
+        """
+        Collars for many files, scanning only new or changed ones.
+
+        Args:
+            file_paths: Hole files to scan
+            max_workers: Scanner threads (default: ThreadPoolExecutor's default)
+            progress_callback: Called as ``(completed, total)`` while scanning
+
+        Returns:
+            Dict of file_path -> hole_info for the files with coordinates, in input
+            order; each hole_info's ``file_path`` is the path as passed in
+        """
+        results = {}
+        to_scan = []
+        for file_path in file_paths:
+            hit, hole_info = self._lookup(os.path.abspath(file_path))
+            if hit:
+                results[file_path] = hole_info
+            else:
+                to_scan.append(file_path)
+
+        changed = self._prune(set(os.path.abspath(path) for path in file_paths))
+        if to_scan:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(self._scan_one, os.path.abspath(path)) for path in to_scan]
+                for completed, (file_path, future) in enumerate(zip(to_scan, futures), start=1):
+                    try:
+                        entry = future.result()
+                        self._entries[os.path.abspath(file_path)] = entry
+                        results[file_path] = entry[2]
+                    except OSError:
+                        self._entries.pop(os.path.abspath(file_path), None)
+                    finally:
+                        if progress_callback:
+                            progress_callback(completed, len(to_scan))
+            changed = True
+        if changed:
+            self.save()
+
+        return {file_path: dict(results[file_path], file_path=file_path) for file_path in file_paths
+                if results.get(file_path) is not None}
+
+    def _prune(self, scanned_paths) -> bool:
+        """Drop entries for files that no longer exist; True if any were dropped."""
+        missing = [path for path in self._entries
+                   if path not in scanned_paths and not os.path.exists(path)]
+        for path in missing:
+            del self._entries[path]
+        return bool(missing)
@@ -1,7 +1,7 @@
-import lasio
 import pandas as pd
 import numpy as np
 from .config import INVALID_DATA_VALUE
+from .las_cache import read_las
 
 class DataProcessor:
     def __init__(self):
@@ -20,7 +20,7 @@ class DataProcessor:
                 - list: List of string names of all curve mnemonics.
                 - dict: Dictionary mapping mnemonic to unit string.
         """
-        las = lasio.read(file_path)
+        las = read_las(file_path)
         
         # Extract data, mnemonics, and units
         data = {curve.mnemonic: curve.data for curve in las.curves}
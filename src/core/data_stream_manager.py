@@ -8,7 +8,6 @@ data streaming to handle large geological datasets without memory pressure.
 import os
 import numpy as np
 import pandas as pd
-import lasio
 import threading
 import time
 import psutil
@@ -22,6 +21,9 @@ import zlib
 from pathlib import Path
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer
 
+from .las_data_index import LASDataIndex
+from .las_cache import read_las
+
 
 @dataclass
 class DataChunk:
@@ -61,11 +63,11 @@ class DataStreamManager(QObject):
     """
     
     # Signals for UI updates
-    chunk_loaded = pyqtSignal(Tuple[float, float], int)  # depth_range, size_bytes
-    chunk_unloaded = pyqtSignal(Tuple[float, float])
+    chunk_loaded = pyqtSignal(tuple, int)  # depth_range, size_bytes
+    chunk_unloaded = pyqtSignal(tuple)
     memory_usage_updated = pyqtSignal(int, int)  # current_memory_mb, max_memory_mb
     loading_progress = pyqtSignal(int, str)  # progress_percentage, status_message
-    data_ready = pyqtSignal(pd.DataFrame, Dict[str, Any])  # data, metadata
+    data_ready = pyqtSignal(pd.DataFrame, dict)  # data, metadata
     
     def __init__(self, las_file_path: str, chunk_size_mb: float = 10.0, 
                  max_loaded_chunks: int = 5, max_total_memory_mb: int = 500):
@@ -94,6 +96,7 @@ class DataStreamManager(QObject):
         self.mmap_file = None
         self.mmap_data = None
         self.file_size = 0
+        self.data_index: Optional[LASDataIndex] = None  # Depth->byte-offset index of the ~A section
         
         # Background loading
         self.loading_thread = None
@@ -115,10 +118,63 @@ class DataStreamManager(QObject):
         self._initialize_chunk_metadata()
     
     def _initialize_chunk_metadata(self):
-        """Initialize chunk metadata by scanning the LAS file."""
+        """Initialize chunk metadata by indexing the LAS data section once."""
+        try:
+            self._initialize_data_index()
+        except Exception as e:
+            # Wrapped or unsorted files cannot be byte-indexed; read them through lasio instead
+            print(f"Byte-offset index unavailable ({e}), falling back to full LAS read")
+            self._cleanup_mmap()
+            self._initialize_chunk_metadata_from_lasio()
+            return
+        
+        self.loading_progress.emit(100, f"Initialized {len(self.chunk_metadata)} chunks")
+    
+    def _initialize_data_index(self):
+        """Build the depth->byte-offset index and split the data section into chunks."""
+        self.file_size = os.path.getsize(self.las_file_path)
+        self.mmap_file = open(self.las_file_path, 'rb')
+        self.mmap_data = mmap.mmap(self.mmap_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data_index = LASDataIndex(self.mmap_data)
+        
+        index = self.data_index
+        if index.num_rows == 0:
+            raise ValueError("LAS file has no data rows")
+        
+        # Cut the data section at indexed lines roughly every chunk_size_bytes
+        data_size = index.data_end - index.data_start
+        num_chunks = max(1, -(-data_size // self.chunk_size_bytes))
+        targets = index.data_start + np.arange(num_chunks) * self.chunk_size_bytes
+        cuts = np.unique(np.searchsorted(index.offsets, targets))
+        cuts = cuts[cuts < len(index.offsets)]
+        
+        self.chunk_metadata = {}
+        for i, cut in enumerate(cuts):
+            next_cut = cuts[i + 1] if i + 1 < len(cuts) else None
+            file_offset = int(index.offsets[cut])
+            end_offset = int(index.offsets[next_cut]) if next_cut is not None else index.data_end
+            first_row = int(cut) * index.stride
+            end_row = int(next_cut) * index.stride if next_cut is not None else index.num_rows
+            
+            chunk_min = float(index.depths[cut])
+            chunk_max = float(index.depths[next_cut]) if next_cut is not None else index.last_depth
+            depth_range = (chunk_min, chunk_max)
+            
+            self.chunk_metadata[depth_range] = ChunkMetadata(
+                depth_range=depth_range,
+                file_offset=file_offset,
+                size_bytes=end_offset - file_offset,
+                curve_columns=list(index.curve_names),
+                num_points=end_row - first_row,
+                min_values={},  # Populated when the chunk is loaded
+                max_values={}
+            )
+    
+    def _initialize_chunk_metadata_from_lasio(self):
+        """Initialize chunk metadata by reading the whole LAS file through lasio."""
         try:
             # Read LAS file header to get depth range and curve information
-            las = lasio.read(self.las_file_path)
+            las = read_las(self.las_file_path)
             df = las.df()
             
             # Get depth column
@@ -280,24 +336,14 @@ class DataStreamManager(QObject):
         
         # Load the chunk
         try:
-            # Read LAS file and extract chunk
-            las = lasio.read(self.las_file_path)
-            df = las.df()
-            
-            # Identify depth column
-            depth_col = self._identify_depth_column(df)
-            if depth_col is None:
+            if self.data_index is not None:
+                # Parse only the bytes belonging to this chunk
+                chunk_data = self._read_indexed_chunk(chunk_range)
+            else:
+                chunk_data = self._read_chunk_with_lasio(chunk_range)
+            if chunk_data is None:
                 return
             
-            # Reset index if depth is the index
-            if df.index.name == depth_col:
-                df = df.reset_index()
-            
-            # Filter data for chunk range
-            chunk_min, chunk_max = chunk_range
-            mask = (df[depth_col] >= chunk_min) & (df[depth_col] <= chunk_max)
-            chunk_data = df[mask].copy()
-            
             # Create chunk object
             size_bytes = chunk_data.memory_usage(deep=True).sum()
             chunk = DataChunk(
@@ -327,6 +373,37 @@ class DataStreamManager(QObject):
         except Exception as e:
             print(f"Error loading chunk {chunk_range}: {e}")
     
+    def _read_indexed_chunk(self, chunk_range: Tuple[float, float]) -> pd.DataFrame:
+        """Read a chunk's rows straight from its byte window in the mmap'd file."""
+        metadata = self.chunk_metadata[chunk_range]
+        chunk_data = self.data_index.read_byte_range(
+            metadata.file_offset, metadata.file_offset + metadata.size_bytes)
+        
+        metadata.num_points = len(chunk_data)
+        metadata.min_values = {col: float(chunk_data[col].min()) for col in chunk_data.columns}
+        metadata.max_values = {col: float(chunk_data[col].max()) for col in chunk_data.columns}
+        self.total_data_transferred_mb += metadata.size_bytes / (1024 * 1024)
+        return chunk_data
+    
+    def _read_chunk_with_lasio(self, chunk_range: Tuple[float, float]) -> Optional[pd.DataFrame]:
+        """Read the whole LAS file through lasio and extract a chunk."""
+        las = read_las(self.las_file_path)
+        df = las.df()
+        
+        # Identify depth column
+        depth_col = self._identify_depth_column(df)
+        if depth_col is None:
+            return None
+        
+        # Reset index if depth is the index
+        if df.index.name == depth_col:
+            df = df.reset_index()
+        
+        # Filter data for chunk range
+        chunk_min, chunk_max = chunk_range
+        mask = (df[depth_col] >= chunk_min) & (df[depth_col] <= chunk_max)
+        return df[mask].copy()
+    
     def prefetch_adjacent_ranges(self, current_range: Tuple[float, float]):
         """
         Pre-load adjacent depth ranges for smoother scrolling.
@@ -473,8 +550,16 @@ class DataStreamManager(QObject):
         self.cancel_loading = True
         self.memory_monitor_timer.stop()
         self.clear_cache()
+        self._cleanup_mmap()
+    
+    def _cleanup_mmap(self):
+        """Release the memory-mapped file and its index."""
+        self.data_index = None
+        
+        if self.mmap_data:
+            self.mmap_data.close()
+            self.mmap_data = None
         
         if self.mmap_file:
             self.mmap_file.close()
-            self.mmap_file = None
-            self.mmap_data = None
\ No newline at end of file
+            self.mmap_file = None
\ No newline at end of file
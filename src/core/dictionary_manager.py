@@ -7,8 +7,78 @@ CoalLog dictionary data with caching for performance.
 
 import pandas as pd
 import os
+from bisect import bisect_left
 from typing import Dict, List, Optional, Tuple
-from .coallog_utils import load_coallog_dictionaries
+from .coallog_utils import load_coallog_dictionaries_cached
+
+
+class CodeSearchIndex:
+    """
+    Case-insensitive substring search over (category, code, description) entries.
+    
+    Entries are numbered in category order, so each category is a contiguous
+    id range. A trigram index maps every three-character sequence of a code or
+    description to the ids containing it; a query is answered by intersecting
+    the posting sets of its trigrams and confirming the substring match on the
+    few survivors. Queries shorter than three characters scan the pre-lowered
+    text.
+    """
+    
+    NGRAM = 3
+    
+    def __init__(self, code_cache: Dict[str, List[Tuple[str, str]]]):
+        self.entries: List[Tuple[str, str, str]] = []
+        self._lowered: List[Tuple[str, str]] = []
+        self._category_ranges: Dict[str, Tuple[int, int]] = {}
+        self._postings: Dict[str, set] = {}
+        
+        for category, codes in code_cache.items():
+            start = len(self.entries)
+            for code, desc in codes:
+                entry_id = len(self.entries)
+                self.entries.append((category, code, desc))
+                lowered = (code.lower(), desc.lower())
+                self._lowered.append(lowered)
+                for text in lowered:
+                    for gram in self._ngrams(text):
+                        self._postings.setdefault(gram, set()).add(entry_id)
+            self._category_ranges[category] = (start, len(self.entries))
+    
+    @classmethod
+    def _ngrams(cls, text: str) -> set:
+        return {text[i:i + cls.NGRAM] for i in range(len(text) - cls.NGRAM + 1)}
+    
+    def _matching_ids(self, search_lower: str) -> Optional[List[int]]:
+        """Sorted ids of entries whose code or description contains the term (None = every entry)."""
+        if not search_lower:
+            return None
+        if len(search_lower) < self.NGRAM:
+            candidates = range(len(self.entries))
+        else:
+            postings = sorted((self._postings.get(gram, set()) for gram in self._ngrams(search_lower)), key=len)
+            candidates = set.intersection(*postings) if postings[0] else set()
+        return sorted(entry_id for entry_id in candidates
+                      if search_lower in self._lowered[entry_id][0] or search_lower in self._lowered[entry_id][1])
+    
+    def search(self, search_term: str, categories: Optional[List[str]] = None) -> List[Tuple[str, str, str]]:
+        """(category, code, description) matches, grouped by category in ``categories`` order."""
+        matches = self._matching_ids(search_term.lower())
+        if categories is None:
+            categories = list(self._category_ranges.keys())
+        
+        results = []
+        for category in categories:
+            if category not in self._category_ranges:
+                continue
+            start, stop = self._category_ranges[category]
+            if matches is None:
+                results.extend(self.entries[start:stop])
+            else:
+                position = bisect_left(matches, start)
+                while position < len(matches) and matches[position] < stop:
+                    results.append(self.entries[matches[position]])
+                    position += 1
+        return results
 
 
 class DictionaryManager:
@@ -24,6 +94,8 @@ class DictionaryManager:
         """
         self._dictionaries: Optional[Dict[str, pd.DataFrame]] = None
         self._code_cache: Dict[str, List[Tuple[str, str]]] = {}  # category -> [(code, description)]
+        self._code_maps: Dict[str, Dict[str, str]] = {}  # category -> {code: description}
+        self._search_index: Optional[CodeSearchIndex] = None
         self._coal_log_path = coal_log_path
         
         if not self._coal_log_path:
@@ -94,7 +166,7 @@ class DictionaryManager:
     def _load_dictionaries(self):
         """Load dictionaries from the CoalLog Excel file."""
         try:
-            self._dictionaries = load_coallog_dictionaries(self._coal_log_path)
+            self._dictionaries = load_coallog_dictionaries_cached(self._coal_log_path)
             self._build_cache()
             print(f"Successfully loaded dictionaries from: {self._coal_log_path}")
         except Exception as e:
@@ -107,6 +179,7 @@ class DictionaryManager:
             return
         
         self._code_cache.clear()
+        self._code_maps.clear()
         
         for category, df in self._dictionaries.items():
             if df is None or df.empty:
@@ -127,12 +200,20 @@ class DictionaryManager:
             # Ensure columns exist
             if code_col in df.columns and desc_col in df.columns:
                 codes = []
-                for _, row in df.iterrows():
-                    code = str(row[code_col]).strip()
-                    desc = str(row[desc_col]).strip()
+                for code, desc in zip(df[code_col].tolist(), df[desc_col].tolist()):
+                    code = str(code).strip()
+                    desc = str(desc).strip()
                     if code and desc:  # Skip empty entries
                         codes.append((code, desc))
                 self._code_cache[category] = codes
+                
+                # First entry wins for duplicated codes
+                code_map = {}
+                for code, desc in codes:
+                    code_map.setdefault(code, desc)
+                self._code_maps[category] = code_map
+        
+        self._search_index = CodeSearchIndex(self._code_cache)
     
     def get_codes_for_category(self, category: str) -> List[Tuple[str, str]]:
         """
@@ -184,11 +265,11 @@ class DictionaryManager:
         Returns:
             Description string or None if not found
         """
-        codes = self.get_codes_for_category(category)
-        for c, desc in codes:
-            if c == code:
-                return desc
-        return None
+        return self._code_maps.get(category, {}).get(code)
+    
+    def has_code(self, category: str, code: str) -> bool:
+        """Check whether a code exists in a category."""
+        return code in self._code_maps.get(category, {})
     
     def search_codes(self, search_term: str, categories: Optional[List[str]] = None) -> List[Tuple[str, str, str]]:
         """
@@ -201,20 +282,9 @@ class DictionaryManager:
         Returns:
             List of (category, code, description) tuples
         """
-        results = []
-        search_lower = search_term.lower()
-        
-        if categories is None:
-            categories = list(self._code_cache.keys())
-        
-        for category in categories:
-            codes = self.get_codes_for_category(category)
-            for code, desc in codes:
-                if (search_lower in code.lower() or 
-                    search_lower in desc.lower()):
-                    results.append((category, code, desc))
-        
-        return results
+        if self._search_index is None:
+            return []
+        return self._search_index.search(search_term, categories)
     
     def get_all_categories(self) -> List[str]:
         """Get list of all available dictionary categories."""
@@ -6,6 +6,7 @@ from .lithology_interval import LithologyCode, LithologyInterval
 from .las_point import LASPoint
 from .hole_data_provider import HoleDataProvider
 from .excel_hole_data_provider import ExcelHoleDataProvider
+from .columnar_hole_data_provider import ColumnarHoleDataProvider
 from .synchronization_cache import SynchronizationCache
 
 __all__ = [
@@ -14,5 +15,6 @@ __all__ = [
     'LASPoint',
     'HoleDataProvider',
     'ExcelHoleDataProvider',
+    'ColumnarHoleDataProvider',
     'SynchronizationCache',
 ]
\ No newline at end of file
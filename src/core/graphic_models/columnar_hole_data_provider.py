@@ -0,0 +1,204 @@
+"""
+Array-backed hole data provider.
+Keeps LAS curves and lithology intervals as contiguous NumPy columns.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from .hole_data_provider import HoleDataProvider
+from .lithology_interval import LithologyInterval, LITHOLOGY_CODE_COLORS, DEFAULT_LITHOLOGY_COLOR
+from .las_point import LASPoint
+
+
+class ColumnarHoleDataProvider(HoleDataProvider):
+    """
+    Provides hole data from NumPy columns instead of per-sample objects.
+
+    LAS data is one sorted float64 depth array plus one float32 array per
+    curve; lithology is parallel from/to/code/description arrays sorted by
+    from depth. Depth lookups are binary searches, and ``get_range`` returns
+    views into the stored arrays. ``LithologyInterval``/``LASPoint`` objects
+    are only built when the list-based ``HoleDataProvider`` API is used.
+    """
+
+    def __init__(self, depths: np.ndarray, curves: Dict[str, np.ndarray],
+                 from_depths: np.ndarray, to_depths: np.ndarray,
+                 codes: List[str], descriptions: Optional[List[str]] = None,
+                 sample_numbers: Optional[List[Optional[str]]] = None,
+                 comments: Optional[List[str]] = None):
+        """
+        Args:
+            depths: LAS sample depths
+            curves: {curve_name: values}, each the same length as ``depths``
+            from_depths, to_depths: Lithology interval tops and bottoms
+            codes: Lithology code per interval
+            descriptions, sample_numbers, comments: Optional per-interval metadata
+        """
+        depths = np.asarray(depths, dtype=np.float64)
+        order = np.argsort(depths, kind='stable')
+        self.depths = np.ascontiguousarray(depths[order])
+        self.curves = {
+            name: np.ascontiguousarray(np.asarray(values, dtype=np.float32)[order])
+            for name, values in curves.items()
+        }
+
+        from_depths = np.asarray(from_depths, dtype=np.float64)
+        interval_order = np.argsort(from_depths, kind='stable')
+        count = len(from_depths)
+        self.from_depths = np.ascontiguousarray(from_depths[interval_order])
+        self.to_depths = np.ascontiguousarray(np.asarray(to_depths, dtype=np.float64)[interval_order])
+        self.codes = np.asarray(codes, dtype=object)[interval_order]
+        self.descriptions = np.asarray(descriptions if descriptions is not None else [''] * count,
+                                       dtype=object)[interval_order]
+        self.sample_numbers = np.asarray(sample_numbers if sample_numbers is not None else [None] * count,
+                                         dtype=object)[interval_order]
+        self.comments = np.asarray(comments if comments is not None else [''] * count,
+                                   dtype=object)[interval_order]
+        # Non-overlapping intervals have sorted bottoms, which allows a binary search
+        self._bottoms_sorted = bool(np.all(np.diff(self.to_depths) >= 0))
+
+        self._lithology_cache: Optional[List[LithologyInterval]] = None
+        self._las_cache: Optional[List[LASPoint]] = None
+
+    @classmethod
+    def from_dataframes(cls, lithology_df: pd.DataFrame, las_df: pd.DataFrame) -> 'ColumnarHoleDataProvider':
+        """
+        Build from the same DataFrames ``ExcelHoleDataProvider`` takes.
+
+        Args:
+            lithology_df: DataFrame with columns [from_depth, to_depth, code, description, ...]
+            las_df: DataFrame with columns [depth, gamma, density, ...]
+        """
+        def optional_column(name, default):
+            if name in lithology_df.columns:
+                return lithology_df[name].tolist()
+            return [default] * len(lithology_df)
+
+        return cls(
+            depths=las_df['depth'].to_numpy(),
+            curves={name: las_df[name].to_numpy() for name in las_df.columns if name != 'depth'},
+            from_depths=lithology_df['from_depth'].to_numpy(),
+            to_depths=lithology_df['to_depth'].to_numpy(),
+            codes=optional_column('code', 'UNKNOWN'),
+            descriptions=optional_column('description', ''),
+            sample_numbers=optional_column('sample_number', None),
+            comments=optional_column('comment', ''),
+        )
+
+    # ========== HoleDataProvider API ==========
+
+    def get_lithology_intervals(self) -> List[LithologyInterval]:
+        """Build and cache lithology interval objects."""
+        if self._lithology_cache is None:
+            self._lithology_cache = [self._make_interval(i) for i in range(len(self.from_depths))]
+        return self._lithology_cache
+
+    def get_lithology_for_depth(self, depth: float) -> Optional[LithologyInterval]:
+        """Get lithology containing specific depth."""
+        position = self.interval_index_for_depth(depth)
+        return self.get_lithology_intervals()[position] if position is not None else None
+
+    def get_las_points(self, curve_names: List[str] = None) -> List[LASPoint]:
+        """Get LAS points for specified curves (builds one object per sample; prefer ``get_range``)."""
+        all_curves = curve_names is None
+        if self._las_cache is not None and all_curves:
+            return self._las_cache
+
+        if all_curves:
+            curve_names = self.get_available_curves()
+
+        columns = [self.curves[name].tolist() if name in self.curves else [None] * len(self.depths)
+                   for name in curve_names]
+        points = [LASPoint(depth=depth, curves=dict(zip(curve_names, values)))
+                  for depth, *values in zip(self.depths.tolist(), *columns)]
+
+        if all_curves:
+            self._las_cache = points
+        return points
+
+    def get_depth_range(self) -> tuple:
+        """Get min/max depths from lithology."""
+        if len(self.from_depths) == 0:
+            return (0, 100)
+        return (float(self.from_depths[0]), float(self.to_depths[-1]))
+
+    def get_available_curves(self) -> List[str]:
+        """Get all curve names from LAS data."""
+        return list(self.curves.keys())
+
+    # ========== Array API ==========
+
+    def get_range(self, from_depth: float, to_depth: float,
+                  curve_names: List[str] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Samples with ``from_depth <= depth <= to_depth``.
+
+        Returns:
+            tuple: (depths, {curve_name: values}) - views into the stored arrays, not copies
+        """
+        start, stop = self.range_indices(from_depth, to_depth)
+        names = curve_names if curve_names is not None else self.get_available_curves()
+        return self.depths[start:stop], {name: self.curves[name][start:stop] for name in names if name in self.curves}
+
+    def range_indices(self, from_depth: float, to_depth: float) -> Tuple[int, int]:
+        """Slice bounds of the samples within a depth range."""
+        start = int(np.searchsorted(self.depths, from_depth, side='left'))
+        stop = int(np.searchsorted(self.depths, to_depth, side='right'))
+        return start, max(start, stop)
+
+    def nearest_sample_index(self, depth: float) -> Optional[int]:
+        """Index of the sample closest to ``depth`` (the shallower one on a tie)."""
+        if len(self.depths) == 0:
+            return None
+        position = int(np.searchsorted(self.depths, depth))
+        if position == 0:
+            return 0
+        if position == len(self.depths):
+            return position - 1
+        return position - 1 if depth - self.depths[position - 1] <= self.depths[position] - depth else position
+
+    def get_nearest_sample(self, depth: float) -> Optional[Tuple[float, Dict[str, float]]]:
+        """(depth, {curve_name: value}) of the sample closest to ``depth``."""
+        index = self.nearest_sample_index(depth)
+        if index is None:
+            return None
+        return float(self.depths[index]), {name: float(values[index]) for name, values in self.curves.items()}
+
+    def get_las_point(self, index: int) -> LASPoint:
+        """``LASPoint`` for a single sample index."""
+        return LASPoint(depth=float(self.depths[index]),
+                        curves={name: float(values[index]) for name, values in self.curves.items()})
+
+    def interval_index_for_depth(self, depth: float) -> Optional[int]:
+        """Index of the first interval whose range includes ``depth``."""
+        if not self._bottoms_sorted:
+            matches = np.flatnonzero((self.from_depths <= depth) & (depth <= self.to_depths))
+            return int(matches[0]) if len(matches) else None
+        position = int(np.searchsorted(self.to_depths, depth, side='left'))
+        if position < len(self.from_depths) and self.from_depths[position] <= depth:
+            return position
+        return None
+
+    def interval_indices(self, from_depth: float, to_depth: float) -> Tuple[int, int]:
+        """Slice bounds of the intervals overlapping a depth range (assumes non-overlapping intervals)."""
+        start = int(np.searchsorted(self.to_depths, from_depth, side='left'))
+        stop = int(np.searchsorted(self.from_depths, to_depth, side='right'))
+        return start, max(start, stop)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the LAS sample arrays."""
+        return self.depths.nbytes + sum(values.nbytes for values in self.curves.values())
+
+    def _make_interval(self, index: int) -> LithologyInterval:
+        code = self.codes[index]
+        return LithologyInterval(
+            from_depth=float(self.from_depths[index]),
+            to_depth=float(self.to_depths[index]),
+            code=code,
+            description=self.descriptions[index],
+            color=LITHOLOGY_CODE_COLORS.get(code, DEFAULT_LITHOLOGY_COLOR),
+            sample_number=self.sample_numbers[index],
+            comment=self.comments[index]
+        )
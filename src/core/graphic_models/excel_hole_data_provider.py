@@ -6,7 +6,7 @@ Provides hole data from Earthworm Excel format (.xlsx).
 import pandas as pd
 from typing import List, Optional
 from .hole_data_provider import HoleDataProvider
-from .lithology_interval import LithologyInterval
+from .lithology_interval import LithologyInterval, LITHOLOGY_CODE_COLORS, DEFAULT_LITHOLOGY_COLOR
 from .las_point import LASPoint
 
 
@@ -57,21 +57,21 @@ class ExcelHoleDataProvider(HoleDataProvider):
     
     def get_las_points(self, curve_names: List[str] = None) -> List[LASPoint]:
         """Get LAS points for specified curves."""
-        if self._las_cache is not None and curve_names is None:
+        all_curves = curve_names is None
+        if self._las_cache is not None and all_curves:
             return self._las_cache
         
-        if curve_names is None:
+        if all_curves:
             curve_names = self.get_available_curves()
         
-        points = []
-        for _, row in self.las_df.iterrows():
-            point = LASPoint(
-                depth=row['depth'],
-                curves={name: row.get(name, None) for name in curve_names}
-            )
-            points.append(point)
+        # Read whole columns once instead of building a Series per row
+        depths = self.las_df['depth'].tolist()
+        columns = [self.las_df[name].tolist() if name in self.las_df.columns else [None] * len(depths)
+                   for name in curve_names]
+        points = [LASPoint(depth=depth, curves=dict(zip(curve_names, values)))
+                  for depth, *values in zip(depths, *columns)]
         
-        if curve_names is None:
+        if all_curves:
             self._las_cache = points
         
         return points
@@ -90,11 +90,4 @@ class ExcelHoleDataProvider(HoleDataProvider):
     
     def _get_color_for_code(self, code: str) -> tuple:
         """Get RGB color for lithology code."""
-        color_map = {
-            'SAND': (255, 215, 0),
-            'COAL': (0, 0, 0),
-            'SHALE': (169, 169, 169),
-            'SILT': (210, 180, 140),
-            'MUDSTONE': (128, 128, 128),
-        }
-        return color_map.get(code, (128, 128, 128))
\ No newline at end of file
+        return LITHOLOGY_CODE_COLORS.get(code, DEFAULT_LITHOLOGY_COLOR)
\ No newline at end of file
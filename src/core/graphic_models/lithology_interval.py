@@ -18,6 +18,17 @@ class LithologyCode(Enum):
     # ... add all codes from CoalLog dictionary
 
 
+# Display colours for common lithology codes; anything else is drawn grey
+LITHOLOGY_CODE_COLORS = {
+    'SAND': (255, 215, 0),
+    'COAL': (0, 0, 0),
+    'SHALE': (169, 169, 169),
+    'SILT': (210, 180, 140),
+    'MUDSTONE': (128, 128, 128),
+}
+DEFAULT_LITHOLOGY_COLOR = (128, 128, 128)
+
+
 @dataclass
 class LithologyInterval:
     """
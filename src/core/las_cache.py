@@ -0,0 +1,374 @@
+"""
+On-disk cache of parsed LAS files.
+
+Parsing LAS text with lasio dominates load time for large holes, and the same
+file is typically parsed again by several loaders (analysis, the LAS loader
+worker, the map and cross-section windows). The cache stores each parsed file
+once, keyed by a hash of its contents:
+
+    <cache_dir>/<digest[:2]>/<digest>/header.json   version/well/params/curve metadata
+    <cache_dir>/<digest[:2]>/<digest>/data.npy      curve data, float64, one column per curve
+    <cache_dir>/paths/<path hash>.json              [path, size, mtime_ns, digest] of a hashed file
+
+``data.npy`` is column-major so every curve is a contiguous slice of a
+memory-mapped array; opening a cached hole reads only the JSON header.
+File contents are hashed once per (path, size, mtime) and the digest is
+remembered in a small record per path, so hashing a file writes only its own
+record and processes sharing the cache never overwrite each other's digests.
+
+``read_las`` returns an object with the parts of the ``lasio.LASFile`` API
+that the loaders use (``curves``, ``well``, ``params``, ``version``,
+``index``, ``keys()``, ``[mnemonic]`` and ``df()``). Files whose curves
+aren't all numeric are returned straight from lasio and not cached.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import lasio
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; older entries are then ignored
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'EARTHWORM_LAS_CACHE_DIR',
+    os.path.join(os.path.expanduser("~"), ".earthworm_cache", "las")
+)
+
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+class HeaderItem:
+    """A single header line (mnemonic, unit, value, description)."""
+
+    def __init__(self, mnemonic: str, unit: str = '', value=None, descr: str = ''):
+        self.mnemonic = mnemonic
+        self.unit = unit
+        self.value = value
+        self.descr = descr
+
+    def __repr__(self):
+        return f"HeaderItem(mnemonic={self.mnemonic!r}, unit={self.unit!r}, value={self.value!r}, descr={self.descr!r})"
+
+
+class CachedCurve(HeaderItem):
+    """Curve metadata plus its data column."""
+
+    def __init__(self, mnemonic: str, unit: str = '', value=None, descr: str = '', data: Optional[np.ndarray] = None):
+        super().__init__(mnemonic, unit, value, descr)
+        self.data = data
+
+
+class HeaderSection:
+    """Ordered header items with attribute and key access, like lasio's SectionItems."""
+
+    def __init__(self, items: List[HeaderItem]):
+        self._items = list(items)
+        self._by_mnemonic = {item.mnemonic: item for item in self._items}
+
+    def __getattr__(self, mnemonic):
+        by_mnemonic = self.__dict__.get('_by_mnemonic', {})
+        if mnemonic in by_mnemonic:
+            return by_mnemonic[mnemonic]
+        raise AttributeError(mnemonic)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._items[key]
+        return self._by_mnemonic[key]
+
+    def __contains__(self, mnemonic):
+        return mnemonic in self._by_mnemonic
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def keys(self):
+        return [item.mnemonic for item in self._items]
+
+
+class CachedLASFile:
+    """A parsed LAS file restored from the cache."""
+
+    def __init__(self, header: Dict, data: Optional[np.ndarray], file_path: str = ''):
+        self.file_path = file_path
+        self.version = HeaderSection(HeaderItem(**item) for item in header.get('version', []))
+        self.well = HeaderSection(HeaderItem(**item) for item in header.get('well', []))
+        self.params = HeaderSection(HeaderItem(**item) for item in header.get('params', []))
+        self.other = header.get('other', '')
+        self.data = data
+
+        curves = []
+        for position, item in enumerate(header.get('curves', [])):
+            column = data[:, position] if data is not None else None
+            curves.append(CachedCurve(data=column, **item))
+        self.curves = HeaderSection(curves)
+
+    @property
+    def index(self) -> Optional[np.ndarray]:
+        """Data of the first (depth/index) curve."""
+        return self.curves[0].data if len(self.curves) else None
+
+    def keys(self) -> List[str]:
+        return self.curves.keys()
+
+    def __getitem__(self, mnemonic) -> np.ndarray:
+        return self.curves[mnemonic].data
+
+    def df(self) -> pd.DataFrame:
+        """DataFrame indexed by the first curve, like ``lasio.LASFile.df()``."""
+        mnemonics = self.keys()
+        if self.data is None or not mnemonics:
+            return pd.DataFrame()
+        index = pd.Index(self.data[:, 0], name=mnemonics[0])
+        return pd.DataFrame(self.data[:, 1:], index=index, columns=mnemonics[1:])
+
+
+def _json_value(value):
+    """Convert a header value into something JSON can hold."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _section_items(section) -> List[Dict]:
+    return [{'mnemonic': item.mnemonic, 'unit': item.unit, 'value': _json_value(item.value), 'descr': item.descr}
+            for item in section]
+
+
+def _header_from_lasio(las) -> Dict:
+    """Header metadata of a lasio LASFile as a JSON-serialisable dictionary."""
+    return {
+        'format_version': CACHE_FORMAT_VERSION,
+        'version': _section_items(las.version),
+        'well': _section_items(las.well),
+        'params': _section_items(las.params),
+        'curves': _section_items(las.curves),
+        'other': las.other if isinstance(las.other, str) else '',
+    }
+
+
+class LASCache:
+    """Content-hash keyed store of parsed LAS files."""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self._records_dir = os.path.join(self.cache_dir, 'paths')
+        self._digests: Dict[str, List] = {}
+        self._lock = threading.Lock()
+
+    # Hashing
+
+    def file_digest(self, file_path: str) -> str:
+        """Content hash of a file, reusing the last digest while its size and mtime are unchanged."""
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        known = self._lookup_digest(path, stat)
+        if known is not None:
+            return known
+
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+
+        self._save_digest(path, [stat.st_size, stat.st_mtime_ns, digest])
+        return digest
+
+    def _known_digest(self, file_path: str) -> Optional[str]:
+        """Digest from the index if the file hasn't changed since it was hashed, without hashing."""
+        path = os.path.abspath(file_path)
+        return self._lookup_digest(path, os.stat(path))
+
+    def _lookup_digest(self, path: str, stat) -> Optional[str]:
+        """Remembered digest of ``path`` if its size and mtime still match, checking memory then disk."""
+        with self._lock:
+            known = self._digests.get(path)
+        if not (known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns):
+            # Another process (or instance) may have hashed the file since
+            known = self._read_record(path)
+            if known is None:
+                return None
+            with self._lock:
+                self._digests[path] = known
+        if known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        return None
+
+    def _record_path(self, path: str) -> str:
+        name = hashlib.blake2b(path.encode('utf-8', 'surrogateescape'), digest_size=16).hexdigest()
+        return os.path.join(self._records_dir, name + '.json')
+
+    def _read_record(self, path: str) -> Optional[List]:
+        try:
+            with open(self._record_path(path), 'r') as f:
+                record_path, size, mtime_ns, digest = json.load(f)
+        except (OSError, ValueError, TypeError):
+            return None
+        return [size, mtime_ns, digest] if record_path == path else None
+
+    def _save_digest(self, path: str, known: List):
+        """Remember a digest, replacing only this path's record on disk."""
+        with self._lock:
+            self._digests[path] = known
+        try:
+            os.makedirs(self._records_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._records_dir, suffix='.json.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump([path] + known, f)
+            os.replace(tmp_path, self._record_path(path))
+        except OSError as e:
+            logger.warning(f"Could not update LAS cache index: {e}")
+
+    # Entries
+
+    def _entry_dir(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def _load_entry(self, digest: str, file_path: str, with_data: bool = True) -> Optional[CachedLASFile]:
+        entry_dir = self._entry_dir(digest)
+        try:
+            with open(os.path.join(entry_dir, 'header.json'), 'r') as f:
+                header = json.load(f)
+            if header.get('format_version') != CACHE_FORMAT_VERSION:
+                return None
+            data = None
+            if with_data:
+                # Copy-on-write so callers can modify the frames they build without touching the cache
+                data = np.load(os.path.join(entry_dir, 'data.npy'), mmap_mode='c')
+            return CachedLASFile(header, data, file_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"LAS cache miss for {file_path}: {e}")
+            return None
+
+    def get(self, file_path: str) -> Optional[CachedLASFile]:
+        """Return the cached parse of a file, or None if it isn't cached."""
+        return self._load_entry(self.file_digest(file_path), file_path)
+
+    def store(self, digest: str, las) -> bool:
+        """
+        Store a parsed lasio LASFile under ``digest``.
+
+        Returns:
+            bool: False if the file can't be cached (non-numeric curves or a write error)
+        """
+        curves = list(las.curves)
+        if not curves or not all(np.issubdtype(np.asarray(curve.data).dtype, np.number) for curve in curves):
+            return False
+
+        entry_dir = self._entry_dir(digest)
+        if os.path.exists(os.path.join(entry_dir, 'data.npy')):
+            return True
+
+        tmp_dir = None
+        try:
+            os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+            tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir), prefix='.tmp-')
+            data = np.empty((len(curves[0].data), len(curves)), dtype=np.float64, order='F')
+            for position, curve in enumerate(curves):
+                data[:, position] = curve.data
+            np.save(os.path.join(tmp_dir, 'data.npy'), data)
+            with open(os.path.join(tmp_dir, 'header.json'), 'w') as f:
+                json.dump(_header_from_lasio(las), f)
+            try:
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                # Another process stored the same file first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not write LAS cache entry {digest}: {e}")
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+    def read(self, file_path: str):
+        """
+        Read a LAS file through the cache.
+
+        Returns:
+            CachedLASFile on a hit, or after parsing and storing a miss; the
+            lasio LASFile if the file can't be cached.
+        """
+        try:
+            digest = self.file_digest(file_path)
+        except OSError:
+            # Let lasio raise its usual error for missing/unreadable files
+            return lasio.read(file_path)
+
+        cached = self._load_entry(digest, file_path)
+        if cached is not None:
+            return cached
+
+        las = lasio.read(file_path)
+        if self.store(digest, las):
+            cached = self._load_entry(digest, file_path)
+            if cached is not None:
+                return cached
+        return las
+
+    def read_header(self, file_path: str):
+        """
+        Read only the header sections of a LAS file.
+
+        Uses the cached header if the file has been cached and is unchanged;
+        otherwise lasio parses the header and skips the data section. Neither
+        path reads the data section.
+        """
+        cached = self.cached_header(file_path)
+        if cached is not None:
+            return cached
+        return lasio.read(file_path, ignore_data=True)
+
+    def cached_header(self, file_path: str) -> Optional[CachedLASFile]:
+        """Header of a file that is cached and unchanged since, or None; never parses the file."""
+        try:
+            digest = self._known_digest(file_path)
+        except OSError:
+            return None
+        if digest is None:
+            return None
+        return self._load_entry(digest, file_path, with_data=False)
+
+    def clear(self):
+        """Delete every cache entry."""
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self._digests = {}
+
+
+_default_cache: Optional[LASCache] = None
+
+
+def get_default_cache() -> LASCache:
+    """Shared cache in ``DEFAULT_CACHE_DIR``."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LASCache()
+    return _default_cache
+
+
+def read_las(file_path: str):
+    """Read a LAS file through the shared cache (see ``LASCache.read``)."""
+    return get_default_cache().read(file_path)
+
+
+def read_las_header(file_path: str):
+    """Read a LAS file's header sections through the shared cache (see ``LASCache.read_header``)."""
+    return get_default_cache().read_header(file_path)
@@ -0,0 +1,382 @@
+"""
+LASDataIndex - Depth to byte-offset index over the ~A section of a LAS file.
+
+The ASCII data section is scanned once and the start offset of every Nth data
+line is recorded together with its depth. Depth range reads then seek straight
+to the relevant byte window and only tokenize the rows they need, so the cost
+of a read is proportional to the rows requested rather than to the file size.
+
+For very large files the index can instead be sampled: a fixed number of probes
+spread evenly through the data section each record the start of the next data
+line. Building a sampled index touches only a few pages of the file, so it is
+effectively instant and its size does not grow with the file.
+"""
+
+import io
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Record every Nth data line in the index. Reads round outwards to the nearest
+# indexed line, so this trades index memory against a few extra parsed rows.
+DEFAULT_INDEX_STRIDE = 32
+
+# Size of the window used when scanning the data section for line starts
+SCAN_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Number of probes used for a sampled index (16 bytes per probe)
+DEFAULT_SAMPLE_COUNT = 4096
+
+_NEWLINE = ord('\n')
+_COMMENT = ord('#')
+
+
+class LASDataIndex:
+    """
+    Byte-offset index for the data (~A) section of a LAS 2.0 file.
+
+    The index works on any bytes-like buffer (``bytes`` or an ``mmap``) and
+    keeps only two compact NumPy arrays: ``offsets`` (int64 absolute byte
+    position of each indexed data line) and ``depths`` (float64 depth of that
+    line). Wrapped files are not supported and raise ``ValueError`` so callers
+    can fall back to a full lasio read.
+    """
+
+    def __init__(self, buffer, stride: int = DEFAULT_INDEX_STRIDE,
+                 sample_count: Optional[int] = None):
+        """
+        Build the index by parsing the header and indexing the data section.
+
+        Args:
+            buffer: Bytes-like object holding the complete LAS file
+            stride: Record the offset of every ``stride``-th data line
+            sample_count: If given, sample this many evenly spaced data lines
+                instead of scanning the whole section. ``num_rows`` is then
+                unknown and left as None.
+        """
+        self.buffer = buffer
+        self.stride = max(1, int(stride))
+        self.sample_count = sample_count
+
+        # Header information
+        self.curve_names: List[str] = []
+        self.curve_units: List[str] = []
+        self.null_value: Optional[float] = None
+        self.wrapped = False
+
+        # Data section layout
+        self.data_start = 0
+        self.data_end = len(buffer)
+        self.num_rows = 0
+        self.first_depth = None
+        self.last_depth = None
+
+        # The index itself
+        self.offsets = np.empty(0, dtype=np.int64)
+        self.depths = np.empty(0, dtype=np.float64)
+
+        self._parse_header()
+        if sample_count:
+            self._sample_data_section(int(sample_count))
+        else:
+            self._scan_data_section()
+
+    @classmethod
+    def from_file(cls, las_file_path, stride: int = DEFAULT_INDEX_STRIDE,
+                  sample_count: Optional[int] = None) -> 'LASDataIndex':
+        """Build an index from a file path by reading the file into memory."""
+        with open(las_file_path, 'rb') as f:
+            return cls(f.read(), stride=stride, sample_count=sample_count)
+
+    def _parse_header(self):
+        """Parse the header sections up to the ~A line."""
+        section = None
+        pos = 0
+        size = len(self.buffer)
+        curve_names = []
+
+        while pos < size:
+            end = self.buffer.find(b'\n', pos)
+            if end == -1:
+                end = size
+            line = self.buffer[pos:end].decode('latin-1').strip()
+            pos = end + 1
+
+            if not line or line.startswith('#'):
+                continue
+
+            if line.startswith('~'):
+                section = line[1:2].upper()
+                if section == 'A':
+                    self.data_start = pos
+                    break
+                continue
+
+            mnemonic, unit, value = self._split_header_line(line)
+            if section == 'V' and mnemonic.upper() == 'WRAP':
+                self.wrapped = value.upper().startswith('Y')
+            elif section == 'W' and mnemonic.upper() == 'NULL':
+                try:
+                    self.null_value = float(value)
+                except ValueError:
+                    self.null_value = None
+            elif section == 'C':
+                curve_names.append(mnemonic)
+                self.curve_units.append(unit)
+        else:
+            raise ValueError("LAS file has no ~A data section")
+
+        if self.wrapped:
+            raise ValueError("Wrapped LAS files cannot be indexed")
+        if not curve_names:
+            raise ValueError("LAS file has no curves defined in the ~C section")
+
+        self.curve_names = self._deduplicate_names(curve_names)
+
+    @staticmethod
+    def _split_header_line(line: str) -> Tuple[str, str, str]:
+        """Split a 'MNEM.UNIT  VALUE : DESCRIPTION' header line."""
+        mnemonic, _, rest = line.partition('.')
+        unit = ''
+        if rest and not rest[0].isspace():
+            parts = rest.split(None, 1)
+            unit = parts[0]
+            rest = parts[1] if len(parts) > 1 else ''
+        value = rest.rsplit(':', 1)[0] if ':' in rest else rest
+        return mnemonic.strip(), unit.strip(), value.strip()
+
+    @staticmethod
+    def _deduplicate_names(names: List[str]) -> List[str]:
+        """Suffix duplicated mnemonics with ':1', ':2', ... the same way lasio does."""
+        result = []
+        seen = {}
+        for name in names:
+            if names.count(name) > 1:
+                seen[name] = seen.get(name, 0) + 1
+                result.append(f"{name}:{seen[name]}")
+            else:
+                result.append(name)
+        return result
+
+    def _scan_data_section(self):
+        """Record the byte offset and depth of every ``stride``-th data line."""
+        offsets = []
+        depths = []
+        line_number = 0
+        pos = self.data_start
+
+        while pos < self.data_end:
+            block_end = min(pos + SCAN_BLOCK_SIZE, self.data_end)
+            block = self.buffer[pos:block_end]
+
+            # Only scan complete lines; the remainder is picked up by the next block
+            if block_end < self.data_end:
+                cut = block.rfind(b'\n')
+                if cut == -1:
+                    newline = self.buffer.find(b'\n', block_end)
+                    block_end = self.data_end if newline == -1 else newline + 1
+                    block = self.buffer[pos:block_end]
+                else:
+                    block = block[:cut + 1]
+
+            starts, token_starts, token_ends = self._find_data_lines(block)
+            count = len(starts)
+
+            if count:
+                keep = ((line_number + np.arange(count)) % self.stride) == 0
+                kept = np.flatnonzero(keep)
+                tokens = [block[token_starts[i]:token_ends[i]] for i in kept]
+                offsets.append(starts[kept] + pos)
+                depths.append(np.array(tokens, dtype=np.bytes_).astype(np.float64))
+
+                if self.first_depth is None:
+                    self.first_depth = float(block[token_starts[0]:token_ends[0]])
+                self.last_depth = float(block[token_starts[-1]:token_ends[-1]])
+                line_number += count
+
+            pos += len(block)
+
+        self.num_rows = line_number
+        if offsets:
+            self.offsets = np.concatenate(offsets).astype(np.int64)
+            self.depths = np.concatenate(depths)
+
+        if len(self.depths) > 1 and np.any(np.diff(self.depths) < 0):
+            raise ValueError("LAS depths are not increasing; byte-offset index requires sorted depths")
+
+    def _sample_data_section(self, sample_count: int):
+        """Record the first data line at or after evenly spaced byte positions."""
+        self.num_rows = None
+        spacing = max(1, (self.data_end - self.data_start) // max(1, sample_count))
+        offsets = []
+        depths = []
+        pos = self.data_start
+
+        while pos < self.data_end:
+            line = self._next_data_line(pos)
+            if line is None:
+                break
+            line_start, line_end, depth = line
+            offsets.append(line_start)
+            depths.append(depth)
+            pos = max(line_end + 1, pos + spacing)
+
+        if not offsets:
+            return
+
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.depths = np.array(depths, dtype=np.float64)
+        self.first_depth = float(self.depths[0])
+        self.last_depth = self._last_data_line_depth()
+
+        if len(self.depths) > 1 and np.any(np.diff(self.depths) < 0):
+            raise ValueError("LAS depths are not increasing; byte-offset index requires sorted depths")
+
+    def _next_data_line(self, pos: int) -> Optional[Tuple[int, int, float]]:
+        """
+        Find the first data line starting at or after ``pos``.
+
+        Returns:
+            Tuple of (line start, line end, depth) or None at the end of the data
+        """
+        if pos > self.data_start and self.buffer[pos - 1:pos] != b'\n':
+            newline = self.buffer.find(b'\n', pos, self.data_end)
+            if newline == -1:
+                return None
+            pos = newline + 1
+
+        while pos < self.data_end:
+            end = self.buffer.find(b'\n', pos, self.data_end)
+            if end == -1:
+                end = self.data_end
+            tokens = self.buffer[pos:end].split(None, 1)
+            if tokens and not tokens[0].startswith(b'#'):
+                return (pos, end, float(tokens[0]))
+            pos = end + 1
+        return None
+
+    def _last_data_line_depth(self) -> Optional[float]:
+        """Read the depth of the last data line by walking backwards from the end."""
+        end = self.data_end
+        while end > self.data_start:
+            start = self.buffer.rfind(b'\n', self.data_start, end - 1) + 1
+            start = max(start, self.data_start)
+            tokens = self.buffer[start:end].split(None, 1)
+            if tokens and not tokens[0].startswith(b'#'):
+                return float(tokens[0])
+            end = start
+        return None
+
+    @staticmethod
+    def _find_data_lines(block: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Locate the data lines in a block of complete lines.
+
+        Returns:
+            Tuple of (line start offsets, depth token starts, depth token ends),
+            all relative to the start of the block. Blank and comment lines are
+            excluded.
+        """
+        arr = np.frombuffer(block, dtype=np.uint8)
+        newlines = np.flatnonzero(arr == _NEWLINE)
+        starts = np.concatenate(([0], newlines + 1))
+        starts = starts[starts < len(arr)]
+        line_ends = np.append(newlines, len(arr))[:len(starts)]
+
+        # Whitespace and control characters are all <= 32
+        visible = arr > 32
+        visible_pos = np.flatnonzero(visible)
+        blank_pos = np.flatnonzero(~visible)
+
+        first = np.searchsorted(visible_pos, starts)
+        has_token = first < len(visible_pos)
+        token_starts = np.where(has_token, visible_pos[np.minimum(first, len(visible_pos) - 1)], len(arr))
+        has_token &= token_starts < line_ends
+        is_data = has_token & (arr[np.minimum(token_starts, len(arr) - 1)] != _COMMENT)
+
+        starts = starts[is_data]
+        token_starts = token_starts[is_data]
+        after = np.searchsorted(blank_pos, token_starts)
+        token_ends = np.where(after < len(blank_pos), blank_pos[np.minimum(after, len(blank_pos) - 1)], len(arr))
+        return starts, token_starts, token_ends
+
+    def depth_range(self) -> Tuple[float, float]:
+        """Get the (first, last) depth of the data section."""
+        if self.first_depth is None:
+            return (0.0, 0.0)
+        return (self.first_depth, self.last_depth)
+
+    def byte_range_for_depths(self, min_depth: float, max_depth: float) -> Tuple[int, int]:
+        """
+        Find the byte window of the data section covering a depth range.
+
+        The window starts at the last indexed line at or above ``min_depth``
+        and ends at the first indexed line past ``max_depth``, so it may hold
+        up to ``stride - 1`` extra rows on either side.
+        """
+        if len(self.offsets) == 0:
+            return (self.data_start, self.data_start)
+
+        lo = max(int(np.searchsorted(self.depths, min_depth, side='right')) - 1, 0)
+        hi = int(np.searchsorted(self.depths, max_depth, side='right'))
+        start = int(self.offsets[lo])
+        end = int(self.offsets[hi]) if hi < len(self.offsets) else self.data_end
+        return (start, end)
+
+    def read_byte_range(self, start: int, end: int,
+                        curve_names: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Parse the data lines between two byte offsets.
+
+        Args:
+            start: Absolute byte offset of the first line to parse
+            end: Absolute byte offset one past the last line to parse
+            curve_names: Curves to return (None for all curves)
+
+        Returns:
+            DataFrame with one column per curve and null values replaced by NaN
+        """
+        usecols = None
+        if curve_names:
+            usecols = [name for name in self.curve_names if name in curve_names or name == self.curve_names[0]]
+
+        if end <= start:
+            return pd.DataFrame(columns=usecols or self.curve_names, dtype=np.float64)
+
+        df = pd.read_csv(
+            io.BytesIO(self.buffer[start:end]),
+            sep=r'\s+',
+            header=None,
+            names=self.curve_names,
+            usecols=usecols,
+            comment='#',
+            engine='c',
+        )
+        if self.null_value is not None:
+            df = df.replace(self.null_value, np.nan)
+        return df
+
+    def read_depth_range(self, min_depth: float, max_depth: float,
+                         curve_names: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Parse only the rows whose depth lies within ``[min_depth, max_depth]``.
+
+        Args:
+            min_depth: Minimum depth (inclusive)
+            max_depth: Maximum depth (inclusive)
+            curve_names: Curves to return (None for all curves); the depth
+                curve is always included
+
+        Returns:
+            DataFrame with the depth curve as the first column
+        """
+        start, end = self.byte_range_for_depths(min_depth, max_depth)
+        df = self.read_byte_range(start, end, curve_names)
+        if df.empty:
+            return df
+
+        depth_col = self.curve_names[0]
+        mask = (df[depth_col] >= min_depth) & (df[depth_col] <= max_depth)
+        return df[mask].reset_index(drop=True)
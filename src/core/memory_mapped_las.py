@@ -7,7 +7,6 @@ Provides efficient random access to LAS files without loading entire files into
 import os
 import numpy as np
 import pandas as pd
-import lasio
 import mmap
 import struct
 from typing import Dict, List, Tuple, Optional, Any
@@ -15,6 +14,9 @@ from pathlib import Path
 import threading
 import zlib
 
+from .las_data_index import LASDataIndex, DEFAULT_SAMPLE_COUNT
+from .las_cache import read_las
+
 
 class MemoryMappedLAS:
     """
@@ -47,8 +49,9 @@ class MemoryMappedLAS:
         # LAS file structure
         self.depth_column = None
         self.curve_columns = []
-        self.depth_index = None  # Sorted depth values for binary search
-        self.depth_positions = None  # File positions for each depth
+        self.depth_index = None  # Sorted depths of the sampled data lines (float64)
+        self.depth_positions = None  # Byte offset of each sampled data line (int64)
+        self.data_index: Optional[LASDataIndex] = None
         
         # Cache for loaded data
         self.data_cache = {}
@@ -83,10 +86,26 @@ class MemoryMappedLAS:
             self._cleanup_mmap()
     
     def _parse_las_header(self):
-        """Parse LAS header to extract structure information."""
+        """Parse LAS header and sample the ~A section of the mapped buffer for a depth index."""
+        try:
+            self.data_index = LASDataIndex(self.mmap_data, sample_count=DEFAULT_SAMPLE_COUNT)
+        except Exception as e:
+            # Wrapped or unsorted files cannot be byte-indexed; read them through lasio instead
+            print(f"Byte-offset index unavailable ({e}), falling back to full LAS read")
+            self.data_index = None
+            self._parse_las_header_with_lasio()
+            return
+        
+        # The first curve of a LAS file is always the index (depth) curve
+        self.depth_column = self.data_index.curve_names[0]
+        self.curve_columns = self.data_index.curve_names[1:]
+        self.depth_index = self.data_index.depths
+        self.depth_positions = self.data_index.offsets
+    
+    def _parse_las_header_with_lasio(self):
+        """Parse LAS structure by reading the whole file through lasio (via the parse cache)."""
         try:
-            # Read LAS file with lasio to get structure
-            las = lasio.read(self.las_file_path)
+            las = read_las(self.las_file_path)
             df = las.df()
             
             # Identify depth column
@@ -97,13 +116,6 @@ class MemoryMappedLAS:
             if self.depth_column:
                 depth_data = df.index if df.index.name == self.depth_column else df[self.depth_column]
                 self.depth_index = np.sort(depth_data.unique())
-                
-                # Estimate file positions (simplified - actual implementation would need LAS format parsing)
-                self.depth_positions = {}
-                for i, depth in enumerate(self.depth_index):
-                    # Linear mapping for now - could be improved with actual LAS format parsing
-                    position = int((i / len(self.depth_index)) * self.file_size)
-                    self.depth_positions[depth] = position
             
         except Exception as e:
             print(f"Error parsing LAS header: {e}")
@@ -169,11 +181,19 @@ class MemoryMappedLAS:
         """Load data directly from the LAS file."""
         min_depth, max_depth = depth_range
         
+        if self.data_index is not None:
+            try:
+                # Parse only the slice of the mapped file covering the range
+                data = self.data_index.read_depth_range(min_depth, max_depth, curve_names)
+                self.disk_reads += 1
+                return data
+            except Exception as e:
+                print(f"Error loading data from mapped file: {e}")
+                return None
+        
         try:
-            # Use lasio to read the specific range
-            # Note: lasio doesn't support random access natively, so we read the whole file
-            # but only extract the needed range
-            las = lasio.read(self.las_file_path)
+            # Without an index the whole file is needed; the parse cache makes repeat reads cheap
+            las = read_las(self.las_file_path)
             df = las.df()
             
             # Identify depth column
@@ -219,6 +239,9 @@ class MemoryMappedLAS:
     
     def get_depth_range(self) -> Tuple[float, float]:
         """Get the total depth range of the LAS file."""
+        if self.data_index is not None and self.data_index.first_depth is not None:
+            return self.data_index.depth_range()
+        
         if self.depth_index is None or len(self.depth_index) == 0:
             return (0.0, 1000.0)
         
@@ -274,6 +297,8 @@ class MemoryMappedLAS:
     
     def _cleanup_mmap(self):
         """Clean up memory-mapped file resources."""
+        self.data_index = None
+        
         if self.mmap_data:
             self.mmap_data.close()
             self.mmap_data = None
@@ -1,7 +1,6 @@
 import json
 import os
 import base64
-from PyQt6.QtCore import QByteArray
 from .config import DEFAULT_LITHOLOGY_RULES, DEFAULT_SEPARATOR_THICKNESS, DRAW_SEPARATOR_LINES, CURVE_INVERSION_DEFAULTS, DEFAULT_CURVE_THICKNESS, DEFAULT_MERGE_THIN_UNITS, DEFAULT_MERGE_THRESHOLD, DEFAULT_SMART_INTERBEDDING, DEFAULT_SMART_INTERBEDDING_MAX_SEQUENCE_LENGTH, DEFAULT_SMART_INTERBEDDING_THICK_UNIT_THRESHOLD, DEFAULT_FALLBACK_CLASSIFICATION, DEFAULT_BIT_SIZE_MM, DEFAULT_SHOW_ANOMALY_HIGHLIGHTS, DEFAULT_CASING_DEPTH_ENABLED, DEFAULT_CASING_DEPTH_M, DISABLE_SVG_DEFAULT
 
 USE_RESEARCHED_DEFAULTS_DEFAULT = True  # Default to maintaining backward compatibility
@@ -119,6 +118,8 @@ def serialize_qbytearray(qbytearray):
 
 def deserialize_qbytearray(base64_str):
     """Convert base64 string back to QByteArray."""
+    # Imported here so that loading settings doesn't pull in Qt
+    from PyQt6.QtCore import QByteArray
     if base64_str is None:
         return QByteArray()
     data = base64.b64decode(base64_str)
@@ -0,0 +1,181 @@
+"""
+Uniform-grid spatial index over hole collar coordinates.
+
+Collars are kept in NumPy easting/northing arrays (one slot per hole, removed
+holes are swapped out with the last slot). Queries bucket the points into a
+grid of square cells stored CSR-style - points sorted by cell id plus the
+start offset of every cell - which is rebuilt lazily after the set of holes
+changes. A pick then only measures the points in the few cells around the
+click, and a lasso only tests the points inside the polygon's bounding box.
+"""
+
+import math
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Average number of points per occupied cell the grid is sized for
+TARGET_POINTS_PER_CELL = 4
+
+# Upper bound on cells along either axis, for degenerate (e.g. collinear) layouts
+MAX_CELLS_PER_AXIS = 2048
+
+
+class HoleSpatialIndex:
+    """Nearest-point and polygon queries over 2D hole locations."""
+
+    def __init__(self):
+        self._keys: List[Hashable] = []
+        self._slots = {}  # key -> position in the coordinate arrays
+        self._x = np.empty(0, dtype=np.float64)
+        self._y = np.empty(0, dtype=np.float64)
+        self._grid = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    # Maintenance
+
+    def add(self, key: Hashable, x: float, y: float):
+        """
+        Add a point, or move it if ``key`` is already indexed.
+
+        Non-finite coordinates (e.g. a NaN collar from a LAS header) can't be
+        placed in the grid, so the key is removed instead.
+        """
+        if not (math.isfinite(x) and math.isfinite(y)):
+            self.remove(key)
+            return
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            if slot == len(self._x):
+                capacity = max(16, 2 * slot)
+                self._x = np.resize(self._x, capacity)
+                self._y = np.resize(self._y, capacity)
+            self._keys.append(key)
+            self._slots[key] = slot
+        self._x[slot] = x
+        self._y[slot] = y
+        self._grid = None
+
+    def remove(self, key: Hashable):
+        """Remove a point; unknown keys are ignored."""
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        last = len(self._keys) - 1
+        if slot != last:
+            moved_key = self._keys[last]
+            self._keys[slot] = moved_key
+            self._slots[moved_key] = slot
+            self._x[slot] = self._x[last]
+            self._y[slot] = self._y[last]
+        self._keys.pop()
+        self._grid = None
+
+    def clear(self):
+        self._keys = []
+        self._slots = {}
+        self._x = np.empty(0, dtype=np.float64)
+        self._y = np.empty(0, dtype=np.float64)
+        self._grid = None
+
+    # Queries
+
+    def nearest(self, x: float, y: float, tolerance: float) -> Optional[Hashable]:
+        """Key of the closest point strictly within ``tolerance`` of (x, y), or None."""
+        candidates = self._candidates_in_box(x - tolerance, y - tolerance, x + tolerance, y + tolerance)
+        if len(candidates) == 0:
+            return None
+        distances = np.hypot(self._x[candidates] - x, self._y[candidates] - y)
+        best = int(np.argmin(distances))
+        if distances[best] >= tolerance:
+            return None
+        return self._keys[candidates[best]]
+
+    def within_polygon(self, vertices: Sequence[Tuple[float, float]]) -> List[Hashable]:
+        """Keys of the points inside a polygon (even-odd rule, like ``QPainterPath.contains``)."""
+        if len(vertices) < 3:
+            return []
+        polygon = np.asarray(vertices, dtype=np.float64)
+        min_x, min_y = polygon.min(axis=0)
+        max_x, max_y = polygon.max(axis=0)
+        candidates = self._candidates_in_box(min_x, min_y, max_x, max_y)
+        if len(candidates) == 0:
+            return []
+
+        inside = points_in_polygon(self._x[candidates], self._y[candidates], polygon)
+        return [self._keys[slot] for slot in candidates[inside]]
+
+    def _candidates_in_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> np.ndarray:
+        """Slots of the points in the grid cells overlapping a box (a superset of the points in it)."""
+        grid = self._get_grid()
+        if grid is None:
+            return np.empty(0, dtype=np.intp)
+        origin_x, origin_y, cell_size, nx, ny, order, cell_starts = grid
+
+        ix0 = max(0, math.floor((min_x - origin_x) / cell_size))
+        ix1 = min(nx - 1, math.floor((max_x - origin_x) / cell_size))
+        iy0 = max(0, math.floor((min_y - origin_y) / cell_size))
+        iy1 = min(ny - 1, math.floor((max_y - origin_y) / cell_size))
+        if ix0 > ix1 or iy0 > iy1:
+            return np.empty(0, dtype=np.intp)
+
+        # Cells of one grid row are contiguous, so each row is a single slice
+        rows = np.arange(iy0, iy1 + 1) * nx
+        starts = cell_starts[rows + ix0]
+        stops = cell_starts[rows + ix1 + 1]
+        if len(rows) == 1:
+            return order[starts[0]:stops[0]]
+        return np.concatenate([order[start:stop] for start, stop in zip(starts, stops)])
+
+    def _get_grid(self):
+        if self._grid is None and self._keys:
+            self._grid = self._build_grid()
+        return self._grid
+
+    def _build_grid(self):
+        count = len(self._keys)
+        x = self._x[:count]
+        y = self._y[:count]
+        origin_x, origin_y = float(x.min()), float(y.min())
+        width = float(x.max()) - origin_x
+        height = float(y.max()) - origin_y
+
+        cell_size = math.sqrt(width * height * TARGET_POINTS_PER_CELL / count)
+        cell_size = max(cell_size, max(width, height) / MAX_CELLS_PER_AXIS, 1e-9)
+        nx = int(width / cell_size) + 1
+        ny = int(height / cell_size) + 1
+
+        cell_ids = (np.floor((y - origin_y) / cell_size).astype(np.intp) * nx +
+                    np.floor((x - origin_x) / cell_size).astype(np.intp))
+        order = np.argsort(cell_ids, kind='stable')
+        cell_starts = np.searchsorted(cell_ids[order], np.arange(nx * ny + 1))
+        return origin_x, origin_y, cell_size, nx, ny, order, cell_starts
+
+
+def points_in_polygon(x: np.ndarray, y: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """
+    Even-odd point-in-polygon test for many points at once.
+
+    Args:
+        x, y: Point coordinates
+        polygon: (n, 2) array of vertices; the closing edge is implied
+
+    Returns:
+        Boolean mask of the points inside
+    """
+    inside = np.zeros(len(x), dtype=bool)
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        # Edge crosses the horizontal line through the point, to the point's right
+        straddles = (y1 > y) != (y2 > y)
+        if np.any(straddles):
+            crossing_x = x1 + (y[straddles] - y1) * (x2 - x1) / (y2 - y1)
+            inside[straddles] ^= x[straddles] < crossing_x
+        x1, y1 = x2, y2
+    return inside
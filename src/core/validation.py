@@ -5,9 +5,10 @@ Provides real-time validation of hole data including gaps, overlaps,
 and total depth consistency.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Any
+from dataclasses import dataclass, replace
 from enum import Enum
 
 from .config import LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN
@@ -129,13 +130,30 @@ class ValidationResult:
         return "\n".join(lines)
 
 
-def validate_hole(dataframe: pd.DataFrame, total_depth: Optional[float] = None) -> ValidationResult:
+DEPTH_TOLERANCE = 0.001  # Small tolerance for floating point
+
+# Default depth column names; tables in the CoalLog layout use from_depth / to_depth
+FROM_DEPTH_COLUMN = 'From_Depth'
+TO_DEPTH_COLUMN = 'To_Depth'
+
+# validate_hole's checks, in the order their issues are reported
+HOLE_CHECKS = ('depth', 'adjacent', 'total_depth', 'duplicate', 'thickness')
+
+
+def validate_hole(dataframe: pd.DataFrame, total_depth: Optional[float] = None,
+                  from_column: str = FROM_DEPTH_COLUMN, to_column: str = TO_DEPTH_COLUMN) -> ValidationResult:
     """
     Validate hole data for gaps, overlaps, and consistency.
+
+    Every check is computed as a mask over the depth columns (and adjacent
+    row differences for gaps/overlaps); issue objects are only built for the
+    rows that fail, in the same order a row-by-row pass would report them.
     
     Args:
         dataframe: DataFrame containing hole data with 'From_Depth' and 'To_Depth' columns
         total_depth: Optional total depth from header to validate against
+        from_column: Name of the From_Depth column
+        to_column: Name of the To_Depth column
         
     Returns:
         ValidationResult object containing all validation issues
@@ -147,7 +165,7 @@ def validate_hole(dataframe: pd.DataFrame, total_depth: Optional[float] = None)
         return result
     
     # Check required columns
-    required_columns = ['From_Depth', 'To_Depth']
+    required_columns = [from_column, to_column]
     for col in required_columns:
         if col not in dataframe.columns:
             result.add_error(f"Missing required column: {col}")
@@ -155,104 +173,251 @@ def validate_hole(dataframe: pd.DataFrame, total_depth: Optional[float] = None)
     if not result.is_valid:
         return result
     
-    # Sort by From_Depth to ensure proper validation
-    df = dataframe.sort_values('From_Depth').reset_index(drop=True)
+    for issues in _hole_checks(_HoleColumns(dataframe, from_column=from_column, to_column=to_column),
+                               total_depth).values():
+        for issue in issues:
+            result.add_issue(issue)
     
-    # Validate each row
-    for idx, row in df.iterrows():
-        from_depth = row['From_Depth']
-        to_depth = row['To_Depth']
-        
-        # Check for valid numeric values
-        if pd.isna(from_depth) or pd.isna(to_depth):
+    return result
+
+
+def validation_snapshot(dataframe: pd.DataFrame, from_column: str = FROM_DEPTH_COLUMN,
+                        to_column: str = TO_DEPTH_COLUMN) -> pd.DataFrame:
+    """
+    Copy of just the columns ``validate_hole`` reads, for validating off the UI thread.
+
+    The columns are cast to the table's common row type so the snapshot
+    reports the same issues (messages and values) as the full table; rows
+    with equal From_Depth stay in the same order because validate_hole sorts
+    stably, whether the depths are floats or objects.
+    """
+    columns = [col for col in (from_column, to_column, RECOVERED_THICKNESS_COLUMN)
+               if col in dataframe.columns]
+    if not columns:
+        return dataframe.copy()
+    return dataframe[columns].astype(dataframe.iloc[:0].to_numpy().dtype)
+
+
+class _HoleColumns:
+    """
+    The columns ``validate_hole`` checks, in From_Depth order.
+
+    Checks compare the float arrays; issues report values as a row of the
+    whole table would hold them (e.g. integer depths become floats next to
+    float columns). ``frame`` names the depth columns From_Depth / To_Depth
+    whatever the table calls them; issues name the table's own columns.
+    """
+
+    def __init__(self, dataframe: pd.DataFrame, sort: bool = True,
+                 from_column: str = FROM_DEPTH_COLUMN, to_column: str = TO_DEPTH_COLUMN):
+        self.row_dtype = dataframe.iloc[:0].to_numpy().dtype
+        self.from_column = from_column
+        self.to_column = to_column
+        columns = [from_column, to_column]
+        self.has_thickness = RECOVERED_THICKNESS_COLUMN in dataframe.columns
+        if self.has_thickness:
+            columns.append(RECOVERED_THICKNESS_COLUMN)
+        frame = dataframe[columns]
+        if from_column != 'From_Depth' or to_column != 'To_Depth':
+            frame = frame.set_axis(['From_Depth', 'To_Depth'] + columns[2:], axis=1)
+        # Sort by From_Depth to ensure proper validation. The sort is stable so rows with
+        # equal depths keep their order whatever the column dtype (see validation_snapshot)
+        self.frame = frame.sort_values('From_Depth', kind='stable').reset_index(drop=True) if sort else frame
+        self.from_depths = _float_column(self.frame['From_Depth'])
+        self.to_depths = _float_column(self.frame['To_Depth'])
+        self.thickness = _float_column(self.frame[RECOVERED_THICKNESS_COLUMN]) if self.has_thickness else None
+
+    def __len__(self):
+        return len(self.frame)
+
+    def values(self, column: str, rows: np.ndarray, python_scalars: bool = True) -> np.ndarray:
+        """Row-typed values of ``column`` at ``rows``."""
+        return _row_values(self.frame[column].iloc[rows], self.row_dtype, python_scalars)
+
+    def in_depth_order(self) -> bool:
+        """Whether the rows are already sorted by From_Depth (missing depths last)."""
+        missing = np.isnan(self.from_depths)
+        known = int(np.count_nonzero(~missing))
+        return (not missing[:known].any()
+                and bool(np.all(self.from_depths[1:known] >= self.from_depths[:known - 1])))
+
+
+def _float_column(column: pd.Series) -> np.ndarray:
+    return column.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _hole_checks(columns: _HoleColumns, total_depth: Optional[float]) -> Dict[str, List[ValidationIssue]]:
+    """Issues of every check over all rows, keyed by ``HOLE_CHECKS`` name."""
+    rows = np.arange(len(columns))
+    keys = _duplicate_keys(columns, rows)
+    duplicated = pd.DataFrame(dict(enumerate(keys))).duplicated().to_numpy()
+    return {
+        'depth': _check_depth_rows(columns, rows),
+        'adjacent': _check_adjacent_rows(columns, rows[:-1]),
+        'total_depth': _check_total_depth(columns, total_depth),
+        'duplicate': _duplicate_issues(columns, rows[duplicated]),
+        'thickness': _check_thickness(columns, rows),
+    }
+
+
+def _check_depth_rows(columns: _HoleColumns, rows: np.ndarray) -> List[ValidationIssue]:
+    """Missing depths, From_Depth >= To_Depth and negative depths."""
+    from_depths = columns.from_depths[rows]
+    to_depths = columns.to_depths[rows]
+    missing = np.isnan(from_depths) | np.isnan(to_depths)
+    with np.errstate(invalid='ignore'):
+        inverted = ~missing & (from_depths >= to_depths)
+        negative = ~missing & ((from_depths < 0) | (to_depths < 0))
+    failing = np.flatnonzero(missing | inverted | negative)
+    from_values = columns.values('From_Depth', rows[failing])
+    to_values = columns.values('To_Depth', rows[failing])
+    
+    result = ValidationResult()
+    for position, idx, from_depth, to_depth in zip(failing.tolist(), rows[failing].tolist(),
+                                                   from_values, to_values):
+        if missing[position]:
             result.add_error(f"Missing depth values", row_index=idx)
             continue
-        
-        # Check From_Depth < To_Depth
-        if from_depth >= to_depth:
+        if inverted[position]:
             result.add_error(
                 f"From_Depth ({from_depth}) must be less than To_Depth ({to_depth})",
                 row_index=idx,
-                column='From_Depth' if from_depth >= to_depth else 'To_Depth',
-                value=from_depth if from_depth >= to_depth else to_depth
+                column=columns.from_column,
+                value=from_depth
             )
-        
-        # Check for negative depths
-        if from_depth < 0 or to_depth < 0:
+        if negative[position]:
             result.add_error(
                 f"Negative depth value",
                 row_index=idx,
-                column='From_Depth' if from_depth < 0 else 'To_Depth',
+                column=columns.from_column if from_depth < 0 else columns.to_column,
                 value=from_depth if from_depth < 0 else to_depth
             )
+    return result.issues
+
+
+def _check_adjacent_rows(columns: _HoleColumns, rows: np.ndarray) -> List[ValidationIssue]:
+    """Gaps and overlaps between each row in ``rows`` and the row after it."""
+    step = columns.from_depths[rows + 1] - columns.to_depths[rows]
+    with np.errstate(invalid='ignore'):
+        failing = np.flatnonzero(np.abs(step) > DEPTH_TOLERANCE)
+    # Reported as ``df.iloc[i]`` holds the value
+    to_values = columns.values('To_Depth', rows[failing], python_scalars=False)
     
-    # Check for gaps and overlaps between rows
-    for i in range(len(df) - 1):
-        current_to = df.iloc[i]['To_Depth']
-        next_from = df.iloc[i + 1]['From_Depth']
-        
-        # Check for gap
-        if abs(current_to - next_from) > 0.001:  # Small tolerance for floating point
-            gap_size = next_from - current_to
-            if gap_size > 0:
-                result.add_error(
-                    f"Gap of {gap_size:.3f}m between rows {i} and {i+1}",
-                    row_index=i,
-                    column='To_Depth',
-                    value=current_to
-                )
-            else:  # Overlap
-                overlap_size = current_to - next_from
-                result.add_error(
-                    f"Overlap of {overlap_size:.3f}m between rows {i} and {i+1}",
-                    row_index=i,
-                    column='To_Depth',
-                    value=current_to
-                )
-    
-    # Check total depth consistency
-    if total_depth is not None and len(df) > 0:
-        last_to_depth = df.iloc[-1]['To_Depth']
-        if abs(last_to_depth - total_depth) > 0.001:  # Small tolerance
+    result = ValidationResult()
+    for position, i, current_to in zip(failing.tolist(), rows[failing].tolist(), to_values):
+        gap_size = step[position]
+        if gap_size > 0:
+            result.add_error(
+                f"Gap of {gap_size:.3f}m between rows {i} and {i+1}",
+                row_index=i,
+                column=columns.to_column,
+                value=current_to
+            )
+        else:  # Overlap
+            overlap_size = columns.to_depths[i] - columns.from_depths[i + 1]
+            result.add_error(
+                f"Overlap of {overlap_size:.3f}m between rows {i} and {i+1}",
+                row_index=i,
+                column=columns.to_column,
+                value=current_to
+            )
+    return result.issues
+
+
+def _check_total_depth(columns: _HoleColumns, total_depth: Optional[float]) -> List[ValidationIssue]:
+    """Last row's To_Depth against the header total depth."""
+    result = ValidationResult()
+    if total_depth is not None and len(columns) > 0:
+        last_to_depth = columns.values('To_Depth', [len(columns) - 1], python_scalars=False)[0]
+        if abs(last_to_depth - total_depth) > DEPTH_TOLERANCE:
             diff = total_depth - last_to_depth
             result.add_warning(
                 f"Last row To_Depth ({last_to_depth:.3f}) doesn't match header TD ({total_depth:.3f}), difference: {diff:.3f}m",
-                row_index=len(df) - 1,
-                column='To_Depth',
+                row_index=len(columns) - 1,
+                column=columns.to_column,
                 value=last_to_depth
             )
+    return result.issues
+
+
+def _duplicate_keys(columns: _HoleColumns, rows: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Depth range keys of ``rows``; rows share a key when their ranges format alike to 3 decimals."""
+    from_keys, from_negative_zero = _formatted_keys(columns.from_depths[rows])
+    to_keys, to_negative_zero = _formatted_keys(columns.to_depths[rows])
+    return from_keys, from_negative_zero, to_keys, to_negative_zero
+
+
+def _duplicate_issues(columns: _HoleColumns, rows: np.ndarray) -> List[ValidationIssue]:
+    """Warnings for ``rows``, already known to repeat an earlier depth range."""
+    from_values = columns.frame['From_Depth'].to_numpy()[rows]
+    to_values = columns.frame['To_Depth'].to_numpy()[rows]
+    result = ValidationResult()
+    for idx, from_depth, to_depth in zip(rows.tolist(), from_values, to_values):
+        range_str = f"{from_depth:.3f}-{to_depth:.3f}"
+        result.add_warning(
+            f"Duplicate depth range: {range_str}",
+            row_index=idx
+        )
+    return result.issues
+
+
+def _check_thickness(columns: _HoleColumns, rows: np.ndarray) -> List[ValidationIssue]:
+    """Stored recovered thickness against To_Depth - From_Depth."""
+    if not columns.has_thickness:
+        return []
+    calculated = columns.to_depths[rows] - columns.from_depths[rows]
+    with np.errstate(invalid='ignore'):
+        failing = rows[np.abs(calculated - columns.thickness[rows]) > DEPTH_TOLERANCE]
+    from_values = columns.values('From_Depth', failing)
+    to_values = columns.values('To_Depth', failing)
+    stored_values = columns.values(RECOVERED_THICKNESS_COLUMN, failing)
     
-    # Check for duplicate depth ranges
-    depth_ranges = list(zip(df['From_Depth'], df['To_Depth']))
-    seen_ranges = set()
-    for idx, (f, t) in enumerate(depth_ranges):
-        range_str = f"{f:.3f}-{t:.3f}"
-        if range_str in seen_ranges:
-            result.add_warning(
-                f"Duplicate depth range: {range_str}",
-                row_index=idx
-            )
-        seen_ranges.add(range_str)
-    
-    # Check thickness calculation if Thickness column exists
-    if RECOVERED_THICKNESS_COLUMN in df.columns:
-        for idx, row in df.iterrows():
-            calculated = row['To_Depth'] - row['From_Depth']
-            stored = row[RECOVERED_THICKNESS_COLUMN]
-            if pd.notna(stored) and abs(calculated - stored) > 0.001:
-                result.add_warning(
-                    f"Thickness mismatch: calculated {calculated:.3f}, stored {stored:.3f}",
-                    row_index=idx,
-                    column=RECOVERED_THICKNESS_COLUMN,
-                    value=stored
-                )
-    
-    return result
+    result = ValidationResult()
+    for idx, from_depth, to_depth, stored in zip(failing.tolist(), from_values, to_values, stored_values):
+        calculated_value = to_depth - from_depth
+        result.add_warning(
+            f"Thickness mismatch: calculated {calculated_value:.3f}, stored {stored:.3f}",
+            row_index=idx,
+            column=RECOVERED_THICKNESS_COLUMN,
+            value=stored
+        )
+    return result.issues
+
+
+def _row_values(column: pd.Series, row_dtype: np.dtype, python_scalars: bool = True) -> np.ndarray:
+    """
+    Column values with the scalar types a row of ``row_dtype`` would hold.
+
+    Rows of mixed-type tables hold Python scalars when iterated with
+    ``iterrows`` (``python_scalars``) but the column's NumPy scalars when
+    taken with ``iloc``.
+    """
+    if row_dtype == object:
+        return column.to_numpy(dtype=object) if python_scalars else column.to_numpy()
+    return column.to_numpy(dtype=row_dtype)
+
+
+def _formatted_keys(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integer thousandths matching ``f"{value:.3f}"``, plus a mask of the values
+    that format as "-0.000" (NaN keys stay NaN).
+
+    Rounding ``value * 1000`` agrees with the string formatting except for
+    values sitting on a half-thousandth, which are formatted individually.
+    """
+    scaled = values * 1000
+    keys = np.round(scaled) + 0.0  # + 0.0 folds -0.0 into 0.0
+    with np.errstate(invalid='ignore'):
+        ambiguous = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    for idx in np.flatnonzero(ambiguous).tolist():
+        keys[idx] = int(f"{values[idx]:.3f}".replace('.', ''))
+    return keys, np.signbit(values) & (keys == 0)
 
 
 def validate_dictionary_codes(dataframe: pd.DataFrame, 
                              dictionary_manager: Any,
-                             code_columns: Dict[str, str]) -> ValidationResult:
+                             code_columns: Dict[str, str],
+                             rows: Optional[Sequence[int]] = None) -> ValidationResult:
     """
     Validate that codes in the dataframe exist in the dictionaries.
     
@@ -260,6 +425,7 @@ def validate_dictionary_codes(dataframe: pd.DataFrame,
         dataframe: DataFrame containing code columns
         dictionary_manager: DictionaryManager instance
         code_columns: Dict mapping column names to dictionary categories
+        rows: Optional row positions to check (default: all rows)
         
     Returns:
         ValidationResult object containing validation issues
@@ -276,7 +442,8 @@ def validate_dictionary_codes(dataframe: pd.DataFrame,
         
         valid_codes = {code for code, _ in dictionary_manager.get_codes_for_category(category)}
         
-        for idx, value in dataframe[column].items():
+        values = dataframe[column] if rows is None else dataframe[column].iloc[rows]
+        for idx, value in values.items():
             if pd.isna(value):
                 continue
             
@@ -295,10 +462,26 @@ def validate_dictionary_codes(dataframe: pd.DataFrame,
 class RealTimeValidator:
     """
     Real-time validator that can be connected to table models.
+
+    After a full ``validate_dataframe`` of a table in depth order, the
+    validator keeps every issue per check and row. Table edits are reported
+    with ``mark_rows_changed``, ``mark_rows_inserted`` and
+    ``mark_rows_removed``; ``revalidate`` then re-checks only those rows
+    (and the gaps/overlaps with their neighbours), keeps the issues of
+    untouched rows, and returns the same result a full validation would.
+
+    ``from_column`` / ``to_column`` name the table's depth columns, e.g.
+    from_depth / to_depth for tables in the CoalLog v3.1 layout.
     """
     
-    def __init__(self, dictionary_manager: Optional[Any] = None):
+    # Above this many depth ranges to regroup, duplicates are recomputed in one pass
+    MAX_DUPLICATE_GROUPS = 64
+    
+    def __init__(self, dictionary_manager: Optional[Any] = None,
+                 from_column: str = FROM_DEPTH_COLUMN, to_column: str = TO_DEPTH_COLUMN):
         self.dictionary_manager = dictionary_manager
+        self.from_column = from_column
+        self.to_column = to_column
         self.code_columns = {
             LITHOLOGY_COLUMN: 'Litho_Type',
             'lithology_qualifier': 'Litho_Qual',
@@ -310,6 +493,19 @@ class RealTimeValidator:
             'inter_relationship': 'Litho_Interrel',
             'bed_spacing': 'Bed_Spacing'
         }
+        self.invalidate()
+    
+    def invalidate(self):
+        """Forget tracked issues; the next ``revalidate`` validates everything."""
+        self._tracking = False
+        self._issues: Dict[Any, Dict[int, List[ValidationIssue]]] = {}  # check -> row -> issues
+        self._keys: Tuple[np.ndarray, ...] = ()  # duplicate-range key columns, per row
+        self._row_count = 0
+        self._row_dtype = None
+        self._checked_code_columns: Dict[str, str] = {}
+        self._changed_rows = set()
+        self._adjacent_rows = set()  # first rows of gap/overlap pairs to re-check
+        self._stale_keys = set()  # duplicate ranges that may have lost a row
     
     def validate_dataframe(self, dataframe: pd.DataFrame, 
                           total_depth: Optional[float] = None) -> ValidationResult:
@@ -323,7 +519,14 @@ class RealTimeValidator:
         Returns:
             Combined validation result
         """
-        result = validate_hole(dataframe, total_depth)
+        self.invalidate()
+        if self._can_track(dataframe):
+            columns = self._hole_columns(dataframe)
+            if columns.in_depth_order():
+                self._track(dataframe, columns, total_depth)
+                return self._result()
+        
+        result = validate_hole(dataframe, total_depth, self.from_column, self.to_column)
         
         # Add dictionary validation if manager is available
         if self.dictionary_manager and self.dictionary_manager.is_loaded:
@@ -335,6 +538,93 @@ class RealTimeValidator:
         
         return result
     
+    def revalidate(self, dataframe: pd.DataFrame,
+                   total_depth: Optional[float] = None) -> ValidationResult:
+        """
+        Validate dataframe, re-checking only the rows marked since the last validation.
+        
+        Falls back to ``validate_dataframe`` when nothing is tracked yet, the
+        marks don't add up to the table's row count, or the table is not in
+        depth order.
+        
+        Args:
+            dataframe: DataFrame to validate (after the marked edits)
+            total_depth: Optional total depth from header
+            
+        Returns:
+            Combined validation result
+        """
+        if not self.can_revalidate(dataframe):
+            return self.validate_dataframe(dataframe, total_depth)
+        columns = self._hole_columns(dataframe)
+        if columns.row_dtype != self._row_dtype or not columns.in_depth_order():
+            return self.validate_dataframe(dataframe, total_depth)
+        
+        changed = np.array(sorted(self._changed_rows), dtype=np.intp)
+        pairs = self._adjacent_rows.union((changed - 1).tolist(), changed.tolist())
+        pairs = np.array(sorted(row for row in pairs if row >= 0), dtype=np.intp)
+        
+        self._replace('depth', changed, _check_depth_rows(columns, changed))
+        self._replace('adjacent', pairs, _check_adjacent_rows(columns, pairs[pairs < len(columns) - 1]))
+        self._issues['total_depth'] = _group_by_row(_check_total_depth(columns, total_depth))
+        self._update_duplicates(columns, changed)
+        self._replace('thickness', changed, _check_thickness(columns, changed))
+        for column, category in self._checked_code_columns.items():
+            code_result = validate_dictionary_codes(dataframe, self.dictionary_manager,
+                                                    {column: category}, rows=changed)
+            self._replace(('code', column), changed, code_result.issues)
+        
+        self._changed_rows.clear()
+        self._adjacent_rows.clear()
+        self._stale_keys.clear()
+        return self._result()
+    
+    def can_revalidate(self, dataframe: pd.DataFrame) -> bool:
+        """
+        Whether ``revalidate`` can re-check just the marked rows of ``dataframe``.
+
+        False when it would fall back to a full validation (apart from the
+        depth order check, which needs the depth columns converted).
+        """
+        return (self._tracking and len(dataframe) == self._row_count
+                and self._can_track(dataframe)
+                and self._code_columns_for(dataframe) == self._checked_code_columns)
+    
+    def mark_rows_changed(self, rows):
+        """Record edits to existing rows (e.g. from ``PandasModel.setData``)."""
+        if not self._tracking:
+            return
+        for row in rows:
+            if 0 <= row < self._row_count and row not in self._changed_rows:
+                self._changed_rows.add(row)
+                self._stale_keys.add(self._key_at(row))
+    
+    def mark_rows_inserted(self, row: int, count: int = 1):
+        """Record ``count`` new rows inserted before ``row`` (e.g. from ``PandasModel.insert_row``)."""
+        if not self._tracking:
+            return
+        self._shift_rows(row, count)
+        self._keys = tuple(np.insert(keys, row, np.zeros(count, dtype=keys.dtype)) for keys in self._keys)
+        self._row_count += count
+        self._changed_rows.update(range(row, row + count))
+    
+    def mark_rows_removed(self, row: int, count: int = 1):
+        """Record ``count`` rows removed from ``row`` on (e.g. from ``PandasModel.remove_row``)."""
+        if not self._tracking:
+            return
+        removed = range(row, row + count)
+        self._stale_keys.update(self._key_at(r) for r in removed)
+        for by_row in self._issues.values():
+            for r in removed:
+                by_row.pop(r, None)
+        self._changed_rows.difference_update(removed)
+        self._adjacent_rows.difference_update(removed)
+        self._shift_rows(row + count, -count)
+        self._keys = tuple(np.delete(keys, removed) for keys in self._keys)
+        self._row_count -= count
+        # The row before the removed ones now borders a different row
+        self._adjacent_rows.add(row - 1)
+    
     def get_validation_summary(self, result: ValidationResult) -> str:
         """
         Get a summary string for display in status bar.
@@ -357,4 +647,95 @@ class RealTimeValidator:
         if warnings:
             summary_parts.append(f"{len(warnings)} warning(s)")
         
-        return "⚠ " + ", ".join(summary_parts)
\ No newline at end of file
+        return "⚠ " + ", ".join(summary_parts)
+    
+    def _can_track(self, dataframe: pd.DataFrame) -> bool:
+        # Code issues report index labels, which must be row positions
+        return (not dataframe.empty
+                and self.from_column in dataframe.columns and self.to_column in dataframe.columns
+                and dataframe.index.equals(pd.RangeIndex(len(dataframe))))
+    
+    def _hole_columns(self, dataframe: pd.DataFrame) -> _HoleColumns:
+        return _HoleColumns(dataframe, sort=False, from_column=self.from_column, to_column=self.to_column)
+    
+    def _code_columns_for(self, dataframe: pd.DataFrame) -> Dict[str, str]:
+        if not (self.dictionary_manager and self.dictionary_manager.is_loaded):
+            return {}
+        return {column: category for column, category in self.code_columns.items()
+                if column in dataframe.columns}
+    
+    def _track(self, dataframe: pd.DataFrame, columns: _HoleColumns, total_depth: Optional[float]):
+        for check, issues in _hole_checks(columns, total_depth).items():
+            self._issues[check] = _group_by_row(issues)
+        self._checked_code_columns = self._code_columns_for(dataframe)
+        for column, category in self._checked_code_columns.items():
+            code_result = validate_dictionary_codes(dataframe, self.dictionary_manager, {column: category})
+            self._issues[('code', column)] = _group_by_row(code_result.issues)
+        self._keys = _duplicate_keys(columns, np.arange(len(columns)))
+        self._row_count = len(columns)
+        self._row_dtype = columns.row_dtype
+        self._tracking = True
+    
+    def _result(self) -> ValidationResult:
+        """Tracked issues in full-validation order: by check, then by row."""
+        result = ValidationResult()
+        for by_row in self._issues.values():
+            for row in sorted(by_row):
+                for issue in by_row[row]:
+                    result.add_issue(issue)
+        return result
+    
+    def _replace(self, check, rows: np.ndarray, issues: List[ValidationIssue]):
+        by_row = self._issues[check]
+        for row in rows.tolist():
+            by_row.pop(row, None)
+        for row, row_issues in _group_by_row(issues).items():
+            by_row[row] = row_issues
+    
+    def _shift_rows(self, start: int, delta: int):
+        """Renumber tracked rows from ``start`` on by ``delta``."""
+        self._changed_rows = {row + delta if row >= start else row for row in self._changed_rows}
+        self._adjacent_rows = {row + delta if row >= start else row for row in self._adjacent_rows}
+        for check, by_row in self._issues.items():
+            moved = {row: by_row.pop(row) for row in [row for row in by_row if row >= start]}
+            if check == 'adjacent':
+                # Messages name both rows; re-check the pairs under their new numbers
+                self._adjacent_rows.update(row + delta for row in moved)
+                continue
+            for row, issues in moved.items():
+                by_row[row + delta] = [replace(issue, row_index=row + delta) for issue in issues]
+    
+    def _key_at(self, row: int) -> tuple:
+        # NaN keys become None so equal keys hash alike
+        return tuple(None if value != value else value for value in (keys[row].item() for keys in self._keys))
+    
+    def _update_duplicates(self, columns: _HoleColumns, changed: np.ndarray):
+        """Re-group the depth ranges the changed rows left or joined."""
+        new_keys = _duplicate_keys(columns, changed)
+        for keys, values in zip(self._keys, new_keys):
+            keys[changed] = values
+        groups = self._stale_keys.union(self._key_at(row) for row in changed.tolist())
+        
+        if len(groups) > self.MAX_DUPLICATE_GROUPS:
+            duplicated = pd.DataFrame(dict(enumerate(self._keys))).duplicated().to_numpy()
+            self._issues['duplicate'] = _group_by_row(_duplicate_issues(columns, np.flatnonzero(duplicated)))
+            return
+        
+        by_row = self._issues['duplicate']
+        for key in groups:
+            matches = np.ones(self._row_count, dtype=bool)
+            for keys, value in zip(self._keys, key):
+                matches &= np.isnan(keys) if value is None else keys == value
+            members = np.flatnonzero(matches)
+            for row in members.tolist():
+                by_row.pop(row, None)
+            # The first row with a range is the original, later ones are duplicates
+            for row, issues in _group_by_row(_duplicate_issues(columns, members[1:])).items():
+                by_row[row] = issues
+
+
+def _group_by_row(issues: List[ValidationIssue]) -> Dict[int, List[ValidationIssue]]:
+    by_row: Dict[int, List[ValidationIssue]] = {}
+    for issue in issues:
+        by_row.setdefault(issue.row_index, []).append(issue)
+    return by_row
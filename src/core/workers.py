@@ -6,9 +6,10 @@ from typing import Optional, Dict, Any, List, Tuple
 import pandas as pd
 import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal, QObject
-import lasio
 
-from .validation import validate_hole, ValidationResult
+from .validation import validate_hole, validation_snapshot, ValidationResult, RealTimeValidator
+from .analyzer import Analyzer
+from .las_cache import read_las, read_las_header
 
 
 class LASLoaderWorker(QObject):
@@ -30,7 +31,7 @@ class LASLoaderWorker(QObject):
             self.progress.emit(0, f"Opening LAS file: {self.file_path}")
             
             # Read LAS file
-            las = lasio.read(self.file_path)
+            las = read_las(self.file_path)
             self.progress.emit(30, "Parsing LAS data...")
             
             # Convert to DataFrame
@@ -112,9 +113,23 @@ class ValidationWorker(QObject):
     finished = pyqtSignal(ValidationResult)  # validation result
     error = pyqtSignal(str)  # error message
     
-    def __init__(self, dataframe: pd.DataFrame, total_depth: Optional[float] = None):
+    def __init__(self, dataframe: pd.DataFrame, total_depth: Optional[float] = None,
+                 validator: Optional[RealTimeValidator] = None):
+        """
+        Args:
+            dataframe: Table to validate
+            total_depth: Optional total depth from header
+            validator: Optional RealTimeValidator to run instead of ``validate_hole``;
+                it tracks the issues of the snapshot for later incremental re-checks
+        """
         super().__init__()
-        self.dataframe = dataframe.copy()
+        self.validator = validator
+        # The table may be edited meanwhile: copy just the depth columns, or the whole
+        # table when the validator also checks dictionary codes
+        if validator is None:
+            self.dataframe = validation_snapshot(dataframe)
+        else:
+            self.dataframe = dataframe.copy()
         self.total_depth = total_depth
     
     def run(self):
@@ -123,7 +138,10 @@ class ValidationWorker(QObject):
             self.progress.emit(0, "Starting validation...")
             
             # Validate the dataframe
-            result = validate_hole(self.dataframe, self.total_depth)
+            if self.validator is None:
+                result = validate_hole(self.dataframe, self.total_depth)
+            else:
+                result = self.validator.validate_dataframe(self.dataframe, self.total_depth)
             
             self.progress.emit(100, "Validation completed")
             self.finished.emit(result)
@@ -171,10 +189,8 @@ class MapDataWorker(QObject):
                 
                 try:
                     if file_path.lower().endswith('.las'):
-                        # Load LAS file
-                        las = lasio.read(file_path)
-                        df = las.df()
-                        df.reset_index(inplace=True)
+                        # Only the header is needed for coordinates
+                        las = read_las_header(file_path)
                         
                         # Extract coordinates
                         coords = {}
@@ -247,6 +263,37 @@ class MapDataWorker(QObject):
             self.error.emit(error_msg)
 
 
+class TemplateExportWorker(QObject):
+    """
+    Worker for writing analysis results to the Excel template in background.
+    """
+    # Signals for communication with main thread
+    progress = pyqtSignal(str)  # status message
+    finished = pyqtSignal(str)  # output path
+    error = pyqtSignal(str)  # error message
+
+    def __init__(self, units: pd.DataFrame, classified_data: pd.DataFrame, template_path: str, output_path: str):
+        super().__init__()
+        self.units = units
+        self.classified_data = classified_data
+        self.template_path = template_path
+        self.output_path = output_path
+
+    def run(self):
+        """Save the units to the template in background thread."""
+        try:
+            success = Analyzer().save_to_template(self.classified_data, self.template_path, self.output_path,
+                                                  callback=self.progress.emit, units=self.units)
+            if not success:
+                self.error.emit(f"Failed to save results to Excel template: {self.output_path}")
+                return
+            self.finished.emit(self.output_path)
+
+        except Exception as e:
+            error_msg = f"Error exporting to template: {str(e)}\n{traceback.format_exc()}"
+            self.error.emit(error_msg)
+
+
 class ValidationCache:
     """
     Simple cache for validation results to avoid recomputation.
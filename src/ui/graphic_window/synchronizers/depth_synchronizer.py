@@ -2,9 +2,115 @@
 DepthSynchronizer - Handles cursor depth synchronization across components.
 """
 
+import numpy as np
 from PyQt6.QtCore import QObject, pyqtSignal
 from typing import Optional, List, Tuple
-from src.core.graphic_models import HoleDataProvider, LithologyInterval, LASPoint
+from src.core.graphic_models import HoleDataProvider, ColumnarHoleDataProvider, LithologyInterval, LASPoint
+
+# Depths closer than this are treated as the same data point
+DEPTH_MATCH_TOLERANCE = 0.001
+
+
+class DepthIndex:
+    """
+    Sorted depth arrays for one snapshot of a hole's data.
+
+    Lithology intervals are kept in depth order with their tops and bottoms as
+    parallel arrays; LAS sample depths are sorted, with a lookup back to the
+    provider's points. All lookups are ``searchsorted`` queries.
+    """
+
+    @classmethod
+    def for_provider(cls, data_provider: HoleDataProvider) -> 'DepthIndex':
+        """Index a provider's data, using its arrays directly when it is columnar."""
+        intervals = data_provider.get_lithology_intervals()
+        if isinstance(data_provider, ColumnarHoleDataProvider):
+            return cls(intervals, las_depths=data_provider.depths, las_point_getter=data_provider.get_las_point)
+        return cls(intervals, las_points=data_provider.get_las_points())
+
+    def __init__(self, intervals: List[LithologyInterval], las_points: Optional[List[LASPoint]] = None,
+                 las_depths: Optional[np.ndarray] = None, las_point_getter=None):
+        """
+        Args:
+            intervals: Lithology intervals
+            las_points: LAS points, in any order
+            las_depths: Sorted LAS depths, instead of ``las_points``
+            las_point_getter: Returns the ``LASPoint`` for a position in ``las_depths``
+        """
+        tops = np.array([float(interval.from_depth) for interval in intervals], dtype=np.float64)
+        interval_order = np.argsort(tops, kind='stable')
+        self.intervals = [intervals[i] for i in interval_order]
+        self.tops = tops[interval_order]
+        self.bottoms = np.array([float(interval.to_depth) for interval in self.intervals], dtype=np.float64)
+        # Non-overlapping intervals have sorted bottoms too; otherwise fall back to scanning
+        self.bottoms_sorted = bool(np.all(np.diff(self.bottoms) >= 0))
+
+        if las_depths is not None:
+            self.las_depths = las_depths
+            self._las_point_getter = las_point_getter
+        else:
+            las_points = las_points or []
+            depths = np.array([float(point.depth) for point in las_points], dtype=np.float64)
+            las_order = np.argsort(depths, kind='stable')
+            self.las_depths = depths[las_order]
+            self._las_point_getter = lambda position: las_points[las_order[position]]
+
+        self.boundaries = np.unique(np.concatenate((self.tops, self.bottoms)))
+        self.all_depths = np.unique(np.concatenate((self.boundaries, self.las_depths)))
+
+    @staticmethod
+    def nearest(sorted_depths: np.ndarray, depth: float) -> Optional[float]:
+        """Closest value in a sorted array (the shallower one on a tie)."""
+        if len(sorted_depths) == 0:
+            return None
+        position = int(np.searchsorted(sorted_depths, depth))
+        below = sorted_depths[position - 1] if position > 0 else None
+        above = sorted_depths[position] if position < len(sorted_depths) else None
+        if below is None:
+            return float(above)
+        if above is None or depth - below <= above - depth:
+            return float(below)
+        return float(above)
+
+    @staticmethod
+    def first_match(sorted_depths: np.ndarray, depth: float) -> int:
+        """Position of the first value within the match tolerance of ``depth``, or -1."""
+        position = int(np.searchsorted(sorted_depths, depth - DEPTH_MATCH_TOLERANCE, side='right'))
+        if position < len(sorted_depths) and sorted_depths[position] < depth + DEPTH_MATCH_TOLERANCE:
+            return position
+        return -1
+
+    def interval_containing(self, depth: float) -> Optional[LithologyInterval]:
+        """First interval (in depth order) whose range includes ``depth``."""
+        if not self.bottoms_sorted:
+            return next((interval for interval in self.intervals if interval.contains_depth(depth)), None)
+        position = int(np.searchsorted(self.bottoms, depth, side='left'))
+        if position < len(self.intervals) and self.tops[position] <= depth:
+            return self.intervals[position]
+        return None
+
+    def boundary_at(self, depth: float) -> Optional[str]:
+        """Snap type of the first interval (in depth order) with a top or bottom at ``depth``."""
+        if not self.bottoms_sorted:
+            for interval in self.intervals:
+                if abs(interval.from_depth - depth) < DEPTH_MATCH_TOLERANCE:
+                    return f"lithology_top:{interval.code}"
+                if abs(interval.to_depth - depth) < DEPTH_MATCH_TOLERANCE:
+                    return f"lithology_bottom:{interval.code}"
+            return None
+
+        top = self.first_match(self.tops, depth)
+        bottom = self.first_match(self.bottoms, depth)
+        if top < 0 and bottom < 0:
+            return None
+        if bottom < 0 or (top >= 0 and top <= bottom):
+            return f"lithology_top:{self.intervals[top].code}"
+        return f"lithology_bottom:{self.intervals[bottom].code}"
+
+    def las_point_at(self, depth: float) -> Optional[LASPoint]:
+        """LAS point at ``depth`` within the match tolerance."""
+        position = self.first_match(self.las_depths, depth)
+        return self._las_point_getter(position) if position >= 0 else None
 
 
 class DepthSynchronizer(QObject):
@@ -40,6 +146,23 @@ class DepthSynchronizer(QObject):
         
         # Cursor visibility
         self.keep_cursor_visible = True
+
+        # Sorted lookup index over the provider's data, built on first use. Providers
+        # are read-only snapshots of a hole, so new data always comes with a new
+        # provider and the index is rebuilt when data_provider is replaced.
+        self._index: Optional[DepthIndex] = None
+        self._index_provider: Optional[HoleDataProvider] = None
+        self._marker_depths = np.empty(0)
+
+    def _get_index(self) -> DepthIndex:
+        """Depth index for the current provider, building it if needed."""
+        if self._index is None or self._index_provider is not self.data_provider:
+            self._index = DepthIndex.for_provider(self.data_provider)
+            self._index_provider = self.data_provider
+        return self._index
+
+    def _update_marker_depths(self):
+        self._marker_depths = np.sort(np.array([float(d) for d, _ in self.depth_markers], dtype=np.float64))
     
     def set_cursor_depth(self, depth: float, snap: bool = True):
         """
@@ -81,55 +204,41 @@ class DepthSynchronizer(QObject):
         Returns:
             Snapped depth
         """
-        candidates = []
-        
-        # Snap to lithology interval boundaries
+        index = self._get_index()
+        sources = []
         if self.snap_to_lithology:
-            intervals = self.data_provider.get_lithology_intervals()
-            for interval in intervals:
-                candidates.append(float(interval.from_depth))
-                candidates.append(float(interval.to_depth))
-        
-        # Snap to LAS data points
+            sources.append(index.boundaries)
         if self.snap_to_las:
-            las_points = self.data_provider.get_las_points()
-            for point in las_points:
-                candidates.append(float(point.depth))
-        
-        # Add depth markers
-        for marker_depth, _ in self.depth_markers:
-            candidates.append(float(marker_depth))
-        
-        if not candidates:
-            return depth
-        
+            sources.append(index.las_depths)
+        sources.append(self._marker_depths)
+
         # Find closest candidate within tolerance
         closest = None
         min_distance = float('inf')
-        
-        for candidate in candidates:
+
+        for sorted_depths in sources:
+            candidate = DepthIndex.nearest(sorted_depths, depth)
+            if candidate is None:
+                continue
             distance = abs(candidate - depth)
             if distance < min_distance and distance <= self.snap_tolerance:
                 min_distance = distance
                 closest = candidate
-        
+
         return closest if closest is not None else depth
     
     def _get_snap_type(self, snapped_depth: float, original_depth: float) -> str:
         """Determine what type of snap occurred."""
+        index = self._get_index()
+
         # Check lithology intervals
-        intervals = self.data_provider.get_lithology_intervals()
-        for interval in intervals:
-            if abs(interval.from_depth - snapped_depth) < 0.001:
-                return f"lithology_top:{interval.code}"
-            if abs(interval.to_depth - snapped_depth) < 0.001:
-                return f"lithology_bottom:{interval.code}"
-        
+        boundary = index.boundary_at(snapped_depth)
+        if boundary is not None:
+            return boundary
+
         # Check LAS points
-        las_points = self.data_provider.get_las_points()
-        for point in las_points:
-            if abs(point.depth - snapped_depth) < 0.001:
-                return "las_point"
+        if index.las_point_at(snapped_depth) is not None:
+            return "las_point"
         
         # Check depth markers
         for marker_depth, label in self.depth_markers:
@@ -155,6 +264,7 @@ class DepthSynchronizer(QObject):
             label: Optional label
         """
         self.depth_markers.append((depth, label))
+        self._update_marker_depths()
         self.depthMarkerAdded.emit(depth, label)
     
     def remove_depth_marker(self, depth: float):
@@ -165,10 +275,12 @@ class DepthSynchronizer(QObject):
             depth: Marker depth to remove
         """
         self.depth_markers = [(d, l) for d, l in self.depth_markers if abs(d - depth) > 0.001]
+        self._update_marker_depths()
     
     def clear_depth_markers(self):
         """Clear all depth markers."""
         self.depth_markers.clear()
+        self._update_marker_depths()
     
     def get_depth_markers(self) -> List[Tuple[float, str]]:
         """Get all depth markers."""
@@ -191,27 +303,25 @@ class DepthSynchronizer(QObject):
             'markers': []
         }
         
+        index = self._get_index()
+
         # Find lithology interval
-        intervals = self.data_provider.get_lithology_intervals()
-        for interval in intervals:
-            if interval.contains_depth(depth):
-                result['lithology'] = {
-                    'code': interval.code,
-                    'description': interval.description,
-                    'from_depth': interval.from_depth,
-                    'to_depth': interval.to_depth,
-                    'thickness': interval.thickness,
-                    'sample_number': interval.sample_number,
-                    'comment': interval.comment
-                }
-                break
+        interval = index.interval_containing(depth)
+        if interval is not None:
+            result['lithology'] = {
+                'code': interval.code,
+                'description': interval.description,
+                'from_depth': interval.from_depth,
+                'to_depth': interval.to_depth,
+                'thickness': interval.thickness,
+                'sample_number': interval.sample_number,
+                'comment': interval.comment
+            }
         
         # Get LAS values
-        las_points = self.data_provider.get_las_points()
-        for point in las_points:
-            if abs(point.depth - depth) < 0.001:
-                result['las_values'] = point.curves.copy()
-                break
+        point = index.las_point_at(depth)
+        if point is not None:
+            result['las_values'] = point.curves.copy()
         
         # Get markers at this depth
         for marker_depth, label in self.depth_markers:
@@ -231,36 +341,24 @@ class DepthSynchronizer(QObject):
         Returns:
             Depth of next data point, or None
         """
-        all_points = []
-        
-        # Collect all data points
-        intervals = self.data_provider.get_lithology_intervals()
-        for interval in intervals:
-            all_points.append(interval.from_depth)
-            all_points.append(interval.to_depth)
-        
-        las_points = self.data_provider.get_las_points()
-        for point in las_points:
-            all_points.append(point.depth)
-        
-        for marker_depth, _ in self.depth_markers:
-            all_points.append(marker_depth)
-        
-        # Remove duplicates and sort
-        all_points = sorted(set(all_points))
-        
-        if direction == "down":
-            # Find next deeper point
-            for point in all_points:
-                if point > depth + 0.001:  # Small epsilon
-                    return point
-        else:  # "up"
-            # Find next shallower point
-            for point in reversed(all_points):
-                if point < depth - 0.001:  # Small epsilon
-                    return point
-        
-        return None
+        index = self._get_index()
+        candidates = []
+
+        for sorted_depths in (index.all_depths, self._marker_depths):
+            if direction == "down":
+                # Find next deeper point
+                position = int(np.searchsorted(sorted_depths, depth + 0.001, side='right'))  # Small epsilon
+                if position < len(sorted_depths):
+                    candidates.append(float(sorted_depths[position]))
+            else:  # "up"
+                # Find next shallower point
+                position = int(np.searchsorted(sorted_depths, depth - 0.001, side='left')) - 1  # Small epsilon
+                if position >= 0:
+                    candidates.append(float(sorted_depths[position]))
+
+        if not candidates:
+            return None
+        return min(candidates) if direction == "down" else max(candidates)
     
     def toggle_snap(self):
         """Toggle snap on/off."""
@@ -20,9 +20,11 @@ import webbrowser
 
 from ..core.data_processor import DataProcessor
 from ..core.analyzer import Analyzer
-from ..core.workers import LASLoaderWorker, ValidationWorker
-from ..core.config import DEFAULT_LITHOLOGY_RULES, DEPTH_COLUMN, DEFAULT_SEPARATOR_THICKNESS, DRAW_SEPARATOR_LINES, DEFAULT_CURVE_THICKNESS, CURVE_RANGES, INVALID_DATA_VALUE, DEFAULT_MERGE_THIN_UNITS, DEFAULT_MERGE_THRESHOLD, DEFAULT_SMART_INTERBEDDING, DEFAULT_SMART_INTERBEDDING_MAX_SEQUENCE_LENGTH, DEFAULT_SMART_INTERBEDDING_THICK_UNIT_THRESHOLD, DEFAULT_FALLBACK_CLASSIFICATION, DEFAULT_BIT_SIZE_MM, DEFAULT_SHOW_ANOMALY_HIGHLIGHTS, DEFAULT_CASING_DEPTH_ENABLED, DEFAULT_CASING_DEPTH_M, LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN, RECORD_SEQUENCE_FLAG_COLUMN, INTERRELATIONSHIP_COLUMN, LITHOLOGY_PERCENT_COLUMN, COALLOG_V31_COLUMNS
-from ..core.coallog_utils import load_coallog_dictionaries
+from ..core.batch_pipeline import AnalysisSettings, analyze_hole
+from ..core.workers import LASLoaderWorker, ValidationWorker, TemplateExportWorker
+from ..core.config import DEFAULT_LITHOLOGY_RULES, DEPTH_COLUMN, DEFAULT_SEPARATOR_THICKNESS, DRAW_SEPARATOR_LINES, DEFAULT_CURVE_THICKNESS, CURVE_RANGES, INVALID_DATA_VALUE, DEFAULT_MERGE_THIN_UNITS, DEFAULT_MERGE_THRESHOLD, DEFAULT_SMART_INTERBEDDING, DEFAULT_SMART_INTERBEDDING_MAX_SEQUENCE_LENGTH, DEFAULT_SMART_INTERBEDDING_THICK_UNIT_THRESHOLD, DEFAULT_FALLBACK_CLASSIFICATION, DEFAULT_BIT_SIZE_MM, DEFAULT_SHOW_ANOMALY_HIGHLIGHTS, DEFAULT_CASING_DEPTH_ENABLED, DEFAULT_CASING_DEPTH_M, LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN, RECORD_SEQUENCE_FLAG_COLUMN, INTERRELATIONSHIP_COLUMN, LITHOLOGY_PERCENT_COLUMN, COALLOG_V31_COLUMNS, ANALYSIS_COLUMNS
+from ..core.coallog_utils import load_coallog_dictionaries_cached
+from ..core.collar_scanner import CollarIndex
 from .widgets.stratigraphic_column import StratigraphicColumn
 from .widgets.enhanced_stratigraphic_column import EnhancedStratigraphicColumn
 from .widgets.svg_renderer import SvgRenderer
@@ -1721,47 +1723,24 @@ class Worker(QObject):
     def run(self):
         try:
             print(f"DEBUG (Worker): run() started with file={self.file_path}")
-            print(f"DEBUG (Worker): lithology_rules count={len(self.lithology_rules)}")
-            data_processor = DataProcessor()
-            analyzer = Analyzer()
-            dataframe, _, units = data_processor.load_las_file(self.file_path)
-
-            # Ensure all required curve mnemonics are in the map for preprocessing
-            # Add default mappings if not already present in mnemonic_map
-            full_mnemonic_map = self.mnemonic_map.copy()
-            if 'short_space_density' not in full_mnemonic_map:
-                full_mnemonic_map['short_space_density'] = 'DENS' # Common mnemonic for short space density
-            if 'long_space_density' not in full_mnemonic_map:
-                full_mnemonic_map['long_space_density'] = 'LSD' # Common mnemonic for long space density
-
-            processed_dataframe = data_processor.preprocess_data(dataframe, full_mnemonic_map, units)
-            # Use appropriate classification method based on settings
-            if self.analysis_method == "simple":
-                classified_dataframe = analyzer.classify_rows_simple(processed_dataframe, self.lithology_rules, full_mnemonic_map, self.casing_depth_enabled, self.casing_depth_m)
-            else:
-                print(f"DEBUG (Worker): Calling classify_rows with use_researched_defaults={self.use_researched_defaults}")
-                classified_dataframe = analyzer.classify_rows(processed_dataframe, self.lithology_rules, full_mnemonic_map, self.use_researched_defaults, self.use_fallback_classification, self.casing_depth_enabled, self.casing_depth_m)
-            # Debug: print lithology rules being passed
-            print(f"DEBUG (Worker): lithology_rules count = {len(self.lithology_rules)}")
-            for idx, rule in enumerate(self.lithology_rules):
-                print(f"  [{idx}] code={rule.get('code', 'N/A')}, name={rule.get('name', 'N/A')}, background_color={rule.get('background_color', 'MISSING')}, svg_path={rule.get('svg_path', 'MISSING')}")
-            units_dataframe = analyzer.group_into_units(classified_dataframe, self.lithology_rules, self.smart_interbedding, self.smart_interbedding_max_sequence_length, self.smart_interbedding_thick_unit_threshold)
-            print(f"DEBUG (Worker): units_dataframe columns: {list(units_dataframe.columns)}")
-            print(f"DEBUG (Worker): background_color in columns? {'background_color' in units_dataframe.columns}")
-            print(f"DEBUG (Worker): svg_path in columns? {'svg_path' in units_dataframe.columns}")
-            if not units_dataframe.empty:
-                print(f"DEBUG (Worker): First unit background_color: {units_dataframe.iloc[0].get('background_color', 'MISSING')}")
-                print(f"DEBUG (Worker): First unit svg_path: {units_dataframe.iloc[0].get('svg_path', 'MISSING')}")
-            if self.merge_thin_units:
-                units_dataframe = analyzer.merge_thin_units(units_dataframe, self.merge_threshold)
-            template_path = os.path.join(os.getcwd(), 'src', 'assets', 'TEMPLATE.xlsx')
-            output_path = os.path.join(os.path.dirname(self.file_path), "output_lithology.xlsx")
-            def log_progress(message):
-                pass  # Log progress
-#                 print(f"Worker Log: {message}")
-            success = analyzer.save_to_template(classified_dataframe, template_path, output_path, callback=log_progress, units=units_dataframe)
-            if not success:
-                raise Exception("Failed to save results to Excel template.")
+            # Same chain as the headless batch pipeline, so both produce the same units
+            settings = AnalysisSettings(
+                mnemonic_map=self.mnemonic_map,
+                lithology_rules=self.lithology_rules,
+                use_researched_defaults=self.use_researched_defaults,
+                merge_thin_units=self.merge_thin_units,
+                merge_threshold=self.merge_threshold,
+                smart_interbedding=self.smart_interbedding,
+                smart_interbedding_max_sequence_length=self.smart_interbedding_max_sequence_length,
+                smart_interbedding_thick_unit_threshold=self.smart_interbedding_thick_unit_threshold,
+                use_fallback_classification=self.use_fallback_classification,
+                analysis_method=self.analysis_method,
+                casing_depth_enabled=self.casing_depth_enabled,
+                casing_depth_m=self.casing_depth_m,
+                template_path=None,
+            )
+            units_dataframe, classified_dataframe = analyze_hole(self.file_path, settings)
+            # The Excel export runs in its own TemplateExportWorker once the results are shown
             self.finished.emit(units_dataframe, classified_dataframe)
         except Exception as e:
             full_traceback = traceback.format_exc()
@@ -1777,6 +1756,11 @@ class MainWindow(QMainWindow):
         self.las_file_path = None
         self.las_metadata = None
         
+        # Background Excel template export; a rerun while it writes waits its turn
+        self.export_thread = None
+        self.export_worker = None
+        self._queued_template_export = None
+        
         # Cross-widget synchronization lock to prevent infinite loops
         # When one widget is syncing, others should wait
         self._cross_widget_sync_in_progress = False
@@ -3070,7 +3054,8 @@ class MainWindow(QMainWindow):
     def load_holes_into_map(self, map_window):
         """Load holes from project explorer into map window."""
         # Get all files from the holes model
-        root_index = self.holes_model.index(os.getcwd())
+        project_root = self.holes_model.rootPath()
+        root_index = self.holes_model.index(project_root)
 
         # Walk through the model to find all files
         files_to_process = []
@@ -3090,11 +3075,9 @@ class MainWindow(QMainWindow):
                 if file_path.lower().endswith(('.csv', '.xlsx', '.las')):
                     files_to_process.append(file_path)
 
-        # Process each file
-        for file_path in files_to_process:
-            hole_info = map_window.extract_coordinates_from_file(file_path)
-            if hole_info:
-                map_window.add_hole(file_path, hole_info)
+        # Read collars from file headers in parallel; unchanged files come from the project's collar index
+        collars = CollarIndex(project_root).scan(files_to_process)
+        map_window.add_holes(collars)
 
         if files_to_process:
             print(f"Loaded {len(files_to_process)} files into map window")
@@ -3210,7 +3193,7 @@ class MainWindow(QMainWindow):
     def load_coallog_data(self):
         try:
             coallog_path = os.path.join(os.getcwd(), 'src', 'assets', 'CoalLog v3.1 Dictionaries.xlsx')
-            return load_coallog_dictionaries(coallog_path)
+            return load_coallog_dictionaries_cached(coallog_path)
         except FileNotFoundError as e:
             QMessageBox.critical(self, "Error", f"Failed to load CoalLog dictionaries: {e}")
             return None
@@ -3855,6 +3838,10 @@ class MainWindow(QMainWindow):
         # Save window geometry and settings automatically when the application closes
         self.save_window_geometry()
         self.update_settings(auto_save=True)
+        # Let a running template export finish writing its workbook
+        self._queued_template_export = None
+        if self.export_thread is not None:
+            self.export_thread.wait()
         super().closeEvent(event)
 
     def save_window_geometry(self):
@@ -4328,6 +4315,10 @@ class MainWindow(QMainWindow):
         self.last_units_dataframe = units_dataframe.copy()
         self.last_analysis_file = self.las_file_path
         self.last_analysis_timestamp = pd.Timestamp.now()
+        self.update_range_visualization_samples()
+
+        # Write the Excel template in the background so the results display immediately
+        self._start_template_export(units_dataframe, classified_dataframe)
 
         # Debug: check columns
         print(f"DEBUG (analysis_finished): units_dataframe columns: {list(units_dataframe.columns)}")
@@ -4354,6 +4345,46 @@ class MainWindow(QMainWindow):
         self.runAnalysisButton.setEnabled(True)
         QMessageBox.critical(self, "Analysis Error", message)
 
+    def _start_template_export(self, units_dataframe, classified_dataframe):
+        """
+        Save the analysis results to the Excel template in a background thread.
+
+        Only one export writes at a time: results arriving while one is running
+        are queued (the latest replacing any queued earlier) and written once
+        it has finished.
+        """
+        template_path = os.path.join(os.getcwd(), 'src', 'assets', 'TEMPLATE.xlsx')
+        output_path = os.path.join(os.path.dirname(self.las_file_path), "output_lithology.xlsx")
+
+        if self.export_thread is not None:
+            self._queued_template_export = (units_dataframe, classified_dataframe, template_path, output_path)
+            return
+        self._run_template_export(units_dataframe, classified_dataframe, template_path, output_path)
+
+    def _run_template_export(self, units_dataframe, classified_dataframe, template_path, output_path):
+        # References are kept until the thread has finished
+        self.export_thread = QThread()
+        self.export_worker = TemplateExportWorker(units_dataframe, classified_dataframe, template_path, output_path)
+        self.export_worker.moveToThread(self.export_thread)
+        self.export_thread.started.connect(self.export_worker.run)
+        self.export_worker.error.connect(self.template_export_error)
+        self.export_worker.finished.connect(self.export_thread.quit)
+        self.export_worker.error.connect(self.export_thread.quit)
+        self.export_thread.finished.connect(self.export_worker.deleteLater)
+        self.export_thread.finished.connect(self.export_thread.deleteLater)
+        self.export_thread.finished.connect(self._template_export_thread_finished)
+        self.export_thread.start()
+
+    def _template_export_thread_finished(self):
+        self.export_thread = None
+        self.export_worker = None
+        if self._queued_template_export is not None:
+            queued, self._queued_template_export = self._queued_template_export, None
+            self._run_template_export(*queued)
+
+    def template_export_error(self, message):
+        QMessageBox.warning(self, "Export Error", message)
+
     def _apply_researched_defaults_if_needed(self):
         """
         Checks lithology rules for zero/blank gamma/density ranges and prompts the user
@@ -4560,6 +4591,17 @@ class MainWindow(QMainWindow):
 
         self.range_visualizer.update_ranges(gamma_covered, gamma_gaps, density_covered, density_gaps, use_overlaps=True, lithology_rules=current_rules)
 
+        self.update_range_visualization_samples()
+
+    def update_range_visualization_samples(self):
+        """Overlay the last analysed hole's gamma/density samples on the 2D coverage matrix"""
+        samples = self.last_classified_dataframe
+        gamma_column, density_column = ANALYSIS_COLUMNS
+        if samples is not None and gamma_column in samples.columns and density_column in samples.columns:
+            self.range_visualizer.set_sample_data(samples[gamma_column].values, samples[density_column].values)
+        else:
+            self.range_visualizer.set_sample_data(None, None)
+
     def export_lithology_report(self):
         """Export a comprehensive lithology report with density statistics."""
         # Check if we have recent analysis data
@@ -5,7 +5,7 @@ from typing import Optional, Any, Dict, List, Tuple
 import pandas as pd
 import numpy as np
 from PyQt6.QtCore import QAbstractTableModel, Qt, QModelIndex, QVariant
-from PyQt6.QtGui import QBrush, QColor
+from PyQt6.QtGui import QBrush, QColor, QFont
 
 
 class PandasModel(QAbstractTableModel):
@@ -17,6 +17,12 @@ class PandasModel(QAbstractTableModel):
     - Support for editing, sorting, and filtering
     - Proper data type handling
     - Performance optimizations for large tables
+    
+    Cells are read from one NumPy array per column rather than through the
+    DataFrame. Display strings are formatted on first request and cached per
+    column until the cell, column or table changes, and validation issues are
+    resolved into a (row, column) -> style index when they are set, so every
+    ``data()`` call is a couple of array/dict lookups.
     """
     
     def __init__(self, dataframe: pd.DataFrame = None, parent=None):
@@ -29,14 +35,31 @@ class PandasModel(QAbstractTableModel):
         self._validation_issues = {}  # row -> list of column issues
         self._background_colors = {}  # (row, col) -> QColor
         
+        self._error_brush = QBrush(QColor(255, 200, 200))  # Light red
+        self._warning_brush = QBrush(QColor(255, 255, 200))  # Light yellow
+        self._alternate_brush = QBrush(QColor(240, 240, 240))
+        self._error_font = QFont()
+        self._error_font.setBold(True)
+        self._rebuild_columns()
+        
     def set_dataframe(self, dataframe: pd.DataFrame):
         """Set the underlying dataframe."""
         self.beginResetModel()
         self._dataframe = dataframe.copy()
+        self._rebuild_columns()
         self.endResetModel()
         # Emit layoutChanged to ensure views are properly updated
         self.layoutChanged.emit()
     
+    def update_dataframe(self, dataframe: pd.DataFrame):
+        """
+        Replace the data with an edited dataframe of the same shape, without a model reset.
+        
+        The caller emits dataChanged for the cells it changed.
+        """
+        self._dataframe = dataframe.copy()
+        self._rebuild_columns()
+    
     def dataframe(self) -> pd.DataFrame:
         """Get the underlying dataframe."""
         return self._dataframe.copy()
@@ -64,47 +87,18 @@ class PandasModel(QAbstractTableModel):
         if row >= self.rowCount() or col >= self.columnCount():
             return QVariant()
         
-        # Get column name
-        col_name = self._dataframe.columns[col]
-        
         # Handle different roles
         if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
-            # Get the value
-            value = self._dataframe.iat[row, col]
-            
-            # Handle NaN/None
-            if pd.isna(value):
-                return ""
-            
-            # Apply formatter if available
-            if col_name in self._column_formatters:
-                return self._column_formatters[col_name](value)
-            
-            # Convert to string for display
-            return str(value)
+            return self._display_text(row, col)
         
         elif role == Qt.ItemDataRole.TextAlignmentRole:
-            # Align numeric columns to the right
-            if pd.api.types.is_numeric_dtype(self._dataframe.dtypes.iloc[col]):
-                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            return self._alignments[col]
         
         elif role == Qt.ItemDataRole.BackgroundRole:
             # Check for validation issues
-            if row in self._validation_issues:
-                issues = self._validation_issues[row]
-                # Check if any issue is for this column
-                # In practice, we'd need better column mapping
-                for issue in issues:
-                    # Handle both dictionary and object formats
-                    column = issue.get('column') if isinstance(issue, dict) else issue.column
-                    severity = issue.get('severity') if isinstance(issue, dict) else issue.severity
-                    
-                    if column == col_name or column is None:
-                        if severity == "ERROR":
-                            return QBrush(QColor(255, 200, 200))  # Light red
-                        elif severity == "WARNING":
-                            return QBrush(QColor(255, 255, 200))  # Light yellow
+            style = self._issue_style(row, col)
+            if style is not None and style[0] is not None:
+                return style[0]
             
             # Check for custom background color
             if (row, col) in self._background_colors:
@@ -112,41 +106,111 @@ class PandasModel(QAbstractTableModel):
             
             # Alternate row colors for better readability
             if row % 2 == 0:
-                return QBrush(QColor(240, 240, 240))
+                return self._alternate_brush
             
         elif role == Qt.ItemDataRole.ToolTipRole:
             # Show tooltip for validation issues
-            if row in self._validation_issues:
-                issues = self._validation_issues[row]
-                tooltips = []
-                for issue in issues:
-                    # Handle both dictionary and object formats
-                    column = issue.get('column') if isinstance(issue, dict) else issue.column
-                    severity = issue.get('severity') if isinstance(issue, dict) else issue.severity
-                    message = issue.get('message') if isinstance(issue, dict) else issue.message
-                    
-                    if column == col_name or column is None:
-                        tooltips.append(f"{severity}: {message}")
-                if tooltips:
-                    return "\n".join(tooltips)
+            style = self._issue_style(row, col)
+            if style is not None and style[1]:
+                return style[1]
         
         elif role == Qt.ItemDataRole.FontRole:
             # Make validation errors bold
-            if row in self._validation_issues:
-                issues = self._validation_issues[row]
-                for issue in issues:
-                    # Handle both dictionary and object formats
-                    column = issue.get('column') if isinstance(issue, dict) else issue.column
-                    severity = issue.get('severity') if isinstance(issue, dict) else issue.severity
-                    
-                    if (column == col_name or column is None) and severity == "ERROR":
-                        from PyQt6.QtGui import QFont
-                        font = QFont()
-                        font.setBold(True)
-                        return font
+            style = self._issue_style(row, col)
+            if style is not None and style[2]:
+                return self._error_font
         
         return QVariant()
     
+    def _rebuild_columns(self):
+        """Rebuild the per-column arrays, caches and issue index from the dataframe."""
+        self._column_names = list(self._dataframe.columns)
+        self._dtypes = list(self._dataframe.dtypes)
+        self._values = [self._column_values(col) for col in range(len(self._column_names))]
+        self._display_cache: List[Optional[np.ndarray]] = [None] * len(self._column_names)
+        self._alignments = [self._column_alignment(dtype) for dtype in self._dtypes]
+        self._index_validation_issues()
+    
+    def _column_values(self, col: int) -> np.ndarray:
+        """Values of a column as the scalars ``iat`` returns."""
+        column = self._dataframe.iloc[:, col]
+        dtype = column.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biufc':
+            return column.to_numpy()
+        return column.to_numpy(dtype=object)
+    
+    @staticmethod
+    def _column_alignment(dtype):
+        # Align numeric columns to the right
+        if pd.api.types.is_numeric_dtype(dtype):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+    
+    def _display_text(self, row: int, col: int):
+        """Formatted cell text, cached until the cell changes."""
+        cache = self._display_cache[col]
+        if cache is None:
+            cache = self._display_cache[col] = np.empty(len(self._values[col]), dtype=object)
+        text = cache[row]
+        if text is None:
+            value = self._values[col][row]
+            
+            # Handle NaN/None
+            if pd.isna(value):
+                text = ""
+            # Apply formatter if available
+            elif self._column_names[col] in self._column_formatters:
+                text = self._column_formatters[self._column_names[col]](value)
+            # Convert to string for display
+            else:
+                text = str(value)
+            cache[row] = text
+        return text
+    
+    def _index_validation_issues(self):
+        """Index validation issues by (row, column name); row-wide issues are under (row, None)."""
+        self._issue_index: Dict[Tuple[int, Any], List[Tuple[int, Any, Any]]] = {}
+        self._cell_issue_styles = {}  # (row, col) -> (brush, tooltip, bold), filled on demand
+        for row, issues in self._validation_issues.items():
+            for position, issue in enumerate(issues):
+                # Handle both dictionary and object formats
+                column = issue.get('column') if isinstance(issue, dict) else issue.column
+                severity = issue.get('severity') if isinstance(issue, dict) else issue.severity
+                message = issue.get('message') if isinstance(issue, dict) else issue.message
+                self._issue_index.setdefault((row, column), []).append((position, severity, message))
+    
+    def _issue_style(self, row: int, col: int):
+        """
+        (brush, tooltip, bold) for a cell's validation issues, or None.
+        
+        A cell shows the issues of its column and the row-wide ones, in the
+        row's order; the first ERROR/WARNING issue sets its background.
+        """
+        cell = (row, col)
+        style = self._cell_issue_styles.get(cell)
+        if style is not None:
+            return style
+        
+        issues = self._issue_index.get((row, self._column_names[col]), [])
+        row_issues = self._issue_index.get((row, None))
+        if row_issues:
+            issues = sorted(issues + row_issues, key=lambda issue: issue[0])
+        if not issues:
+            return None
+        
+        brush = None
+        for _, severity, _ in issues:
+            if severity == "ERROR":
+                brush = self._error_brush
+                break
+            elif severity == "WARNING":
+                brush = self._warning_brush
+                break
+        tooltip = "\n".join(f"{severity}: {message}" for _, severity, message in issues)
+        bold = any(severity == "ERROR" for _, severity, _ in issues)
+        style = self._cell_issue_styles[cell] = (brush, tooltip, bold)
+        return style
+    
     def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
         """Set data at the given index."""
         if not index.isValid() or role != Qt.ItemDataRole.EditRole:
@@ -181,6 +245,17 @@ class PandasModel(QAbstractTableModel):
             # Update dataframe
             self._dataframe.iat[row, col] = new_value
             
+            # Update the column array (rebuilt if the write changed the column's dtype)
+            if self._dataframe.dtypes.iloc[col] == self._dtypes[col]:
+                self._values[col][row] = self._dataframe.iat[row, col]
+                if self._display_cache[col] is not None:
+                    self._display_cache[col][row] = None
+            else:
+                self._dtypes[col] = self._dataframe.dtypes.iloc[col]
+                self._values[col] = self._column_values(col)
+                self._display_cache[col] = None
+                self._alignments[col] = self._column_alignment(self._dtypes[col])
+            
             # Emit data changed signal
             self.dataChanged.emit(index, index, [role])
             
@@ -236,6 +311,7 @@ class PandasModel(QAbstractTableModel):
         except Exception as e:
             print(f"Error sorting by column {col_name}: {e}")
         
+        self._rebuild_columns()
         self.endResetModel()
     
     def set_editable_columns(self, columns: List[str]):
@@ -245,10 +321,14 @@ class PandasModel(QAbstractTableModel):
     def set_column_formatter(self, column: str, formatter):
         """Set a formatter function for a column."""
         self._column_formatters[column] = formatter
+        for col, name in enumerate(self._column_names):
+            if name == column:
+                self._display_cache[col] = None
     
     def set_validation_issues(self, validation_issues: Dict[int, List]):
         """Set validation issues for highlighting."""
         self._validation_issues = validation_issues
+        self._index_validation_issues()
         self.dataChanged.emit(
             self.index(0, 0),
             self.index(self.rowCount() - 1, self.columnCount() - 1),
@@ -296,6 +376,7 @@ class PandasModel(QAbstractTableModel):
             pd.DataFrame([new_row]),
             self._dataframe.iloc[row:]
         ], ignore_index=True)
+        self._rebuild_columns()
         
         self.endInsertRows()
         return True
@@ -307,6 +388,7 @@ class PandasModel(QAbstractTableModel):
         
         self.beginRemoveRows(QModelIndex(), row, row)
         self._dataframe = self._dataframe.drop(index=row).reset_index(drop=True)
+        self._rebuild_columns()
         self.endRemoveRows()
         return True
     
@@ -0,0 +1,103 @@
+"""
+Single graphics item drawing all caliper anomaly intervals of a hole.
+
+One ``pg.LinearRegionItem`` per interval puts thousands of items in the
+scene for a washed-out hole. This item holds the intervals as two arrays and
+paints, in one call, only the bands inside the visible depth range, with
+bands closer than a pixel row merged, so it never draws more rectangles than
+the plot has pixel rows.
+"""
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtCore import QRectF, Qt
+
+
+class AnomalyHighlightItem(pg.GraphicsObject):
+    """Horizontal bands spanning the view's full width over a set of depth intervals."""
+
+    def __init__(self, brush=(255, 0, 0, 50)):
+        super().__init__()
+        self.brush = pg.mkBrush(brush)
+        self.starts = np.empty(0)
+        self.ends = np.empty(0)
+
+    def set_intervals(self, anomaly_intervals):
+        """
+        Replace the highlighted intervals.
+
+        Args:
+            anomaly_intervals: Sequence of (start_depth, end_depth) tuples
+        """
+        intervals = np.asarray(anomaly_intervals, dtype=np.float64).reshape(-1, 2)
+        intervals = np.sort(intervals, axis=1)
+        intervals = intervals[np.argsort(intervals[:, 0], kind='stable')]
+        self.prepareGeometryChange()
+        self.starts = intervals[:, 0]
+        # Running maximum so that ``ends`` is sorted even if intervals overlap
+        self.ends = np.maximum.accumulate(intervals[:, 1]) if len(intervals) else intervals[:, 1]
+        self.update()
+
+    def __len__(self):
+        return len(self.starts)
+
+    def dataBounds(self, axis, frac=1.0, orthoRange=None):
+        """Depth extent of the intervals; the bands span any X range."""
+        if axis == 1 and len(self.starts):
+            return (self.starts[0], self.ends[-1])
+        return None
+
+    def boundingRect(self):
+        view = self.getViewBox()
+        if view is None or not len(self.starts):
+            return QRectF()
+        (x_min, x_max), _ = view.viewRange()
+        # Plus a pixel row for the minimum band height (see paint)
+        height = self.ends[-1] - self.starts[0] + self.pixelHeight()
+        return QRectF(min(x_min, x_max), self.starts[0], abs(x_max - x_min), height)
+
+    def viewRangeChanged(self):
+        # The bands follow the view's X range
+        self.prepareGeometryChange()
+
+    def viewTransformChanged(self):
+        # A pixel row covers another depth span
+        self.prepareGeometryChange()
+        super().viewTransformChanged()
+
+    def visible_bands(self):
+        """
+        Bands to paint for the current view.
+
+        Returns:
+            Tuple of (starts, ends) arrays for the intervals overlapping the
+            visible depth range, with gaps narrower than a pixel row bridged
+        """
+        view = self.getViewBox()
+        if view is None or not len(self.starts):
+            return self.starts[:0], self.ends[:0]
+        _, (y_min, y_max) = view.viewRange()
+        first = int(np.searchsorted(self.ends, min(y_min, y_max), side='left'))
+        last = int(np.searchsorted(self.starts, max(y_min, y_max), side='right'))
+        starts = self.starts[first:last]
+        ends = self.ends[first:last]
+
+        pixel = self.pixelHeight()
+        if len(starts) > 1 and pixel > 0:
+            # Keep only the boundaries whose gap is at least a pixel row wide
+            keep = starts[1:] - ends[:-1] >= pixel
+            starts = starts[np.concatenate(([True], keep))]
+            ends = ends[np.concatenate((keep, [True]))]
+        return starts, ends
+
+    def paint(self, p, *args):
+        starts, ends = self.visible_bands()
+        if not len(starts):
+            return
+        rect = self.boundingRect()
+        # At least a pixel row tall, so single-sample intervals stay visible
+        heights = np.maximum(ends - starts, self.pixelHeight())
+        p.setPen(Qt.PenStyle.NoPen)
+        p.setBrush(self.brush)
+        p.drawRects([QRectF(rect.left(), start, rect.width(), height)
+                     for start, height in zip(starts.tolist(), heights.tolist())])
@@ -17,7 +17,7 @@ from PyQt6.QtCore import Qt, pyqtSignal, QPointF, QRectF, QTimer, QSize
 import pyqtgraph as pg
 
 from .stratigraphic_column import StratigraphicColumn
-from .map_window import MapWindow  # For coordinate extraction
+from ...core.collar_scanner import extract_collar
 from ...core.data_processor import DataProcessor
 from ...core.analyzer import Analyzer
 from ...core.config import LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN
@@ -226,8 +226,8 @@ class CrossSectionWindow(QWidget):
         
         # Extract coordinates and load data for each hole
         for file_path in file_paths:
-            # Extract coordinates using MapWindow's method
-            hole_info = MapWindow.extract_coordinates_from_file(MapWindow(), file_path)
+            # Extract collar coordinates from the file header
+            hole_info = extract_collar(file_path)
             if hole_info and hole_info.get('easting') is not None and hole_info.get('northing') is not None:
                 self.hole_coordinates[file_path] = (
                     hole_info.get('easting'),
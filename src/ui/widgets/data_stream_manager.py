@@ -14,6 +14,8 @@ from dataclasses import dataclass
 from enum import Enum
 import warnings
 
+from ...core.las_cache import read_las
+
 
 class LoadingStrategy(Enum):
     """Strategies for loading LAS data."""
@@ -72,6 +74,8 @@ class DataStreamManager:
         
         # File state
         self.current_file_path: Optional[str] = None
+        self._las = None
+        self._depths: np.ndarray = np.empty(0)
         self.file_metadata: Dict[str, Any] = {}
         self.depth_column: str = "DEPT"
         
@@ -245,18 +249,29 @@ class DataStreamManager:
     def _load_file_metadata(self, file_path: str) -> bool:
         """Load file metadata without loading all data."""
         try:
-            # In a real implementation, this would parse LAS file headers
-            # For now, simulate with dummy data
+            # The parse cache keeps curves as memory-mapped columns, so this
+            # doesn't pull the whole file into memory once it has been cached
+            las = read_las(file_path)
+            curves = list(las.keys())
+            if not curves:
+                raise ValueError("LAS file has no curves")
+            if self.depth_column not in curves:
+                self.depth_column = curves[0]
+
+            depths = np.asarray(las[self.depth_column], dtype=np.float64)
+            steps = np.diff(depths[:1000])
+            self._las = las
+            self._depths = depths
             self.file_metadata = {
                 "file_path": file_path,
                 "file_size": os.path.getsize(file_path),
-                "min_depth": 0.0,
-                "max_depth": 1000.0,
-                "depth_units": "m",
-                "curve_count": 5,
-                "curves": ["DEPT", "GR", "RHOB", "NPHI", "DT"],
-                "sample_rate": 0.1524,  # 0.5 ft in meters
-                "total_points": 65536
+                "min_depth": float(np.nanmin(depths)) if len(depths) else 0.0,
+                "max_depth": float(np.nanmax(depths)) if len(depths) else 0.0,
+                "depth_units": las.curves[self.depth_column].unit,
+                "curve_count": len(curves),
+                "curves": curves,
+                "sample_rate": float(np.median(steps)) if len(steps) else 0.0,
+                "total_points": len(depths)
             }
             return True
         except Exception as e:
@@ -317,27 +332,16 @@ class DataStreamManager:
     def _load_chunk(self, file_path: str, min_depth: float, max_depth: float) -> bool:
         """Load a specific chunk of data."""
         try:
-            # In a real implementation, this would read from LAS file
-            # For simulation, generate synthetic data
-            points = self.chunk_size_points
-            
-            # Generate depth values
-            depths = np.linspace(min_depth, max_depth, points)
-            
-            # Generate curve data (simulated)
-            data = {
-                self.depth_column: depths,
-                "GR": 50 + 50 * np.sin(depths / 100) + np.random.normal(0, 10, points),
-                "RHOB": 2.0 + 0.5 * np.sin(depths / 50) + np.random.normal(0, 0.1, points),
-                "NPHI": 0.2 + 0.1 * np.cos(depths / 75) + np.random.normal(0, 0.05, points),
-                "DT": 100 + 20 * np.sin(depths / 80) + np.random.normal(0, 5, points)
-            }
-            
+            # Depths are sorted in LAS files, so the chunk is a contiguous row range
+            start = np.searchsorted(self._depths, min_depth, side='left')
+            end = np.searchsorted(self._depths, max_depth, side='right')
+
             # Convert to structured array
-            dtype = [(col, 'float64') for col in data.keys()]
-            structured_data = np.zeros(points, dtype=dtype)
-            for col, values in data.items():
-                structured_data[col] = values
+            curves = self.file_metadata["curves"]
+            dtype = [(col, 'float64') for col in curves]
+            structured_data = np.zeros(end - start, dtype=dtype)
+            for col in curves:
+                structured_data[col] = self._las[col][start:end]
             
             # Create chunk
             chunk = DataChunk(
@@ -79,6 +79,10 @@ class EnhancedRangeGapVisualizer(QWidget):
         # Update the statistics panel
         self.statistics_panel.update_statistics(gamma_gaps, density_gaps, self.gamma_range, self.density_range)
 
+    def set_sample_data(self, gamma_values, density_values):
+        """Set the current hole's gamma/density samples for the 2D matrix overlay"""
+        self.range_visualizer.set_sample_data(gamma_values, density_values)
+
     def refresh_visualization(self):
         """Refresh the visualization with current data"""
         if self.range_analyzer and self.lithology_rules:
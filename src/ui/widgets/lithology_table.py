@@ -9,7 +9,7 @@ from typing import Optional, Dict, List, Tuple
 import pandas as pd
 
 from ...core.dictionary_manager import get_dictionary_manager
-from ...core.validation import ValidationResult, ValidationIssue, ValidationSeverity
+from ...core.validation import ValidationResult, ValidationIssue, ValidationSeverity, RealTimeValidator
 from ...core.workers import ValidationWorker
 
 
@@ -127,10 +127,14 @@ class LithologyTableWidget(QTableView):
         self.pandas_model = PandasModel()
         self.setModel(self.pandas_model)
         
-        # Background validation
+        # Incremental validation: edits re-check only the rows they touch. Full validations
+        # (after a load, or when the edits can't be tracked) run in a background thread
+        self.validator = self._new_validator()
         self.validation_worker: Optional[ValidationWorker] = None
         self.validation_thread: Optional[QThread] = None
-        self.is_validating = False
+        self._edit_generation = 0  # Bumped by every edit, to spot results of a stale table
+        self._validation_generation = 0
+        self._validation_pending = False
         
         # CoalLog v3.1 standard 37-column layout
         self.headers = [
@@ -204,6 +208,9 @@ class LithologyTableWidget(QTableView):
         # Connect signals
         self.selectionModel().selectionChanged.connect(self._handle_selection_changed)
         self.pandas_model.dataChanged.connect(self._handle_data_changed)
+        self.pandas_model.rowsInserted.connect(self._handle_rows_inserted)
+        self.pandas_model.rowsRemoved.connect(self._handle_rows_removed)
+        self.pandas_model.modelReset.connect(self._handle_model_reset)
         
         # Install event filter for F3 key
         self.installEventFilter(self)
@@ -239,7 +246,9 @@ class LithologyTableWidget(QTableView):
             # roles is None, treat as all roles changed
             pass  # Continue to run validation
         
-        # Run validation
+        # Run validation on the changed rows
+        if top_left.isValid() and bottom_right.isValid():
+            self._mark_rows_changed(range(top_left.row(), bottom_right.row() + 1))
         self.run_validation()
         
         # Emit data changed signal
@@ -299,8 +308,8 @@ class LithologyTableWidget(QTableView):
                 current_thickness = new_depth - self.current_dataframe.loc[row_index, 'from_depth']
             self.current_dataframe.loc[row_index, 'recovered_thickness'] = current_thickness
             
-            # Update the model with new dataframe
-            self.pandas_model.set_dataframe(self.current_dataframe)
+            # Update the model with new dataframe (the dataChanged signals below mark the edited rows)
+            self.pandas_model.update_dataframe(self.current_dataframe)
             
             # Emit data changed for affected cells
             col_idx = self.col_map[column_name]
@@ -365,62 +374,103 @@ class LithologyTableWidget(QTableView):
         # Run validation
         self.run_validation()
     
+    def _new_validator(self) -> RealTimeValidator:
+        # The table uses the CoalLog v3.1 column names
+        return RealTimeValidator(from_column='from_depth', to_column='to_depth')
+    
+    def _mark_rows_changed(self, rows):
+        self._edit_generation += 1
+        self.validator.mark_rows_changed(rows)
+    
+    def _handle_rows_inserted(self, parent, first, last):
+        self._edit_generation += 1
+        self.validator.mark_rows_inserted(first, last - first + 1)
+    
+    def _handle_rows_removed(self, parent, first, last):
+        self._edit_generation += 1
+        self.validator.mark_rows_removed(first, last - first + 1)
+    
+    def _handle_model_reset(self):
+        self._edit_generation += 1
+        self.validator.invalidate()
+    
     def run_validation(self):
-        """Run validation in background thread."""
+        """
+        Validate the rows changed since the last validation.
+        
+        Tracked edits are re-checked right away; everything else (e.g. after
+        a load) is validated in full in a background thread.
+        """
         if self.current_dataframe is None or self.current_dataframe.empty:
             self.validation_issues.clear()
             # Update PandasModel with empty validation issues
             self.pandas_model.set_validation_issues({})
             return
         
-        # Cancel any ongoing validation
-        self._cancel_validation()
+        if self.validation_thread is not None:
+            # A full validation is running; validate again once it is done
+            self._validation_pending = True
+            return
         
-        # Create worker and thread
-        self.validation_worker = ValidationWorker(self.current_dataframe, self.total_depth)
-        self.validation_thread = QThread()
+        if not self.validator.can_revalidate(self.current_dataframe):
+            self._start_full_validation()
+            return
         
-        # Move worker to thread
+        try:
+            result = self.validator.revalidate(self.current_dataframe, self.total_depth)
+        except Exception as e:
+            print(f"Validation error: {e}")
+            self.validator.invalidate()
+            return
+        self._on_validation_finished(result)
+    
+    def _start_full_validation(self):
+        """Validate a copy of the table with a fresh validator in a background thread."""
+        self._validation_generation = self._edit_generation
+        self.validation_worker = ValidationWorker(self.current_dataframe, self.total_depth,
+                                                  validator=self._new_validator())
+        self.validation_thread = QThread()
         self.validation_worker.moveToThread(self.validation_thread)
         
-        # Connect signals
         self.validation_thread.started.connect(self.validation_worker.run)
-        self.validation_worker.progress.connect(self._on_validation_progress)
-        self.validation_worker.finished.connect(self._on_validation_finished)
+        self.validation_worker.finished.connect(self._on_full_validation_finished)
         self.validation_worker.error.connect(self._on_validation_error)
-        
-        # Cleanup connections
         self.validation_worker.finished.connect(self.validation_thread.quit)
-        self.validation_worker.finished.connect(self.validation_worker.deleteLater)
-        self.validation_thread.finished.connect(self.validation_thread.deleteLater)
-        
-        # Set flag and start
-        self.is_validating = True
+        self.validation_worker.error.connect(self.validation_thread.quit)
+        # References are kept until the thread has finished
+        self.validation_thread.finished.connect(self._on_validation_thread_finished)
         self.validation_thread.start()
     
-    def _cancel_validation(self):
-        """Cancel any ongoing validation."""
-        if self.validation_thread:
-            try:
-                if self.validation_thread.isRunning():
-                    self.validation_thread.quit()
-                    self.validation_thread.wait()
-            except RuntimeError:
-                # Thread has already been deleted (wrapped C/C++ object deleted)
-                pass
+    def _on_full_validation_finished(self, result: ValidationResult):
+        if self._edit_generation != self._validation_generation:
+            # The table was edited meanwhile: the result is stale
+            self._validation_pending = True
+            return
+        # The worker's validator tracks the validated table for the next edits
+        self.validator = self.validation_worker.validator
+        self._on_validation_finished(result)
+    
+    def _on_validation_error(self, message: str):
+        print(f"Validation error: {message}")
+    
+    def _on_validation_thread_finished(self):
+        self.validation_worker.deleteLater()
+        self.validation_thread.deleteLater()
         self.validation_worker = None
         self.validation_thread = None
-        self.is_validating = False
+        if self._validation_pending:
+            self._validation_pending = False
+            self.run_validation()
     
-    def _on_validation_progress(self, percent: int, message: str):
-        """Handle validation progress updates."""
-        # Could update status bar or show progress in UI
-        print(f"Validation: {percent}% - {message}")
+    def wait_for_validation(self):
+        """Block until a running background validation has been applied."""
+        while self.validation_thread is not None:
+            # The thread is stopped by queued signals, so keep the event loop going
+            self.validation_thread.wait(10)
+            QApplication.processEvents()
     
     def _on_validation_finished(self, result: ValidationResult):
         """Handle validation completion."""
-        self.is_validating = False
-        
         # Group issues by row
         self.validation_issues.clear()
         for issue in result.issues:
@@ -450,16 +500,9 @@ class LithologyTableWidget(QTableView):
         # Emit signal with validation results
         self.validationChangedSignal.emit(result)
     
-    def _on_validation_error(self, error_msg: str):
-        """Handle validation errors."""
-        self.is_validating = False
-        print(f"Validation error: {error_msg}")
-        # Could show error in status bar
-    
     def _run_validation_for_rows(self, row_indices: List[int]):
-        """Run validation for specific rows (triggers background validation)."""
-        # For now, just trigger full background validation
-        # This ensures UI doesn't freeze while providing validation feedback
+        """Run validation for specific rows."""
+        self._mark_rows_changed(row_indices)
         self.run_validation()
     
     # Note: _handle_item_changed method removed - not needed for QTableView
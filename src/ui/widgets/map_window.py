@@ -3,21 +3,23 @@ MapWindow - Interactive map window for displaying hole locations with Easting/No
 Part of Phase 5: GIS & Cross-Sections implementation.
 """
 
+import math
 import numpy as np
 import pandas as pd
 import os
-import re
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QToolButton, 
     QComboBox, QSpinBox, QDoubleSpinBox, QCheckBox, QGroupBox, QFrame,
     QSizePolicy, QMessageBox, QToolTip, QProgressBar
 )
-from PyQt6.QtGui import QColor, QPen, QFont, QBrush, QPainter, QPainterPath
+from PyQt6.QtGui import QColor, QPen, QFont, QBrush, QPainter
 from PyQt6.QtCore import Qt, pyqtSignal, QPointF, QRectF, QTimer
 import pyqtgraph as pg
 
 # Import the worker
-from .map_render_worker import MapRenderWorker
+from .map_render_worker import MapRenderWorker, MapHoleTable
+from ...core.collar_scanner import extract_collar
+from ...core.spatial_index import HoleSpatialIndex
 
 class MapWindow(QWidget):
     """
@@ -39,6 +41,7 @@ class MapWindow(QWidget):
         # Data storage
         self.hole_data = {}  # Dict: file_path -> dict with hole info
         self.selected_holes = set()  # Set of selected hole file paths
+        self.spatial_index = HoleSpatialIndex()  # Collar locations, for picking and lasso selection
         
         # Map configuration
         self.point_size = 10
@@ -59,15 +62,10 @@ class MapWindow(QWidget):
         self.is_rendering = False
         self.pending_update = False
         
-        # Progressive rendering state
-        self.progressive_data = {
-            'eastings': [],
-            'northings': [],
-            'sizes': [],
-            'brushes': [],
-            'symbols': [],
-            'labels': []
-        }
+        # Plotted holes as arrays; rebuilt when holes are added or removed
+        self.hole_table = None
+        self.hole_table_stale = True
+        self._brush_cache = {}  # (r, g, b, a) -> QBrush
         
         # Initialize UI
         self.setup_ui()
@@ -220,36 +218,77 @@ class MapWindow(QWidget):
                 - other metadata
         """
         self.hole_data[file_path] = hole_info
+        self._index_hole(file_path, hole_info)
+        self.hole_table_stale = True
         self.update_plot()
+    
+    def add_holes(self, holes):
+        """
+        Add many holes to the map with a single redraw.
+        
+        Args:
+            holes: Dict of file_path -> hole_info (see add_hole)
+        """
+        for file_path, hole_info in holes.items():
+            self.hole_data[file_path] = hole_info
+            self._index_hole(file_path, hole_info)
+        self.hole_table_stale = True
+        self.update_plot()
+    
+    def _index_hole(self, file_path, hole_info):
+        """Add a hole's collar to the spatial index (holes without finite coordinates aren't indexed)."""
+        try:
+            easting = float(hole_info.get('easting'))
+            northing = float(hole_info.get('northing'))
+        except (TypeError, ValueError):
+            easting = northing = math.nan
+        if math.isfinite(easting) and math.isfinite(northing):
+            self.spatial_index.add(file_path, easting, northing)
+        else:
+            self.spatial_index.remove(file_path)
         
     def remove_hole(self, file_path):
         """Remove a hole from the map."""
         if file_path in self.hole_data:
             del self.hole_data[file_path]
+            self.spatial_index.remove(file_path)
             if file_path in self.selected_holes:
                 self.selected_holes.remove(file_path)
+            self.hole_table_stale = True
             self.update_plot()
             
     def clear_holes(self):
         """Clear all holes from the map."""
         self.hole_data.clear()
+        self.spatial_index.clear()
         self.selected_holes.clear()
+        self.hole_table_stale = True
         self.update_plot()
         
     def update_plot(self, force_sync=False):
         """
         Update the scatter plot with current hole data.
         
+        Rebuilds the hole table if holes were added or removed; otherwise
+        only restyles the existing spots.
+        
         Args:
             force_sync: If True, force synchronous rendering (for small datasets or testing)
         """
         if not self.hole_data:
+            self.hole_table = None
+            self.hole_table_stale = False
             self.scatter_plot.setData([], [])
+            self.clear_point_labels()
             self.hole_count_label.setText("Holes: 0")
             self.selected_count_label.setText("Selected: 0")
             self.progress_bar.hide()
             return
         
+        if not self.hole_table_stale and self.hole_table is not None:
+            self._restyle_points()
+            return
+        
         # For very small datasets or when forced, use synchronous rendering
         if force_sync or len(self.hole_data) <= 10:
             self._update_plot_sync()
@@ -265,65 +304,7 @@ class MapWindow(QWidget):
     
     def _update_plot_sync(self):
         """Synchronous version of update_plot for small datasets."""
-        if not self.hole_data:
-            self.scatter_plot.setData([], [])
-            self.hole_count_label.setText("Holes: 0")
-            self.selected_count_label.setText("Selected: 0")
-            return
-            
-        # Prepare data arrays
-        eastings = []
-        northings = []
-        sizes = []
-        brushes = []
-        symbols = []
-        labels = []
-        
-        # Get color by setting
-        color_by = self.color_combo.currentText()
-        
-        for file_path, hole_info in self.hole_data.items():
-            easting = hole_info.get('easting', 0)
-            northing = hole_info.get('northing', 0)
-            
-            # Skip holes without coordinates
-            if easting is None or northing is None:
-                continue
-                
-            eastings.append(easting)
-            northings.append(northing)
-            labels.append(hole_info.get('hole_id', os.path.basename(file_path)))
-            
-            # Determine point color based on selection and color_by setting
-            if file_path in self.selected_holes:
-                sizes.append(self.selected_point_size)
-                brush_color = self.selected_point_color
-                symbols.append('o')  # Circle
-            else:
-                sizes.append(self.point_size)
-                brush_color = self.get_color_for_hole(hole_info, color_by)
-                symbols.append('o')  # Circle
-                
-            brushes.append(pg.mkBrush(brush_color))
-                
-        # Update scatter plot
-        self.scatter_plot.setData(x=eastings, y=northings, size=sizes, brush=brushes, symbol=symbols)
-        
-        # Add labels if there are not too many points
-        if len(eastings) <= 50:  # Only show labels for reasonable number of points
-            self.add_point_labels(eastings, northings, labels)
-        else:
-            self.clear_point_labels()
-        
-        # Update labels
-        self.hole_count_label.setText(f"Holes: {len(self.hole_data)}")
-        self.selected_count_label.setText(f"Selected: {len(self.selected_holes)}")
-        
-        # Auto-range if needed
-        if eastings and northings:
-            self.plot_widget.autoRange()
-            # Update scale bar after auto-ranging
-            self.update_scale_bar()
+        self._set_hole_table(MapHoleTable.from_hole_data(self.hole_data, self.selected_holes))
     
     def _start_render_worker(self):
         """Start the background rendering worker."""
@@ -332,31 +313,14 @@ class MapWindow(QWidget):
             self.render_worker.cancel()
             self.render_worker.wait()
         
-        # Reset progressive data
-        self.progressive_data = {
-            'eastings': [],
-            'northings': [],
-            'sizes': [],
-            'brushes': [],
-            'symbols': [],
-            'labels': []
-        }
-        
         # Create new worker
         self.render_worker = MapRenderWorker(
             hole_data=self.hole_data,
-            selected_holes=self.selected_holes,
-            color_by=self.color_combo.currentText(),
-            point_size=self.point_size,
-            selected_point_size=self.selected_point_size,
-            point_color=self.point_color,
-            selected_point_color=self.selected_point_color,
-            batch_size=50  # Render 50 points at a time
+            selected_holes=self.selected_holes
         )
         
         # Connect signals
         self.render_worker.progress.connect(self._on_render_progress)
-        self.render_worker.batch_ready.connect(self._on_batch_ready)
         self.render_worker.data_ready.connect(self._on_data_ready)
         self.render_worker.finished.connect(self._on_render_finished)
         self.render_worker.error.connect(self._on_render_error)
@@ -375,75 +339,91 @@ class MapWindow(QWidget):
         """Handle progress updates from the worker."""
         self.progress_bar.setValue(progress)
         
-    def _on_batch_ready(self, eastings, northings, sizes, brushes, symbols, labels):
-        """Handle batch data from the worker (progressive loading)."""
-        # Append batch data
-        self.progressive_data['eastings'].extend(eastings)
-        self.progressive_data['northings'].extend(northings)
-        self.progressive_data['sizes'].extend(sizes)
-        self.progressive_data['brushes'].extend(brushes)
-        self.progressive_data['symbols'].extend(symbols)
-        self.progressive_data['labels'].extend(labels)
-        
-        # Update plot with current data
-        self._update_plot_from_data(self.progressive_data, is_final=False)
-        
-    def _on_data_ready(self, eastings, northings, sizes, brushes, symbols, labels):
-        """Handle complete data from the worker."""
-        # Update progressive data
-        self.progressive_data = {
-            'eastings': eastings,
-            'northings': northings,
-            'sizes': sizes,
-            'brushes': brushes,
-            'symbols': symbols,
-            'labels': labels
-        }
-        
-        # Update plot with final data
-        self._update_plot_from_data(self.progressive_data, is_final=True)
-        
-    def _update_plot_from_data(self, data, is_final=False):
+    def _on_data_ready(self, table):
+        """Handle the hole table built by the worker."""
+        # The selection may have changed while the worker was running
+        table.set_selection(self.selected_holes)
+        self._set_hole_table(table)
+        
+    def _set_hole_table(self, table):
         """
-        Update the scatter plot from prepared data.
+        Plot a freshly built hole table.
         
         Args:
-            data: Dict with 'eastings', 'northings', 'sizes', 'brushes', 'symbols', 'labels'
-            is_final: Whether this is the final update
+            table: MapHoleTable for the current hole data
         """
-        eastings = data['eastings']
-        northings = data['northings']
-        sizes = data['sizes']
-        brushes = data['brushes']
-        symbols = data['symbols']
-        labels = data['labels']
-        
-        # Convert brush tuples back to QBrush objects
-        brush_objects = []
-        for brush_tuple in brushes:
-            if isinstance(brush_tuple, tuple):
-                # Convert (r, g, b, a) tuple to QBrush
-                brush_objects.append(pg.mkBrush(brush_tuple))
-            else:
-                brush_objects.append(brush_tuple)
+        self.hole_table = table
+        self.hole_table_stale = False
+        
+        eastings = table.eastings
+        northings = table.northings
         
         # Update scatter plot
-        self.scatter_plot.setData(x=eastings, y=northings, size=sizes, brush=brush_objects, symbol=symbols)
+        self.scatter_plot.setData(
+            x=eastings, y=northings,
+            size=table.sizes(self.point_size, self.selected_point_size),
+            brush=self._brushes_for(self._hole_colors()),
+            symbol='o'
+        )
         
-        # Add labels if there are not too many points (only on final update)
-        if is_final and len(eastings) <= 50:
-            self.add_point_labels(eastings, northings, labels)
-        elif is_final:
+        # Add labels if there are not too many points
+        if len(table) <= 50:  # Only show labels for reasonable number of points
+            self.add_point_labels(eastings, northings, table.labels)
+        else:
             self.clear_point_labels()
         
         # Update labels
         self.hole_count_label.setText(f"Holes: {len(self.hole_data)}")
         self.selected_count_label.setText(f"Selected: {len(self.selected_holes)}")
         
-        # Auto-range if needed (only on final update to avoid constant re-ranging)
-        if is_final and eastings and northings:
+        # Auto-range if needed
+        if len(table):
             self.plot_widget.autoRange()
+            # Update scale bar after auto-ranging
             self.update_scale_bar()
+    
+    def _hole_colors(self, rows=None):
+        """RGBA colours of the plotted holes (or of ``rows``) for the current colour-by setting."""
+        return self.hole_table.colors(self.color_combo.currentText(), self.point_color,
+                                      self.selected_point_color, rows)
+    
+    def _brushes_for(self, colors):
+        """QBrush per RGBA row; holes share one brush per distinct colour."""
+        # Compare colours as packed 32-bit RGBA values
+        packed = np.ascontiguousarray(colors, dtype=np.uint8).view(np.uint32).ravel()
+        palette, color_index = np.unique(packed, return_inverse=True)
+        palette_brushes = []
+        for color in map(tuple, palette.view(np.uint8).reshape(-1, 4).tolist()):
+            brush = self._brush_cache.get(color)
+            if brush is None:
+                brush = self._brush_cache[color] = pg.mkBrush(color)
+            palette_brushes.append(brush)
+        return [palette_brushes[i] for i in color_index.ravel()]
+    
+    def _restyle_points(self):
+        """Recompute every spot's size and colour without rebuilding the plot data."""
+        table = self.hole_table
+        self.scatter_plot.setSize(table.sizes(self.point_size, self.selected_point_size), update=False)
+        self.scatter_plot.setBrush(self._brushes_for(self._hole_colors()))
+        self.selected_count_label.setText(f"Selected: {len(self.selected_holes)}")
+    
+    def _apply_selection(self):
+        """Restyle only the spots whose selection state changed."""
+        if self.hole_table is None or self.hole_table_stale:
+            # A rebuild is due (or under way) and picks up the selection itself
+            self.update_plot()
+            return
+        
+        rows = self.hole_table.set_selection(self.selected_holes)
+        if len(rows):
+            # Write the changed spots in place; updateSpots re-renders only
+            # spots whose cached sourceRect was cleared
+            spots = self.scatter_plot.data
+            spots['size'][rows] = self.hole_table.sizes(self.point_size, self.selected_point_size, rows)
+            spots['brush'][rows] = self._brushes_for(self._hole_colors(rows))
+            spots['sourceRect'][rows] = 0
+            self.scatter_plot.updateSpots()
+        self.selected_count_label.setText(f"Selected: {len(self.selected_holes)}")
         
     def _on_render_finished(self):
         """Handle worker finished signal."""
@@ -466,37 +446,6 @@ class MapWindow(QWidget):
         
         # Fall back to synchronous rendering
         self._update_plot_sync()
-            
-    def get_color_for_hole(self, hole_info, color_by):
-        """Get color for a hole based on the color_by setting."""
-        if color_by == "Default":
-            return self.point_color
-        elif color_by == "Total Depth":
-            return self.get_color_by_depth(hole_info.get('total_depth'))
-        elif color_by == "Hole Count":
-            # Color by sequence - just for demonstration
-            return QColor(70, 130, 180)  # Steel blue
-        elif color_by == "File Type":
-            # Color by file extension - just for demonstration
-            return QColor(100, 149, 237)  # Cornflower blue
-        else:
-            return self.point_color
-            
-    def get_color_by_depth(self, depth):
-        """Get color based on total depth."""
-        if depth is None:
-            return self.point_color
-            
-        # Color gradient from light blue (shallow) to dark blue (deep)
-        # Normalize depth to 0-1 range (assuming max depth ~500m)
-        normalized = min(depth / 500.0, 1.0)
-        
-        # Interpolate between light blue and dark blue
-        r = int(70 + normalized * 30)  # 70-100
-        g = int(130 + normalized * 50)  # 130-180
-        b = int(180 + normalized * 75)  # 180-255
-        
-        return QColor(r, g, b)
         
     def add_point_labels(self, eastings, northings, labels):
         """Add text labels to points."""
@@ -591,26 +540,12 @@ class MapWindow(QWidget):
         if len(self.lasso_points) < 3:
             return
             
-        # Create QPainterPath for polygon
-        path = QPainterPath()
-        path.moveTo(self.lasso_points[0])
-        for point in self.lasso_points[1:]:
-            path.lineTo(point)
-        path.closeSubpath()
-        
         # Find holes inside polygon
-        selected = []
-        for file_path, hole_info in self.hole_data.items():
-            easting = hole_info.get('easting')
-            northing = hole_info.get('northing')
-            
-            if easting is not None and northing is not None:
-                if path.contains(QPointF(easting, northing)):
-                    selected.append(file_path)
+        selected = self.spatial_index.within_polygon([(p.x(), p.y()) for p in self.lasso_points])
                     
         # Update selection
         self.selected_holes = set(selected)
-        self.update_plot()
+        self._apply_selection()
         
         # Emit selection changed signal
         self.selectionChanged.emit(list(self.selected_holes))
@@ -628,18 +563,7 @@ class MapWindow(QWidget):
             x, y: Coordinates to check
             tolerance: Selection tolerance in plot units
         """
-        closest_distance = float('inf')
-        closest_file = None
-        
-        for file_path, hole_info in self.hole_data.items():
-            easting = hole_info.get('easting')
-            northing = hole_info.get('northing')
-            
-            if easting is not None and northing is not None:
-                distance = np.sqrt((easting - x)**2 + (northing - y)**2)
-                if distance < tolerance and distance < closest_distance:
-                    closest_distance = distance
-                    closest_file = file_path
+        closest_file = self.spatial_index.nearest(x, y, tolerance)
                     
         if closest_file:
             # Toggle selection
@@ -648,13 +572,13 @@ class MapWindow(QWidget):
             else:
                 self.selected_holes.add(closest_file)
                 
-            self.update_plot()
+            self._apply_selection()
             self.selectionChanged.emit(list(self.selected_holes))
             
     def clear_selection(self):
         """Clear all selections."""
         self.selected_holes.clear()
-        self.update_plot()
+        self._apply_selection()
         self.selectionChanged.emit([])
         self.status_label.setText("Selection cleared")
         
@@ -674,7 +598,7 @@ class MapWindow(QWidget):
             point_index = points[0].index()
             
             # Get the corresponding file path
-            file_paths = list(self.hole_data.keys())
+            file_paths = self.hole_table.file_paths if self.hole_table is not None else []
             if 0 <= point_index < len(file_paths):
                 file_path = file_paths[point_index]
                 hole_info = self.hole_data[file_path]
@@ -715,7 +639,7 @@ class MapWindow(QWidget):
         # Only update if selection has changed
         if new_selection != self.selected_holes:
             self.selected_holes = new_selection
-            self.update_plot()
+            self._apply_selection()
             
             # Emit signal (but don't cause infinite loop)
             # We'll use a flag to prevent re-emission
@@ -729,13 +653,13 @@ class MapWindow(QWidget):
     def select_all_holes(self):
         """Select all holes in the map."""
         self.selected_holes = set(self.hole_data.keys())
-        self.update_plot()
+        self._apply_selection()
         self.selectionChanged.emit(list(self.selected_holes))
         
     def deselect_all_holes(self):
         """Deselect all holes in the map."""
         self.selected_holes.clear()
-        self.update_plot()
+        self._apply_selection()
         self.selectionChanged.emit([])
         
     def extract_coordinates_from_file(self, file_path):
@@ -749,250 +673,7 @@ class MapWindow(QWidget):
             Dict with easting, northing, hole_id, and other metadata,
             or None if coordinates not found.
         """
-        try:
-            hole_info = {
-                'file_path': file_path,
-                'hole_id': os.path.basename(file_path).replace('.csv', '').replace('.xlsx', '').replace('.las', ''),
-                'easting': None,
-                'northing': None,
-                'total_depth': None,
-                'elevation': None,
-                'collar_elevation': None
-            }
-            
-            # Handle different file types
-            if file_path.lower().endswith('.csv'):
-                hole_info = self._extract_from_csv(file_path, hole_info)
-            elif file_path.lower().endswith('.las'):
-                hole_info = self._extract_from_las(file_path, hole_info)
-            elif file_path.lower().endswith('.xlsx'):
-                hole_info = self._extract_from_excel(file_path, hole_info)
-            else:
-                # Try generic text file extraction
-                hole_info = self._extract_from_text(file_path, hole_info)
-            
-            # If coordinates found, return hole info
-            if hole_info['easting'] is not None and hole_info['northing'] is not None:
-                return hole_info
-            else:
-                # Return None if no coordinates found
-                return None
-                
-        except Exception as e:
-            print(f"Error extracting coordinates from {file_path}: {e}")
-            return None
-            
-    def _extract_from_csv(self, file_path, hole_info):
-        """Extract coordinates from CSV file."""
-        try:
-            # Read file as text to look for header comments
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
-                
-            return self._extract_from_text_lines(lines, hole_info)
-        except Exception as e:
-            print(f"Error reading CSV {file_path}: {e}")
-            return hole_info
-            
-    def _extract_from_las(self, file_path, hole_info):
-        """Extract coordinates from LAS file."""
-        try:
-            # Read file as text to look for header section
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
-                
-            # LAS files have specific sections
-            in_well_section = False
-            for line in lines:
-                line = line.strip()
-                
-                # Check for well section
-                if line.startswith('~W'):
-                    in_well_section = True
-                    continue
-                elif line.startswith('~') and not line.startswith('~W'):
-                    in_well_section = False
-                    continue
-                    
-                if in_well_section and line:
-                    # Parse LAS well information
-                    parts = line.split('.')
-                    if len(parts) >= 2:
-                        mnemonic = parts[0].strip()
-                        value_part = '.'.join(parts[1:]).strip()
-                        
-                        # Extract value (remove unit if present)
-                        if ':' in value_part:
-                            value = value_part.split(':')[0].strip()
-                        else:
-                            value = value_part
-                            
-                        # Check for coordinates
-                        if mnemonic.upper() in ['X', 'EAST', 'EASTING']:
-                            try:
-                                hole_info['easting'] = float(value)
-                            except ValueError:
-                                pass
-                        elif mnemonic.upper() in ['Y', 'NORTH', 'NORTHING']:
-                            try:
-                                hole_info['northing'] = float(value)
-                            except ValueError:
-                                pass
-                        elif mnemonic.upper() in ['ELEV', 'ELEVATION', 'KB', 'GL']:
-                            try:
-                                hole_info['elevation'] = float(value)
-                            except ValueError:
-                                pass
-                        elif mnemonic.upper() in ['WELL', 'UWI']:
-                            hole_info['hole_id'] = value
-                            
-            return hole_info
-        except Exception as e:
-            print(f"Error reading LAS {file_path}: {e}")
-            return hole_info
-            
-    def _extract_from_excel(self, file_path, hole_info):
-        """Extract coordinates from Excel file."""
-        try:
-            import pandas as pd
-            # Try to read the first few rows as text to find metadata
-            df = pd.read_excel(file_path, nrows=10)
-            
-            # Check for coordinates in column names or first row
-            for col in df.columns:
-                col_lower = str(col).lower()
-                if 'easting' in col_lower or 'x' == col_lower:
-                    if not pd.isna(df[col].iloc[0]):
-                        try:
-                            hole_info['easting'] = float(df[col].iloc[0])
-                        except (ValueError, TypeError):
-                            pass
-                elif 'northing' in col_lower or 'y' == col_lower:
-                    if not pd.isna(df[col].iloc[0]):
-                        try:
-                            hole_info['northing'] = float(df[col].iloc[0])
-                        except (ValueError, TypeError):
-                            pass
-                            
-            return hole_info
-        except Exception as e:
-            print(f"Error reading Excel {file_path}: {e}")
-            # Fall back to text extraction
-            try:
-                with open(file_path, 'rb') as f:
-                    # Try to read as text (Excel files are binary, but we'll try)
-                    # This is a fallback for very simple Excel files
-                    return hole_info
-            except:
-                return hole_info
-                
-    def _extract_from_text(self, file_path, hole_info):
-        """Extract coordinates from generic text file."""
-        try:
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
-            return self._extract_from_text_lines(lines, hole_info)
-        except Exception as e:
-            print(f"Error reading text file {file_path}: {e}")
-            return hole_info
-            
-    def _extract_from_text_lines(self, lines, hole_info):
-        """Extract coordinates from text lines."""
-        # Look for coordinate patterns in header comments
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines and data rows (starting with numbers or dashes)
-            if not line or (line[0].isdigit() if line else False) or (line[0] == '-' if line else False):
-                continue
-                
-            # Check for Easting (various patterns)
-            easting_patterns = [
-                r'[Ee]asting\s*[:=]\s*([\d\.\-]+)',  # Easting: 500000
-                r'[Xx]\s*[:=]\s*([\d\.\-]+)',        # X: 500000
-                r'[Ee]asting\s+([\d\.\-]+)',         # Easting 500000
-                r'[Xx]\s+([\d\.\-]+)',               # X 500000
-                r'EAST\s*[:=]\s*([\d\.\-]+)',        # EAST: 500000
-            ]
-            
-            for pattern in easting_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    try:
-                        hole_info['easting'] = float(match.group(1))
-                        break
-                    except ValueError:
-                        pass
-                        
-            # Check for Northing (various patterns)
-            northing_patterns = [
-                r'[Nn]orthing\s*[:=]\s*([\d\.\-]+)',  # Northing: 7000000
-                r'[Yy]\s*[:=]\s*([\d\.\-]+)',         # Y: 7000000
-                r'[Nn]orthing\s+([\d\.\-]+)',         # Northing 7000000
-                r'[Yy]\s+([\d\.\-]+)',                # Y 7000000
-                r'NORTH\s*[:=]\s*([\d\.\-]+)',        # NORTH: 7000000
-            ]
-            
-            for pattern in northing_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    try:
-                        hole_info['northing'] = float(match.group(1))
-                        break
-                    except ValueError:
-                        pass
-                        
-            # Check for Total Depth
-            td_patterns = [
-                r'[Tt]otal\s*[Dd]epth\s*[:=]\s*([\d\.\-]+)',
-                r'[Tt][Dd]\s*[:=]\s*([\d\.\-]+)',
-                r'[Ff]inal\s*[Dd]epth\s*[:=]\s*([\d\.\-]+)',
-                r'[Ee]nd\s*[Dd]epth\s*[:=]\s*([\d\.\-]+)',
-            ]
-            
-            for pattern in td_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    try:
-                        hole_info['total_depth'] = float(match.group(1))
-                        break
-                    except ValueError:
-                        pass
-                        
-            # Check for Elevation
-            elev_patterns = [
-                r'[Ee]levation\s*[:=]\s*([\d\.\-]+)',
-                r'[Ee]lev\s*[:=]\s*([\d\.\-]+)',
-                r'[Cc]ollar\s*[Ee]levation\s*[:=]\s*([\d\.\-]+)',
-                r'[Kk][Bb]\s*[:=]\s*([\d\.\-]+)',  # Kelly Bushing
-                r'[Gg][Ll]\s*[:=]\s*([\d\.\-]+)',  # Ground Level
-            ]
-            
-            for pattern in elev_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    try:
-                        hole_info['elevation'] = float(match.group(1))
-                        break
-                    except ValueError:
-                        pass
-                        
-            # Check for Hole ID
-            hole_patterns = [
-                r'[Hh]ole\s*[:=]\s*([\w\d\-_\.]+)',
-                r'[Ww]ell\s*[:=]\s*([\w\d\-_\.]+)',
-                r'[Bb]orehole\s*[:=]\s*([\w\d\-_\.]+)',
-                r'[Dd]rillhole\s*[:=]\s*([\w\d\-_\.]+)',
-                r'[Ii][Dd]\s*[:=]\s*([\w\d\-_\.]+)',
-            ]
-            
-            for pattern in hole_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    hole_info['hole_id'] = match.group(1)
-                    break
-                    
-        return hole_info
+        return extract_collar(file_path)
     
     def on_view_range_changed(self):
         """Handle view range changes (zooming/panning)."""
@@ -2,13 +2,75 @@
 2D Matrix Visualization for Gamma/Density Lithology Coverage Analysis
 """
 
+from collections.abc import Mapping
+
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QSizePolicy, QToolTip
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QSizePolicy, QToolTip, QCheckBox
 )
-from PyQt6.QtGui import QPainter, QBrush, QColor, QFont, QPen
-from PyQt6.QtCore import Qt, QRectF, QPointF, QSize
+from PyQt6.QtGui import QPainter, QBrush, QColor, QFont, QPen, QImage
+from PyQt6.QtCore import Qt, QRectF, QPointF, QSize, QLineF
 import numpy as np
 
+# Gamma/density value marking a "don't care" rule bound
+DONT_CARE_VALUE = -999.25
+
+# Cell colours (RGBA) for gaps, single coverage, overlaps and "don't care"
+GAP_RGBA = (0xFF, 0x6B, 0x6B, 255)
+SINGLE_RGBA = (0x4E, 0xCD, 0xC4, 255)
+OVERLAP_RGBA = (0xFF, 0xE6, 0x6D, 255)
+DONT_CARE_RGBA = (0xCC, 0xCC, 0xCC, 255)
+
+# Cells smaller than this (in pixels) are drawn without grid lines
+MIN_GRID_CELL_SIZE = 4
+
+
+def cell_rule_counts(gamma_masks, density_masks):
+    """
+    Number of rules covering each cell.
+    
+    Args:
+        gamma_masks: (rules, gamma_bins) boolean array of the gamma bins each rule covers
+        density_masks: (rules, density_bins) boolean array of the density bins each rule covers
+        
+    Returns:
+        (density_bins, gamma_bins) integer array
+    """
+    # Float products go through BLAS; the counts are small integers, so they are exact
+    return (density_masks.T.astype(np.float32) @ gamma_masks.astype(np.float32)).astype(np.int64)
+
+
+class CellRuleLists(Mapping):
+    """
+    Lithology codes covering each matrix cell, looked up on demand.
+
+    Maps (gamma_idx, density_idx) to the list of codes of the rules covering
+    that cell, in rule order, like a dict without the empty cells. Each rule
+    covers a rectangle of cells, so only its gamma and density bin masks are
+    stored.
+    """
+
+    def __init__(self, codes, gamma_masks, density_masks):
+        self.codes = np.asarray(codes, dtype=object)
+        self.gamma_masks = gamma_masks  # (rules, gamma_bins)
+        self.density_masks = density_masks  # (rules, density_bins)
+
+    def __getitem__(self, key):
+        gamma_idx, density_idx = key
+        if not (0 <= gamma_idx < self.gamma_masks.shape[1] and 0 <= density_idx < self.density_masks.shape[1]):
+            raise KeyError(key)
+        covering = self.gamma_masks[:, gamma_idx] & self.density_masks[:, density_idx]
+        if not covering.any():
+            raise KeyError(key)
+        return self.codes[covering].tolist()
+
+    def __iter__(self):
+        for density_idx, gamma_idx in np.argwhere(cell_rule_counts(self.gamma_masks, self.density_masks)):
+            yield (int(gamma_idx), int(density_idx))
+
+    def __len__(self):
+        return int(np.count_nonzero(cell_rule_counts(self.gamma_masks, self.density_masks)))
+
+
 class MatrixVisualizer(QWidget):
     """2D Matrix visualization showing gamma/density coverage combinations"""
 
@@ -26,7 +88,13 @@ class MatrixVisualizer(QWidget):
         
         # Coverage matrix: 0=gap, 1=single coverage, 2+=overlap
         self.coverage_matrix = None
-        self.coverage_details = {}  # (gamma_idx, density_idx) -> list of lithology codes
+        self.coverage_details = {}  # (gamma_idx, density_idx) -> list of lithology codes (CellRuleLists)
+        
+        # Optional overlay: gamma/density samples of the current hole
+        self.sample_gamma = None
+        self.sample_density = None
+        self.sample_histogram = None  # Sample count per cell, same shape as coverage_matrix
+        self._sample_histogram_bins = None  # Bins and ranges sample_histogram was counted for
         
         self.setup_ui()
 
@@ -65,6 +133,14 @@ class MatrixVisualizer(QWidget):
         dont_care_label.setStyleSheet("background-color: #CCCCCC; padding: 2px; border: 1px solid #666;")
         legend_layout.addWidget(dont_care_label)
         
+        # Hole samples overlay
+        self.samples_checkbox = QCheckBox("Hole samples")
+        self.samples_checkbox.setChecked(True)
+        self.samples_checkbox.setEnabled(False)
+        self.samples_checkbox.setToolTip("Darken cells by the number of gamma/density samples of the current hole")
+        self.samples_checkbox.toggled.connect(self._update_canvas)
+        legend_layout.addWidget(self.samples_checkbox)
+        
         legend_layout.addStretch()
         layout.addLayout(legend_layout)
 
@@ -87,80 +163,104 @@ class MatrixVisualizer(QWidget):
         """Update with new lithology rules and recalculate coverage"""
         self.lithology_rules = lithology_rules
         self._calculate_coverage_matrix()
-        self.matrix_canvas.update_coverage(self.coverage_matrix, self.coverage_details, self.gamma_range, self.density_range)
+        self._calculate_sample_histogram()
+        self._update_canvas()
         self.update()
 
+    def set_sample_data(self, gamma_values, density_values):
+        """
+        Set the gamma/density samples of the current hole for the overlay.
+        
+        Args:
+            gamma_values: Gamma sample values (None to clear the overlay)
+            density_values: Density sample values, paired with gamma_values
+        """
+        if gamma_values is None or density_values is None:
+            self.sample_gamma = self.sample_density = None
+        else:
+            gamma = np.asarray(gamma_values, dtype=np.float64)
+            density = np.asarray(density_values, dtype=np.float64)
+            valid = np.isfinite(gamma) & np.isfinite(density)
+            self.sample_gamma = gamma[valid]
+            self.sample_density = density[valid]
+        self._sample_histogram_bins = None
+        self.samples_checkbox.setEnabled(self.sample_gamma is not None)
+        self._calculate_sample_histogram()
+        self._update_canvas()
+
+    def _update_canvas(self, *args):
+        show_samples = self.samples_checkbox.isChecked()
+        self.matrix_canvas.update_coverage(self.coverage_matrix, self.coverage_details, self.gamma_range,
+                                           self.density_range, self.sample_histogram if show_samples else None)
+
+    def _bin_centres(self):
+        """Gamma and density values at the centre of each bin."""
+        gamma_step = (self.gamma_range[1] - self.gamma_range[0]) / self.gamma_bins
+        density_step = (self.density_range[1] - self.density_range[0]) / self.density_bins
+        gamma_values = self.gamma_range[0] + np.arange(self.gamma_bins) * gamma_step + gamma_step / 2
+        density_values = self.density_range[0] + np.arange(self.density_bins) * density_step + density_step / 2
+        return gamma_values, density_values
+
     def _calculate_coverage_matrix(self):
         """Calculate 2D coverage matrix for all gamma/density combinations"""
         if not self.lithology_rules:
             return
 
-        # Initialize coverage matrix
-        self.coverage_matrix = np.zeros((self.density_bins, self.gamma_bins), dtype=int)
-        self.coverage_details = {}
-
-        gamma_step = (self.gamma_range[1] - self.gamma_range[0]) / self.gamma_bins
-        density_step = (self.density_range[1] - self.density_range[0]) / self.density_bins
-
-        # Check each lithology rule against all gamma/density combinations
-        for rule in self.lithology_rules:
-            gamma_min = rule.get('gamma_min')
-            gamma_max = rule.get('gamma_max')
-            density_min = rule.get('density_min')
-            density_max = rule.get('density_max')
-            code = rule.get('code', '')
-
-            # Skip NL rule
-            if code == 'NL':
-                continue
-
-            # Check if this rule has "don't care" for gamma or density
-            gamma_dont_care = gamma_min == -999.25 and gamma_max == -999.25
-            density_dont_care = density_min == -999.25 and density_max == -999.25
-
-            for density_idx in range(self.density_bins):
-                density_val = self.density_range[0] + density_idx * density_step + density_step / 2
-                
-                for gamma_idx in range(self.gamma_bins):
-                    gamma_val = self.gamma_range[0] + gamma_idx * gamma_step + gamma_step / 2
-
-                    # Check if this combination is covered by current rule
-                    covered = True
-                    
-                    if not gamma_dont_care:
-                        covered &= gamma_min <= gamma_val <= gamma_max
-                    if not density_dont_care:
-                        covered &= density_min <= density_val <= density_max
-
-                    if covered:
-                        # Update coverage matrix
-                        if gamma_dont_care or density_dont_care:
-                            # Mark as "don't care" coverage (special value)
-                            if self.coverage_matrix[density_idx, gamma_idx] == 0:
-                                self.coverage_matrix[density_idx, gamma_idx] = -1  # Don't care
-                        else:
-                            # Normal coverage
-                            self.coverage_matrix[density_idx, gamma_idx] += 1
-
-                        # Store coverage details
-                        key = (gamma_idx, density_idx)
-                        if key not in self.coverage_details:
-                            self.coverage_details[key] = []
-                        self.coverage_details[key].append(code)
-
-        # Convert "don't care" areas to proper values for visualization
-        for density_idx in range(self.density_bins):
-            for gamma_idx in range(self.gamma_bins):
-                if self.coverage_matrix[density_idx, gamma_idx] == -1:
-                    # If don't care but also has normal coverage, use normal coverage
-                    key = (gamma_idx, density_idx)
-                    if key in self.coverage_details and len(self.coverage_details[key]) > 1:
-                        # Count only non-dont-care rules
-                        normal_count = sum(1 for rule in self.lithology_rules 
-                                         if rule.get('code') in self.coverage_details[key]
-                                         and not (rule.get('gamma_min') == -999.25 and rule.get('gamma_max') == -999.25)
-                                         and not (rule.get('density_min') == -999.25 and rule.get('density_max') == -999.25))
-                        self.coverage_matrix[density_idx, gamma_idx] = normal_count if normal_count > 0 else -1
+        # Skip NL rule
+        rules = [rule for rule in self.lithology_rules if rule.get('code', '') != 'NL']
+        codes = [rule.get('code', '') for rule in rules]
+        bounds = np.array([[rule.get('gamma_min'), rule.get('gamma_max'),
+                            rule.get('density_min'), rule.get('density_max')] for rule in rules],
+                          dtype=np.float64).reshape(-1, 4)
+        gamma_min, gamma_max, density_min, density_max = bounds.T
+
+        # Check if each rule has "don't care" for gamma or density
+        gamma_dont_care = (gamma_min == DONT_CARE_VALUE) & (gamma_max == DONT_CARE_VALUE)
+        density_dont_care = (density_min == DONT_CARE_VALUE) & (density_max == DONT_CARE_VALUE)
+
+        # Bins covered by each rule's interval (every bin when "don't care"), one row per rule
+        gamma_values, density_values = self._bin_centres()
+        gamma_masks = (gamma_dont_care[:, None] | ((gamma_min[:, None] <= gamma_values)
+                                                    & (gamma_values <= gamma_max[:, None])))
+        density_masks = (density_dont_care[:, None] | ((density_min[:, None] <= density_values)
+                                                        & (density_values <= density_max[:, None])))
+        self.coverage_details = CellRuleLists(codes, gamma_masks, density_masks)
+
+        # A cell covered by a rule with a "don't care" bound is -1, unless normal rules cover it too:
+        # then it is the number of those normal rules
+        dont_care = gamma_dont_care | density_dont_care
+        normal_count = cell_rule_counts(gamma_masks[~dont_care], density_masks[~dont_care])
+        dont_care_count = cell_rule_counts(gamma_masks[dont_care], density_masks[dont_care])
+        self.coverage_matrix = np.where(normal_count > 0, normal_count, np.where(dont_care_count > 0, -1, 0)).astype(int)
+
+    def _calculate_sample_histogram(self):
+        """Count the hole's samples per matrix cell (rows: density bins, columns: gamma bins)."""
+        if self.sample_gamma is None:
+            self.sample_histogram = None
+            return
+        
+        # Rule edits leave the counts unchanged
+        bins = (self.density_bins, self.gamma_bins, tuple(self.density_range), tuple(self.gamma_range))
+        if bins == self._sample_histogram_bins:
+            return
+        self._sample_histogram_bins = bins
+        
+        # Uniform bins: the bin index is arithmetic (the top edge belongs to the last bin, like np.histogram2d)
+        rows = self._sample_bin_index(self.sample_density, self.density_range, self.density_bins)
+        cols = self._sample_bin_index(self.sample_gamma, self.gamma_range, self.gamma_bins)
+        inside = (rows >= 0) & (cols >= 0)
+        cells = rows[inside] * self.gamma_bins + cols[inside]
+        self.sample_histogram = np.bincount(cells, minlength=self.density_bins * self.gamma_bins).reshape(
+            self.density_bins, self.gamma_bins)
+
+    @staticmethod
+    def _sample_bin_index(values, value_range, bins):
+        """Bin of each value, -1 outside the range."""
+        low, high = value_range
+        index = np.floor((values - low) * (bins / (high - low))).astype(np.int64)
+        index[values == high] = bins - 1
+        index[(values < low) | (values > high)] = -1
+        return index
 
     def get_gap_analysis(self):
         """Return analysis of coverage gaps"""
@@ -180,12 +280,12 @@ class MatrixVisualizer(QWidget):
         analysis += f"Overlaps: {overlap_cells} ({overlap_cells/total_cells:.1%})\n"
         analysis += f"Don't care areas: {dont_care_cells} ({dont_care_cells/total_cells:.1%})\n"
 
+        if self.sample_histogram is not None and len(self.sample_gamma):
+            gap_samples = int(self.sample_histogram[self.coverage_matrix == 0].sum())
+            analysis += f"Hole samples in gaps: {gap_samples} ({gap_samples/len(self.sample_gamma):.1%})\n"
+
         # Find largest gap areas
-        gap_areas = []
-        for density_idx in range(self.density_bins):
-            for gamma_idx in range(self.gamma_bins):
-                if self.coverage_matrix[density_idx, gamma_idx] == 0:
-                    gap_areas.append((gamma_idx, density_idx))
+        gap_areas = [(gamma_idx, density_idx) for density_idx, gamma_idx in np.argwhere(self.coverage_matrix == 0)[:5]]
 
         if gap_areas:
             analysis += "\nMajor Gap Areas:"
@@ -206,6 +306,9 @@ class MatrixCanvas(QWidget):
         super().__init__(parent)
         self.coverage_matrix = None
         self.coverage_details = {}
+        self.sample_histogram = None
+        self.coverage_image = None  # One pixel per cell, scaled to the drawing area
+        self.samples_image = None
         self.cell_size = 15
         self.margin = 5
         self.label_width = 40
@@ -216,16 +319,49 @@ class MatrixCanvas(QWidget):
         self.setMinimumSize(600, 400)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
 
-    def update_coverage(self, coverage_matrix, coverage_details, gamma_range=None, density_range=None):
-        """Update the coverage data"""
+    def update_coverage(self, coverage_matrix, coverage_details, gamma_range=None, density_range=None,
+                        sample_histogram=None):
+        """Update the coverage data (and the optional per-cell sample counts of the current hole)"""
         self.coverage_matrix = coverage_matrix
         self.coverage_details = coverage_details
         if gamma_range:
             self.gamma_range = gamma_range
         if density_range:
             self.density_range = density_range
+        self.coverage_image = self._coverage_image() if coverage_matrix is not None else None
+        
+        # The sample counts only change with the hole or the bins, not with rule edits
+        if sample_histogram is None:
+            self.samples_image = None
+        elif sample_histogram is not self.sample_histogram or self.samples_image is None:
+            self.samples_image = self._samples_image(sample_histogram)
+        self.sample_histogram = sample_histogram
         self.update()
 
+    @staticmethod
+    def _rgba_image(rgba):
+        """QImage of a (rows, cols, 4) uint8 RGBA array."""
+        rows, cols, _ = rgba.shape
+        rgba = np.ascontiguousarray(rgba)
+        # copy() detaches the image from the array's buffer
+        return QImage(rgba.data, cols, rows, cols * 4, QImage.Format.Format_RGBA8888).copy()
+
+    def _coverage_image(self):
+        """Cell colours based on coverage, one pixel per cell."""
+        coverage = self.coverage_matrix
+        # Coverage is -1 (don't care), 0 (gap), 1 (single) or 2+ (overlap)
+        palette = np.array([DONT_CARE_RGBA, GAP_RGBA, SINGLE_RGBA, OVERLAP_RGBA], dtype=np.uint8)
+        return self._rgba_image(palette[np.clip(coverage, -1, 2) + 1])
+
+    def _samples_image(self, sample_histogram):
+        """Black cells whose opacity grows with the (log) number of samples."""
+        counts = np.log1p(sample_histogram)
+        peak = counts.max()
+        rgba = np.zeros(counts.shape + (4,), dtype=np.uint8)
+        if peak > 0:
+            rgba[..., 3] = np.where(counts > 0, 40 + 160 * counts / peak, 0).astype(np.uint8)
+        return self._rgba_image(rgba)
+
     def paintEvent(self, event):
         """Paint the 2D matrix"""
         if self.coverage_matrix is None:
@@ -241,35 +377,25 @@ class MatrixCanvas(QWidget):
         # Draw axes labels
         self._draw_axes_labels(painter, draw_width, draw_height)
         
-        # Draw grid
+        # Draw cells: one image pixel per cell, scaled without smoothing
         rows, cols = self.coverage_matrix.shape
         cell_width = draw_width / cols
         cell_height = draw_height / rows
+        target = QRectF(self.label_width, self.label_height, draw_width, draw_height)
+        painter.drawImage(target, self.coverage_image)
+        if self.samples_image is not None:
+            painter.drawImage(target, self.samples_image)
         
-        for row in range(rows):
-            for col in range(cols):
-                coverage = self.coverage_matrix[row, col]
-                
-                # Determine cell color based on coverage
-                if coverage == 0:
-                    color = QColor("#FF6B6B")  # Red for gaps
-                elif coverage == 1:
-                    color = QColor("#4ECDC4")  # Teal for single coverage
-                elif coverage >= 2:
-                    color = QColor("#FFE66D")  # Yellow for overlaps
-                elif coverage == -1:
-                    color = QColor("#CCCCCC")  # Gray for "don't care"
-                else:
-                    color = QColor("#FFFFFF")
-                
-                # Draw cell
-                x = self.label_width + col * cell_width
-                y = self.label_height + row * cell_height
-                cell_rect = QRectF(x, y, cell_width, cell_height)
-                
-                painter.fillRect(cell_rect, QBrush(color))
-                painter.setPen(QPen(QColor("#666666"), 0.5))
-                painter.drawRect(cell_rect)
+        # Draw grid (only when cells are large enough to see it)
+        if min(cell_width, cell_height) >= MIN_GRID_CELL_SIZE:
+            painter.setPen(QPen(QColor("#666666"), 0.5))
+            lines = [QLineF(self.label_width + col * cell_width, self.label_height,
+                            self.label_width + col * cell_width, self.label_height + draw_height)
+                     for col in range(cols + 1)]
+            lines += [QLineF(self.label_width, self.label_height + row * cell_height,
+                             self.label_width + draw_width, self.label_height + row * cell_height)
+                      for row in range(rows + 1)]
+            painter.drawLines(lines)
 
     def _draw_axes_labels(self, painter, draw_width, draw_height):
         """Draw axis labels"""
@@ -330,6 +456,8 @@ class MatrixCanvas(QWidget):
                 density_val = self.density_range[0] + row * (self.density_range[1] - self.density_range[0]) / rows
                 
                 tooltip = f"Gamma: {gamma_val:.1f}, Density: {density_val:.2f}\n"
+                if self.sample_histogram is not None:
+                    tooltip += f"Hole samples: {int(self.sample_histogram[row, col])}\n"
                 
                 if coverage == 0:
                     tooltip += "Status: GAP (No coverage)"
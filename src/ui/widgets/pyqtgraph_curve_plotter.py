@@ -4,6 +4,8 @@ Provides improved performance and features over the QGraphicsScene-based CurvePl
 Supports dual-axis plotting for LAS comparative analysis.
 """
 
+import logging
+
 import numpy as np
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QToolTip
 from PyQt6.QtGui import QColor, QPen, QFont
@@ -23,6 +25,14 @@ from .scroll_optimizer import ScrollOptimizer
 
 # Import 1Point-style curve display modes
 from .curve_display_modes import CurveDisplayModes, create_curve_display_modes
+from .anomaly_highlight_item import AnomalyHighlightItem
+
+from ...core.curve_lod import CurveLODPyramid
+
+logger = logging.getLogger(__name__)
+
+# Plot height assumed for level-of-detail selection before the widget has a size
+DEFAULT_PLOT_PIXEL_ROWS = 800
 
 class PyQtGraphCurvePlotter(QWidget):
     """A PyQtGraph-based curve plotter widget with improved performance and dual-axis support."""
@@ -76,6 +86,9 @@ class PyQtGraphCurvePlotter(QWidget):
         self.resistivity_axis = None  # Bottom3 axis for Resistivity
         self.resistivity_curves = []  # List of Resistivity curves
         self.curve_items = {}  # Dictionary mapping curve_name -> curve item(s)
+        self._curve_pyramids = {}  # curve_name -> CurveLODPyramid (None without valid samples) for self.data
+        self._drawn_axis_state = None  # Curve names, ranges and inversion behind the current axis ranges
+        self._drawn_label_state = None  # ... and curve colours, behind the current X-axis labels
         
         # Curve type identification patterns
         self.gamma_patterns = ['gamma', 'gr', 'gamma_ray', 'gammaray']
@@ -121,8 +134,10 @@ class PyQtGraphCurvePlotter(QWidget):
         
         # Anomaly detection
         self.bit_size_mm = 150.0  # Default bit size in mm
-        self.anomaly_regions = []  # List of pg.LinearRegionItem for anomaly highlighting
+        self.anomaly_highlight = None  # AnomalyHighlightItem drawing all anomaly intervals
         self.anomaly_brush = (255, 0, 0, 50)  # Semi-transparent red for anomaly regions
+        self.anomaly_min_length = 0.0  # Drop anomaly intervals shorter than this (depth units)
+        self.anomaly_max_gap = 0.0  # Merge anomaly intervals separated by at most this (depth units)
         
         # Synchronization state tracking to prevent infinite loops
         from .sync_state_tracker import SyncStateTracker
@@ -195,6 +210,10 @@ class PyQtGraphCurvePlotter(QWidget):
         self._updating_view_range = False
         self.plot_widget.sigRangeChanged.connect(self.on_view_range_changed)
         
+        # Re-pick curve level of detail when zooming, scrolling or resizing
+        self.plot_widget.sigRangeChanged.connect(self._update_curve_lod)
+        self.plot_item.vb.sigResized.connect(self._update_curve_lod)
+        
         layout.addWidget(self.plot_widget)
         
         # Add X-axis controls for each curve (legacy style)
@@ -647,6 +666,8 @@ class PyQtGraphCurvePlotter(QWidget):
         for line in traceback.format_stack()[-5:-1]:
             print(f"  {line.strip()}")
         self.data = dataframe
+        self._curve_pyramids = {}
+        self._drawn_axis_state = None  # The Y range follows the new data
         self.draw_curves()
         self.on_data_updated()
         # Update Y-axis ticks after data is set
@@ -756,28 +777,8 @@ class PyQtGraphCurvePlotter(QWidget):
         #         self._apply_cached_curves(cached_result)
         #         return
         
-        # Remove existing curve items without clearing the entire plot
-        # This preserves the dual-axis setup
-        
-        
-        
-        # Clear anomaly regions (they will be recreated after curves are drawn)
-        self.clear_anomaly_highlights()
-        
-        # Track curves to remove
-        items_to_remove = []
-        
-        # Find and remove previous curve items from main plot
-        for item in self.plot_item.items[:]:  # Copy list to avoid modification during iteration
-            if hasattr(item, 'config'):  # This is one of our curve items
-                items_to_remove.append(item)
-        
-        for item in items_to_remove:
-            self.plot_item.removeItem(item)
-        
-        # Clear gamma viewbox if it exists
-        if self.gamma_viewbox:
-            self.gamma_viewbox.clear()
+        # Phase 5: Curve items persist between draws (see _update_curve_item), so
+        # only what changed in a curve's config or data is pushed to its item
         
         # Ensure dual axes are set up
         if not self.gamma_viewbox:
@@ -785,6 +786,8 @@ class PyQtGraphCurvePlotter(QWidget):
         
         if self.data is None or self.data.empty or not self.curve_configs:
             print(f"DEBUG (draw_curves): early return - data is None: {self.data is None}, data empty: {self.data.empty if self.data is not None else 'N/A'}, curve_configs: {len(self.curve_configs) if self.curve_configs else 0}")
+            self.clear_anomaly_highlights()
+            self._remove_curve_items()
             return
         
         print(f"DEBUG (draw_curves): Proceeding to draw - data shape {self.data.shape}, depth column '{self.depth_column}' present: {self.depth_column in self.data.columns}")
@@ -792,14 +795,14 @@ class PyQtGraphCurvePlotter(QWidget):
         # Extract depth data
         if self.depth_column not in self.data.columns:
             print(f"DEBUG (draw_curves): depth column '{self.depth_column}' not in data columns: {list(self.data.columns)}")
+            self.clear_anomaly_highlights()
+            self._remove_curve_items()
             return
-            
-        depth_data = self.data[self.depth_column].values
         
         # Configure plot for current display mode
         if self.current_display_mode == 'histogram':
-            pass
-            # For histogram mode, configure the plot
+            # For histogram mode, configure the plot (this clears it, so no curve item survives)
+            self._remove_curve_items()
             self.curve_display_modes.configure_plot(self.plot_widget, self.curve_configs)
         # Note: Other modes will use existing dual-axis configuration
         
@@ -820,8 +823,6 @@ class PyQtGraphCurvePlotter(QWidget):
             is_caliper = any(curve_name.startswith(pattern) for pattern in self.caliper_patterns)
             is_resistivity = any(curve_name.startswith(pattern) for pattern in self.resistivity_patterns)
             
-            print(f"DEBUG (draw_curves classification): '{curve_name}' -> gamma={is_gamma}, caliper={is_caliper}, resistivity={is_resistivity}")
-            
             if is_gamma:
                 gamma_configs.append(config)
             elif is_caliper:
@@ -833,15 +834,21 @@ class PyQtGraphCurvePlotter(QWidget):
                 density_configs.append(config)
         
         # Track curves for legend and visibility control
+        previous_items = self.curve_items
         self.gamma_curves = []
         self.density_curves = []
         self.caliper_curves = []
         self.resistivity_curves = []
         self.curve_items = {}  # Dictionary mapping curve_name -> curve item(s)
+        group_curves = {
+            'density': self.density_curves,
+            'caliper': self.caliper_curves,
+            'resistivity': self.resistivity_curves,
+            'gamma': self.gamma_curves,
+        }
         
         # Use 1Point-style display modes for density curves
         if self.current_display_mode == 'histogram':
-            pass
             # For histogram mode, use the display modes system
             self.curve_display_modes.draw_curves(
                 self.plot_widget, 
@@ -849,259 +856,161 @@ class PyQtGraphCurvePlotter(QWidget):
                 self.depth_column, 
                 density_configs
             )
-        else:
-            # For other modes, use existing dual-axis logic (for now)
-            print(f"DEBUG (draw_curves): Plotting {len(density_configs)} density curves, {len(gamma_configs)} gamma curves, {len(caliper_configs)} caliper curves, {len(resistivity_configs)} resistivity curves")
-            # Plot density curves on main plot (bottom axis)
-            for config in density_configs:
-                curve_name = config['name']
-                color = config['color']
-                thickness = config.get('thickness', 1.5)
-                print(f"DEBUG (draw_curves): Density config '{curve_name}' - thickness in config: {thickness}, color: {color}")
-                
-                if curve_name not in self.data.columns:
-                    continue
-                    
-                # Extract curve data
-                curve_data = self.data[curve_name].values
-                
-                # Filter out NaN values
-                mask = ~np.isnan(curve_data)
-                if not np.any(mask):
+            density_configs = []
+        
+        print(f"DEBUG (draw_curves): Plotting {len(density_configs)} density curves, {len(gamma_configs)} gamma curves, {len(caliper_configs)} caliper curves, {len(resistivity_configs)} resistivity curves")
+        for group, configs in (('density', density_configs), ('caliper', caliper_configs),
+                               ('resistivity', resistivity_configs), ('gamma', gamma_configs)):
+            for config in configs:
+                curve = self._update_curve_item(group, config, previous_items.get(config['name']))
+                if curve is None:
                     continue
-                    
-                valid_depths = depth_data[mask]
-                valid_values = curve_data[mask]
-                print(f"DEBUG (draw_curves): Density curve '{curve_name}' - valid points: {len(valid_values)}, range: {valid_values.min():.2f}-{valid_values.max():.2f}, config: {config['min']}-{config['max']}")
-                
-                # Scale density values by 100 to align with gamma track (0-4.0 g/cc -> 0-400 scaled units)
-                valid_values = valid_values * 100.0
-                
-                # Phase 5: Apply downsampling for performance optimization
-                if self.performance_monitor_enabled and len(valid_values) > 1000:
-                    valid_values, valid_depths = self._get_downsampled_data(
-                        valid_values, valid_depths, self.get_view_range()
-                    )
-                
-                # Create pen for the curve with line style
-                line_style = config.get('line_style', 'solid')
-                if line_style == 'dotted':
-                    pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DotLine)
-                elif line_style == 'dashed':
-                    pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashLine)
-                elif line_style == 'dash_dot':
-                    pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashDotLine)
-                else:  # solid
-                    pen = pg.mkPen(color=color, width=thickness)
-                print(f"DEBUG (draw_curves): Density '{curve_name}' pen color={color}, thickness={thickness}, line_style={line_style}")
-                
-                # Apply inversion if specified
-                # Note: In legacy plotter:
-                # - inverted=False: axis IS inverted (for well logs) - low values on right, high on left
-                # - inverted=True: axis is NOT inverted - low values on left, high on right
-                inverted = config.get('inverted', False)
-                
-                # Plot the curve - we'll handle inversion at axis level
-                curve = self.plot_widget.plot(valid_values, valid_depths, pen=pen)
-                print(f"DEBUG (draw_curves): Added density curve '{curve_name}' to main plot, curve item: {curve}")
-                
-                # Store inversion state
-                curve.inverted = inverted
-                
-                # Store reference
-                curve.config = config
-                self.density_curves.append(curve)
+                group_curves[group].append(curve)
                 # Store in dictionary for visibility control
-                self.curve_items[curve_name] = curve
+                self.curve_items[config['name']] = curve
         
-        # Plot caliper curves on caliper viewbox (bottom2 axis)
-        for config in caliper_configs:
-            curve_name = config['name']
-            color = config['color']
-            thickness = config.get('thickness', 1.5)
-            
-            if curve_name not in self.data.columns:
-                continue
-                
-            # Extract curve data
-            curve_data = self.data[curve_name].values
-            
-            # Filter out NaN values
-            mask = ~np.isnan(curve_data)
-            if not np.any(mask):
-                continue
-                
-            valid_depths = depth_data[mask]
-            valid_values = curve_data[mask]
-            print(f"DEBUG (draw_curves): Caliper curve '{curve_name}' - valid points: {len(valid_values)}, range: {valid_values.min():.2f}-{valid_values.max():.2f}, config: {config['min']}-{config['max']}")
-            
-            # Phase 5: Apply downsampling for performance optimization
-            if self.performance_monitor_enabled and len(valid_values) > 1000:
-                valid_values, valid_depths = self._get_downsampled_data(
-                    valid_values, valid_depths, self.get_view_range()
-                )
-            
-            # Create pen for the curve with line style
-            line_style = config.get('line_style', 'solid')
-            if line_style == 'dotted':
-                pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DotLine)
-            elif line_style == 'dashed':
-                pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashLine)
-            elif line_style == 'dash_dot':
-                pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashDotLine)
-            else:  # solid
-                pen = pg.mkPen(color=color, width=thickness)
-            
-            # Apply inversion if specified
-            inverted = config.get('inverted', False)
-            
-            # Create PlotCurveItem for caliper viewbox
-            curve = pg.PlotCurveItem(valid_values, valid_depths, pen=pen)
-            curve.inverted = inverted
-            curve.config = config
-            
-            # Add to caliper viewbox
-            if self.caliper_viewbox:
-                self.caliper_viewbox.addItem(curve)
-                print(f"DEBUG (draw_curves): Added caliper curve '{curve_name}' to caliper_viewbox")
-                # Make axis visible
-                if self.caliper_axis:
-                    self.caliper_axis.setVisible(True)
-            
-            # Store reference
-            self.caliper_curves.append(curve)
-            self.curve_items[curve_name] = curve
-        
-        # Plot resistivity curves on resistivity viewbox (bottom3 axis)
-        for config in resistivity_configs:
-            curve_name = config['name']
-            color = config['color']
-            thickness = config.get('thickness', 1.5)
-            
-            if curve_name not in self.data.columns:
-                continue
-                
-            # Extract curve data
-            curve_data = self.data[curve_name].values
-            
-            # Filter out NaN values
-            mask = ~np.isnan(curve_data)
-            if not np.any(mask):
-                continue
-                
-            valid_depths = depth_data[mask]
-            valid_values = curve_data[mask]
-            print(f"DEBUG (draw_curves): Resistivity curve '{curve_name}' - valid points: {len(valid_values)}, range: {valid_values.min():.2f}-{valid_values.max():.2f}, config: {config['min']}-{config['max']}")
-            
-            # Phase 5: Apply downsampling for performance optimization
-            if self.performance_monitor_enabled and len(valid_values) > 1000:
-                valid_values, valid_depths = self._get_downsampled_data(
-                    valid_values, valid_depths, self.get_view_range()
-                )
-            
-            # Create pen for the curve with line style
-            line_style = config.get('line_style', 'solid')
-            if line_style == 'dotted':
-                pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DotLine)
-            elif line_style == 'dashed':
-                pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashLine)
-            elif line_style == 'dash_dot':
-                pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashDotLine)
-            else:  # solid
-                pen = pg.mkPen(color=color, width=thickness)
-            
-            # Apply inversion if specified
-            inverted = config.get('inverted', False)
-            
-            # Create PlotCurveItem for resistivity viewbox
-            curve = pg.PlotCurveItem(valid_values, valid_depths, pen=pen)
-            curve.inverted = inverted
-            curve.config = config
-            
-            # Add to resistivity viewbox
-            if self.resistivity_viewbox:
-                self.resistivity_viewbox.addItem(curve)
-                print(f"DEBUG (draw_curves): Added resistivity curve '{curve_name}' to resistivity_viewbox")
-                # Make axis visible
-                if self.resistivity_axis:
-                    self.resistivity_axis.setVisible(True)
-            
-            # Store reference
-            self.resistivity_curves.append(curve)
-            self.curve_items[curve_name] = curve
-        
-        # Plot gamma curves on gamma viewbox (top axis)
-        for config in gamma_configs:
-            curve_name = config['name']
-            color = config['color']
-            thickness = config.get('thickness', 1.5)
-            
-            if curve_name not in self.data.columns:
-                continue
-                
-            # Extract curve data
-            curve_data = self.data[curve_name].values
-            
-            # Filter out NaN values
-            mask = ~np.isnan(curve_data)
-            if not np.any(mask):
-                continue
-                
-            valid_depths = depth_data[mask]
-            valid_values = curve_data[mask]
-            print(f"DEBUG (draw_curves): Gamma curve '{curve_name}' - valid points: {len(valid_values)}, range: {valid_values.min():.2f}-{valid_values.max():.2f}, config: {config['min']}-{config['max']}")
-            
-            # Phase 5: Apply downsampling for performance optimization
-            if self.performance_monitor_enabled and len(valid_values) > 1000:
-                valid_values, valid_depths = self._get_downsampled_data(
-                    valid_values, valid_depths, self.get_view_range()
-                )
-            
-            # Create pen for the curve with line style
-            line_style = config.get('line_style', 'solid')
-            if line_style == 'dotted':
-                pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DotLine)
-            elif line_style == 'dashed':
-                pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashLine)
-            elif line_style == 'dash_dot':
-                pen = pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashDotLine)
-            else:  # solid
-                pen = pg.mkPen(color=color, width=thickness)
-            
-            # Apply inversion if specified
-            inverted = config.get('inverted', False)
-            
-            # Create PlotCurveItem for gamma viewbox with a name for the legend
-            curve = pg.PlotCurveItem(valid_values, valid_depths, pen=pen)
-            
-            # Store inversion state
-            curve.inverted = inverted
-            
-            # Add to gamma viewbox
-            if self.gamma_viewbox:
-                self.gamma_viewbox.addItem(curve)
-                print(f"DEBUG (draw_curves): Added gamma curve '{curve_name}' to gamma_viewbox")
-            
-            # Store reference
-            curve.config = config
-            self.gamma_curves.append(curve)
-            # Store in dictionary for visibility control
-            self.curve_items[curve_name] = curve
+        # Remove the items of curves that are no longer drawn (or moved to another axis)
+        for curve_name, curve in previous_items.items():
+            if self.curve_items.get(curve_name) is not curve:
+                self._remove_curve_item(curve)
         
         # LEGEND REMOVAL: No legend should ever be shown
         # All legend removal is done at the beginning of draw_curves
         # We must NOT access plot_item.legend property here as it may create a legend
         
-        # Set axis ranges and labels
-        self.update_axis_ranges()
+        # Axis ranges only depend on the curves' names, ranges and inversion and
+        # the X-axis labels also on their colours: pen, visibility and colour
+        # edits keep the current view
+        axis_state = tuple((config['name'], config.get('min'), config.get('max'), config.get('inverted', False))
+                           for config in sorted_configs)
+        label_state = (axis_state, tuple(config['color'] for config in sorted_configs))
         
-        # Debug: print view range
-        if self.plot_item.vb:
-            view_range = self.plot_item.vb.viewRange()
-            print(f"DEBUG (draw_curves): Main viewbox X range: {view_range[0] if view_range else 'N/A'}, Y range: {view_range[1] if view_range else 'N/A'}")
+        if axis_state != self._drawn_axis_state:
+            # Set axis ranges
+            self.update_axis_ranges()
+            self._drawn_axis_state = axis_state
+            
+            # Debug: print view range
+            if self.plot_item.vb:
+                view_range = self.plot_item.vb.viewRange()
+                print(f"DEBUG (draw_curves): Main viewbox X range: {view_range[0] if view_range else 'N/A'}, Y range: {view_range[1] if view_range else 'N/A'}")
         
-        # Setup X-axis labels (legacy feature migration)
-        self.setup_x_axis_labels()
+        if label_state != self._drawn_label_state:
+            # Setup X-axis labels (legacy feature migration)
+            self.setup_x_axis_labels()
+            self._drawn_label_state = label_state
+    
+    def _make_curve_pen(self, config):
+        """Create the pen for a curve from its colour, thickness and line style."""
+        color = config['color']
+        thickness = config.get('thickness', 1.5)
+        line_style = config.get('line_style', 'solid')
+        if line_style == 'dotted':
+            return pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DotLine)
+        elif line_style == 'dashed':
+            return pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashLine)
+        elif line_style == 'dash_dot':
+            return pg.mkPen(color=color, width=thickness, style=Qt.PenStyle.DashDotLine)
+        else:  # solid
+            return pg.mkPen(color=color, width=thickness)
+    
+    def _get_curve_group_container(self, group):
+        """Plot item or viewbox that holds the curves of a group ('density', 'caliper', 'resistivity' or 'gamma')."""
+        if group == 'density':
+            return self.plot_item
+        return {
+            'caliper': self.caliper_viewbox,
+            'resistivity': self.resistivity_viewbox,
+            'gamma': self.gamma_viewbox,
+        }[group]
+    
+    def _update_curve_item(self, group, config, curve=None):
+        """
+        Create the plot item of a curve, or bring its existing item up to date.
+        
+        An existing item of the same group is kept: its data is re-uploaded only
+        when the curve's pyramid changed (new data), its pen replaced only when
+        the colour, thickness or line style changed. Visibility always follows
+        the config's 'visible' flag, which set_curve_visibility keeps up to date.
+        
+        Args:
+            group: 'density', 'caliper', 'resistivity' or 'gamma'
+            config: Curve configuration
+            curve: Item drawn for this curve name by the previous draw, if any
+            
+        Returns:
+            The curve item, or None when the curve has no valid samples
+        """
+        curve_name = config['name']
+        if curve_name not in self.data.columns:
+            return None
+        
+        # Extract curve data (NaN values are filtered out by the LOD pyramid)
+        pyramid = self._get_curve_pyramid(curve_name)
+        if pyramid is None:
+            return None
+        
+        pen_key = (config['color'], config.get('thickness', 1.5), config.get('line_style', 'solid'))
+        if curve is None or curve.curve_group != group:
+            # Scale density values by 100 to align with gamma track (0-4.0 g/cc -> 0-400 scaled units)
+            value_scale = self.density_scale_factor if group == 'density' else 1.0
+            # Phase 5: Draw the min/max level of detail matching the current view
+            values, depths, lod = self._get_curve_lod_points(pyramid, value_scale)
+            pen = self._make_curve_pen(config)
+            container = self._get_curve_group_container(group)
+            if group == 'density':
+                curve = self.plot_widget.plot(values, depths, pen=pen)
+            else:
+                curve = pg.PlotCurveItem(values, depths, pen=pen)
+                if container:
+                    container.addItem(curve)
+                    # Make axis visible
+                    axis = {'caliper': self.caliper_axis, 'resistivity': self.resistivity_axis}.get(group)
+                    if axis:
+                        axis.setVisible(True)
+            logger.debug(f"Added {group} curve '{curve_name}' - valid points: {len(pyramid)}, config: {config['min']}-{config['max']}")
+            curve.curve_group = group
+            curve.lod = lod
+            curve.pen_key = pen_key
+        else:
+            if curve.lod[0] is not pyramid:
+                values, depths, curve.lod = self._get_curve_lod_points(pyramid, curve.lod[1])
+                curve.setData(values, depths)
+            if pen_key != curve.pen_key:
+                curve.setPen(self._make_curve_pen(config))
+                curve.pen_key = pen_key
+        
+        # No-op when unchanged
+        curve.setVisible(config.get('visible', True))
+        
+        # Store inversion state
+        # Note: In legacy plotter:
+        # - inverted=False: axis IS inverted (for well logs) - low values on right, high on left
+        # - inverted=True: axis is NOT inverted - low values on left, high on right
+        # Inversion is handled at axis level
+        curve.inverted = config.get('inverted', False)
+        
+        # Store reference
+        curve.config = config
+        return curve
+    
+    def _remove_curve_item(self, curve):
+        """Remove a curve item from its plot item or viewbox."""
+        container = self._get_curve_group_container(curve.curve_group)
+        if container:
+            container.removeItem(curve)
+    
+    def _remove_curve_items(self):
+        """Remove every curve item drawn by draw_curves."""
+        for curve in self.curve_items.values():
+            self._remove_curve_item(curve)
+        self.gamma_curves = []
+        self.density_curves = []
+        self.caliper_curves = []
+        self.resistivity_curves = []
+        self.curve_items = {}
+        self._drawn_axis_state = None
+        self._drawn_label_state = None
         
     def update_axis_ranges(self):
         """Update plot axis ranges based on curve configurations for dual-axis system."""
@@ -1865,59 +1774,60 @@ class PyQtGraphCurvePlotter(QWidget):
         
         return (min_depth, max_depth)
     
-    def _get_downsampled_data(self, values, depths, view_range=None, max_points=1000):
+    def _get_curve_pyramid(self, curve_name):
+        """
+        Min/max LOD pyramid for a data column, built once per ``set_data``.
+        
+        Returns:
+            CurveLODPyramid, or None when the column has no valid samples
+        """
+        if curve_name not in self._curve_pyramids:
+            pyramid = CurveLODPyramid(self.data[self.depth_column].values, self.data[curve_name].values)
+            self._curve_pyramids[curve_name] = pyramid if len(pyramid) else None
+        return self._curve_pyramids[curve_name]
+    
+    def _get_plot_pixel_rows(self):
+        """Height of the main plot area in pixels (a default until the widget is laid out)."""
+        height = int(self.plot_item.vb.height())
+        return height if height > 0 else DEFAULT_PLOT_PIXEL_ROWS
+    
+    def _get_curve_lod_points(self, pyramid, value_scale=1.0):
         """
-        Downsample data for performance optimization.
+        Points of a curve to plot for the current view.
+        
+        The visible depth range (plus a visible span either side) is drawn at
+        the coarsest level with a bucket per pixel row, the rest of the hole
+        at the level that fits the whole hole into the plot's height.
         
         Args:
-            values: Curve values array
-            depths: Depth values array
-            view_range: (min_depth, max_depth) tuple or None for current view
-            max_points: Maximum number of points to keep
+            pyramid: CurveLODPyramid of the curve
+            value_scale: Factor applied to the values (e.g. density to gamma units)
             
         Returns:
-            Tuple of (downsampled_values, downsampled_depths)
+            Tuple of (values, depths, lod) where ``lod`` is stored on the curve
+            item for ``_update_curve_lod``
         """
-        if len(values) <= max_points:
-            return values, depths
-            
-        # If view_range is provided, prioritize points in visible range
-        if view_range and len(view_range) == 2:
-            min_depth, max_depth = view_range
-            # Find indices in visible range
-            in_view_mask = (depths >= min_depth) & (depths <= max_depth)
-            in_view_count = np.sum(in_view_mask)
-            
-            if in_view_count > 0:
-                pass
-                # Keep more points in visible range
-                visible_ratio = min(0.7, in_view_count / len(values))
-                visible_points = int(max_points * visible_ratio)
-                outside_points = max_points - visible_points
-                
-                # Sample visible range more densely
-                if in_view_count > visible_points:
-                    visible_indices = np.where(in_view_mask)[0]
-                    step = max(1, in_view_count // visible_points)
-                    visible_sample = visible_indices[::step][:visible_points]
-                else:
-                    visible_sample = np.where(in_view_mask)[0]
-                
-                # Sample outside range less densely
-                outside_indices = np.where(~in_view_mask)[0]
-                if len(outside_indices) > outside_points:
-                    step = max(1, len(outside_indices) // outside_points)
-                    outside_sample = outside_indices[::step][:outside_points]
-                else:
-                    outside_sample = outside_indices
-                
-                # Combine samples
-                sample_indices = np.sort(np.concatenate([visible_sample, outside_sample]))
-                return values[sample_indices], depths[sample_indices]
-        
-        # Simple uniform sampling if no view range or all points outside
-        step = max(1, len(values) // max_points)
-        return values[::step], depths[::step]
+        pixel_rows = self._get_plot_pixel_rows()
+        min_depth, max_depth = self.get_view_range()
+        level, first, last = pyramid.select(min_depth, max_depth, pixel_rows)
+        start, stop = pyramid.window(level, first, last, pixel_rows)
+        depths, values = pyramid.points(level, start, stop, pixel_rows)
+        return values * value_scale, depths, (pyramid, value_scale, pixel_rows, level, start, stop)
+    
+    def _update_curve_lod(self, *args):
+        """Re-upload curves whose drawn level of detail no longer matches the view range or plot height."""
+        pixel_rows = self._get_plot_pixel_rows()
+        min_depth, max_depth = self.get_view_range()
+        for curve in list(self.curve_items.values()):
+            lod = getattr(curve, 'lod', None)
+            if lod is None:
+                continue
+            pyramid, value_scale, drawn_rows, drawn_level, start, stop = lod
+            level, first, last = pyramid.select(min_depth, max_depth, pixel_rows)
+            if level == drawn_level and pixel_rows == drawn_rows and start <= first and last <= stop:
+                continue
+            values, depths, curve.lod = self._get_curve_lod_points(pyramid, value_scale)
+            curve.setData(values, depths)
     
     def _get_viewport_cache_key(self):
         """Generate a cache key for the current viewport state."""
@@ -2519,8 +2429,11 @@ class PyQtGraphCurvePlotter(QWidget):
     
     def _update_curve_visibility(self, curve_item, visible: bool, curve_name: str):
         """Update visibility of a single curve item."""
-        # Set visibility of the curve item
+        # Set visibility of the curve item, and record it in its config so redraws keep it
         curve_item.setVisible(visible)
+        config = getattr(curve_item, 'config', None)
+        if config is not None:
+            config['visible'] = visible
         
         # NO LEGEND SYNCHRONIZATION - We never want a legend to appear
         # Accessing plot_item.legend can automatically create a legend in pyqtgraph
@@ -2608,17 +2521,21 @@ class PyQtGraphCurvePlotter(QWidget):
             return
             
         # Detect anomalies
-        anomaly_intervals = self.detect_caliper_anomalies(self.bit_size_mm)
+        anomaly_intervals = self.detect_caliper_anomalies(
+            self.bit_size_mm, min_length=self.anomaly_min_length, max_gap=self.anomaly_max_gap)
         
         # Highlight anomalies
         self.highlight_anomalies(anomaly_intervals)
         
-    def detect_caliper_anomalies(self, bit_size_mm):
+    def detect_caliper_anomalies(self, bit_size_mm, min_length=0.0, max_gap=0.0):
         """
         Detect caliper anomalies where (CAL - BitSize) > 20 mm.
         
         Args:
             bit_size_mm: Bit size in millimeters
+            min_length: Drop intervals shorter than this depth (after merging)
+            max_gap: Merge intervals whose gap (between the depths of their
+                closest anomalous samples) is at most this depth
             
         Returns:
             List of (start_depth, end_depth) tuples for anomaly intervals
@@ -2662,71 +2579,57 @@ class PyQtGraphCurvePlotter(QWidget):
         if not np.any(anomaly_mask):
             return []
             
-        # Convert mask to contiguous intervals
-        anomaly_intervals = []
-        in_anomaly = False
-        start_idx = -1
+        # Convert mask to contiguous intervals: rising and falling edges of the mask
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], anomaly_mask.view(np.int8), [0]))))
+        start_depths = valid_depths[edges[0::2]]
+        end_depths = valid_depths[edges[1::2] - 1]
         
-        for i, is_anomaly in enumerate(anomaly_mask):
-            if is_anomaly and not in_anomaly:
-                pass
-                # Start of anomaly interval
-                in_anomaly = True
-                start_idx = i
-            elif not is_anomaly and in_anomaly:
-                pass
-                # End of anomaly interval
-                in_anomaly = False
-                # Add interval (start_depth, end_depth)
-                anomaly_intervals.append((valid_depths[start_idx], valid_depths[i-1]))
-                
-        # Handle case where anomaly continues to end of data
-        if in_anomaly:
-            anomaly_intervals.append((valid_depths[start_idx], valid_depths[-1]))
+        # Bridge short gaps between consecutive intervals
+        if max_gap > 0 and len(start_depths) > 1:
+            kept = (start_depths[1:] - end_depths[:-1]) > max_gap
+            start_depths = start_depths[np.concatenate(([True], kept))]
+            end_depths = end_depths[np.concatenate((kept, [True]))]
+        
+        # Drop intervals that are too short
+        if min_length > 0:
+            long_enough = (end_depths - start_depths) >= min_length
+            start_depths = start_depths[long_enough]
+            end_depths = end_depths[long_enough]
             
-        return anomaly_intervals
+        return list(zip(start_depths.tolist(), end_depths.tolist()))
         
     def highlight_anomalies(self, anomaly_intervals):
         """
-        Highlight anomaly intervals with semi-transparent red regions.
+        Highlight anomaly intervals with semi-transparent red bands.
+        
+        All intervals are drawn by a single AnomalyHighlightItem, which only
+        paints the bands in the visible depth range.
         
         Args:
             anomaly_intervals: List of (start_depth, end_depth) tuples
         """
-        # Clear previous anomaly regions
-        self.clear_anomaly_highlights()
+        if self.anomaly_highlight is None:
+            self.anomaly_highlight = AnomalyHighlightItem(brush=self.anomaly_brush)
         
-        # Create new regions for each anomaly interval
-        for start_depth, end_depth in anomaly_intervals:
-            pass
-            # Create linear region item for anomaly interval
-            region = pg.LinearRegionItem(
-                values=[start_depth, end_depth],
-                orientation='horizontal',
-                brush=self.anomaly_brush,
-                movable=False
-            )
-            
-            # Add to plot
-            self.plot_widget.addItem(region)
+        # Re-add the item if the plot was cleared (e.g. by the histogram display mode)
+        if self.anomaly_highlight not in self.plot_item.items:
+            self.plot_widget.addItem(self.anomaly_highlight)
             
-            # Store reference
-            self.anomaly_regions.append(region)
+        self.anomaly_highlight.set_intervals(anomaly_intervals)
             
     def clear_anomaly_highlights(self):
-        """Remove all anomaly highlight regions from the plot."""
-        for region in self.anomaly_regions:
-            self.plot_widget.removeItem(region)
-        self.anomaly_regions.clear()
+        """Remove all anomaly highlight bands from the plot."""
+        if self.anomaly_highlight is not None:
+            self.anomaly_highlight.set_intervals([])
         
     def set_anomaly_highlight_visible(self, visible):
-        """Show or hide anomaly highlight regions.
+        """Show or hide anomaly highlight bands.
         
         Args:
             visible: Boolean indicating whether to show anomaly highlights
         """
-        for region in self.anomaly_regions:
-            region.setVisible(visible)
+        if self.anomaly_highlight is not None:
+            self.anomaly_highlight.setVisible(visible)
         
     def on_data_updated(self):
         """Called when data is updated to refresh anomaly detection."""
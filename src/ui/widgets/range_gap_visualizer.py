@@ -122,6 +122,11 @@ class RangeGapVisualizer(QWidget):
         # Update display
         self.update()
 
+    def set_sample_data(self, gamma_values, density_values):
+        """Set the current hole's gamma/density samples for the 2D matrix overlay"""
+        if hasattr(self, 'matrix_visualizer'):
+            self.matrix_visualizer.set_sample_data(gamma_values, density_values)
+
 
 class RangeCanvas(QWidget):
     """Canvas widget for drawing range visualization"""
@@ -1,13 +1,16 @@
 import os
 from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsTextItem, QGraphicsLineItem
 from PyQt6.QtSvgWidgets import QGraphicsSvgItem
-from PyQt6.QtGui import QBrush, QColor, QFont, QPainter, QPixmap, QPen, QTransform
+from PyQt6.QtGui import QBrush, QColor, QFont, QFontMetricsF, QPainter, QPixmap, QPen, QTransform
 from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtCore import QRectF, Qt, pyqtSignal
 import numpy as np # Import numpy
 from ...core.config import LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN
 from .svg_renderer import SvgRenderer
 
+# Default QTextDocument margin, which offset the text of the QGraphicsTextItem axis labels
+AXIS_LABEL_MARGIN = 4
+
 class StratigraphicColumn(QGraphicsView):
     unitClicked = pyqtSignal(int)  # emits unit index when a unit is clicked
     
@@ -156,78 +159,87 @@ class StratigraphicColumn(QGraphicsView):
 
         # Draw stratigraphic units
 #         print(f"DEBUG (StratigraphicColumn): Drawing {len(units_dataframe)} units, min_depth={self.min_depth}, max_depth={self.max_depth}")
-        for index, unit in units_dataframe.iterrows():
-            from_depth = unit['from_depth']
-            to_depth = unit['to_depth']
-            thickness = unit[RECOVERED_THICKNESS_COLUMN]
-            lithology_code = unit[LITHOLOGY_COLUMN]
-            lithology_qualifier = unit.get('lithology_qualifier', '')
-            svg_file = unit.get('svg_path')
+        # Pens are shared by all units; brushes by all units with the same pattern and colour
+        border_pen = QPen(QColor(Qt.GlobalColor.gray), 0.5)
+        thin_unit_pen = QPen(Qt.GlobalColor.transparent, 0)
+        separator_pen = QPen(QColor(Qt.GlobalColor.gray))
+        separator_pen.setWidthF(separator_thickness)
+        brushes = {}
+        if self.disable_svg:
+            print(f"DEBUG (StratigraphicColumn): SVG patterns disabled, using solid color")
+
+        # Unit geometry for the whole column at once
+        y_starts = (units_dataframe['from_depth'].to_numpy(dtype=float) - self.min_depth) * self.depth_scale
+        rect_heights = units_dataframe[RECOVERED_THICKNESS_COLUMN].to_numpy(dtype=float) * self.depth_scale
+
+        # Apply minimum display height for very thin units
+        thin = (rect_heights > 0) & (rect_heights < self.min_display_height_pixels)
+        rect_heights[thin] = self.min_display_height_pixels
+
+        # Safety check to prevent drawing zero-height rectangles
+        drawn = ~(rect_heights <= 0)
+
+        lithology_codes = units_dataframe[LITHOLOGY_COLUMN].to_numpy()[drawn].tolist()
+        svg_files = self._unit_values(units_dataframe, 'svg_path')[drawn].tolist()
+        bg_color_strs = self._unit_values(units_dataframe, 'background_color')[drawn].tolist()
+        x_left = self.y_axis_width
+        x_right = self.y_axis_width + self.column_width
+
+        for y_start, rect_height, lithology_code, svg_file, bg_color_str in zip(
+                y_starts[drawn].tolist(), rect_heights[drawn].tolist(), lithology_codes, svg_files, bg_color_strs):
             if svg_file is None:
                 svg_file = ''
-            bg_color_str = unit.get('background_color')
             if not bg_color_str:
                 bg_color_str = '#FFFFFF'
-            bg_color = QColor(bg_color_str)
-            if not bg_color.isValid():
-                print(f"WARNING (StratigraphicColumn): Invalid background_color '{bg_color_str}' for lithology {lithology_code}, falling back to white")
-                bg_color = QColor('#FFFFFF')
-
-            # Commented out verbose debug - keep console clean
-            # print(f"DEBUG (StratigraphicColumn): Drawing unit {index}: from={from_depth}, to={to_depth}, thickness={thickness}, code={lithology_code}, background_color_raw={unit.get('background_color', 'MISSING')}, color={bg_color.name()}, svg={svg_file}")
-#             print(f"DEBUG (StratigraphicColumn): Unit columns: {list(unit.keys()) if hasattr(unit, 'keys') else 'not a dict'}")
-
-            y_start = (from_depth - self.min_depth) * self.depth_scale
-            rect_height = thickness * self.depth_scale
-
-            # Apply minimum display height for very thin units
-            if rect_height > 0 and rect_height < self.min_display_height_pixels:
-                rect_height = self.min_display_height_pixels
-            
-            # Safety check to prevent drawing zero-height rectangles
-            if rect_height <= 0:
-                continue
 
-#             print(f"DEBUG (StratigraphicColumn): Unit {index} rect_height={rect_height:.2f}px, border={'gray 0.5px' if rect_height >= 5 else 'transparent'}")
+            brush = brushes.get((svg_file, bg_color_str))
+            if brush is None:
+                brush = self._unit_brush(svg_file, bg_color_str, lithology_code)
+                brushes[(svg_file, bg_color_str)] = brush
 
             # Position the column to the right of the Y-axis
-            rect_item = QGraphicsRectItem(self.y_axis_width, y_start, self.column_width, rect_height)
-            
             # Add a subtle border to make units visible, but use transparent for very thin units
             # Thin units (< 5px) get transparent borders to prevent grey appearance
-            if rect_height >= 5:
-                rect_item.setPen(QPen(QColor(Qt.GlobalColor.gray), 0.5))
-            else:
-                # For very thin units, use transparent border to avoid grey appearance
-                rect_item.setPen(QPen(Qt.GlobalColor.transparent, 0))
-
-            # Check if SVG patterns are disabled
-            if self.disable_svg:
-                print(f"DEBUG (StratigraphicColumn): SVG patterns disabled, using solid color")
-                pixmap = None
-            else:
-                pixmap = self.svg_renderer.render_svg(svg_file, self.column_width, int(rect_height), bg_color)
-#             print(f"DEBUG (StratigraphicColumn): pixmap created: {pixmap is not None}")
-            if pixmap:
-                print(f"DEBUG (StratigraphicColumn): Setting pixmap brush for unit {index}")
-                rect_item.setBrush(QBrush(pixmap))
-            else:
-#                 print(f"DEBUG (StratigraphicColumn): Setting solid color brush for unit {index}: {bg_color.name()}")
-                rect_item.setBrush(QBrush(bg_color))
-            
-            self.scene.addItem(rect_item)
+            self.scene.addRect(x_left, y_start, self.column_width, rect_height,
+                               border_pen if rect_height >= 5 else thin_unit_pen, brush)
 
             # Draw a thin grey line at the bottom of each unit to act as a separator
             if draw_separators and separator_thickness > 0:
-                separator_pen = QPen(QColor(Qt.GlobalColor.gray))
-                separator_pen.setWidthF(separator_thickness)
-                line_item = QGraphicsLineItem(self.y_axis_width, y_start + rect_height, self.y_axis_width + self.column_width, y_start + rect_height)
-                line_item.setPen(separator_pen)
-                self.scene.addItem(line_item)
+                self.scene.addLine(x_left, y_start + rect_height, x_right, y_start + rect_height, separator_pen)
 
         self.fitInView(self.scene.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
         self.verticalScrollBar().setValue(self.verticalScrollBar().maximum()) # Scroll to bottom to show top of log
 
+    @staticmethod
+    def _unit_values(units_dataframe, column):
+        """Values of an optional unit column as an object array (None throughout when the column is missing)."""
+        if column not in units_dataframe.columns:
+            return np.full(len(units_dataframe), None, dtype=object)
+        return units_dataframe[column].to_numpy(dtype=object)
+
+    def _unit_brush(self, svg_file, bg_color_str, lithology_code):
+        """
+        Brush for units with this pattern and background colour.
+
+        The pattern is tiled as a square texture of the column's width, rendered
+        once per pattern, colour, width and DPI by the SVG renderer's tile cache,
+        so thousands of units share a handful of pixmaps. Falls back to the plain
+        background colour when SVGs are disabled or the pattern cannot be rendered.
+        """
+        bg_color = QColor(bg_color_str)
+        if not bg_color.isValid():
+            print(f"WARNING (StratigraphicColumn): Invalid background_color '{bg_color_str}' for lithology {lithology_code}, falling back to white")
+            bg_color = QColor('#FFFFFF')
+
+        if not self.disable_svg:
+            tile = self.svg_renderer.render_tile(svg_file, self.column_width, bg_color, self.devicePixelRatioF())
+            if tile is not None:
+                # Tiles line up with the column's left edge and repeat down the whole column
+                brush = QBrush(tile)
+                brush.setTransform(QTransform.fromTranslate(self.y_axis_width, 0))
+                return brush
+        return QBrush(bg_color)
+
     def set_zoom_level(self, zoom_factor):
         """Set zoom level (1.0 = 100% = normal fit level)."""
         # In overview mode, ignore zoom commands - overview should not zoom
@@ -333,6 +345,7 @@ class StratigraphicColumn(QGraphicsView):
         print(f"DEBUG (StratigraphicColumn._draw_y_axis): Drawing metre marks from {start_whole_metre:.0f}m to {end_whole_metre:.0f}m")
         
         # Draw major ticks at every whole metre
+        label_height = QFontMetricsF(axis_font).height()
         current_whole_metre = start_whole_metre
         while current_whole_metre <= end_whole_metre:
             pass
@@ -342,12 +355,11 @@ class StratigraphicColumn(QGraphicsView):
             # Draw tick mark (10px long)
             self.scene.addLine(self.y_axis_width - 10, y_pos, self.y_axis_width, y_pos, axis_pen)
             
-            # Draw label (integer depth)
+            # Draw label (integer depth). Simple text items avoid a QTextDocument per label;
+            # the offset keeps them where a QGraphicsTextItem's document margin put the text
             label_text = f"{current_whole_metre:.0f}"
-            text_item = QGraphicsTextItem(label_text)
-            text_item.setFont(axis_font)
-            text_item.setPos(self.y_axis_width - 30, y_pos - text_item.boundingRect().height() / 2)
-            self.scene.addItem(text_item)
+            text_item = self.scene.addSimpleText(label_text, axis_font)
+            text_item.setPos(self.y_axis_width - 30 + AXIS_LABEL_MARGIN, y_pos - label_height / 2)
             
 #             print(f"DEBUG (StratigraphicColumn._draw_y_axis): Drew metre mark at {current_whole_metre:.0f}m, y_pos={y_pos:.1f}px")
             
@@ -5,6 +5,7 @@ from PyQt6.QtGui import QPixmap, QPainter, QColor
 class SvgRenderer:
     def __init__(self):
         self.renderer_cache = {}
+        self.tile_cache = {}  # (svg_path, rgba, size, device_pixel_ratio) -> QPixmap or None
 
     def get_renderer(self, svg_path):
         if not svg_path:
@@ -49,3 +50,18 @@ class SvgRenderer:
         
         # print(f"DEBUG (SvgRenderer): Returning pixmap, isNull={pixmap.isNull()}, size={pixmap.size().width()}x{pixmap.size().height()}")
         return pixmap
+
+    def render_tile(self, svg_path, size, background_color, device_pixel_ratio=1.0):
+        """Square pattern tile of ``size`` logical pixels, rendered once per path, colour, size and DPI."""
+        key = (svg_path, QColor(background_color).rgba(), size, device_pixel_ratio)
+        if key not in self.tile_cache:
+            pixel_size = max(1, round(size * device_pixel_ratio))
+            pixmap = self.render_svg(svg_path, pixel_size, pixel_size, background_color)
+            if pixmap is not None:
+                pixmap.setDevicePixelRatio(device_pixel_ratio)
+            self.tile_cache[key] = pixmap
+        return self.tile_cache[key]
+
+    def clear_cache(self):
+        self.renderer_cache.clear()
+        self.tile_cache.clear()
@@ -0,0 +1,11 @@
+"""
+Shared pytest configuration.
+"""
+
+import os
+import tempfile
+
+# Keep the LAS parse cache, collar index and dictionary cache out of the user's home directory during tests
+os.environ.setdefault('EARTHWORM_LAS_CACHE_DIR', tempfile.mkdtemp(prefix='earthworm-las-cache-'))
+os.environ.setdefault('EARTHWORM_COLLAR_INDEX_DIR', tempfile.mkdtemp(prefix='earthworm-collars-'))
+os.environ.setdefault('EARTHWORM_DICTIONARY_CACHE_DIR', tempfile.mkdtemp(prefix='earthworm-dictionaries-'))
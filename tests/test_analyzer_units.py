@@ -0,0 +1,96 @@
+"""
+Unit tests for grouping classified samples into lithological units.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.analyzer import Analyzer
+from src.core.config import COALLOG_V31_COLUMNS, DEFAULT_LITHOLOGY_RULES, LITHOLOGY_COLUMN
+
+
+@pytest.fixture
+def analyzer():
+    return Analyzer()
+
+
+def classified_hole(codes, step=0.1, top=10.0):
+    """Build a classified sample DataFrame from a list of lithology codes."""
+    return pd.DataFrame({
+        'DEPT': top + np.arange(len(codes)) * step,
+        LITHOLOGY_COLUMN: codes,
+    })
+
+
+class TestGroupStandardUnits:
+    """Test run-length grouping of classified samples."""
+
+    def test_unit_boundaries(self, analyzer):
+        df = classified_hole(['CO', 'CO', 'SS', 'SS', 'SS', 'CO', 'NL'])
+        units = analyzer.group_into_units(df, DEFAULT_LITHOLOGY_RULES)
+
+        assert list(units[LITHOLOGY_COLUMN]) == ['CO', 'SS', 'CO', 'NL']
+        np.testing.assert_allclose(units['from_depth'], [10.0, 10.2, 10.5, 10.6])
+        np.testing.assert_allclose(units['to_depth'], [10.2, 10.5, 10.6, 10.6])
+        np.testing.assert_allclose(units['recovered_thickness'], [0.2, 0.3, 0.1, 0.0], atol=1e-9)
+
+    def test_column_layout_and_rule_properties(self, analyzer):
+        rules = [dict(rule, qualifier='CL' if rule['code'] == 'SS' else '') for rule in DEFAULT_LITHOLOGY_RULES]
+        units = analyzer.group_into_units(classified_hole(['SS', 'SS', 'XM']), rules)
+
+        assert list(units.columns) == COALLOG_V31_COLUMNS + ['background_color', 'svg_path']
+        assert list(units['lithology_qualifier']) == ['CL', '']
+        assert list(units['background_color']) == ['#FFFF00', '#8b4513']
+        assert list(units['record_sequence_flag']) == ['', '']
+        assert list(units['lithology_percent']) == [0.0, 0.0]
+
+    def test_unsorted_input_is_sorted(self, analyzer):
+        df = classified_hole(['CO', 'SS', 'SS']).iloc[::-1]
+        units = analyzer.group_into_units(df, DEFAULT_LITHOLOGY_RULES)
+        assert list(units[LITHOLOGY_COLUMN]) == ['CO', 'SS']
+
+    def test_single_sample_and_empty(self, analyzer):
+        units = analyzer.group_into_units(classified_hole(['SH']), DEFAULT_LITHOLOGY_RULES)
+        assert len(units) == 1
+        assert units.iloc[0]['recovered_thickness'] == 0.0
+
+        empty = analyzer.group_into_units(classified_hole([]), DEFAULT_LITHOLOGY_RULES)
+        assert empty.empty
+        assert list(empty.columns) == COALLOG_V31_COLUMNS + ['background_color', 'svg_path']
+
+
+def unit_table(rows):
+    """Build a units DataFrame from (from_depth, to_depth, code) tuples."""
+    units = pd.DataFrame(rows, columns=['from_depth', 'to_depth', LITHOLOGY_COLUMN])
+    units['recovered_thickness'] = units['to_depth'] - units['from_depth']
+    units['lithology_qualifier'] = ''
+    return units
+
+
+class TestMergeThinUnits:
+    """Test merging thin units into following units of the same lithology."""
+
+    def test_thin_units_absorb_same_lithology(self, analyzer):
+        units = unit_table([
+            (0.0, 0.02, 'CO'), (0.02, 0.04, 'CO'), (0.04, 0.5, 'CO'),
+            (0.5, 0.51, 'SS'), (0.51, 0.52, 'SH'), (0.52, 1.0, 'SH'),
+        ])
+        merged = analyzer.merge_thin_units(units, threshold=0.05)
+
+        assert list(merged[LITHOLOGY_COLUMN]) == ['CO', 'SS', 'SH']
+        np.testing.assert_allclose(merged['from_depth'], [0.0, 0.5, 0.51])
+        np.testing.assert_allclose(merged['to_depth'], [0.5, 0.51, 1.0])
+        np.testing.assert_allclose(merged['recovered_thickness'], [0.5, 0.01, 0.49])
+
+    def test_merging_stops_once_thick_enough(self, analyzer):
+        units = unit_table([(0.0, 0.04, 'CO'), (0.04, 0.1, 'CO'), (0.1, 0.12, 'CO')])
+        merged = analyzer.merge_thin_units(units, threshold=0.05)
+        np.testing.assert_allclose(merged['to_depth'], [0.1, 0.12])
+
+    def test_qualifier_must_match(self, analyzer):
+        units = unit_table([(0.0, 0.01, 'SS'), (0.01, 0.5, 'SS')])
+        units.loc[1, 'lithology_qualifier'] = 'CL'
+        merged = analyzer.merge_thin_units(units, threshold=0.05)
+        assert len(merged) == 2
+        assert list(merged.columns) == COALLOG_V31_COLUMNS + ['background_color', 'svg_path']
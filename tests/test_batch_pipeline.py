@@ -0,0 +1,107 @@
+"""
+Unit tests for the headless batch analysis pipeline.
+"""
+
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from src.core import batch_pipeline
+from src.core.batch_pipeline import AnalysisSettings, BatchAnalysisPipeline, analyze_hole, output_path_for
+from src.core.config import DEFAULT_LITHOLOGY_RULES
+
+
+LAS_HEADER = """~VERSION INFORMATION
+ VERS.   2.0 : CWLS LOG ASCII STANDARD - VERSION 2.0
+ WRAP.   NO  : One line per depth step
+~WELL INFORMATION
+ NULL.  -999.25 : NULL VALUE
+~CURVE INFORMATION
+ DEPT.M    : Depth
+ GR  .API  : Gamma ray
+ RHOB.G/CC : Bulk density
+~A
+"""
+
+
+def write_hole(path, seed):
+    rng = np.random.default_rng(seed)
+    depths = 10.0 + np.arange(400) * 0.05
+    gamma = np.repeat(rng.uniform(0, 150, 40), 10)
+    density = np.repeat(rng.uniform(1.2, 2.9, 40), 10)
+    lines = [f"{d:.3f} {g:.3f} {r:.3f}" for d, g, r in zip(depths, gamma, density)]
+    path.write_text(LAS_HEADER + "\n".join(lines) + "\n")
+    return str(path)
+
+
+def crash_on_bad_hole(file_path, settings):
+    """analyze_hole that kills its worker process for files named bad*.las."""
+    if os.path.basename(file_path).startswith("bad"):
+        os._exit(1)
+    return analyze_hole(file_path, settings)
+
+
+@pytest.fixture
+def settings():
+    return AnalysisSettings(mnemonic_map={'gamma': 'GR', 'density': 'RHOB'},
+                            lithology_rules=DEFAULT_LITHOLOGY_RULES, template_path=None)
+
+
+class TestBatchAnalysisPipeline:
+    """Test batch runs, failure isolation and reporting."""
+
+    def test_failures_are_isolated(self, tmp_path, settings):
+        good = [write_hole(tmp_path / f"hole_{i}.las", i) for i in range(3)]
+        missing = str(tmp_path / "missing.las")
+        progress = []
+
+        report = BatchAnalysisPipeline(settings, max_workers=2).run(
+            good[:2] + [missing] + good[2:], progress_callback=lambda done, total, result: progress.append(done))
+
+        assert [result.file_path for result in report.results] == good[:2] + [missing] + good[2:]
+        assert len(report.succeeded) == 3 and len(report.failed) == 1
+        assert report.failed[0].file_path == missing
+        assert sorted(progress) == [1, 2, 3, 4]
+        assert "1 failed" in report.summary()
+
+    @pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                        reason="workers only see the patched analyze_hole when forked")
+    def test_dead_worker_only_fails_its_hole(self, tmp_path, settings, monkeypatch):
+        monkeypatch.setattr(batch_pipeline, 'analyze_hole', crash_on_bad_hole)
+        file_paths = [write_hole(tmp_path / f"hole_{i}.las", i) for i in range(7)]
+        file_paths.insert(2, write_hole(tmp_path / "bad.las", 7))
+        progress = []
+
+        report = BatchAnalysisPipeline(settings, max_workers=2).run(
+            file_paths, progress_callback=lambda done, total, result: progress.append(done))
+
+        assert [result.file_path for result in report.results] == file_paths
+        assert [result.file_path for result in report.failed] == [file_paths[2]]
+        assert "Worker process failed" in report.failed[0].error
+        assert len(report.succeeded) == 7
+        assert sorted(progress) == list(range(1, 9))
+
+    def test_results_match_single_hole_analysis(self, tmp_path, settings):
+        file_path = write_hole(tmp_path / "hole.las", 5)
+        units, classified = analyze_hole(file_path, settings)
+
+        report = BatchAnalysisPipeline(settings, max_workers=1).run([file_path])
+        result = report.results[0]
+        assert result.success
+        assert result.num_samples == len(classified)
+        assert result.num_units == len(units)
+        assert sum(result.lithology_thickness.values()) == pytest.approx(units['recovered_thickness'].sum())
+
+    def test_template_export_and_report(self, tmp_path, settings):
+        settings.template_path = AnalysisSettings.__dataclass_fields__['template_path'].default
+        settings.output_dir = str(tmp_path / "out")
+        file_path = write_hole(tmp_path / "hole.las", 1)
+
+        report = BatchAnalysisPipeline(settings, max_workers=1).run([file_path])
+        assert report.results[0].output_path == output_path_for(file_path, settings)
+        assert (tmp_path / "out" / "hole_lithology.xlsx").exists()
+
+        report.save(str(tmp_path / "report.csv"))
+        assert list(report.to_dataframe()['success']) == [True]
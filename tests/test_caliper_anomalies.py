@@ -0,0 +1,118 @@
+"""
+Unit tests for caliper anomaly detection and the batched highlight item.
+
+detect_caliper_anomalies must return the intervals of the sample-by-sample
+scan it replaces, and all intervals must be drawn by one scene item.
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pyqtgraph as pg
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from src.ui.widgets.anomaly_highlight_item import AnomalyHighlightItem
+from src.ui.widgets.pyqtgraph_curve_plotter import PyQtGraphCurvePlotter
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def plotter(app, monkeypatch):
+    # update_axis_ranges reads AxisItem.ticks, which not every pyqtgraph version defines
+    monkeypatch.setattr(pg.AxisItem, 'ticks', None, raising=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plotter = PyQtGraphCurvePlotter()
+        plotter.curve_configs = [{'name': 'CAL', 'color': '#00AA00', 'min': 100, 'max': 250}]
+        plotter.set_data(make_log(200_000))
+    return plotter
+
+
+def make_log(count, seed=0):
+    """Caliper around a 150 mm bit with many short washouts and NaN gaps."""
+    rng = np.random.default_rng(seed)
+    caliper = 150 + 5 * rng.standard_normal(count)
+    caliper[rng.random(count) < 0.02] = 190.0
+    caliper[rng.choice(count, count // 100, replace=False)] = np.nan
+    return pd.DataFrame({'DEPT': np.arange(count) * 0.01, 'CAL': caliper})
+
+
+def reference_intervals(data, bit_size_mm):
+    """Sample-by-sample scan, as previously done in detect_caliper_anomalies."""
+    cal = data['CAL'].values
+    valid = ~np.isnan(cal)
+    depths = data['DEPT'].values[valid]
+    anomaly_mask = (cal[valid] - bit_size_mm) > 20
+    intervals = []
+    in_anomaly = False
+    start_idx = -1
+    for i, is_anomaly in enumerate(anomaly_mask):
+        if is_anomaly and not in_anomaly:
+            in_anomaly = True
+            start_idx = i
+        elif not is_anomaly and in_anomaly:
+            in_anomaly = False
+            intervals.append((depths[start_idx], depths[i - 1]))
+    if in_anomaly:
+        intervals.append((depths[start_idx], depths[-1]))
+    return intervals
+
+
+class TestCaliperAnomalies:
+    """Interval detection and batched highlights."""
+
+    def test_matches_reference(self, plotter):
+        intervals = plotter.detect_caliper_anomalies(150.0)
+        assert len(intervals) > 1000
+        assert intervals == reference_intervals(plotter.data, 150.0)
+
+        # Anomalies running into the first and last samples
+        with contextlib.redirect_stdout(io.StringIO()):
+            plotter.set_data(pd.DataFrame({'DEPT': [0.0, 0.5, 1.0, 1.5], 'CAL': [190.0, 150.0, np.nan, 200.0]}))
+        assert plotter.detect_caliper_anomalies(150.0) == [(0.0, 0.0), (1.5, 1.5)]
+        assert plotter.detect_caliper_anomalies(250.0) == []
+
+    def test_gap_bridging_and_min_length(self, plotter):
+        data = pd.DataFrame({'DEPT': np.arange(12) * 0.1,
+                             'CAL': [190, 190, 150, 190, 150, 150, 150, 190, 190, 190, 150, 190]})
+        with contextlib.redirect_stdout(io.StringIO()):
+            plotter.set_data(data)
+
+        def detect(**kwargs):
+            return np.array(plotter.detect_caliper_anomalies(150.0, **kwargs)).reshape(-1, 2)
+
+        assert np.allclose(detect(), [(0.0, 0.1), (0.3, 0.3), (0.7, 0.9), (1.1, 1.1)])
+        assert np.allclose(detect(max_gap=0.25), [(0.0, 0.3), (0.7, 1.1)])
+        assert np.allclose(detect(min_length=0.15), [(0.7, 0.9)])
+        assert np.allclose(detect(min_length=0.35, max_gap=0.25), [(0.7, 1.1)])
+
+    def test_single_highlight_item(self, app, plotter):
+        intervals = plotter.detect_caliper_anomalies(150.0)
+        highlights = [item for item in plotter.plot_item.items if isinstance(item, AnomalyHighlightItem)]
+        assert highlights == [plotter.anomaly_highlight]
+        assert len(plotter.anomaly_highlight) == len(intervals)
+
+        # Only bands overlapping the view are drawn, merged down to at most one per pixel row
+        plotter.resize(300, 600)
+        plotter.show()
+        app.processEvents()
+        plotter.plot_widget.setYRange(100.0, 110.0, padding=0)
+        starts, ends = plotter.anomaly_highlight.visible_bands()
+        in_view = [(start, end) for start, end in intervals if end >= 100.0 and start <= 110.0]
+        assert 0 < len(starts) <= len(in_view)
+        assert starts[0] == in_view[0][0] and ends[-1] == in_view[-1][1]
+        plotter.plot_widget.setYRange(0.0, 2000.0, padding=0)
+        assert len(plotter.anomaly_highlight.visible_bands()[0]) <= plotter.plot_item.vb.height() + 1
+        plotter.plot_widget.grab()
+
+        plotter.update_anomaly_detection()
+        plotter.clear_anomaly_highlights()
+        assert len(plotter.anomaly_highlight) == 0
+        assert [item for item in plotter.plot_item.items if isinstance(item, AnomalyHighlightItem)] == highlights
+        plotter.close()
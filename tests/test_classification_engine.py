@@ -0,0 +1,165 @@
+"""
+Unit tests for the vectorised lithology classification engine.
+
+The compiled engine must give exactly the same codes as applying each rule in
+turn to the still-unclassified rows, which is how Analyzer.classify_rows used
+to work.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.analyzer import Analyzer
+from src.core.classification_engine import CompiledLithologyRules
+from src.core.config import INVALID_DATA_VALUE, LITHOLOGY_COLUMN, RESEARCHED_LITHOLOGY_DEFAULTS
+
+
+RULES = [
+    {'name': 'Coal', 'code': 'CO', 'gamma_min': 0, 'gamma_max': 20, 'density_min': 0, 'density_max': 1.8},
+    {'name': 'Not Logged', 'code': 'NL', 'gamma_min': -1, 'gamma_max': -1, 'density_min': -1, 'density_max': -1},
+    {'name': 'Siltstone', 'code': 'ST', 'gamma_min': 0.0, 'gamma_max': 0.0,
+     'density_min': INVALID_DATA_VALUE, 'density_max': INVALID_DATA_VALUE},
+    {'name': 'Sandstone', 'code': 'SS', 'gamma_min': 21, 'gamma_max': 50, 'density_min': 2.0, 'density_max': 2.7},
+    {'name': 'Tuff', 'code': 'TF', 'gamma_min': INVALID_DATA_VALUE, 'gamma_max': INVALID_DATA_VALUE,
+     'density_min': 2.1, 'density_max': 2.2},
+    {'name': 'Shale', 'code': 'SH', 'gamma_min': 51, 'gamma_max': 100, 'density_min': 2.5, 'density_max': 3.0},
+    {'name': 'Sandstone again', 'code': 'SS', 'gamma_min': 40, 'gamma_max': 120, 'density_min': 1.5, 'density_max': 2.6},
+]
+
+
+def reference_classify(df, rules, use_researched_defaults):
+    """Rule-by-rule classification, as previously done in Analyzer.classify_rows."""
+    result = pd.Series('NL', index=df.index, dtype=object)
+    for rule in rules:
+        code = rule['code']
+        if code == 'NL':
+            continue
+        gamma_min, gamma_max = rule['gamma_min'], rule['gamma_max']
+        density_min, density_max = rule['density_min'], rule['density_max']
+        gamma_ignore = gamma_min == INVALID_DATA_VALUE and gamma_max == INVALID_DATA_VALUE
+        density_ignore = density_min == INVALID_DATA_VALUE and density_max == INVALID_DATA_VALUE
+        if use_researched_defaults and code in RESEARCHED_LITHOLOGY_DEFAULTS:
+            defaults = RESEARCHED_LITHOLOGY_DEFAULTS[code]
+            if gamma_ignore or (gamma_min == 0.0 and gamma_max == 0.0):
+                gamma_min, gamma_max, gamma_ignore = defaults['gamma_min'], defaults['gamma_max'], False
+            if density_ignore or (density_min == 0.0 and density_max == 0.0):
+                density_min, density_max, density_ignore = defaults['density_min'], defaults['density_max'], False
+        gamma_condition = True if gamma_ignore else (df['gamma'] >= gamma_min) & (df['gamma'] <= gamma_max)
+        density_condition = True if density_ignore else (df['density'] >= density_min) & (df['density'] <= density_max)
+        result[(result == 'NL') & gamma_condition & density_condition] = code
+    return result
+
+
+def reference_nearest(gamma_val, density_val):
+    """Per-sample nearest lithology, as previously done in Analyzer._get_nearest_lithology."""
+    best_match, min_distance = None, float('inf')
+    for code, defaults in RESEARCHED_LITHOLOGY_DEFAULTS.items():
+        gamma_center = (defaults['gamma_min'] + defaults['gamma_max']) / 2
+        density_center = (defaults['density_min'] + defaults['density_max']) / 2
+        gamma_range = defaults['gamma_max'] - defaults['gamma_min']
+        density_range = defaults['density_max'] - defaults['density_min']
+        distance = ((abs(gamma_val - gamma_center) / gamma_range) ** 2 +
+                    (abs(density_val - density_center) / density_range) ** 2) ** 0.5
+        if distance < min_distance:
+            min_distance, best_match = distance, code
+    return best_match if min_distance <= 2.0 else None
+
+
+def reference_extreme(gamma_val, density_val):
+    """Per-sample extreme value rules, as previously done in Analyzer._apply_extreme_value_rules."""
+    if density_val < 1.0:
+        return 'CO'
+    elif density_val > 3.5:
+        return 'IG'
+    elif gamma_val > 200:
+        return 'SH'
+    elif gamma_val < 10 and 2.0 <= density_val <= 3.0:
+        return 'SS' if density_val < 2.7 else 'LS'
+    return None
+
+
+@pytest.fixture
+def samples():
+    """Random gamma/density samples with a sprinkling of nulls."""
+    rng = np.random.default_rng(42)
+    n = 20000
+    df = pd.DataFrame({
+        'DEPT': np.arange(n) * 0.01,
+        'gamma': rng.uniform(-10, 200, n),
+        'density': rng.uniform(0.8, 3.4, n),
+    })
+    df.loc[rng.choice(n, 500, replace=False), 'gamma'] = np.nan
+    df.loc[rng.choice(n, 500, replace=False), 'density'] = np.nan
+    return df
+
+
+class TestCompiledLithologyRules:
+    """Test rule compilation and first-match-wins classification."""
+
+    @pytest.mark.parametrize("use_researched_defaults", [True, False])
+    def test_matches_rule_by_rule_classification(self, samples, use_researched_defaults):
+        rule_set = CompiledLithologyRules(RULES, use_researched_defaults)
+        codes = rule_set.labels(rule_set.classify(samples['gamma'], samples['density']))
+        expected = reference_classify(samples, RULES, use_researched_defaults)
+        assert list(codes) == list(expected)
+
+    def test_codes_are_compact_integers(self):
+        rule_set = CompiledLithologyRules(RULES)
+        assert rule_set.codes[0] == 'NL'
+        assert rule_set.rule_codes.dtype == np.int8
+        assert len(rule_set.rule_codes) == len(RULES) - 1
+
+    def test_nl_rule_and_empty_rules(self):
+        rule_set = CompiledLithologyRules([RULES[1]])
+        result = rule_set.classify(np.array([10.0, 50.0]), np.array([1.5, 2.5]))
+        assert list(rule_set.labels(result)) == ['NL', 'NL']
+
+
+class TestAnalyzerClassifyRows:
+    """Test the classify_rows integration."""
+
+    def test_classify_rows_uses_engine(self, samples):
+        mnemonic_map = {'gamma': 'GR', 'density': 'density'}
+        classified = Analyzer().classify_rows(samples, RULES, mnemonic_map)
+        expected = reference_classify(samples, RULES, True)
+        assert list(classified[LITHOLOGY_COLUMN]) == list(expected)
+        assert LITHOLOGY_COLUMN not in samples.columns
+
+
+class TestFallbackClassification:
+    """Test the batch nearest-lithology and extreme value fallbacks."""
+
+    @pytest.fixture
+    def wide_samples(self):
+        """Samples spread well beyond the researched ranges."""
+        rng = np.random.default_rng(7)
+        n = 5000
+        df = pd.DataFrame({
+            'DEPT': np.arange(n) * 0.01,
+            'gamma': rng.uniform(-50, 400, n),
+            'density': rng.uniform(0.2, 4.5, n),
+        })
+        df.loc[rng.choice(n, 100, replace=False), 'density'] = np.nan
+        return df
+
+    def test_fallback_matches_per_row_logic(self, wide_samples):
+        mnemonic_map = {'gamma': 'GR', 'density': 'density'}
+        classified = Analyzer().classify_rows(wide_samples, RULES, mnemonic_map,
+                                              use_fallback_classification=True)
+
+        expected = reference_classify(wide_samples, RULES, True)
+        for idx in expected.index[expected == 'NL']:
+            gamma_val = wide_samples.at[idx, 'gamma']
+            density_val = wide_samples.at[idx, 'density']
+            code = reference_nearest(gamma_val, density_val) or reference_extreme(gamma_val, density_val)
+            if code:
+                expected[idx] = code
+
+        assert list(classified[LITHOLOGY_COLUMN]) == list(expected)
+
+    def test_nearest_lithology_single_value(self):
+        analyzer = Analyzer()
+        assert analyzer._get_nearest_lithology(10.0, 1.5) == 'CO'
+        assert analyzer._get_nearest_lithology(1000.0, 1.5) is None
+        assert analyzer._get_nearest_lithology(np.nan, 1.5) is None
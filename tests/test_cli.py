@@ -0,0 +1,58 @@
+"""
+Unit tests for the headless command-line interface.
+"""
+
+import os
+import subprocess
+import sys
+
+from src.cli import main
+from tests.test_batch_pipeline import write_hole
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(code):
+    """Run ``code`` in a fresh interpreter and return the top-level modules it imported."""
+    output = subprocess.run(
+        [sys.executable, '-c', code + "\nimport sys; print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return set(output.split())
+
+
+class TestClassifyCommand:
+    """Test the classify command and its import footprint."""
+
+    def test_startup_is_lightweight(self):
+        modules = imported_modules("import src.cli")
+        assert not modules & {'pandas', 'lasio', 'openpyxl', 'PyQt6', 'pyqtgraph'}
+
+    def test_pipeline_does_not_import_qt(self):
+        modules = imported_modules("import src.core.batch_pipeline, src.core.settings_manager")
+        assert not modules & {'openpyxl', 'PyQt6', 'pyqtgraph'}
+
+    def test_classify_directory(self, tmp_path, capsys):
+        holes = tmp_path / "holes"
+        holes.mkdir()
+        for i in range(2):
+            write_hole(holes / f"hole_{i}.las", i)
+        settings = tmp_path / "settings.json"
+        settings.write_text('{"merge_thin_units": true}')
+        report = tmp_path / "report.csv"
+
+        exit_code = main(['classify', str(holes), '--settings', str(settings), '--no-template',
+                          '--workers', '1', '--report', str(report)])
+
+        assert exit_code == 0
+        assert "2 succeeded, 0 failed" in capsys.readouterr().out
+        assert report.exists()
+
+    def test_single_file_to_explicit_output(self, tmp_path):
+        las_path = write_hole(tmp_path / "hole.las", 3)
+        output = tmp_path / "out" / "result.xlsx"
+        assert main(['classify', las_path, '--output', str(output), '--settings', str(tmp_path / "none.json")]) == 2
+        settings = tmp_path / "settings.json"
+        settings.write_text('{}')
+        assert main(['classify', las_path, '--output', str(output), '--settings', str(settings)]) == 0
+        assert output.exists()
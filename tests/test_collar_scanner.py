@@ -0,0 +1,114 @@
+"""
+Unit tests for header-only collar extraction and the project collar index.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.core import collar_scanner
+from src.core.collar_scanner import CollarIndex, extract_collar
+
+
+LAS_TEXT = """~VERSION INFORMATION
+ VERS.   2.0 : CWLS LOG ASCII STANDARD - VERSION 2.0
+ WRAP.   NO  : One line per depth step
+~WELL INFORMATION
+ NULL.  -999.25 : NULL VALUE
+ WELL.  DH-042 : WELL
+ X   .M 501234.5 : EASTING
+ Y   .M 7001234.25 : NORTHING
+ ELEV.M 312.0 : ELEVATION
+~CURVE INFORMATION
+ DEPT.M    : Depth
+ GR  .API  : Gamma ray
+~A  DEPT  GR
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    # The data section is deliberately unparseable: only the header may be read
+    (tmp_path / "dh042.las").write_text(LAS_TEXT + "10.0 not-a-number extra\n" * 50)
+    (tmp_path / "dh043.csv").write_text("# Hole: DH-043\n# Easting: 502000\n# Northing: 7002000\n"
+                                        "# Total Depth: 150.5\ndepth,gamma\n1,2\n")
+    (tmp_path / "no_coords.csv").write_text("depth,gamma\n1,2\n")
+    pd.DataFrame({'Hole': ['DH-044'], 'Easting': [503000.0], 'Northing': [7003000.0]}).to_excel(
+        tmp_path / "dh044.xlsx", index=False)
+    return tmp_path
+
+
+class TestExtractCollar:
+    """Test header-only extraction per file type."""
+
+    def test_las_header(self, project):
+        hole_info = extract_collar(str(project / "dh042.las"))
+        assert (hole_info['hole_id'], hole_info['easting'], hole_info['northing'], hole_info['elevation']) == \
+            ('DH-042', 501234.5, 7001234.25, 312.0)
+
+    def test_csv_header_comments(self, project):
+        hole_info = extract_collar(str(project / "dh043.csv"))
+        assert (hole_info['hole_id'], hole_info['easting'], hole_info['northing'], hole_info['total_depth']) == \
+            ('DH-043', 502000.0, 7002000.0, 150.5)
+        assert extract_collar(str(project / "no_coords.csv")) is None
+
+    def test_excel_first_row(self, project):
+        hole_info = extract_collar(str(project / "dh044.xlsx"))
+        assert (hole_info['easting'], hole_info['northing']) == (503000.0, 7003000.0)
+
+
+class TestCollarIndex:
+    """Test the per-project index and its invalidation."""
+
+    def test_scan_reuses_unchanged_entries(self, project, tmp_path_factory, monkeypatch):
+        index_dir = str(tmp_path_factory.mktemp("collars"))
+        paths = sorted(str(path) for path in project.iterdir())
+
+        collars = CollarIndex(str(project), index_dir).scan(paths, max_workers=4)
+        assert sorted(os.path.basename(path) for path in collars) == ['dh042.las', 'dh043.csv', 'dh044.xlsx']
+        assert list(collars) == [path for path in paths if path in collars]
+
+        scanned = []
+        original = collar_scanner.extract_collar
+        monkeypatch.setattr(collar_scanner, 'extract_collar', lambda path: scanned.append(path) or original(path))
+
+        # A fresh index object reloads the saved entries; nothing is rescanned
+        assert CollarIndex(str(project), index_dir).scan(paths) == collars
+        assert scanned == []
+
+        # Changing a file invalidates its entry only
+        csv_path = project / "dh043.csv"
+        csv_path.write_text(csv_path.read_text().replace("502000", "502500"))
+        os.utime(csv_path, ns=(0, os.stat(csv_path).st_mtime_ns + 10**9))
+        rescanned = CollarIndex(str(project), index_dir).scan(paths)
+        assert scanned == [str(csv_path)]
+        assert rescanned[str(csv_path)]['easting'] == 502500.0
+
+    def test_results_use_the_callers_paths(self, project, tmp_path_factory, monkeypatch):
+        index_dir = str(tmp_path_factory.mktemp("collars"))
+        monkeypatch.chdir(project)
+        paths = ['dh042.las', 'dh043.csv']
+
+        fresh = CollarIndex(str(project), index_dir).scan(paths)
+        cached = CollarIndex(str(project), index_dir).scan(paths)
+        assert fresh == cached
+        assert [hole_info['file_path'] for hole_info in fresh.values()] == paths
+
+    def test_progress_and_pruning(self, project, tmp_path_factory):
+        index_dir = str(tmp_path_factory.mktemp("collars"))
+        paths = sorted(str(path) for path in project.iterdir())
+        missing = str(project / "missing.las")
+
+        # Files that can't be read still count towards progress
+        progress = []
+        CollarIndex(str(project), index_dir).scan(paths + [missing], progress_callback=lambda *args: progress.append(args))
+        assert sorted(progress) == [(completed, 5) for completed in range(1, 6)]
+
+        # Entries of deleted files are dropped from the saved index
+        os.remove(project / "dh043.csv")
+        index = CollarIndex(str(project), index_dir)
+        assert str(project / "dh043.csv") in index._entries
+        index.scan([paths[0]])
+        assert sorted(CollarIndex(str(project), index_dir)._entries) == [path for path in paths
+                                                                        if not path.endswith('dh043.csv')]
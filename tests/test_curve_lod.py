@@ -0,0 +1,76 @@
+"""
+Unit tests for the min/max curve LOD pyramid.
+
+Every level must keep the exact minimum and maximum of each bucket, so the
+points drawn for any view reach every spike of the curve.
+"""
+
+import numpy as np
+import pytest
+
+from src.core.curve_lod import BUCKET_FACTOR, CurveLODPyramid
+
+
+def make_curve(count, seed=0):
+    """Density-like log at 1 mm spacing with sparse one-sample spikes and NaN gaps."""
+    rng = np.random.default_rng(seed)
+    depths = np.arange(count) * 0.001
+    values = 2.3 + 0.05 * rng.standard_normal(count)
+    spikes = rng.choice(count, 40, replace=False)
+    values[spikes] = rng.choice([1.3, 3.4], 40)
+    values[rng.choice(count, count // 100, replace=False)] = np.nan
+    return depths, values, spikes[~np.isnan(values[spikes])]
+
+
+def visible_points(pyramid, min_depth, max_depth, pixel_rows):
+    level, first, last = pyramid.select(min_depth, max_depth, pixel_rows)
+    start, stop = pyramid.window(level, first, last, pixel_rows)
+    depths, values = pyramid.points(level, start, stop, pixel_rows)
+    return level, depths, values
+
+
+class TestCurveLODPyramid:
+    """Envelopes, level choice and plotted points."""
+
+    @pytest.mark.parametrize("count", [100_003, 4096, 63, 1])
+    def test_levels_keep_bucket_extremes(self, count):
+        depths, values, _ = make_curve(max(count, 64))
+        pyramid = CurveLODPyramid(depths[:count], values[:count])
+        valid = values[:count][~np.isnan(values[:count])]
+        assert np.array_equal(pyramid.values, valid)
+
+        for level, pairs in enumerate(pyramid.levels, 1):
+            size = BUCKET_FACTOR ** level
+            assert len(pairs) == -(-len(valid) // size)
+            assert np.all(pairs[:, 0] <= pairs[:, 1])
+            for bucket in (0, len(pairs) // 2, len(pairs) - 1):
+                samples = valid[bucket * size:(bucket + 1) * size]
+                drawn = valid[pairs[bucket]]
+                assert drawn.min() == samples.min() and drawn.max() == samples.max()
+
+    @pytest.mark.parametrize("view", [(0.0, 1000.0), (120.0, 180.0), (300.0, 300.8)])
+    def test_views_keep_spikes(self, view):
+        depths, values, spikes = make_curve(400_000)
+        pyramid = CurveLODPyramid(depths, values)
+        level, plot_depths, plot_values = visible_points(pyramid, *view, pixel_rows=800)
+
+        assert np.all(np.diff(plot_depths) >= 0)
+        assert len(plot_depths) < 20 * 800
+        for spike in spikes:
+            assert values[spike] in plot_values[plot_depths == depths[spike]]
+
+        in_view = (pyramid.depths >= view[0]) & (pyramid.depths <= view[1])
+        buckets = in_view.sum() // BUCKET_FACTOR ** level
+        assert buckets >= 800 or level == 0
+        assert buckets < 800 * BUCKET_FACTOR or level == pyramid.max_level
+        if level == 0:
+            shown = (plot_depths >= view[0]) & (plot_depths <= view[1])
+            assert np.array_equal(plot_values[shown], pyramid.values[in_view])
+
+    def test_unsorted_depths(self):
+        depths, values, _ = make_curve(5000)
+        order = np.random.default_rng(1).permutation(len(depths))
+        pyramid = CurveLODPyramid(depths[order], values[order])
+        expected = CurveLODPyramid(depths, values)
+        assert np.array_equal(pyramid.depths, expected.depths)
+        assert np.array_equal(pyramid.values, expected.values)
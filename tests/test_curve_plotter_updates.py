@@ -0,0 +1,141 @@
+"""
+Unit tests for PyQtGraphCurvePlotter's persistent curve items.
+
+Style and visibility edits must update the existing plot items in place and
+keep the current view; new data must be re-uploaded to the same items.
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pyqtgraph as pg
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from src.ui.widgets.pyqtgraph_curve_plotter import PyQtGraphCurvePlotter
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def plotter(app, monkeypatch):
+    # update_axis_ranges reads AxisItem.ticks, which not every pyqtgraph version defines
+    monkeypatch.setattr(pg.AxisItem, 'ticks', None, raising=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plotter = PyQtGraphCurvePlotter()
+        plotter.curve_configs = make_configs()
+        plotter.set_data(make_log(200_000))
+    return plotter
+
+
+def make_log(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'DEPT': np.arange(count) * 0.01,
+        'short_space_density': 2.3 + 0.05 * rng.standard_normal(count),
+        'gamma': 80 + 5 * rng.standard_normal(count),
+        'caliper': 150 + rng.standard_normal(count),
+        'resistivity': 10 + rng.standard_normal(count),
+    })
+
+
+def make_configs():
+    return [
+        {'name': 'gamma', 'color': '#8b008b', 'min': 0, 'max': 300, 'thickness': 1.0, 'visible': True},
+        {'name': 'short_space_density', 'color': '#0000FF', 'min': 1.0, 'max': 3.0, 'thickness': 1.0},
+        {'name': 'caliper', 'color': '#00AA00', 'min': 100, 'max': 200},
+        {'name': 'resistivity', 'color': '#FF8800', 'min': 0, 'max': 100},
+    ]
+
+
+def redraw(plotter):
+    with contextlib.redirect_stdout(io.StringIO()):
+        plotter.draw_curves()
+
+
+def container_items(plotter):
+    return [item for container in (plotter.plot_item.vb, plotter.gamma_viewbox,
+                                    plotter.caliper_viewbox, plotter.resistivity_viewbox)
+            for item in container.addedItems if hasattr(item, 'curve_group')]
+
+
+class TestPersistentCurveItems:
+    """Diffing curve configs against the drawn items."""
+
+    def test_style_edits_keep_items_and_view(self, plotter, monkeypatch):
+        items = dict(plotter.curve_items)
+        assert sorted(items) == sorted(config['name'] for config in plotter.curve_configs)
+        plotter.plot_widget.setYRange(500.0, 520.0, padding=0)
+        view = plotter.plot_item.vb.viewRange()[1]
+
+        uploads = []
+        for curve in items.values():
+            monkeypatch.setattr(curve, 'setData', lambda *args, **kwargs: uploads.append(args))
+
+        gamma = plotter.curve_configs[0]
+        gamma['color'] = '#FF0000'
+        gamma['thickness'] = 3.0
+        redraw(plotter)
+        gamma['visible'] = False
+        redraw(plotter)
+
+        assert plotter.curve_items == items
+        assert uploads == []
+        assert items['gamma'].opts['pen'].color().name() == '#ff0000'
+        assert items['gamma'].opts['pen'].widthF() == 3.0
+        assert not items['gamma'].isVisible()
+        assert plotter.plot_item.vb.viewRange()[1] == view
+        assert len(container_items(plotter)) == len(items)
+
+    def test_structural_changes(self, plotter):
+        items = dict(plotter.curve_items)
+        pyramid = items['caliper'].lod[0]
+
+        # New data goes to the same items
+        with contextlib.redirect_stdout(io.StringIO()):
+            plotter.set_data(make_log(1000, seed=1))
+        assert plotter.curve_items == items
+        assert items['caliper'].lod[0] is not pyramid
+        assert len(items['caliper'].getData()[0]) == 1000
+
+        # Removed curves lose their items; repeated draws never duplicate them
+        plotter.curve_configs = [config for config in plotter.curve_configs if config['name'] != 'caliper']
+        redraw(plotter)
+        redraw(plotter)
+        assert 'caliper' not in plotter.curve_items and plotter.caliper_curves == []
+        assert len(container_items(plotter)) == len(plotter.curve_items) == 3
+
+    def test_hidden_curves_stay_hidden_across_redraws(self, plotter):
+        items = dict(plotter.curve_items)
+        with contextlib.redirect_stdout(io.StringIO()):
+            plotter.set_curve_visibility('gamma', False)
+        redraw(plotter)
+        assert not items['gamma'].isVisible()
+
+        # A curve drawn again as a new item keeps the visibility the user gave it
+        configs = plotter.curve_configs
+        plotter.curve_configs = configs[1:]
+        redraw(plotter)
+        plotter.curve_configs = configs
+        redraw(plotter)
+        assert plotter.curve_items['gamma'] is not items['gamma']
+        items['gamma'] = plotter.curve_items['gamma']
+        assert not items['gamma'].isVisible()
+
+        # Hidden through the config, shown by name, then redrawn: the item stays shown
+        plotter.curve_configs[2]['visible'] = False
+        redraw(plotter)
+        with contextlib.redirect_stdout(io.StringIO()):
+            plotter.set_curve_visibility('caliper', True)
+        redraw(plotter)
+        assert items['caliper'].isVisible() and not items['gamma'].isVisible()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            plotter.set_curve_visibility('gamma', True)
+            plotter.set_data(make_log(1000, seed=1))
+        assert all(item.isVisible() for item in items.values())
@@ -0,0 +1,138 @@
+"""
+Unit tests for indexed lookups in DepthSynchronizer.
+
+Snapping, snap types, data-at-depth and next-point lookups must match the
+linear scans over intervals, LAS points and markers they replace.
+"""
+
+import numpy as np
+import pytest
+
+from src.core.graphic_models import HoleDataProvider, LASPoint, LithologyInterval
+from src.ui.graphic_window.synchronizers.depth_synchronizer import DepthSynchronizer
+
+
+class StaticHoleDataProvider(HoleDataProvider):
+    """Provider over fixed interval and LAS point lists."""
+
+    def __init__(self, intervals, las_points):
+        self.intervals = intervals
+        self.las_points = las_points
+
+    def get_lithology_intervals(self):
+        return self.intervals
+
+    def get_lithology_for_depth(self, depth):
+        return next((interval for interval in self.intervals if interval.contains_depth(depth)), None)
+
+    def get_las_points(self, curve_names=None):
+        return self.las_points
+
+    def get_depth_range(self):
+        return (0.0, 100.0)
+
+    def get_available_curves(self):
+        return ['gamma']
+
+
+def reference_snap(sync, depth):
+    candidates = []
+    if sync.snap_to_lithology:
+        for interval in sync.data_provider.get_lithology_intervals():
+            candidates += [float(interval.from_depth), float(interval.to_depth)]
+    if sync.snap_to_las:
+        candidates += [float(point.depth) for point in sync.data_provider.get_las_points()]
+    candidates += [float(d) for d, _ in sync.depth_markers]
+    closest, min_distance = None, float('inf')
+    for candidate in candidates:
+        distance = abs(candidate - depth)
+        if distance < min_distance and distance <= sync.snap_tolerance:
+            min_distance, closest = distance, candidate
+    return closest if closest is not None else depth
+
+
+def reference_snap_type(sync, depth):
+    for interval in sync.data_provider.get_lithology_intervals():
+        if abs(interval.from_depth - depth) < 0.001:
+            return f"lithology_top:{interval.code}"
+        if abs(interval.to_depth - depth) < 0.001:
+            return f"lithology_bottom:{interval.code}"
+    for point in sync.data_provider.get_las_points():
+        if abs(point.depth - depth) < 0.001:
+            return "las_point"
+    for marker_depth, label in sync.depth_markers:
+        if abs(marker_depth - depth) < 0.001:
+            return f"marker:{label}"
+    return "unknown"
+
+
+def reference_next(sync, depth, direction):
+    points = [i.from_depth for i in sync.data_provider.get_lithology_intervals()]
+    points += [i.to_depth for i in sync.data_provider.get_lithology_intervals()]
+    points += [p.depth for p in sync.data_provider.get_las_points()]
+    points += [d for d, _ in sync.depth_markers]
+    points = sorted(set(points))
+    if direction == "down":
+        return next((p for p in points if p > depth + 0.001), None)
+    return next((p for p in reversed(points) if p < depth - 0.001), None)
+
+
+@pytest.fixture
+def sync():
+    rng = np.random.default_rng(3)
+    bounds = np.round(np.cumsum(rng.uniform(0.05, 2.0, 60)), 3)
+    intervals = [LithologyInterval(float(top), float(bottom), code, f"{code} unit")
+                 for top, bottom, code in zip(bounds[:-1], bounds[1:], ['SS', 'CO', 'ST'] * 20)]
+    las_points = [LASPoint(round(float(d), 3), {'gamma': float(g)})
+                  for d, g in zip(np.arange(0, 60, 0.07), rng.uniform(0, 150, 858))]
+    synchronizer = DepthSynchronizer(StaticHoleDataProvider(intervals, las_points))
+    synchronizer.add_depth_marker(12.3456, "fault")
+    synchronizer.add_depth_marker(40.02, "core")
+    return synchronizer
+
+
+@pytest.fixture
+def probe_depths(sync):
+    rng = np.random.default_rng(9)
+    exact = [i.from_depth for i in sync.data_provider.intervals[::5]]
+    exact += [p.depth for p in sync.data_provider.las_points[::50]] + [12.3456, 40.02]
+    return list(rng.uniform(-1, 62, 400)) + exact
+
+
+class TestDepthSynchronizerIndex:
+    """Compare indexed lookups with linear scans."""
+
+    @pytest.mark.parametrize("snap_to_lithology,snap_to_las", [(True, True), (True, False), (False, False)])
+    def test_snap_to_nearest(self, sync, probe_depths, snap_to_lithology, snap_to_las):
+        sync.snap_to_lithology = snap_to_lithology
+        sync.snap_to_las = snap_to_las
+        for depth in probe_depths:
+            assert sync.snap_to_nearest(depth) == reference_snap(sync, depth)
+
+    def test_snap_type(self, sync, probe_depths):
+        for depth in probe_depths:
+            snapped = sync.snap_to_nearest(depth)
+            assert sync._get_snap_type(snapped, depth) == reference_snap_type(sync, snapped)
+
+    def test_get_data_at_depth(self, sync, probe_depths):
+        provider = sync.data_provider
+        for depth in probe_depths:
+            result = sync.get_data_at_depth(depth)
+            interval = provider.get_lithology_for_depth(depth)
+            assert (result['lithology'] or {}).get('from_depth') == (interval.from_depth if interval else None)
+            point = next((p for p in provider.las_points if abs(p.depth - depth) < 0.001), None)
+            assert result['las_values'] == (point.curves if point else {})
+
+    @pytest.mark.parametrize("direction", ["up", "down"])
+    def test_find_next_data_point(self, sync, probe_depths, direction):
+        for depth in probe_depths:
+            assert sync.find_next_data_point(depth, direction) == reference_next(sync, depth, direction)
+
+    def test_markers_and_new_provider(self, sync):
+        sync.remove_depth_marker(12.3456)
+        assert sync.snap_to_nearest(12.3456) == reference_snap(sync, 12.3456)
+
+        # Loading or editing a hole hands the synchronizer a new provider
+        sync.data_provider = StaticHoleDataProvider([LithologyInterval(100.0, 101.0, 'CO', 'Coal')], [])
+        assert sync.find_next_data_point(99.0) == 100.0
+        assert sync.get_data_at_depth(100.5)['lithology']['code'] == 'CO'
@@ -0,0 +1,82 @@
+"""
+Unit tests for DictionaryManager lookup tables and the CoalLog parse cache.
+
+Hash-map lookups and the trigram search index must give the same answers as
+scanning the (code, description) lists.
+"""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from src.core import coallog_utils
+from src.core.coallog_utils import load_coallog_dictionaries, load_coallog_dictionaries_cached
+from src.core.dictionary_manager import DictionaryManager
+
+COALLOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            "src", "assets", "CoalLog v3.1 Dictionaries.xlsx")
+
+
+def reference_search(manager, search_term, categories=None):
+    """Substring scan, as previously done in DictionaryManager.search_codes."""
+    results = []
+    for category in categories if categories is not None else manager.get_all_categories():
+        for code, desc in manager.get_codes_for_category(category):
+            if search_term.lower() in code.lower() or search_term.lower() in desc.lower():
+                results.append((category, code, desc))
+    return results
+
+
+@pytest.fixture(scope="module")
+def manager():
+    return DictionaryManager(COALLOG_PATH)
+
+
+class TestDictionaryLookups:
+    """Compare indexed lookups with list scans."""
+
+    @pytest.mark.parametrize("term", ["", "c", "Co", "coal", "SAND", "stone", "grey", "ly", "zzz", "d (", "Very "])
+    def test_search_matches_scan(self, manager, term):
+        assert manager.search_codes(term) == reference_search(manager, term)
+
+    def test_search_category_order(self, manager):
+        categories = ['Shade', 'Litho_Type', 'Unknown']
+        assert manager.search_codes('ar', categories) == reference_search(manager, 'ar', categories)
+
+    def test_description_for_code(self, manager):
+        for category in manager.get_all_categories():
+            codes = manager.get_codes_for_category(category)
+            for code, _ in codes:
+                expected = next(desc for c, desc in codes if c == code)
+                assert manager.get_description_for_code(category, code) == expected
+                assert manager.has_code(category, code)
+        assert manager.get_description_for_code('Litho_Type', 'NOT-A-CODE') is None
+        assert not manager.has_code('Missing', 'CO')
+
+
+class TestDictionaryCache:
+    """Test the pickled CoalLog parse."""
+
+    def test_cached_parse_matches_and_skips_excel(self, tmp_path, monkeypatch):
+        workbook = tmp_path / "coallog.xlsx"
+        shutil.copy(COALLOG_PATH, workbook)
+        cache_dir = str(tmp_path / "cache")
+
+        first = load_coallog_dictionaries_cached(str(workbook), cache_dir)
+        expected = load_coallog_dictionaries(str(workbook))
+        assert first.keys() == expected.keys()
+        for category in expected:
+            pd.testing.assert_frame_equal(first[category], expected[category])
+
+        def fail(*args, **kwargs):
+            raise AssertionError("workbook parsed again")
+        monkeypatch.setattr(coallog_utils, 'load_coallog_dictionaries', fail)
+        second = load_coallog_dictionaries_cached(str(workbook), cache_dir)
+        pd.testing.assert_frame_equal(second['Litho_Type'], expected['Litho_Type'])
+
+        # A modified workbook is parsed again
+        os.utime(workbook, ns=(0, os.stat(workbook).st_mtime_ns + 10**9))
+        with pytest.raises(AssertionError, match="parsed again"):
+            load_coallog_dictionaries_cached(str(workbook), cache_dir)
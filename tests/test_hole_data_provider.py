@@ -0,0 +1,80 @@
+"""
+Unit tests for the array-backed hole data provider.
+
+ColumnarHoleDataProvider must answer the HoleDataProvider API the same way
+ExcelHoleDataProvider does for the same DataFrames, and its range queries
+must return views rather than copies.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.graphic_models import ColumnarHoleDataProvider, ExcelHoleDataProvider
+
+
+@pytest.fixture
+def frames():
+    rng = np.random.default_rng(5)
+    bounds = np.round(np.cumsum(rng.uniform(0.1, 3.0, 41)), 3)
+    lithology_df = pd.DataFrame({
+        'from_depth': bounds[:-1],
+        'to_depth': bounds[1:],
+        'code': ['SAND', 'COAL', 'SHALE', 'SILT'] * 10,
+        'description': [f"unit {i}" for i in range(40)],
+    }).sample(frac=1, random_state=1)
+    depths = np.round(np.arange(0, bounds[-1], 0.1), 3)
+    las_df = pd.DataFrame({
+        'depth': depths,
+        'gamma': rng.uniform(0, 150, len(depths)),
+        'density': rng.uniform(1.2, 2.9, len(depths)),
+    }).sample(frac=1, random_state=2)
+    return lithology_df, las_df
+
+
+class TestColumnarHoleDataProvider:
+    """Test the columnar provider against the DataFrame-backed one."""
+
+    def test_matches_excel_provider(self, frames):
+        excel = ExcelHoleDataProvider(*frames)
+        columnar = ColumnarHoleDataProvider.from_dataframes(*frames)
+
+        assert columnar.get_depth_range() == pytest.approx(excel.get_depth_range())
+        assert columnar.get_available_curves() == excel.get_available_curves()
+        assert ([(i.from_depth, i.to_depth, i.code, i.color) for i in columnar.get_lithology_intervals()] ==
+                [(i.from_depth, i.to_depth, i.code, i.color) for i in excel.get_lithology_intervals()])
+
+        for depth in np.random.default_rng(0).uniform(-1, 70, 300):
+            expected = excel.get_lithology_for_depth(depth)
+            found = columnar.get_lithology_for_depth(depth)
+            assert (found.from_depth if found else None) == (expected.from_depth if expected else None)
+
+        excel_points = excel.get_las_points(['gamma'])
+        columnar_points = columnar.get_las_points(['gamma'])
+        assert [p.depth for p in columnar_points] == [p.depth for p in excel_points]
+        assert np.allclose([p.curves['gamma'] for p in columnar_points],
+                           [p.curves['gamma'] for p in excel_points], rtol=1e-6)
+
+    def test_las_points_cached_for_all_curves(self, frames):
+        for provider in (ExcelHoleDataProvider(*frames), ColumnarHoleDataProvider.from_dataframes(*frames)):
+            assert provider.get_las_points() is provider.get_las_points()
+            assert provider.get_las_points(['gamma']) is not provider.get_las_points()
+
+    def test_range_returns_views(self, frames):
+        provider = ColumnarHoleDataProvider.from_dataframes(*frames)
+        depths, curves = provider.get_range(10.0, 20.0)
+
+        assert depths.base is provider.depths
+        assert curves['gamma'].base is provider.curves['gamma']
+        assert curves['gamma'].dtype == np.float32
+        assert depths[0] >= 10.0 and depths[-1] <= 20.0
+        assert len(depths) == np.count_nonzero((provider.depths >= 10.0) & (provider.depths <= 20.0))
+
+    def test_nearest_sample(self, frames):
+        provider = ColumnarHoleDataProvider.from_dataframes(*frames)
+        for depth in (-5.0, 0.04, 12.36, 1000.0):
+            index = provider.nearest_sample_index(depth)
+            assert index == int(np.argmin(np.abs(provider.depths - depth)))
+        depth, values = provider.get_nearest_sample(12.36)
+        assert depth == pytest.approx(12.4)
+        assert set(values) == {'gamma', 'density'}
@@ -0,0 +1,150 @@
+"""
+Unit tests for the single-pass interbedding candidate scan.
+
+The scan must return the candidates found by checking every start index
+unit by unit (reference_sequence below, the original implementation), over
+the whole hole.
+"""
+
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.analyzer import Analyzer
+from src.core.config import DEFAULT_LITHOLOGY_RULES, LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN
+
+
+@pytest.fixture
+def analyzer():
+    return Analyzer()
+
+
+def random_units(analyzer, blocks, codes=('CO', 'SS', 'ST', 'NL'), seed=0):
+    """Units grouped from a classified hole of random runs and repeated 2 or 3 lithology patterns."""
+    rng = np.random.default_rng(seed)
+    samples = []
+    for _ in range(blocks):
+        if rng.random() < 0.5:
+            pattern = list(rng.choice(codes, rng.integers(2, min(len(codes), 3) + 1), replace=False))
+            block = pattern * int(rng.integers(1, 6)) + pattern[:int(rng.integers(0, len(pattern)))]
+        else:
+            block = list(rng.choice(codes, rng.integers(1, 6)))
+        runs = rng.choice([1, 2, 3, 5, 25], len(block), p=[0.5, 0.3, 0.12, 0.05, 0.03])
+        samples.extend(np.repeat(block, runs))
+    classified = pd.DataFrame({
+        'DEPT': 100.0 + np.arange(len(samples)) * 0.01,
+        LITHOLOGY_COLUMN: samples,
+    })
+    with contextlib.redirect_stdout(io.StringIO()):
+        units = analyzer.group_into_units(classified, DEFAULT_LITHOLOGY_RULES)
+    units.loc[units.index[::37], RECOVERED_THICKNESS_COLUMN] = np.nan
+    return units
+
+
+def reference_sequence(units_df, start_idx, max_sequence_length, thick_unit_threshold):
+    """
+    Alternating sequence from start_idx, checked unit by unit.
+
+    Individual layers must be <200mm and no thicker than thick_unit_threshold,
+    NL units and repeated lithologies end the sequence, and it must strictly
+    repeat a pattern of 2 or 3 lithologies for at least two full cycles.
+    """
+    sequence = []
+    current_code = None
+    for i in range(start_idx, min(start_idx + max_sequence_length, len(units_df))):
+        unit = units_df.iloc[i]
+        unit_code = unit[LITHOLOGY_COLUMN]
+        unit_thickness = unit.get(RECOVERED_THICKNESS_COLUMN, unit.get('thickness', 0))
+        if unit_code == 'NL' or unit_thickness >= 0.2 or unit_thickness > thick_unit_threshold:
+            break
+        if unit_code == current_code:
+            break
+        current_code = unit_code
+        sequence.append(unit.to_dict())
+
+    if len(sequence) < 4:
+        return []
+    codes = [u[LITHOLOGY_COLUMN] for u in sequence]
+    pattern = list(dict.fromkeys(codes))
+    if not 2 <= len(pattern) <= 3:
+        return []
+    if any(code != pattern[i % len(pattern)] for i, code in enumerate(codes)):
+        return []
+    if len(sequence) < len(pattern) * 2:
+        return []
+    return sequence
+
+
+def reference_candidates(analyzer, units_df, max_sequence_length, thick_unit_threshold):
+    """Candidates from checking every start index, as previously done in find_interbedding_candidates."""
+    candidates = []
+    i = 0
+    while i < len(units_df):
+        sequence = reference_sequence(units_df, i, max_sequence_length, thick_unit_threshold)
+        candidate = analyzer._build_interbedding_candidate(sequence) if sequence else None
+        if candidate:
+            candidates.append(candidate)
+            i += len(candidate['original_sequence'])
+        else:
+            i += 1
+    return candidates
+
+
+def find_candidates(analyzer, units_df, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return analyzer.find_interbedding_candidates(units_df, *args)
+
+
+def assert_same_candidates(candidates, expected):
+    assert len(candidates) == len(expected)
+    for candidate, reference in zip(candidates, expected):
+        assert candidate.keys() == reference.keys()
+        for key in ('from_depth', 'to_depth', 'interrelationship_code'):
+            assert candidate[key] == reference[key]
+        pd.testing.assert_frame_equal(pd.DataFrame(candidate['lithologies']), pd.DataFrame(reference['lithologies']))
+        assert candidate['average_layer_thickness'] == pytest.approx(reference['average_layer_thickness'], nan_ok=True)
+        sequence = pd.DataFrame(candidate['original_sequence'])
+        reference_sequence = pd.DataFrame(reference['original_sequence'])
+        pd.testing.assert_frame_equal(sequence, reference_sequence, check_dtype=False)
+
+
+class TestInterbeddingCandidates:
+    """Compare the single-pass scan with scanning from every start index."""
+
+    @pytest.mark.parametrize("max_sequence_length, thick_unit_threshold", [(10, 0.5), (6, 0.5), (12, 0.1), (3, 0.5)])
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_matches_reference_scan(self, analyzer, seed, max_sequence_length, thick_unit_threshold):
+        units = random_units(analyzer, 60, seed=seed)
+        expected = reference_candidates(analyzer, units, max_sequence_length, thick_unit_threshold)
+        candidates = find_candidates(analyzer, units, max_sequence_length, thick_unit_threshold)
+        assert max_sequence_length < 4 or expected
+        assert_same_candidates(candidates, expected)
+
+    def test_two_lithologies_and_no_thickness(self, analyzer):
+        units = random_units(analyzer, 40, codes=('CO', 'SS'), seed=2)
+        assert_same_candidates(find_candidates(analyzer, units), reference_candidates(analyzer, units, 10, 0.5))
+
+        # Without thickness columns units count as thin, but have no thickness to build candidates from
+        bare = units[['from_depth', 'to_depth', LITHOLOGY_COLUMN]]
+        assert find_candidates(analyzer, bare) == reference_candidates(analyzer, bare, 10, 0.5) == []
+        assert find_candidates(analyzer, units.iloc[:1]) == []
+
+    def test_long_hole(self, analyzer):
+        units = random_units(analyzer, 8000, seed=3)
+        started = time.perf_counter()
+        candidates = find_candidates(analyzer, units)
+        elapsed = time.perf_counter() - started
+
+        # Candidates are found over the whole hole, in depth order and without overlapping
+        assert candidates[-1]['from_depth'] > units['from_depth'].iloc[-1000]
+        from_depths = np.array([candidate['from_depth'] for candidate in candidates])
+        to_depths = np.array([candidate['to_depth'] for candidate in candidates])
+        assert np.all(from_depths[1:] >= to_depths[:-1])
+        assert elapsed < 2.0
+
+        tail = units.iloc[-300:].reset_index(drop=True)
+        assert_same_candidates(find_candidates(analyzer, tail), reference_candidates(analyzer, tail, 10, 0.5))
@@ -0,0 +1,107 @@
+"""
+Unit tests for the on-disk LAS parse cache.
+"""
+
+import os
+
+import lasio
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.las_cache import CachedLASFile, LASCache
+from tests.test_las_data_index import LAS_HEADER
+
+
+@pytest.fixture
+def las_path(tmp_path):
+    rng = np.random.default_rng(1)
+    depths = 10.0 + np.arange(500) * 0.1
+    lines = [f"{d:.2f} {g:.3f} {r:.3f}" for d, g, r in
+             zip(depths, rng.uniform(0, 150, 500), rng.uniform(1.2, 2.9, 500))]
+    lines[10] = "11.00 -999.25 2.000"
+    path = tmp_path / "hole.las"
+    path.write_text(LAS_HEADER + "\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LASCache(str(tmp_path / "cache"))
+
+
+class TestLASCache:
+    """Test cache round trips, invalidation and the lasio-compatible API."""
+
+    def test_round_trip_matches_lasio(self, cache, las_path):
+        expected = lasio.read(las_path)
+        first = cache.read(las_path)
+        second = cache.read(las_path)
+
+        for las in (first, second):
+            assert isinstance(las, CachedLASFile)
+            assert las.keys() == expected.keys()
+            pd.testing.assert_frame_equal(las.df(), expected.df())
+            assert las.well.WELL.value == 'TEST-01'
+            assert las.curves['GR'].unit == 'API'
+            np.testing.assert_array_equal(las.index, expected.index)
+        assert not hasattr(second.well, 'UWI')
+        assert np.isnan(second['GR'][10])
+
+    def test_cached_frames_are_writable_copies(self, cache, las_path):
+        cache.read(las_path)
+        df = cache.read(las_path).df()
+        df.iloc[0, 0] = -1.0
+        assert cache.read(las_path).df().iloc[0, 0] != -1.0
+
+    def test_changed_file_is_reparsed(self, cache, las_path):
+        digest = cache.file_digest(las_path)
+        cache.read(las_path)
+        with open(las_path, 'a') as f:
+            f.write("60.00 1.0 2.0\n")
+        stat = os.stat(las_path)
+        os.utime(las_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert cache.file_digest(las_path) != digest
+        assert len(cache.read(las_path).df()) == 501
+
+    def test_header_only_reads(self, cache, las_path):
+        uncached = cache.read_header(las_path)
+        assert uncached.well['WELL'].value == 'TEST-01'
+
+        cache.read(las_path)
+        cached = cache.read_header(las_path)
+        assert isinstance(cached, CachedLASFile)
+        assert cached.data is None
+        assert cached.well['WELL'].value == 'TEST-01'
+
+    def test_digest_index_survives_new_instances(self, cache, las_path):
+        digest = cache.file_digest(las_path)
+        assert LASCache(cache.cache_dir)._known_digest(las_path) == digest
+
+    def test_hashing_writes_one_record_per_file(self, cache, tmp_path, las_path):
+        paths = []
+        for position in range(5):
+            path = tmp_path / f"hole{position}.las"
+            path.write_text(open(las_path).read() + f"{60 + position:.2f} 1.0 2.0\n")
+            paths.append(str(path))
+        digests = [cache.file_digest(path) for path in paths]
+
+        records = os.listdir(os.path.join(cache.cache_dir, 'paths'))
+        assert len(records) == 5 and all(name.endswith('.json') for name in records)
+        assert len(set(digests)) == 5
+
+    def test_instances_sharing_a_cache_keep_each_others_digests(self, cache, tmp_path, las_path):
+        other_path = tmp_path / "other.las"
+        other_path.write_text(open(las_path).read() + "60.00 1.0 2.0\n")
+        # Two processes using the same cache directory, both started before either hashed a file
+        other = LASCache(cache.cache_dir)
+        assert cache._known_digest(las_path) is None and other._known_digest(str(other_path)) is None
+
+        digest = cache.file_digest(las_path)
+        other_digest = other.file_digest(str(other_path))
+
+        fresh = LASCache(cache.cache_dir)
+        assert fresh._known_digest(las_path) == digest
+        assert fresh._known_digest(str(other_path)) == other_digest
+        assert other._known_digest(las_path) == digest
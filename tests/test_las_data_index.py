@@ -0,0 +1,102 @@
+"""
+Unit tests for the LAS ~A section byte-offset index.
+
+Range reads through the index must return exactly the rows lasio returns
+for the same depth window.
+"""
+
+import mmap
+
+import lasio
+import numpy as np
+import pytest
+
+from src.core.las_data_index import LASDataIndex
+
+
+LAS_HEADER = """~VERSION INFORMATION
+ VERS.   2.0 : CWLS LOG ASCII STANDARD - VERSION 2.0
+ WRAP.   NO  : One line per depth step
+~WELL INFORMATION
+ STRT.M   10.0 : START DEPTH
+ NULL.  -999.25 : NULL VALUE
+ WELL.  TEST-01 : WELL
+~CURVE INFORMATION
+ DEPT.M    : Depth
+ GR  .API  : Gamma ray
+ RHOB.G/CC : Bulk density
+~A  DEPT  GR  RHOB
+"""
+
+
+@pytest.fixture
+def las_path(tmp_path):
+    """Write a synthetic LAS file with nulls, a comment and a blank line."""
+    rng = np.random.default_rng(0)
+    depths = np.round(10.0 + np.arange(2000) * 0.05, 3)
+    gamma = rng.uniform(0, 150, len(depths))
+    density = rng.uniform(1.2, 2.9, len(depths))
+    gamma[::37] = -999.25
+
+    lines = [f"{d:10.3f} {g:10.4f} {r:8.4f}" for d, g, r in zip(depths, gamma, density)]
+    lines.insert(500, "# operator comment")
+    lines.insert(900, "")
+
+    path = tmp_path / "synthetic.las"
+    path.write_text(LAS_HEADER + "\n".join(lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def reference(las_path):
+    """Full lasio read used as the expected result."""
+    return lasio.read(str(las_path)).df().reset_index()
+
+
+class TestLASDataIndex:
+    """Test header parsing and depth range reads."""
+
+    def test_header_is_parsed(self, las_path):
+        index = LASDataIndex.from_file(las_path)
+        assert index.curve_names == ['DEPT', 'GR', 'RHOB']
+        assert index.null_value == -999.25
+        assert index.num_rows == 2000
+        assert index.depth_range() == (10.0, 109.95)
+
+    @pytest.mark.parametrize("stride", [1, 7, 32, 5000])
+    def test_range_read_matches_lasio(self, las_path, reference, stride):
+        index = LASDataIndex.from_file(las_path, stride=stride)
+        for min_depth, max_depth in [(10.0, 10.5), (33.3, 47.71), (100.0, 500.0)]:
+            result = index.read_depth_range(min_depth, max_depth)
+            mask = (reference['DEPT'] >= min_depth) & (reference['DEPT'] <= max_depth)
+            expected = reference[mask].reset_index(drop=True)
+            assert list(result.columns) == list(expected.columns)
+            np.testing.assert_allclose(result.values, expected.values)
+
+    @pytest.mark.parametrize("sample_count", [1, 10, 4096])
+    def test_sampled_index_matches_lasio(self, las_path, reference, sample_count):
+        index = LASDataIndex.from_file(las_path, sample_count=sample_count)
+        assert index.num_rows is None
+        assert index.depth_range() == (10.0, 109.95)
+        assert len(index.offsets) <= sample_count + 1
+        result = index.read_depth_range(33.3, 47.71)
+        mask = (reference['DEPT'] >= 33.3) & (reference['DEPT'] <= 47.71)
+        np.testing.assert_allclose(result.values, reference[mask].values)
+
+    def test_curve_selection_keeps_depth(self, las_path):
+        index = LASDataIndex.from_file(las_path)
+        result = index.read_depth_range(20.0, 21.0, curve_names=['RHOB'])
+        assert list(result.columns) == ['DEPT', 'RHOB']
+
+    def test_works_over_mmap(self, las_path, reference):
+        with open(las_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                index = LASDataIndex(buffer, stride=16)
+                result = index.read_depth_range(50.0, 60.0)
+        expected = reference[(reference['DEPT'] >= 50.0) & (reference['DEPT'] <= 60.0)]
+        assert len(result) == len(expected)
+
+    def test_wrapped_files_are_rejected(self):
+        wrapped = LAS_HEADER.replace("WRAP.   NO", "WRAP.   YES") + "10.0 1.0 2.0\n"
+        with pytest.raises(ValueError):
+            LASDataIndex(wrapped.encode())
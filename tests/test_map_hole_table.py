@@ -0,0 +1,74 @@
+"""
+Unit tests for the map's array-backed hole table.
+
+Colours and sizes computed over the whole table must match the per-hole
+logic MapRenderWorker used to apply, and selection updates must report
+exactly the rows that changed.
+"""
+
+import numpy as np
+import pytest
+from PyQt6.QtGui import QColor
+
+from src.ui.widgets.map_render_worker import MapHoleTable
+
+POINT_COLOR = QColor(70, 130, 180)
+SELECTED_COLOR = QColor(220, 20, 60)
+
+
+def reference_color(hole_info, selected, color_by):
+    """Per-hole colour, as previously done in MapRenderWorker._get_color_for_hole."""
+    if selected:
+        return (220, 20, 60, 255)
+    if color_by == "Total Depth" and hole_info.get('total_depth') is not None:
+        normalized = min(hole_info['total_depth'] / 500.0, 1.0)
+        return (int(70 + normalized * 30), int(130 + normalized * 50), int(180 + normalized * 75), 255)
+    if color_by == "File Type":
+        return (100, 149, 237, 255)
+    return (70, 130, 180, 255)
+
+
+@pytest.fixture
+def hole_data():
+    rng = np.random.default_rng(4)
+    data = {}
+    for i in range(300):
+        data[f"/data/hole_{i}.las"] = {
+            'hole_id': f"H{i}",
+            'easting': float(rng.uniform(0, 1000)),
+            'northing': float(rng.uniform(0, 1000)),
+            'total_depth': None if i % 7 == 0 else float(rng.uniform(0, 800)),
+        }
+    data["/data/no_coords.las"] = {'easting': None, 'northing': 5.0}
+    data["/data/no_id.las"] = {'easting': 1.0, 'northing': 2.0}
+    return data
+
+
+class TestMapHoleTable:
+    """Test table construction, styling and selection."""
+
+    def test_rows_skip_holes_without_coordinates(self, hole_data):
+        table = MapHoleTable.from_hole_data(hole_data)
+        assert len(table) == len(hole_data) - 1
+        assert "/data/no_coords.las" not in table.rows
+        assert table.labels[table.rows["/data/no_id.las"]] == "no_id.las"
+        assert np.isnan(table.records['total_depth'][0])
+
+    @pytest.mark.parametrize("color_by", ["Default", "Total Depth", "Hole Count", "File Type"])
+    def test_colors_match_per_hole_logic(self, hole_data, color_by):
+        selected = {"/data/hole_3.las", "/data/hole_14.las"}
+        table = MapHoleTable.from_hole_data(hole_data, selected)
+        colors = table.colors(color_by, POINT_COLOR, SELECTED_COLOR)
+        for row, file_path in enumerate(table.file_paths):
+            expected = reference_color(hole_data[file_path], file_path in selected, color_by)
+            assert tuple(colors[row]) == expected
+
+    def test_selection_reports_changed_rows(self, hole_data):
+        table = MapHoleTable.from_hole_data(hole_data, {"/data/hole_1.las", "/data/hole_2.las"})
+        changed = table.set_selection({"/data/hole_2.las", "/data/hole_5.las", "/data/unknown.las"})
+        assert sorted(table.file_paths[row] for row in changed) == ["/data/hole_1.las", "/data/hole_5.las"]
+        assert list(table.sizes(10, 15, changed)) == [10, 15]
+        assert table.set_selection({"/data/hole_2.las", "/data/hole_5.las"}).size == 0
+
+    def test_cancelled_build_returns_none(self, hole_data):
+        assert MapHoleTable.from_hole_data(hole_data, is_cancelled=lambda: True, batch_size=10) is None
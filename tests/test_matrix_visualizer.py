@@ -0,0 +1,132 @@
+"""
+Unit tests for MatrixVisualizer's coverage matrix and sample overlay.
+
+The broadcast interval masks must give the coverage and per-cell rule lists
+of the cell-by-cell loops they replace.
+"""
+
+import time
+
+import numpy as np
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from src.ui.widgets.matrix_visualizer import DONT_CARE_VALUE, MatrixVisualizer
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def reference_coverage(visualizer, rules):
+    """Cell-by-cell coverage, as previously done in _calculate_coverage_matrix."""
+    matrix = np.zeros((visualizer.density_bins, visualizer.gamma_bins), dtype=int)
+    details = {}
+    gamma_step = (visualizer.gamma_range[1] - visualizer.gamma_range[0]) / visualizer.gamma_bins
+    density_step = (visualizer.density_range[1] - visualizer.density_range[0]) / visualizer.density_bins
+    for rule in rules:
+        if rule['code'] == 'NL':
+            continue
+        gamma_dont_care = rule['gamma_min'] == DONT_CARE_VALUE and rule['gamma_max'] == DONT_CARE_VALUE
+        density_dont_care = rule['density_min'] == DONT_CARE_VALUE and rule['density_max'] == DONT_CARE_VALUE
+        for density_idx in range(visualizer.density_bins):
+            density_val = visualizer.density_range[0] + density_idx * density_step + density_step / 2
+            for gamma_idx in range(visualizer.gamma_bins):
+                gamma_val = visualizer.gamma_range[0] + gamma_idx * gamma_step + gamma_step / 2
+                covered = True
+                if not gamma_dont_care:
+                    covered &= rule['gamma_min'] <= gamma_val <= rule['gamma_max']
+                if not density_dont_care:
+                    covered &= rule['density_min'] <= density_val <= rule['density_max']
+                if covered:
+                    if gamma_dont_care or density_dont_care:
+                        if matrix[density_idx, gamma_idx] == 0:
+                            matrix[density_idx, gamma_idx] = -1
+                    else:
+                        matrix[density_idx, gamma_idx] += 1
+                    details.setdefault((gamma_idx, density_idx), []).append(rule['code'])
+    return matrix, details
+
+
+def make_rules(count, seed=0):
+    """Overlapping random rules, then rules with "don't care" bounds and the NL rule."""
+    rng = np.random.default_rng(seed)
+    rules = []
+    for i in range(count):
+        gamma_min, gamma_max = np.sort(np.round(rng.uniform(0, 300, 2), 1))
+        density_min, density_max = np.sort(np.round(rng.uniform(0, 4, 2), 2))
+        rules.append({'code': f'R{i}', 'gamma_min': gamma_min, 'gamma_max': gamma_max,
+                      'density_min': density_min, 'density_max': density_max})
+    rules.append({'code': 'DG', 'gamma_min': DONT_CARE_VALUE, 'gamma_max': DONT_CARE_VALUE,
+                  'density_min': 1.0, 'density_max': 1.5})
+    rules.append({'code': 'DD', 'gamma_min': 150, 'gamma_max': 200,
+                  'density_min': DONT_CARE_VALUE, 'density_max': DONT_CARE_VALUE})
+    rules.append({'code': 'NL', 'gamma_min': -1, 'gamma_max': -1, 'density_min': -1, 'density_max': -1})
+    return rules
+
+
+class TestMatrixVisualizer:
+    """Coverage matrix, rule lists and sample overlay."""
+
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_matches_reference(self, app, seed):
+        visualizer = MatrixVisualizer()
+        rules = make_rules(12, seed)
+        visualizer.update_rules(rules)
+        matrix, details = reference_coverage(visualizer, rules)
+        assert np.array_equal(visualizer.coverage_matrix, matrix)
+        assert dict(visualizer.coverage_details) == details
+        assert visualizer.coverage_details.get((0, 0), []) == details.get((0, 0), [])
+        assert "Gaps (no coverage)" in visualizer.get_gap_analysis()
+
+    def test_dont_care_rule_first(self, app):
+        # A "don't care" rule listed before a normal rule over the same cells
+        # used to turn them into gaps (-1 + 1)
+        visualizer = MatrixVisualizer()
+        rules = make_rules(0)[:1] + [{'code': 'CO', 'gamma_min': 0, 'gamma_max': 300,
+                                      'density_min': 1.0, 'density_max': 1.5}]
+        visualizer.update_rules(rules)
+        assert set(np.unique(visualizer.coverage_matrix)) == {0, 1}
+        assert visualizer.coverage_details[(0, 6)] == ['DG', 'CO']
+
+    def test_sample_overlay(self, app):
+        rng = np.random.default_rng(0)
+        gamma = rng.uniform(0, 300, 10000)
+        density = rng.uniform(0, 4, 10000)
+        gamma[:10] = np.nan
+
+        visualizer = MatrixVisualizer()
+        visualizer.update_rules(make_rules(5))
+        visualizer.set_sample_data(gamma, density)
+        histogram = visualizer.sample_histogram
+        assert histogram.shape == visualizer.coverage_matrix.shape
+        assert histogram.sum() == 9990
+        row, col = int(density[10] / 4 * 20), int(gamma[10] / 300 * 30)
+        assert histogram[row, col] > 0
+        assert visualizer.matrix_canvas.sample_histogram is histogram
+        assert "Hole samples in gaps" in visualizer.get_gap_analysis()
+
+        visualizer.samples_checkbox.setChecked(False)
+        assert visualizer.matrix_canvas.samples_image is None
+        visualizer.set_sample_data(None, None)
+        assert visualizer.sample_histogram is None and not visualizer.samples_checkbox.isEnabled()
+
+    def test_fine_bins(self, app):
+        visualizer = MatrixVisualizer()
+        visualizer.gamma_bins = visualizer.density_bins = 500
+        visualizer.set_sample_data(np.random.default_rng(0).uniform(0, 300, 100000),
+                                   np.random.default_rng(1).uniform(0, 4, 100000))
+        rules = make_rules(40)
+        start = time.perf_counter()
+        visualizer.update_rules(rules)
+        elapsed = time.perf_counter() - start
+        assert visualizer.coverage_matrix.shape == (500, 500)
+        assert visualizer.coverage_details[(250, 250)] == [
+            rule['code'] for rule in rules[:-1]
+            if (rule['gamma_min'] == DONT_CARE_VALUE or rule['gamma_min'] <= 150.3 <= rule['gamma_max'])
+            and (rule['density_min'] == DONT_CARE_VALUE or rule['density_min'] <= 2.004 <= rule['density_max'])]
+        assert elapsed < 0.5
+
+        visualizer.matrix_canvas.resize(600, 400)
+        visualizer.matrix_canvas.grab()
@@ -0,0 +1,128 @@
+"""
+Unit tests for PandasModel's column arrays, display cache and issue index.
+
+Every role must return what reading the DataFrame cell and scanning the row's
+validation issues returns.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from PyQt6.QtCore import Qt, QVariant
+
+from src.core.validation import ValidationIssue, ValidationSeverity
+from src.ui.models.pandas_model import PandasModel
+
+ROLES = [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.TextAlignmentRole,
+         Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole, Qt.ItemDataRole.FontRole]
+
+
+def reference_data(model, row, col, role):
+    """Cell value/style from the DataFrame and the row's issues, as previously done in PandasModel.data."""
+    df = model._dataframe
+    col_name = df.columns[col]
+    if role == Qt.ItemDataRole.DisplayRole:
+        value = df.iat[row, col]
+        if pd.isna(value):
+            return ""
+        if col_name in model._column_formatters:
+            return model._column_formatters[col_name](value)
+        return str(value)
+    if role == Qt.ItemDataRole.TextAlignmentRole:
+        if pd.api.types.is_numeric_dtype(df.dtypes.iloc[col]):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+    issues = []
+    for issue in model._validation_issues.get(row, []):
+        column = issue.get('column') if isinstance(issue, dict) else issue.column
+        severity = issue.get('severity') if isinstance(issue, dict) else issue.severity
+        message = issue.get('message') if isinstance(issue, dict) else issue.message
+        if column == col_name or column is None:
+            issues.append((severity, message))
+    if role == Qt.ItemDataRole.BackgroundRole:
+        for severity, _ in issues:
+            if severity == "ERROR":
+                return (255, 200, 200, 255)
+            elif severity == "WARNING":
+                return (255, 255, 200, 255)
+        if (row, col) in model._background_colors:
+            return model._background_colors[(row, col)].getRgb()
+        return (240, 240, 240, 255) if row % 2 == 0 else None
+    if role == Qt.ItemDataRole.ToolTipRole:
+        return "\n".join(f"{severity}: {message}" for severity, message in issues) or None
+    if role == Qt.ItemDataRole.FontRole:
+        return True if any(severity == "ERROR" for severity, _ in issues) else None
+
+
+def model_data(model, row, col, role):
+    value = model.data(model.index(row, col), role)
+    if isinstance(value, QVariant):
+        value = value.value()
+    if role == Qt.ItemDataRole.BackgroundRole:
+        return value.color().getRgb() if value is not None else None
+    if role == Qt.ItemDataRole.FontRole:
+        return value.bold() if value is not None else None
+    return value
+
+
+def assert_matches_reference(model):
+    for row in range(model.rowCount()):
+        for col in range(model.columnCount()):
+            for role in ROLES:
+                assert model_data(model, row, col, role) == reference_data(model, row, col, role), (row, col, role)
+
+
+@pytest.fixture
+def model():
+    rng = np.random.default_rng(0)
+    count = 40
+    df = pd.DataFrame({
+        'from_depth': np.round(np.cumsum(rng.uniform(0.1, 2, count)), 2),
+        'to_depth': np.round(np.cumsum(rng.uniform(0.1, 2, count)), 2) + 1,
+        'seam': rng.choice(['A', 'B', None], count),
+        'ply': rng.integers(0, 5, count),
+        'lithology': rng.choice(['CO', 'SS', ''], count),
+        'intact': rng.choice([True, False], count),
+    })
+    df.loc[3, 'from_depth'] = np.nan
+    model = PandasModel()
+    model.set_dataframe(df)
+    model.set_editable_columns(list(df.columns))
+    model.set_validation_issues({
+        0: [{'severity': 'ERROR', 'column': 'from_depth', 'message': 'Negative depth'},
+            {'severity': 'WARNING', 'column': None, 'message': 'Duplicate range'}],
+        5: [{'severity': 'INFO', 'column': 'lithology', 'message': 'Note'},
+            {'severity': 'WARNING', 'column': 'lithology', 'message': 'Invalid code'}],
+        7: [ValidationIssue(ValidationSeverity.ERROR, 'Gap', 7, 'to_depth')],
+        12: [{'severity': 'ERROR', 'column': 'Missing_Column', 'message': 'Unmatched'}],
+        500: [{'severity': 'ERROR', 'column': None, 'message': 'Stale row'}],
+    })
+    return model
+
+
+class TestPandasModel:
+    """Compare role lookups with reading the DataFrame."""
+
+    def test_roles_match_dataframe(self, model):
+        assert_matches_reference(model)
+
+    def test_edits_update_cache(self, model):
+        assert_matches_reference(model)  # fill the display cache
+        model.setData(model.index(2, 0), "12.5")
+        model.setData(model.index(4, 3), "")  # NaN into an integer column changes its dtype
+        model.setData(model.index(6, 4), "ST")
+        model.set_column_formatter('to_depth', lambda value: f"{value:.1f} m")
+        model.set_background_color(9, 1, model._error_brush.color())
+        assert model.data(model.index(2, 0)) == "12.5"
+        assert model.data(model.index(4, 3)) == ""
+        assert_matches_reference(model)
+
+    def test_structure_changes(self, model):
+        assert_matches_reference(model)
+        model.insert_row(3, {'from_depth': 1.0, 'lithology': 'CO'})
+        model.remove_row(10)
+        model.sort(4)
+        assert_matches_reference(model)
+        model.set_validation_issues({1: [{'severity': 'ERROR', 'column': 'seam', 'message': 'Bad seam'}]})
+        assert_matches_reference(model)
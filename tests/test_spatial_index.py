@@ -0,0 +1,112 @@
+"""
+Unit tests for the hole collar spatial index.
+
+Picks must return the same hole as measuring the distance to every collar,
+and lasso queries the same holes as QPainterPath.contains.
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QPainterPath
+from PyQt6.QtWidgets import QApplication
+
+from src.core.spatial_index import HoleSpatialIndex
+from src.ui.widgets.map_window import MapWindow
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def collars():
+    rng = np.random.default_rng(11)
+    n = 5000
+    x = rng.uniform(500000, 510000, n)
+    y = rng.uniform(7000000, 7004000, n)
+    return {f"hole_{i}.las": (float(x[i]), float(y[i])) for i in range(n)}
+
+
+@pytest.fixture
+def index(collars):
+    spatial_index = HoleSpatialIndex()
+    for key, (x, y) in collars.items():
+        spatial_index.add(key, x, y)
+    return spatial_index
+
+
+def brute_force_nearest(collars, x, y, tolerance):
+    closest, closest_distance = None, float('inf')
+    for key, (cx, cy) in collars.items():
+        distance = np.hypot(cx - x, cy - y)
+        if distance < tolerance and distance < closest_distance:
+            closest, closest_distance = key, distance
+    return closest
+
+
+class TestHoleSpatialIndex:
+    """Compare grid queries with linear scans."""
+
+    @pytest.mark.parametrize("tolerance", [10, 100, 5000])
+    def test_nearest_matches_brute_force(self, collars, index, tolerance):
+        rng = np.random.default_rng(1)
+        for x, y in zip(rng.uniform(499000, 511000, 200), rng.uniform(6999000, 7005000, 200)):
+            assert index.nearest(x, y, tolerance) == brute_force_nearest(collars, x, y, tolerance)
+
+    def test_within_polygon_matches_qpainterpath(self, collars, index):
+        # Self-intersecting bow-tie plus a concave notch
+        vertices = [(501000, 7000500), (508000, 7003500), (508000, 7000500), (504000, 7002000),
+                    (501000, 7003500)]
+        path = QPainterPath()
+        path.moveTo(QPointF(*vertices[0]))
+        for vertex in vertices[1:]:
+            path.lineTo(QPointF(*vertex))
+        path.closeSubpath()
+
+        expected = {key for key, (x, y) in collars.items() if path.contains(QPointF(x, y))}
+        assert set(index.within_polygon(vertices)) == expected
+        assert expected
+
+    def test_add_move_remove(self, collars, index):
+        index.remove("hole_0.las")
+        index.remove("missing.las")
+        assert "hole_0.las" not in index
+        assert len(index) == len(collars) - 1
+
+        index.add("hole_1.las", 0.0, 0.0)
+        assert index.nearest(1.0, 1.0, 10) == "hole_1.las"
+        x, y = collars["hole_0.las"]
+        assert index.nearest(x, y, 0.001) is None
+
+        index.clear()
+        assert index.nearest(0.0, 0.0, 10) is None
+        assert index.within_polygon([(-1, -1), (1, -1), (0, 1)]) == []
+
+    def test_non_finite_collars_are_not_indexed(self, collars, index):
+        index.add("hole_2.las", float('nan'), 7000000.0)
+        index.add("nan.las", 500000.0, float('inf'))
+        assert "hole_2.las" not in index and "nan.las" not in index
+        x, y = collars["hole_5.las"]
+        assert index.nearest(x, y, 0.001) == "hole_5.las"
+        assert "hole_5.las" in index.within_polygon([(x - 1, y - 1), (x + 1, y - 1), (x, y + 1)])
+
+    def test_map_picks_after_nan_collar(self, app):
+        window = MapWindow()
+        with contextlib.redirect_stdout(io.StringIO()):
+            window.add_holes({
+                "a.las": {'easting': 1.0, 'northing': 1.0},
+                "nan.las": {'easting': float("NaN"), 'northing': 2.0},
+                "none.las": {'easting': None, 'northing': 2.0},
+            })
+            window.select_point_at(1.0, 1.0)
+            assert window.selected_holes == {"a.las"}
+
+            window.lasso_points = [QPointF(0, 0), QPointF(3, 0), QPointF(3, 3)]
+            window.finish_lasso()
+        assert window.selected_holes == {"a.las"}
+        assert len(window.spatial_index) == 1
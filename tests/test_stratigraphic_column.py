@@ -0,0 +1,89 @@
+"""
+Unit tests for StratigraphicColumn's pattern tiles.
+
+Units with the same lithology pattern and colour must share one cached tile,
+and every drawable unit must still get its own rectangle.
+"""
+
+import contextlib
+import glob
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication, QGraphicsRectItem
+
+from src.core.config import LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN
+from src.ui.widgets.stratigraphic_column import StratigraphicColumn
+from src.ui.widgets.svg_renderer import SvgRenderer
+
+SVG_DIR = os.path.join(os.path.dirname(__file__), '..', 'src', 'assets', 'svg')
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def svg_paths():
+    paths = sorted(glob.glob(os.path.join(SVG_DIR, '*.svg')))[:3]
+    if len(paths) < 3:
+        pytest.skip("lithology SVG patterns not available")
+    return paths
+
+
+def make_units(count, svg_paths, seed=0):
+    rng = np.random.default_rng(seed)
+    thickness = np.round(rng.uniform(0.05, 1.5, count), 2)
+    thickness[::50] = 0.0  # Not drawn
+    from_depths = np.concatenate([[0.0], np.cumsum(thickness)[:-1]])
+    return pd.DataFrame({
+        'from_depth': from_depths,
+        'to_depth': from_depths + thickness,
+        RECOVERED_THICKNESS_COLUMN: thickness,
+        LITHOLOGY_COLUMN: rng.choice(['CO', 'SS', 'ST'], count),
+        'svg_path': rng.choice(svg_paths + [None], count),
+        'background_color': rng.choice(['#FFFFFF', '#C0A080', '', 'not-a-colour'], count),
+    })
+
+
+def draw(column, units, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        column.draw_column(units, 0.0, float(units['to_depth'].max()), **kwargs)
+    return [item for item in column.scene.items()
+            if isinstance(item, QGraphicsRectItem) and item.rect().x() == column.y_axis_width
+            and item.rect().width() == column.column_width]
+
+
+class TestPatternTiles:
+    """Tile cache and shared unit brushes."""
+
+    def test_tile_cache(self, app, svg_paths):
+        renderer = SvgRenderer()
+        tile = renderer.render_tile(svg_paths[0], 40, QColor('#C0A080'), 2.0)
+        assert tile.width() == 80 and tile.devicePixelRatio() == 2.0
+        assert renderer.render_tile(svg_paths[0], 40, QColor('#C0A080'), 2.0) is tile
+        assert renderer.render_tile(svg_paths[0], 40, QColor('#FFFFFF'), 2.0) is not tile
+        assert renderer.render_tile('missing.svg', 40, QColor('#FFFFFF')) is None
+
+    def test_units_share_tiles(self, app, svg_paths):
+        units = make_units(2000, svg_paths)
+        column = StratigraphicColumn()
+        rects = draw(column, units)
+        assert len(rects) == int((units[RECOVERED_THICKNESS_COLUMN] > 0).sum())
+
+        textures = {item.brush().texture().cacheKey() for item in rects
+                    if item.brush().style() == Qt.BrushStyle.TexturePattern}
+        assert len(textures) == len(svg_paths) * 2  # White (also for blank and invalid colours) and tan
+        assert len(column.svg_renderer.tile_cache) == len(textures) + 2  # Plus the missing (None) pattern
+
+        # Redrawing renders nothing new; disabling SVGs falls back to solid colours
+        draw(column, units)
+        assert len(column.svg_renderer.tile_cache) == len(textures) + 2
+        rects = draw(column, units, disable_svg=True)
+        assert all(item.brush().style() == Qt.BrushStyle.SolidPattern for item in rects)
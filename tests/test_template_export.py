@@ -0,0 +1,150 @@
+"""
+Unit tests for writing lithology units to the Excel template.
+"""
+
+import time
+
+import openpyxl
+import pandas as pd
+import pytest
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+from src.core.analyzer import Analyzer
+from src.core.config import LITHOLOGY_COLUMN
+from src.ui import main_window
+from src.ui.main_window import MainWindow
+
+
+@pytest.fixture
+def units():
+    return pd.DataFrame({
+        'from_depth': [10.0, 10.5, 12.0],
+        'to_depth': [10.5, 12.0, 12.2],
+        'recovered_thickness': [0.5, 1.5, 0.2],
+        LITHOLOGY_COLUMN: ['CO', 'SS', 'SH'],
+        'lithology_qualifier': ['', 'CL', ''],
+        'shade': ['LT', '', ''],
+        'lithology_percent': [0.0, 40.0, 0.0],
+    })
+
+
+def write_template(path, merged_range=None, styled=False):
+    """Create a one-sheet template with four header rows."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Lithology'
+    sheet['A1'] = 'Lithology'
+    sheet['A3'] = 'From'
+    sheet['B3'] = 'To'
+    if styled:
+        sheet['A3'].font = openpyxl.styles.Font(bold=True)
+    if merged_range:
+        sheet.merge_cells(merged_range)
+    workbook.save(path)
+    return path
+
+
+def sheet_values(path):
+    sheet = openpyxl.load_workbook(path)['Lithology']
+    return [[cell.value for cell in row] for row in sheet.iter_rows()]
+
+
+class TestSaveToTemplate:
+    """Test the bulk and streaming template writers."""
+
+    def test_writes_unit_rows(self, tmp_path, units):
+        template = write_template(tmp_path / 'template.xlsx', styled=True)
+        output = tmp_path / 'out' / 'result.xlsx'
+        assert Analyzer().save_to_template(None, str(template), str(output), units=units)
+
+        sheet = openpyxl.load_workbook(output)['Lithology']
+        assert [sheet.cell(row=row, column=1).value for row in (5, 6, 7)] == [10.0, 10.5, 12.0]
+        assert [sheet.cell(row=row, column=12).value for row in (5, 6, 7)] == ['CO', 'SS', 'SH']
+        assert sheet['M5'].value is None and sheet['M6'].value == 'CL'
+        assert sheet['N5'].value == 'LT'
+        assert sheet['U5'].value is None and sheet['U6'].value == 40.0
+        assert sheet['A3'].font.bold
+
+    def test_merged_cells_are_skipped(self, tmp_path, units):
+        template = write_template(tmp_path / 'template.xlsx', merged_range='L6:M7')
+        output = tmp_path / 'result.xlsx'
+        assert Analyzer().save_to_template(None, str(template), str(output), units=units)
+
+        sheet = openpyxl.load_workbook(output)['Lithology']
+        assert sheet['L5'].value == 'CO'
+        assert sheet['L6'].value is None
+        assert sheet['A6'].value == 10.5
+
+    def test_streaming_matches_bulk_write(self, tmp_path, units):
+        template = write_template(tmp_path / 'template.xlsx')
+        bulk = tmp_path / 'bulk.xlsx'
+        streamed = tmp_path / 'streamed.xlsx'
+        assert Analyzer().save_to_template(None, str(template), str(bulk), units=units)
+        assert Analyzer().save_to_template(None, str(template), str(streamed), units=units, streaming=True)
+        assert sheet_values(streamed) == sheet_values(bulk)
+
+    def test_streaming_falls_back_for_rich_templates(self, tmp_path, units):
+        analyzer = Analyzer()
+        for name, kwargs in [('merged', {'merged_range': 'C1:D1'}), ('styled', {'styled': True})]:
+            template = write_template(tmp_path / f'{name}.xlsx', **kwargs)
+            workbook = openpyxl.load_workbook(template)
+            unit_rows = analyzer._template_unit_rows(units, 5)
+            assert not analyzer._template_supports_streaming(workbook, workbook['Lithology'], 5, unit_rows)
+
+
+class SlowExportWorker(QObject):
+    """Stands in for TemplateExportWorker, recording how many exports write at once."""
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+    active = 0
+    runs = []
+
+    def __init__(self, units, classified_data, template_path, output_path):
+        super().__init__()
+        self.units = units
+        self.output_path = output_path
+
+    def run(self):
+        SlowExportWorker.active += 1
+        SlowExportWorker.runs.append((self.units, SlowExportWorker.active))
+        time.sleep(0.05)
+        SlowExportWorker.active -= 1
+        self.finished.emit(self.output_path)
+
+
+class ExportHost(QObject):
+    """The export state and methods of MainWindow, without building the whole window."""
+    _start_template_export = MainWindow._start_template_export
+    _run_template_export = MainWindow._run_template_export
+    _template_export_thread_finished = MainWindow._template_export_thread_finished
+
+    def __init__(self, las_file_path):
+        super().__init__()
+        self.las_file_path = las_file_path
+        self.export_thread = None
+        self.export_worker = None
+        self._queued_template_export = None
+        self.errors = []
+
+    def template_export_error(self, message):
+        self.errors.append(message)
+
+
+def test_reruns_wait_for_the_running_export(tmp_path, monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.setattr(main_window, 'TemplateExportWorker', SlowExportWorker)
+    SlowExportWorker.runs = []
+    host = ExportHost(str(tmp_path / 'hole.las'))
+
+    # A rerun during an export is queued; the latest queued results are the ones written next
+    for run in ('first', 'second', 'third'):
+        host._start_template_export(run, None)
+    deadline = time.monotonic() + 5
+    while (host.export_thread is not None or host._queued_template_export) and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+
+    assert [(units, active) for units, active in SlowExportWorker.runs] == [('first', 1), ('third', 1)]
+    assert host.export_thread is None and host.export_worker is None
+    assert host.errors == []
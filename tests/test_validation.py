@@ -0,0 +1,300 @@
+"""
+Unit tests for the vectorized hole validator.
+
+validate_hole must report exactly the issues (order, messages, rows, columns
+and values) of the row-by-row checks it replaces.
+"""
+
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from src.core.config import COALLOG_V31_COLUMNS, LITHOLOGY_COLUMN, RECOVERED_THICKNESS_COLUMN
+from src.core.validation import RealTimeValidator, ValidationResult, validate_hole, validation_snapshot
+
+
+def reference_validate_hole(dataframe, total_depth=None):
+    """Row-by-row validation, as previously done in validate_hole (tied depths now sort stably)."""
+    result = ValidationResult()
+    if dataframe.empty:
+        result.add_warning("DataFrame is empty")
+        return result
+    for col in ['From_Depth', 'To_Depth']:
+        if col not in dataframe.columns:
+            result.add_error(f"Missing required column: {col}")
+    if not result.is_valid:
+        return result
+
+    df = dataframe.sort_values('From_Depth', kind='stable').reset_index(drop=True)
+    for idx, row in df.iterrows():
+        from_depth, to_depth = row['From_Depth'], row['To_Depth']
+        if pd.isna(from_depth) or pd.isna(to_depth):
+            result.add_error(f"Missing depth values", row_index=idx)
+            continue
+        if from_depth >= to_depth:
+            result.add_error(f"From_Depth ({from_depth}) must be less than To_Depth ({to_depth})",
+                             row_index=idx, column='From_Depth', value=from_depth)
+        if from_depth < 0 or to_depth < 0:
+            result.add_error(f"Negative depth value", row_index=idx,
+                             column='From_Depth' if from_depth < 0 else 'To_Depth',
+                             value=from_depth if from_depth < 0 else to_depth)
+
+    for i in range(len(df) - 1):
+        current_to = df.iloc[i]['To_Depth']
+        next_from = df.iloc[i + 1]['From_Depth']
+        if abs(current_to - next_from) > 0.001:
+            gap_size = next_from - current_to
+            if gap_size > 0:
+                result.add_error(f"Gap of {gap_size:.3f}m between rows {i} and {i+1}",
+                                 row_index=i, column='To_Depth', value=current_to)
+            else:
+                result.add_error(f"Overlap of {current_to - next_from:.3f}m between rows {i} and {i+1}",
+                                 row_index=i, column='To_Depth', value=current_to)
+
+    if total_depth is not None and len(df) > 0:
+        last_to_depth = df.iloc[-1]['To_Depth']
+        if abs(last_to_depth - total_depth) > 0.001:
+            diff = total_depth - last_to_depth
+            result.add_warning(
+                f"Last row To_Depth ({last_to_depth:.3f}) doesn't match header TD ({total_depth:.3f}), difference: {diff:.3f}m",
+                row_index=len(df) - 1, column='To_Depth', value=last_to_depth)
+
+    seen_ranges = set()
+    for idx, (f, t) in enumerate(zip(df['From_Depth'], df['To_Depth'])):
+        range_str = f"{f:.3f}-{t:.3f}"
+        if range_str in seen_ranges:
+            result.add_warning(f"Duplicate depth range: {range_str}", row_index=idx)
+        seen_ranges.add(range_str)
+
+    if RECOVERED_THICKNESS_COLUMN in df.columns:
+        for idx, row in df.iterrows():
+            calculated = row['To_Depth'] - row['From_Depth']
+            stored = row[RECOVERED_THICKNESS_COLUMN]
+            if pd.notna(stored) and abs(calculated - stored) > 0.001:
+                result.add_warning(f"Thickness mismatch: calculated {calculated:.3f}, stored {stored:.3f}",
+                                   row_index=idx, column=RECOVERED_THICKNESS_COLUMN, value=stored)
+    return result
+
+
+def assert_same_issues(result, expected, same_types=True):
+    assert result.is_valid == expected.is_valid
+    assert result.to_dict() == expected.to_dict()
+    assert [issue.value for issue in result.issues] == [issue.value for issue in expected.issues]
+    if same_types:
+        assert [type(issue.value) for issue in result.issues] == [type(issue.value) for issue in expected.issues]
+
+
+def make_intervals(count, seed=0):
+    """Contiguous intervals with a sprinkling of gaps, overlaps, bad rows and duplicates."""
+    rng = np.random.default_rng(seed)
+    bounds = np.round(np.cumsum(rng.uniform(0.05, 2.0, count + 1)), 3)
+    from_depths, to_depths = bounds[:-1].copy(), bounds[1:].copy()
+    to_depths[rng.choice(count, count // 50, replace=False)] += rng.choice([-0.3, 0.2, 0.0005], count // 50)
+    from_depths[rng.choice(count, count // 100, replace=False)] = np.nan
+    inverted = rng.choice(count, count // 100, replace=False)
+    from_depths[inverted], to_depths[inverted] = to_depths[inverted], from_depths[inverted]
+    from_depths[:2] = [-0.0004, -0.0004]
+    to_depths[:2] = [0.0025, 0.0025]
+    thickness = np.round(to_depths - from_depths, 3)
+    thickness[rng.choice(count, count // 40, replace=False)] += 0.5
+    thickness[rng.choice(count, count // 40, replace=False)] = np.nan
+    return pd.DataFrame({
+        'From_Depth': from_depths,
+        'To_Depth': to_depths,
+        RECOVERED_THICKNESS_COLUMN: thickness,
+        LITHOLOGY_COLUMN: rng.choice(['CO', 'SS', 'XX'], count),
+    })
+
+
+class TestValidateHole:
+    """Compare the vectorized validator with the row-by-row checks."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_reference(self, seed):
+        df = make_intervals(2000, seed)
+        total_depth = float(np.nanmax(df['To_Depth'])) + 1.0
+        assert_same_issues(validate_hole(df, total_depth), reference_validate_hole(df, total_depth))
+
+    @pytest.mark.parametrize("df", [
+        pd.DataFrame({'From_Depth': [0, 5, 5, 12], 'To_Depth': [5.0, 10.0, 10.0, 11.0]}),
+        pd.DataFrame({'From_Depth': [0, 5, 5, -2], 'To_Depth': [5, 10, 10, 8]}),
+        pd.DataFrame({'From_Depth': [0, 5, None, 9], 'To_Depth': [5.0, 10.0, 3.0, 9.0],
+                      'recovered_thickness': [5, 4, None, 1], 'code': ['CO', 'SS', 'ST', 'CO']}),
+        pd.DataFrame({'From_Depth': [1.0005, 2.0, 1.0015], 'To_Depth': [2.0, 3.0, 2.0]}),
+        pd.DataFrame({'From_Depth': [0.0], 'To_Depth': [1.0]}),
+        pd.DataFrame({'From_Depth': [1.0]}),
+        pd.DataFrame(),
+    ])
+    def test_edge_cases(self, df):
+        for total_depth in (None, 11, 10.0):
+            assert_same_issues(validate_hole(df, total_depth), reference_validate_hole(df, total_depth))
+
+    def test_snapshot_validates_like_table(self):
+        df = pd.DataFrame({'From_Depth': [0, 5, 5], 'To_Depth': [5.0, 4.0, 10.0],
+                           'recovered_thickness': [5, 1, 5], 'code': ['CO', 'SS', 'ST']})
+        for frame in (df, df.drop(columns='code')):
+            assert_same_issues(validate_hole(validation_snapshot(frame), 10.0), validate_hole(frame, 10.0),
+                               same_types=False)
+
+    def test_snapshot_keeps_tied_rows_in_order(self):
+        # Rows with equal From_Depth must come out of the sort in the same order
+        # whether the depths are float columns or cast to object
+        df = pd.DataFrame({'From_Depth': np.r_[np.arange(20.), 5.], 'To_Depth': np.r_[np.arange(1., 21.), 5.5],
+                           LITHOLOGY_COLUMN: 'CO'})
+        result = validate_hole(validation_snapshot(df))
+        assert [issue.message for issue in result.issues] == [
+            "Overlap of 1.000m between rows 5 and 6", "Gap of 0.500m between rows 6 and 7"]
+        assert_same_issues(result, validate_hole(df), same_types=False)
+
+        rng = np.random.default_rng(3)
+        for _ in range(300):
+            count = int(rng.integers(2, 40))
+            from_depths = rng.integers(0, 20, count) * 0.5
+            to_depths = from_depths + rng.choice([0.25, 0.5, 1.0], count)
+            df = pd.DataFrame({'From_Depth': from_depths, 'To_Depth': to_depths,
+                               RECOVERED_THICKNESS_COLUMN: np.round(to_depths - from_depths, 2),
+                               LITHOLOGY_COLUMN: rng.choice(['CO', 'SS'], count)})
+            assert_same_issues(validate_hole(validation_snapshot(df), 10.0), validate_hole(df, 10.0),
+                               same_types=False)
+
+    def test_large_table(self):
+        df = make_intervals(50000)
+        start = time.perf_counter()
+        result = validate_hole(df, 100.0)
+        elapsed = time.perf_counter() - start
+        assert len(result.issues) > 0
+        assert elapsed < 2.0
+
+
+class StaticDictionaryManager:
+    """Dictionary manager over a fixed code list."""
+
+    is_loaded = True
+
+    def get_codes_for_category(self, category):
+        return [('CO', 'Coal'), ('SS', 'Sandstone')]
+
+
+class TestIncrementalValidation:
+    """Compare RealTimeValidator.revalidate after edits with a fresh full validation."""
+
+    def check(self, validator, df, total_depth=100.0):
+        expected = RealTimeValidator(StaticDictionaryManager()).validate_dataframe(df, total_depth)
+        assert_same_issues(validator.revalidate(df, total_depth), expected)
+
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_random_edits(self, seed):
+        rng = np.random.default_rng(seed)
+        df = make_intervals(400, seed).sort_values('From_Depth').reset_index(drop=True)
+        validator = RealTimeValidator(StaticDictionaryManager())
+        self.check(validator, df)
+
+        for _ in range(60):
+            action = rng.choice(['edit', 'insert', 'remove', 'code', 'duplicate'])
+            row = int(rng.integers(len(df)))
+            if action == 'edit':
+                column = rng.choice(['To_Depth', RECOVERED_THICKNESS_COLUMN])
+                df.loc[row, column] = round(float(df.loc[row, column]) + rng.choice([-0.2, 0.0004, 0.3]), 4)
+                validator.mark_rows_changed([row])
+            elif action == 'code':
+                df.loc[row, LITHOLOGY_COLUMN] = rng.choice(['CO', 'XX'])
+                validator.mark_rows_changed([row])
+            elif action == 'duplicate' and row > 0:
+                df.loc[row, ['From_Depth', 'To_Depth']] = df.loc[row - 1, ['From_Depth', 'To_Depth']].to_numpy()
+                validator.mark_rows_changed([row])
+            elif action == 'insert':
+                new_row = df.iloc[[row]]
+                df = pd.concat([df.iloc[:row], new_row, df.iloc[row:]], ignore_index=True)
+                validator.mark_rows_inserted(row)
+            elif action == 'remove':
+                count = int(rng.integers(1, 3))
+                df = df.drop(index=range(row, min(row + count, len(df)))).reset_index(drop=True)
+                validator.mark_rows_removed(row, min(count, len(df) + count - row))
+            self.check(validator, df, total_depth=float(rng.choice([100.0, 500.0])))
+
+    def test_untouched_issues_are_kept(self):
+        df = make_intervals(2000).sort_values('From_Depth').reset_index(drop=True)
+        validator = RealTimeValidator()
+        before = validator.validate_dataframe(df, 100.0)
+        df.loc[1000, 'To_Depth'] += 0.5
+        validator.mark_rows_changed([1000])
+        after = validator.revalidate(df, 100.0)
+        kept = {id(issue) for issue in before.issues}
+        assert all(id(issue) in kept for issue in after.issues
+                   if abs(issue.row_index - 1000) > 1 and issue.row_index != len(df) - 1)
+        assert_same_issues(after, RealTimeValidator().validate_dataframe(df, 100.0))
+
+    def test_falls_back_when_out_of_order(self):
+        df = make_intervals(300).sort_values('From_Depth').reset_index(drop=True)
+        validator = RealTimeValidator()
+        validator.validate_dataframe(df)
+        df.loc[10, 'From_Depth'] = 1000.0
+        validator.mark_rows_changed([10])
+        assert_same_issues(validator.revalidate(df), validate_hole(df))
+
+
+def coallog_table(count, seed=0):
+    """make_intervals in the CoalLog v3.1 layout the lithology table uses."""
+    intervals = make_intervals(count, seed).sort_values('From_Depth').reset_index(drop=True)
+    table = pd.DataFrame({column: [''] * count for column in COALLOG_V31_COLUMNS})
+    table['from_depth'] = intervals['From_Depth']
+    table['to_depth'] = intervals['To_Depth']
+    table[RECOVERED_THICKNESS_COLUMN] = intervals[RECOVERED_THICKNESS_COLUMN]
+    table[LITHOLOGY_COLUMN] = intervals[LITHOLOGY_COLUMN]
+    table['lithology_percent'] = 0.0
+    return table
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+class TestCoalLogColumns:
+    """Validation of tables naming their depth columns from_depth / to_depth."""
+
+    def test_validator_tracks_coallog_table(self):
+        table = coallog_table(300)
+        renamed = table.rename(columns={'from_depth': 'From_Depth', 'to_depth': 'To_Depth'})
+        validator = RealTimeValidator(from_column='from_depth', to_column='to_depth')
+        result = validator.validate_dataframe(table, 100.0)
+        assert validator.can_revalidate(table)
+        expected = validate_hole(renamed, 100.0)
+        assert [issue.message for issue in result.issues] == [issue.message for issue in expected.issues]
+        assert {issue.column for issue in result.issues} <= {'from_depth', 'to_depth', RECOVERED_THICKNESS_COLUMN, None}
+
+        table.loc[50, 'to_depth'] += 0.3
+        validator.mark_rows_changed([50])
+        assert validator.can_revalidate(table)
+        assert_same_issues(validator.revalidate(table, 100.0),
+                           validate_hole(table, 100.0, from_column='from_depth', to_column='to_depth'))
+
+    def test_table_widget_edits_revalidate_incrementally(self, app):
+        from src.ui.widgets.lithology_table import LithologyTableWidget
+
+        table = coallog_table(200, seed=1)
+        widget = LithologyTableWidget()
+        results = []
+        widget.validationChangedSignal.connect(results.append)
+        with contextlib.redirect_stdout(io.StringIO()):
+            widget.load_data(table, 100.0)
+            assert widget.validation_thread is not None  # Full validation in the background
+            widget.wait_for_validation()
+            assert widget.validator.can_revalidate(widget.current_dataframe)
+
+            model = widget.pandas_model
+            model.setData(model.index(20, table.columns.get_loc('to_depth')), "30.5", Qt.ItemDataRole.EditRole)
+            assert widget.validation_thread is None  # The edit was re-checked right away
+
+        edited = widget.current_dataframe
+        assert edited.loc[20, 'to_depth'] == 30.5
+        expected = RealTimeValidator(from_column='from_depth', to_column='to_depth').validate_dataframe(edited, 100.0)
+        assert_same_issues(results[-1], expected)
+        assert not any("Missing required column" in issue.message for issue in results[-1].issues)
+        assert any(issue.row_index == 20 and issue.column == 'to_depth' for issue in results[-1].issues)